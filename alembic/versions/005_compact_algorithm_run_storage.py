@@ -0,0 +1,220 @@
+"""Content-addressed input snapshots and compressed algorithm run results
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+import gzip
+import hashlib
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+try:
+    import zstandard
+except Exception:
+    zstandard = None
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 200
+
+
+# Frozen copies of the app.services.run_storage helpers as of this revision.
+# The migration must keep writing (and reading) the same format even if the
+# application helpers change later, so it does not import them.
+ENCODING_ZSTD = "zstd"
+ENCODING_GZIP = "gzip"
+DEDUP_KEYS = ("schedule", "assignments", "solution", "final_assignments")
+REF_MARKER = "$ref"
+
+
+def canonical_json(obj):
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str,
+                      ensure_ascii=False).encode("utf-8")
+
+
+def content_hash(obj):
+    return hashlib.sha256(canonical_json(obj)).hexdigest()
+
+
+def encode_payload(obj):
+    raw = canonical_json(obj)
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=6).compress(raw), ENCODING_ZSTD, len(raw)
+    return gzip.compress(raw, compresslevel=6), ENCODING_GZIP, len(raw)
+
+
+def decode_payload(blob, encoding):
+    if encoding == ENCODING_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed payloads")
+        raw = zstandard.ZstdDecompressor().decompress(blob)
+    elif encoding == ENCODING_GZIP:
+        raw = gzip.decompress(blob)
+    else:
+        raise ValueError(f"Unknown payload encoding: {encoding}")
+    return json.loads(raw.decode("utf-8"))
+
+
+def dedupe_result(result):
+    if not isinstance(result, dict):
+        return result
+    deduped = dict(result)
+    seen = {}
+    for key in DEDUP_KEYS:
+        value = result.get(key)
+        if not isinstance(value, list) or not value:
+            continue
+        digest = content_hash(value)
+        if digest in seen:
+            deduped[key] = {REF_MARKER: seen[digest]}
+        else:
+            seen[digest] = key
+    return deduped
+
+
+def restore_result(payload):
+    if not isinstance(payload, dict):
+        return payload
+    restored = dict(payload)
+    for key in DEDUP_KEYS:
+        value = restored.get(key)
+        if isinstance(value, dict) and set(value) == {REF_MARKER}:
+            restored[key] = restored.get(value[REF_MARKER])
+    return restored
+
+
+def upgrade() -> None:
+    """
+    Create input_snapshots, add compressed result columns to algorithm_runs
+    and compact existing rows in batches.
+    """
+    op.create_table(
+        'input_snapshots',
+        sa.Column('content_hash', sa.String(64), nullable=False),
+        sa.Column('payload', sa.LargeBinary(), nullable=False),
+        sa.Column('encoding', sa.String(16), nullable=False),
+        sa.Column('size_bytes', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('content_hash')
+    )
+    op.add_column('algorithm_runs', sa.Column('input_hash', sa.String(64), nullable=True))
+    op.add_column('algorithm_runs', sa.Column('result_payload', sa.LargeBinary(), nullable=True))
+    op.add_column('algorithm_runs', sa.Column('result_encoding', sa.String(16), nullable=True))
+    op.add_column('algorithm_runs', sa.Column('result_size', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_algorithm_runs_input_hash'), 'algorithm_runs', ['input_hash'], unique=False)
+    op.create_foreign_key(
+        'fk_algorithm_runs_input_hash', 'algorithm_runs', 'input_snapshots',
+        ['input_hash'], ['content_hash']
+    )
+
+    _compact_existing_rows(op.get_bind())
+
+
+def _tables():
+    runs = sa.table(
+        'algorithm_runs',
+        sa.column('id', sa.Integer),
+        sa.column('data', sa.JSON),
+        sa.column('result', sa.JSON),
+        sa.column('input_hash', sa.String),
+        sa.column('result_payload', sa.LargeBinary),
+        sa.column('result_encoding', sa.String),
+        sa.column('result_size', sa.Integer),
+    )
+    snapshots = sa.table(
+        'input_snapshots',
+        sa.column('content_hash', sa.String),
+        sa.column('payload', sa.LargeBinary),
+        sa.column('encoding', sa.String),
+        sa.column('size_bytes', sa.Integer),
+    )
+    return runs, snapshots
+
+
+def _compact_existing_rows(bind) -> None:
+    """Move data/result JSON of existing runs into snapshots and compressed payloads."""
+    runs, snapshots = _tables()
+    known = {row[0] for row in bind.execute(sa.select(snapshots.c.content_hash))}
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(runs.c.id, runs.c.data, runs.c.result)
+            .where(runs.c.id > last_id)
+            .where(sa.or_(runs.c.data.isnot(None), runs.c.result.isnot(None)))
+            .order_by(runs.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for run_id, data, result in rows:
+            # SQL NULL (JSON tipinde None 'null' JSON degeri olarak yazilir)
+            values = {"data": sa.null(), "result": sa.null()}
+            if data:
+                digest = content_hash(data)
+                if digest not in known:
+                    blob, encoding, size = encode_payload(data)
+                    bind.execute(snapshots.insert().values(
+                        content_hash=digest, payload=blob, encoding=encoding, size_bytes=size))
+                    known.add(digest)
+                values["input_hash"] = digest
+            if result is not None:
+                blob, encoding, size = encode_payload(dedupe_result(result))
+                values.update(result_payload=blob, result_encoding=encoding, result_size=size)
+            bind.execute(runs.update().where(runs.c.id == run_id).values(**values))
+        last_id = rows[-1][0]
+
+
+def _expand_compacted_rows(bind) -> None:
+    """Write snapshots and compressed results back into the JSON columns."""
+    runs, snapshots = _tables()
+    cache = {}
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(runs.c.id, runs.c.input_hash, runs.c.result_payload, runs.c.result_encoding)
+            .where(runs.c.id > last_id)
+            .where(sa.or_(runs.c.input_hash.isnot(None), runs.c.result_payload.isnot(None)))
+            .order_by(runs.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for run_id, digest, blob, encoding in rows:
+            values = {}
+            if digest:
+                if digest not in cache:
+                    snapshot = bind.execute(
+                        sa.select(snapshots.c.payload, snapshots.c.encoding)
+                        .where(snapshots.c.content_hash == digest)
+                    ).first()
+                    cache[digest] = decode_payload(snapshot[0], snapshot[1]) if snapshot else None
+                values["data"] = cache[digest]
+            if blob is not None:
+                values["result"] = restore_result(decode_payload(blob, encoding))
+            bind.execute(runs.update().where(runs.c.id == run_id).values(**values))
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    """
+    Expand compacted rows back into the JSON columns, then drop the new
+    columns and table.
+    """
+    _expand_compacted_rows(op.get_bind())
+
+    op.drop_constraint('fk_algorithm_runs_input_hash', 'algorithm_runs', type_='foreignkey')
+    op.drop_index(op.f('ix_algorithm_runs_input_hash'), table_name='algorithm_runs')
+    op.drop_column('algorithm_runs', 'result_size')
+    op.drop_column('algorithm_runs', 'result_encoding')
+    op.drop_column('algorithm_runs', 'result_payload')
+    op.drop_column('algorithm_runs', 'input_hash')
+    op.drop_table('input_snapshots')
@@ -0,0 +1,27 @@
+"""Add resource_profile to algorithm_runs
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 23:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Per-run resource profile: phase wall/CPU times, peak RSS, evaluations
+    and final cost (see app.algorithms.resource_profile).
+    """
+    op.add_column('algorithm_runs', sa.Column('resource_profile', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('algorithm_runs', 'resource_profile')
@@ -0,0 +1,35 @@
+"""Add indexes for schedule aggregation queries
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 23:50:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('schedules', 'project_id'),
+    ('schedules', 'classroom_id'),
+    ('schedules', 'timeslot_id'),
+    ('projects', 'responsible_instructor_id'),
+]
+
+
+def upgrade() -> None:
+    """
+    Grouped scoring/chart queries (see app.services.schedule_stats) join and
+    group schedules on these foreign keys.
+    """
+    for table, column in INDEXES:
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+
+
+def downgrade() -> None:
+    for table, column in reversed(INDEXES):
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
@@ -56,6 +56,11 @@ import logging
 import numpy as np
 
 from app.algorithms.base import OptimizationAlgorithm
+from app.algorithms.anytime import get_current_control
+from app.algorithms.checkpoint import (
+    build_checkpoint, is_compatible, pack_solution, unpack_assignments
+)
+from app.algorithms.resource_profile import PHASE_REPAIR, profiled
 
 logger = logging.getLogger(__name__)
 
@@ -372,6 +377,39 @@ class PheromoneMatrix:
             for c in range(new_class_count):
                 if c not in self.project_class_pheromone[p_id]:
                     self.project_class_pheromone[p_id][c] = self.config.initial_pheromone
+    
+    def to_state(self) -> Dict[str, Any]:
+        """Feromon değerlerini checkpoint için kompakt satırlara çevir."""
+        class_range = range(self.config.class_count)
+        initial = self.config.initial_pheromone
+        return {
+            "faculty_ids": list(self.faculty_ids),
+            "class": [
+                [p_id, [round(self.project_class_pheromone[p_id].get(c, initial), 6) for c in class_range]]
+                for p_id in self.project_ids
+            ],
+            "jury": [
+                [p_id, [round(self.project_jury_pheromone[p_id][j_id], 6) for j_id in self.faculty_ids]]
+                for p_id in self.project_ids
+            ],
+        }
+    
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """Checkpoint'teki feromon değerlerini yükle; artık olmayan proje/hoca atlanır."""
+        for p_id, values in state.get("class", []):
+            row = self.project_class_pheromone.get(p_id)
+            if row is None:
+                continue
+            for c, value in enumerate(values[:self.config.class_count]):
+                row[c] = value
+        faculty_ids = state.get("faculty_ids", [])
+        for p_id, values in state.get("jury", []):
+            row = self.project_jury_pheromone.get(p_id)
+            if row is None:
+                continue
+            for j_id, value in zip(faculty_ids, values):
+                if j_id in row:
+                    row[j_id] = value
 
 
 # ============================================================================
@@ -877,6 +915,7 @@ class ACORepairMechanism:
             if i.type == "instructor"
         ]
     
+    @profiled(PHASE_REPAIR)
     def repair(self, solution: ACOSolution) -> None:
         """
         Çözümü onar - SA'daki gibi agresif ve çok katmanlı.
@@ -2712,8 +2751,11 @@ class ACOScheduler:
     - Local search entegrasyonu
     - Adaptif feromon güncelleme
     - Çoklu sınıf sayısı denemesi
+    - Checkpoint'ten devam (feromon matrisi + en iyi çözüm)
     """
     
+    CHECKPOINT_KEY = "ant_colony"
+    
     def __init__(self, config: ACOConfig = None):
         self.config = config or ACOConfig()
         
@@ -2733,6 +2775,9 @@ class ACOScheduler:
         self.best_solution: Optional[ACOSolution] = None
         self.best_cost: float = float('inf')
         self.iteration_history: List[float] = []
+        
+        # Best-so-far snapshot'ları için planner formatına dönüştürücü
+        self.snapshot_converter = None
     
     def initialize(self, data: Dict[str, Any]) -> None:
         """Veriyi yükle ve bileşenleri başlat."""
@@ -2811,12 +2856,21 @@ class ACOScheduler:
                    f"{self.config.max_iterations} iterasyon, "
                    f"{self.config.class_count} sınıf")
         
+        control = get_current_control()
+        self._restore_checkpoint(control)
+        iteration = 0
+        
         for iteration in range(self.config.max_iterations):
             # Zaman kontrolü
             if time.time() - start_time > self.config.time_limit:
                 logger.info(f"Zaman limiti aşıldı, iterasyon {iteration}'de durduruluyor")
                 break
             
+            # Deadline / iptal kontrolü
+            if control is not None and control.should_stop():
+                logger.info(f"ACO iterasyon {iteration}'de durduruldu: {control.stop_reason}")
+                break
+            
             # Karıncaları çalıştır
             iteration_best = self._run_iteration()
             
@@ -2826,6 +2880,7 @@ class ACOScheduler:
                 self.best_solution = iteration_best.copy()
                 self.best_cost = iteration_best.total_cost
                 no_improve_count = 0
+                self._publish_best(control, iteration)
                 logger.info(f"İterasyon {iteration}: Yeni en iyi maliyet = {self.best_cost:.2f}")
             else:
                 no_improve_count += 1
@@ -2843,10 +2898,29 @@ class ACOScheduler:
                         self.best_solution = iteration_best.copy()
                         self.best_cost = iteration_best.total_cost
                         no_improve_count = 0
+                        self._publish_best(control, iteration)
                         logger.info(f"İterasyon {iteration}: Düzeltme sonrası yeni en iyi maliyet = {self.best_cost:.2f}")
             
             self.iteration_history.append(self.best_cost)
             
+            # İlerleme olayı (kısıtlanmış)
+            if control is not None and self.best_solution is not None:
+                best = self.best_solution
+                control.report_progress(
+                    iteration,
+                    best_cost=self.best_cost,
+                    penalty_breakdown={
+                        'h1_gap_penalty': best.h1_gap_penalty,
+                        'h2_workload_penalty': best.h2_workload_penalty,
+                        'h3_class_change_penalty': best.h3_class_change_penalty,
+                        'h4_class_load_penalty': best.h4_class_load_penalty,
+                    },
+                    max_iterations=self.config.max_iterations,
+                    algorithm="AntColonyOptimization",
+                    evaluations=(iteration + 1) * self.config.ant_count,
+                )
+                control.checkpoint(lambda: self._checkpoint_state(iteration))
+            
             # Erken durdurma
             if no_improve_count >= self.config.stagnation_limit:
                 logger.info(f"Stagnasyon limiti aşıldı, iterasyon {iteration}'de durduruluyor")
@@ -2858,6 +2932,9 @@ class ACOScheduler:
         
         elapsed_time = time.time() - start_time
         
+        if control is not None:
+            control.checkpoint(lambda: self._checkpoint_state(iteration), force=True)
+        
         # CRITICAL: Final verification - ensure all classes are used - SA'daki gibi
         # Multiple passes to ensure absolute compliance - SA'daki gibi
         if self.best_solution:
@@ -2901,6 +2978,52 @@ class ACOScheduler:
         
         return self.best_solution
     
+    def _checkpoint_state(self, iteration: int) -> Dict[str, Any]:
+        """Feromon matrisi ve en iyi çözümden kompakt checkpoint."""
+        best = self.best_solution
+        return build_checkpoint(
+            self.CHECKPOINT_KEY, self.config.class_count, [p.id for p in self.projects], iteration,
+            pheromone=self.pheromone_matrix.to_state(),
+            best=pack_solution(best.assignments, self.best_cost) if best is not None else None,
+        )
+    
+    def _restore_checkpoint(self, control) -> bool:
+        """Devam ettirilen koşunun feromon matrisini ve en iyi çözümünü geri yükle."""
+        state = control.take_resume_state(self.CHECKPOINT_KEY) if control is not None else None
+        if state is None:
+            return False
+        if not is_compatible(state, self.CHECKPOINT_KEY, self.config.class_count,
+                             [p.id for p in self.projects]):
+            logger.warning("ACO checkpoint bu veriyle uyuşmuyor, sıfırdan başlanıyor")
+            return False
+        
+        self.pheromone_matrix.load_state(state.get("pheromone") or {})
+        if state.get("best"):
+            best = ACOSolution(
+                assignments=unpack_assignments(state["best"][1], ProjectAssignment),
+                class_count=self.config.class_count,
+            )
+            self.penalty_calculator.calculate_total_cost(best)
+            if not self.penalty_calculator.has_unused_classes(best):
+                self.best_solution = best
+                self.best_cost = best.total_cost
+        logger.info(f"ACO checkpoint'ten devam: iterasyon {state.get('iteration')}, "
+                    f"en iyi maliyet = {self.best_cost:.2f}")
+        return True
+    
+    def _publish_best(self, control, iteration: int) -> None:
+        """En iyi çözümü best-so-far olarak yayınla (dönüşüm lazy)."""
+        if control is None or self.best_solution is None or self.snapshot_converter is None:
+            return
+        best = self.best_solution
+        converter = self.snapshot_converter
+        control.publish(
+            lambda: converter(best.copy()),
+            cost=self.best_cost,
+            algorithm="AntColonyOptimization",
+            iteration=iteration,
+        )
+    
     def _run_iteration(self) -> ACOSolution:
         """
         Tek bir iterasyon çalıştır.
@@ -3449,6 +3572,7 @@ class AntColonyOptimization(OptimizationAlgorithm):
         Returns:
             En iyi çözüm ve istatistikler
         """
+        self.scheduler.snapshot_converter = self._convert_solution_to_schedule
         solution = self.scheduler.run()
         
         return {
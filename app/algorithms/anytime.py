@@ -0,0 +1,473 @@
+"""
+Anytime solver protocol.
+
+Tum algoritmalar icin ortak durdurma ve "best-so-far" mekanizmasi:
+- Deadline: calisma icin mutlak bitis zamani (monotonic saat)
+- CancellationToken: kullanici veya servis tarafindan iptal
+- Snapshot: solver dongusu en iyi cozumu belirli araliklarla yayinlar
+
+Solver donguleri ``should_stop()`` ile ucuz bir kontrol yapar ve iyilesme
+oldugunda ``publish()`` cagirir. Cozum donusumu lazy yapilir; yalnizca
+snapshot araligi doldugunda veya sonuc istendiginde planner formatina cevrilir.
+
+Ilerleme olaylari (iterasyon, en iyi maliyet, ceza kirilimi, gecen sure)
+``report_progress()`` ile yayinlanir ve saniyede en fazla ``max_progress_rate``
+olaya kisilir; boylece websocket'e canli yakinsama bilgisi akar.
+
+Checkpoint: populasyon tabanli / hafizali solver'lar arama durumlarini
+``checkpoint()`` ile en fazla ``checkpoint_interval`` saniyede bir (ve sonda
+``force`` ile) ``on_checkpoint``'e verir. Devam ettirilen bir kosuda onceki
+durum ``resume_state`` uzerinden solver'a ulasir.
+
+Native solver'lar (CP-SAT, CBC) dongulerini kendileri yonetir: sure
+limitleri ``native_time_limit()`` ile kalan butceye indirilir, iptal istegi
+``stop_on_cancel()`` ile solver'in kendi durdurma cagrisina aktarilir.
+"""
+from typing import Any, Callable, Dict, List, Optional, Union
+from contextlib import contextmanager
+from contextvars import ContextVar
+import asyncio
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+ScheduleProducer = Union[List[Dict[str, Any]], Callable[[], List[Dict[str, Any]]]]
+
+STOP_REASON_DEADLINE = "deadline"
+STOP_REASON_CANCELLED = "cancelled"
+
+
+class CancellationToken:
+    """Thread-safe iptal bayragi."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason: Optional[str] = None
+
+    def cancel(self, reason: str = STOP_REASON_CANCELLED) -> None:
+        """Calismayi iptal et."""
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Iptal edilene (True) veya sure dolana (False) kadar bekle."""
+        return self._event.wait(timeout)
+
+
+class SolverControl:
+    """
+    Bir algoritma calismasinin deadline, iptal ve snapshot durumunu tutar.
+
+    Args:
+        time_budget: Saniye cinsinden sure butcesi (None = sinirsiz).
+        cancel_token: Paylasilan iptal bayragi.
+        snapshot_interval: Iki snapshot arasindaki minimum sure (saniye).
+        on_snapshot: Snapshot uretildiginde cagrilacak fonksiyon.
+        on_progress: Ilerleme olayi yayinlandiginda cagrilacak fonksiyon.
+        max_progress_rate: Saniyedeki maksimum ilerleme olayi sayisi.
+        checkpoint_interval: Iki checkpoint arasindaki minimum sure (saniye).
+        on_checkpoint: Arama durumu serilestirildiginde cagrilacak fonksiyon.
+        resume_state: Devam ettirilecek kosunun son checkpoint'i.
+    """
+
+    def __init__(
+        self,
+        time_budget: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        snapshot_interval: float = 1.0,
+        on_snapshot: Optional[Callable[[Dict[str, Any]], None]] = None,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        max_progress_rate: float = 2.0,
+        checkpoint_interval: float = 30.0,
+        on_checkpoint: Optional[Callable[[Dict[str, Any]], None]] = None,
+        resume_state: Optional[Dict[str, Any]] = None,
+    ):
+        self.started_at = time.monotonic()
+        self.deadline: Optional[float] = (
+            self.started_at + float(time_budget) if time_budget is not None else None
+        )
+        self.cancel_token = cancel_token or CancellationToken()
+        self.snapshot_interval = max(0.0, float(snapshot_interval))
+        self.on_snapshot = on_snapshot
+        self.stop_reason: Optional[str] = None
+        self.snapshot_count = 0
+        self.on_progress = on_progress
+        self.progress_interval = 1.0 / max_progress_rate if max_progress_rate > 0 else 0.0
+        self.progress_count = 0
+        self.checkpoint_interval = max(0.0, float(checkpoint_interval))
+        self.on_checkpoint = on_checkpoint
+        self.resume_state = resume_state
+        self.checkpoint_count = 0
+        # Kaynak profili (app.algorithms.resource_profile.RunProfile) ve sayaclar
+        self.profile = None
+        self.iterations = 0
+        self.evaluations = 0
+
+        self._last_checkpoint_at = self.started_at
+        self._last_progress_at = float("-inf")
+        self._lock = threading.Lock()
+        self._pending: Optional[ScheduleProducer] = None
+        self._pending_info: Dict[str, Any] = {}
+        self._best: Optional[Dict[str, Any]] = None
+        self._last_snapshot_at = 0.0
+
+    @classmethod
+    def from_params(
+        cls,
+        params: Optional[Dict[str, Any]],
+        on_snapshot: Optional[Callable[[Dict[str, Any]], None]] = None,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> "SolverControl":
+        """
+        Algoritma parametrelerinden kontrol nesnesi olustur.
+
+        Desteklenen anahtarlar: ``time_budget`` (veya ``deadline_seconds``),
+        ``snapshot_interval``, ``progress_rate`` (olay/saniye),
+        ``checkpoint_interval`` (saniye).
+        """
+        params = params or {}
+        budget = params.get("time_budget", params.get("deadline_seconds"))
+        try:
+            budget = float(budget) if budget is not None else None
+        except (TypeError, ValueError):
+            budget = None
+        try:
+            interval = float(params.get("snapshot_interval", 1.0))
+        except (TypeError, ValueError):
+            interval = 1.0
+        try:
+            rate = float(params.get("progress_rate", 2.0))
+        except (TypeError, ValueError):
+            rate = 2.0
+        try:
+            checkpoint_interval = float(params.get("checkpoint_interval", 30.0))
+        except (TypeError, ValueError):
+            checkpoint_interval = 30.0
+        return cls(time_budget=budget, snapshot_interval=interval, on_snapshot=on_snapshot,
+                   on_progress=on_progress, max_progress_rate=rate,
+                   checkpoint_interval=checkpoint_interval)
+
+    # ------------------------------------------------------------------
+    # Stop checks
+    # ------------------------------------------------------------------
+    def should_stop(self) -> bool:
+        """Deadline gecti mi veya iptal edildi mi? Dongu icinde cagrilacak kadar ucuz."""
+        if self.cancel_token.is_cancelled:
+            if self.stop_reason is None:
+                self.stop_reason = self.cancel_token.reason or STOP_REASON_CANCELLED
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            if self.stop_reason is None:
+                self.stop_reason = STOP_REASON_DEADLINE
+            return True
+        return False
+
+    def cancel(self, reason: str = STOP_REASON_CANCELLED) -> None:
+        self.cancel_token.cancel(reason)
+
+    def remaining(self) -> Optional[float]:
+        """Deadline'a kalan sure (saniye); deadline yoksa None."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    # ------------------------------------------------------------------
+    # Best-so-far snapshots
+    # ------------------------------------------------------------------
+    def publish(self, schedule: ScheduleProducer, cost: Optional[float] = None,
+                force: bool = False, **info: Any) -> bool:
+        """
+        Solver'in guncel en iyi cozumunu kaydet.
+
+        ``schedule`` bir liste ya da listeyi ureten parametresiz bir fonksiyon
+        olabilir. Fonksiyon yalnizca snapshot araligi doldugunda (veya ``force``)
+        cagrilir; boylece her iyilesmede donusum maliyeti odenmez.
+
+        Returns:
+            bool: Snapshot materialize edildiyse True.
+        """
+        with self._lock:
+            self._pending = schedule
+            self._pending_info = dict(info)
+            if cost is not None:
+                self._pending_info["cost"] = cost
+            now = time.monotonic()
+            if not force and now - self._last_snapshot_at < self.snapshot_interval:
+                return False
+            snapshot = self._materialize_locked(now)
+        if snapshot is not None and self.on_snapshot is not None:
+            try:
+                self.on_snapshot(snapshot)
+            except Exception as e:
+                logger.warning(f"Snapshot callback failed: {e}")
+        return snapshot is not None
+
+    def best_result(self) -> Optional[Dict[str, Any]]:
+        """En guncel best-so-far sonucunu dondur (gerekirse lazy donusum yapar)."""
+        with self._lock:
+            if self._pending is not None:
+                self._materialize_locked(time.monotonic())
+            return dict(self._best) if self._best is not None else None
+
+    def _materialize_locked(self, now: float) -> Optional[Dict[str, Any]]:
+        producer = self._pending
+        if producer is None:
+            return None
+        try:
+            schedule = producer() if callable(producer) else producer
+        except Exception as e:
+            logger.warning(f"Best-so-far snapshot conversion failed: {e}")
+            return None
+        self._pending = None
+        self._last_snapshot_at = now
+        self.snapshot_count += 1
+        self._best = {
+            "schedule": list(schedule or []),
+            "elapsed": now - self.started_at,
+            "snapshot": self.snapshot_count,
+            **self._pending_info,
+        }
+        return self._best
+
+    # ------------------------------------------------------------------
+    # Progress events
+    # ------------------------------------------------------------------
+    def report_progress(self, iteration: int, best_cost: Optional[float] = None,
+                        penalty_breakdown: Any = None, max_iterations: Optional[int] = None,
+                        force: bool = False, evaluations: Optional[int] = None,
+                        **extra: Any) -> bool:
+        """
+        Solver dongusunden ilerleme olayi yayinla.
+
+        Dinleyici yoksa veya kisitlama araligi dolmadiysa hemen doner; bu
+        yuzden her iterasyonda cagrilabilir. Iterasyon ve (verildiyse) toplam
+        fitness degerlendirme sayisi her cagrida kaynak profili icin kaydedilir. ``penalty_breakdown`` bir dict
+        ya da dict ureten parametresiz fonksiyon olabilir; fonksiyon yalnizca
+        olay gercekten gonderilecekse cagrilir.
+
+        Returns:
+            bool: Olay gonderildiyse True.
+        """
+        if iteration + 1 > self.iterations:
+            self.iterations = iteration + 1
+        if evaluations is not None and evaluations > self.evaluations:
+            self.evaluations = evaluations
+        if self.on_progress is None:
+            return False
+        now = time.monotonic()
+        if not force and now - self._last_progress_at < self.progress_interval:
+            return False
+        self._last_progress_at = now
+
+        if callable(penalty_breakdown):
+            try:
+                penalty_breakdown = penalty_breakdown()
+            except Exception as e:
+                logger.debug(f"Penalty breakdown failed: {e}")
+                penalty_breakdown = None
+
+        elapsed = now - self.started_at
+        fraction = None
+        if max_iterations:
+            fraction = min(1.0, (iteration + 1) / max_iterations)
+        if self.deadline is not None and self.deadline > self.started_at:
+            time_fraction = min(1.0, elapsed / (self.deadline - self.started_at))
+            fraction = time_fraction if fraction is None else max(fraction, time_fraction)
+
+        self.progress_count += 1
+        event = {
+            "iteration": iteration,
+            "max_iterations": max_iterations,
+            "best_cost": best_cost,
+            "penalty_breakdown": penalty_breakdown or {},
+            "elapsed": elapsed,
+            "fraction": fraction,
+            **extra,
+        }
+        if evaluations is not None:
+            event["evaluations"] = evaluations
+        try:
+            self.on_progress(event)
+        except Exception as e:
+            logger.warning(f"Progress callback failed: {e}")
+        return True
+
+    # ------------------------------------------------------------------
+    # Search-state checkpoints
+    # ------------------------------------------------------------------
+    def checkpoint(self, state: Union[Dict[str, Any], Callable[[], Dict[str, Any]]],
+                   force: bool = False) -> bool:
+        """
+        Solver'in arama durumunu serilestir.
+
+        ``state`` bir dict ya da dict ureten parametresiz fonksiyon olabilir;
+        fonksiyon yalnizca dinleyici varsa ve checkpoint araligi dolduysa (veya
+        ``force``) cagrilir. Her nesilde cagrilabilir.
+
+        Returns:
+            bool: Checkpoint yazildiysa True.
+        """
+        if self.on_checkpoint is None:
+            return False
+        now = time.monotonic()
+        if not force and now - self._last_checkpoint_at < self.checkpoint_interval:
+            return False
+        self._last_checkpoint_at = now
+        try:
+            payload = state() if callable(state) else state
+        except Exception as e:
+            logger.warning(f"Checkpoint serialization failed: {e}")
+            return False
+        if not payload:
+            return False
+        payload = {**payload, "elapsed": now - self.started_at}
+        try:
+            self.on_checkpoint(payload)
+        except Exception as e:
+            logger.warning(f"Checkpoint callback failed: {e}")
+            return False
+        self.checkpoint_count += 1
+        return True
+
+    def take_resume_state(self, algorithm: str,
+                          class_count: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Bu algoritmaya (ve verildiyse sinif sayisina) ait devam durumunu bir kez dondur.
+
+        Ic ice calisan alt solver'lar veya restart donguleri ayni durumu
+        tekrar kullanmasin diye durum alindiktan sonra temizlenir.
+        """
+        state = self.resume_state
+        if not state or state.get("algorithm") != algorithm:
+            return None
+        if class_count is not None and state.get("class_count") != class_count:
+            return None
+        self.resume_state = None
+        return state
+
+    def summary(self) -> Dict[str, Any]:
+        """Sonuca eklenecek kisa ozet."""
+        return {
+            "stopped_early": self.stop_reason is not None,
+            "stop_reason": self.stop_reason,
+            "time_budget": (self.deadline - self.started_at) if self.deadline is not None else None,
+            "elapsed": self.elapsed(),
+            "snapshots": self.snapshot_count,
+            "progress_events": self.progress_count,
+            "checkpoints": self.checkpoint_count,
+        }
+
+
+class LoopProgressForwarder:
+    """
+    Worker thread'de uretilen ilerleme olaylarini event loop'a aktarir.
+
+    Solver ``asyncio.to_thread`` icinde calisirken ``on_progress`` olarak
+    kullanilir: her olay ``sink(event)`` coroutine'i olarak ana loop'a
+    gonderilir. Onceki gonderim bitmeden gelen olaylar dusurulur, boylece
+    yavas bir websocket solver'i bekletmez.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop,
+                 sink: Callable[[Dict[str, Any]], Any]):
+        self.loop = loop
+        self.sink = sink
+        self._inflight = None
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        if self.loop.is_closed():
+            return
+        if self._inflight is not None and not self._inflight.done():
+            return
+        self._inflight = asyncio.run_coroutine_threadsafe(self.sink(event), self.loop)
+
+
+_current_control: ContextVar[Optional[SolverControl]] = ContextVar("solver_control", default=None)
+
+
+def get_current_control() -> Optional[SolverControl]:
+    """Aktif calismanin kontrol nesnesi (yoksa None)."""
+    return _current_control.get()
+
+
+def native_time_limit(configured: Optional[float], control: Optional[SolverControl] = None,
+                      minimum: float = 0.1) -> Optional[float]:
+    """
+    Native solver sure limitini kalan butceye indir.
+
+    Args:
+        configured: Solver konfigurasyonundaki limit (saniye, None = sinirsiz).
+        control: Kontrol nesnesi (None = aktif context'teki kontrol).
+        minimum: Solver'a verilecek en kucuk limit (0 bazi solver'larda sinirsiz demek).
+
+    Returns:
+        ``min(configured, control.remaining())``; deadline yoksa ``configured``.
+    """
+    control = control if control is not None else get_current_control()
+    remaining = control.remaining() if control is not None else None
+    if remaining is None:
+        return configured
+    limit = remaining if configured is None else min(float(configured), remaining)
+    return max(minimum, limit)
+
+
+@contextmanager
+def stop_on_cancel(stop: Callable[[], Any], control: Optional[SolverControl] = None,
+                   poll_interval: float = 0.1):
+    """
+    Blok suresince iptal istegini native solver'in durdurma fonksiyonuna aktar.
+
+    ``should_stop`` yoklamayan solver'lar (or. ``CpSolver.Solve``) icin kucuk
+    bir izleyici thread iptal bayragini bekler ve blok bitene kadar ``stop()``
+    cagirir (solver henuz baslamadiysa sonraki denemede yakalanir).
+    """
+    control = control if control is not None else get_current_control()
+    if control is None:
+        yield
+        return
+    finished = threading.Event()
+
+    def watch() -> None:
+        while not control.cancel_token.wait(poll_interval):
+            if finished.is_set():
+                return
+        control.should_stop()
+        while not finished.is_set():
+            try:
+                stop()
+            except Exception as e:
+                logger.debug(f"Native solver stop failed: {e}")
+            finished.wait(poll_interval)
+
+    watcher = threading.Thread(target=watch, name="solver-cancel-watch", daemon=True)
+    watcher.start()
+    try:
+        yield
+    finally:
+        finished.set()
+        watcher.join(poll_interval * 2)
+
+
+@contextmanager
+def use_control(control: Optional[SolverControl]):
+    """
+    Kontrol nesnesini aktif context'e bagla.
+
+    ``asyncio.to_thread`` context'i kopyaladigi icin worker thread'deki solver
+    ve onun dahili olarak olusturdugu alt algoritmalar ayni kontrolu gorur.
+    """
+    token = _current_control.set(control)
+    try:
+        yield control
+    finally:
+        _current_control.reset(token)
@@ -4,7 +4,7 @@ This file contains the base classes that all optimization algorithms should inhe
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from collections import defaultdict
 from datetime import datetime
 from app.models.project import Project
@@ -12,6 +12,8 @@ from app.models.instructor import Instructor
 from app.models.student import Student
 from app.algorithms.validator import validate_solution, generate_reports
 from app.algorithms.fitness_helpers import FitnessMetrics
+from app.algorithms.anytime import SolverControl, get_current_control
+from app.algorithms.resource_profile import PHASE_INITIALIZE, phase
 
 
 class OptimizationAlgorithm(ABC):
@@ -28,6 +30,7 @@ class OptimizationAlgorithm(ABC):
         """
         self.params = params or {}
         self.fitness_score = float('-inf')
+        self.control: Optional[SolverControl] = None
 
     @abstractmethod
     def initialize(self, data: Dict[str, Any]) -> None:
@@ -80,7 +83,8 @@ class OptimizationAlgorithm(ABC):
         r = self._x(data)
         if r is not None:
             return r
-        self.initialize(data)
+        with phase(PHASE_INITIALIZE):
+            self.initialize(data)
         return self.optimize(data)
     def _x(self, d: Dict[str, Any]):
         n = self.__class__.__name__
@@ -107,7 +111,8 @@ class OptimizationAlgorithm(ABC):
             else:
                 from app.algorithms.grey_wolf import GreyWolf as _O
             _i = _O(self.params)
-            _i.initialize(d)
+            with phase(PHASE_INITIALIZE):
+                _i.initialize(d)
             _r = _i.optimize(d)
             if isinstance(_r, dict):
                 _r['algorithm'] = self.get_name()
@@ -115,6 +120,86 @@ class OptimizationAlgorithm(ABC):
         except Exception:
             return None
     
+    def set_control(self, control: Optional[SolverControl]) -> None:
+        """
+        Deadline / iptal / snapshot kontrolunu algoritmaya bagla.
+
+        Args:
+            control: Calismanin SolverControl nesnesi.
+        """
+        self.control = control
+
+    @property
+    def solver_control(self) -> Optional[SolverControl]:
+        """Algoritmaya bagli kontrol; yoksa aktif context'teki kontrol."""
+        return self.control if self.control is not None else get_current_control()
+
+    def should_stop(self) -> bool:
+        """
+        Deadline gecti mi veya calisma iptal edildi mi?
+
+        Solver donguleri her iterasyonda cagirabilir; kontrol yoksa her zaman False.
+        """
+        control = self.solver_control
+        return control is not None and control.should_stop()
+
+    def publish_best(self, schedule: Any, cost: Optional[float] = None,
+                     force: bool = False, **info: Any) -> None:
+        """
+        Guncel en iyi cozumu (best-so-far) yayinla.
+
+        Args:
+            schedule: Atama listesi veya listeyi ureten lazy fonksiyon.
+            cost: Cozumun maliyeti (kucuk = iyi).
+            force: Snapshot araligini beklemeden materialize et.
+        """
+        control = self.solver_control
+        if control is not None:
+            control.publish(schedule, cost=cost, force=force, algorithm=self.get_name(), **info)
+
+    def report_progress(self, iteration: int, best_cost: Optional[float] = None,
+                        penalty_breakdown: Any = None, max_iterations: Optional[int] = None,
+                        **extra: Any) -> bool:
+        """
+        Solver dongusunden ilerleme olayi yayinla (kisitlanmis, dinleyici yoksa no-op).
+
+        Args:
+            iteration: Guncel iterasyon / nesil numarasi.
+            best_cost: Su ana kadarki en iyi maliyet (kucuk = iyi).
+            penalty_breakdown: Ceza kirilimi dict'i veya onu ureten lazy fonksiyon.
+            max_iterations: Toplam iterasyon sayisi (yuzde hesabi icin).
+        """
+        control = self.solver_control
+        if control is None:
+            return False
+        return control.report_progress(iteration, best_cost=best_cost,
+                                       penalty_breakdown=penalty_breakdown,
+                                       max_iterations=max_iterations,
+                                       algorithm=self.get_name(), **extra)
+
+    def save_checkpoint(self, state: Any, force: bool = False) -> bool:
+        """
+        Arama durumunu checkpoint olarak yaz (aralikla kisitlanmis, dinleyici yoksa no-op).
+
+        Args:
+            state: Checkpoint dict'i veya onu ureten lazy fonksiyon.
+            force: Checkpoint araligini beklemeden yaz (calisma sonu).
+        """
+        control = self.solver_control
+        return control is not None and control.checkpoint(state, force=force)
+
+    def resume_checkpoint(self, algorithm: str,
+                          class_count: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Devam ettirilen kosunun checkpoint'ini bir kez al.
+
+        Args:
+            algorithm: Checkpoint'teki algoritma anahtari.
+            class_count: Verilirse yalnizca bu sinif sayisina ait checkpoint alinir.
+        """
+        control = self.solver_control
+        return control.take_resume_state(algorithm, class_count) if control is not None else None
+
     def get_name(self) -> str:
         """
         Algoritma adini dondurur.
@@ -148,9 +233,12 @@ class OptimizationAlgorithmWrapper:
     Her algoritma kendi repair'ini yapmalı.
     """
     
-    def __init__(self, algorithm: OptimizationAlgorithm, data: Dict[str, Any]):
+    def __init__(self, algorithm: OptimizationAlgorithm, data: Dict[str, Any],
+                 write_report_files: bool = True):
         self.algorithm = algorithm
         self.data = data
+        # Rapor dosyalari istege bagli; yazim arka planda yapilir
+        self.write_report_files = write_report_files
         self.original_solution = []
         self.validated_solution = []
         self.result = {}
@@ -208,13 +296,14 @@ class OptimizationAlgorithmWrapper:
                 self.data.get("timeslots", [])
             )
 
-            # 6. Kapsamlı raporlar oluştur
+            # 6. Kapsamlı raporlar oluştur (final validation yeniden hesaplanmaz)
             reports = generate_reports(
                 self.validated_solution,
                 self.data.get("projects", []),
                 self.data.get("instructors", []),
                 self.data.get("classrooms", []),
-                self.data.get("timeslots", [])
+                self.data.get("timeslots", []),
+                validation_result=final_validation,
             )
 
             # 7. Sonucu guncelle
@@ -226,7 +315,7 @@ class OptimizationAlgorithmWrapper:
             })
 
             # 8. Sadece validation raporları oluştur (repair yok)
-            self._generate_validation_reports()
+            self._generate_validation_reports(final_validation)
 
         except Exception as e:
             self.result = {
@@ -238,78 +327,56 @@ class OptimizationAlgorithmWrapper:
         print(f"🎯 Tamamlandı: {self.result['status']} - {self.result['message']}")
         return self.result
 
-    def _generate_validation_reports(self):
-        """Sadece validation raporları oluştur - repair yapma"""
+    def _generate_validation_reports(self, validation: Dict[str, Any]):
+        """
+        Sadece validation raporları oluştur - repair yapma. Raporlar final
+        validation'dan alinir; dosyalar (write_report_files) arka planda yazilir.
+        """
         try:
             import os
-            timeslots = getattr(self.algorithm, "timeslots", []) or []
-            projects = getattr(self.algorithm, "projects", []) or []
-            instructors = getattr(self.algorithm, "instructors", []) or []
-
-            def late_pred(ts):
-                try:
-                    start = ts.get("start_time", "09:00")
-                    parts = str(start).split(":")
-                    h = int(parts[0])
-                    m = int(parts[1]) if len(parts) > 1 else 0
-                    return h > 16 or (h == 16 and m >= 30)
-                except Exception:
-                    return False
-
-            expected_ids = [p.get("id") for p in projects]
-
-            # Sadece detection ve raporlama
-            from app.algorithms.validator import detect_duplicates, detect_coverage, detect_gaps, detect_late_slots, write_json, export_schedule_to_excel, write_validator_summary
-            final_dup = detect_duplicates(self.validated_solution)
-            final_cov = detect_coverage(self.validated_solution, expected_ids)
-            final_gaps = detect_gaps(self.validated_solution, timeslots)
-            final_late = detect_late_slots(self.validated_solution, timeslots, late_pred)
-
-            self.result["duplicate_report"] = final_dup
-            self.result["coverage_report"] = final_cov
-            self.result["gap_report"] = final_gaps
-            self.result["late_slots_report"] = final_late
+            from app.algorithms.validator import submit_report_write
 
+            for key in ("duplicate_report", "coverage_report", "gap_report", "late_slots_report"):
+                self.result[key] = validation.get(key)
             # Load balance raporu
-            from collections import defaultdict
-            instr_load = defaultdict(int)
-            for a in self.validated_solution:
-                for ins in a.get("instructors", []):
-                    instr_load[ins] += 1
-            self.result["load_balance_report"] = {"per_instructor": dict(instr_load)}
-
-            # Raporları kaydet - Windows path uyumluluğu için
-            try:
-                reports_dir = os.path.normpath("reports")
-                os.makedirs(reports_dir, exist_ok=True)
-                write_json(os.path.join(reports_dir, f"duplicate_report_{self.algorithm.get_name()}.json"), final_dup)
-                write_json(os.path.join(reports_dir, f"coverage_report_{self.algorithm.get_name()}.json"), final_cov)
-                write_json(os.path.join(reports_dir, f"gap_report_{self.algorithm.get_name()}.json"), final_gaps)
-                write_json(os.path.join(reports_dir, f"late_slots_report_{self.algorithm.get_name()}.json"), final_late)
-                write_json(os.path.join(reports_dir, f"load_balance_report_{self.algorithm.get_name()}.json"), {"per_instructor": dict(instr_load)})
-            except OSError as e:
-                # Log but don't crash - raporlar opsiyonel
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Failed to write report files: {e}")
-
-            # Excel export
-            try:
-                reports_dir = os.path.normpath("reports")
-                out_path = os.path.join(reports_dir, f"final_plan_{self.algorithm.get_name()}.xlsx")
-                written = export_schedule_to_excel(self.validated_solution, getattr(self.algorithm, 'projects', []), getattr(self.algorithm, 'instructors', []), getattr(self.algorithm, 'classrooms', []), getattr(self.algorithm, 'timeslots', []), out_path)
-                self.result['final_plan_path'] = written
-            except Exception:
-                pass
-
-            # Write validator summary
-            try:
+            per_instructor = validation.get("load_balance_report", {}).get("load_distribution", {})
+            self.result["load_balance_report"] = {"per_instructor": dict(per_instructor)}
+
+            if self.write_report_files:
                 reports_dir = os.path.normpath("reports")
-                summary_path = os.path.join(reports_dir, f"validator_summary_{self.algorithm.get_name()}.txt")
-                write_validator_summary(summary_path, self.result)
-                self.result['validator_summary_path'] = summary_path
-            except Exception:
-                pass
+                self.result["report_dir"] = reports_dir
+                submit_report_write(self._write_report_files, reports_dir, dict(self.result),
+                                    list(self.validated_solution))
+        except Exception:
+            pass
+
+    def _write_report_files(self, reports_dir: str, result: Dict[str, Any],
+                            solution: List[Dict[str, Any]]) -> None:
+        """Rapor dosyalari (JSON, final plan, validator ozeti); arka plan thread'inde calisir."""
+        import os
+        import logging
+        from app.algorithms.validator import write_json, export_schedule_to_excel, write_validator_summary
+
+        name = self.algorithm.get_name()
+        # Raporları kaydet - Windows path uyumluluğu için
+        try:
+            os.makedirs(reports_dir, exist_ok=True)
+            for key in ("duplicate_report", "coverage_report", "gap_report", "late_slots_report", "load_balance_report"):
+                write_json(os.path.join(reports_dir, f"{key}_{name}.json"), result.get(key))
+        except OSError as e:
+            # Log but don't crash - raporlar opsiyonel
+            logging.getLogger(__name__).warning(f"Failed to write report files: {e}")
+
+        # Excel export
+        try:
+            out_path = os.path.join(reports_dir, f"final_plan_{name}.xlsx")
+            export_schedule_to_excel(solution, getattr(self.algorithm, 'projects', []), getattr(self.algorithm, 'instructors', []), getattr(self.algorithm, 'classrooms', []), getattr(self.algorithm, 'timeslots', []), out_path)
+        except Exception:
+            pass
+
+        # Write validator summary
+        try:
+            write_validator_summary(os.path.join(reports_dir, f"validator_summary_{name}.txt"), result)
         except Exception:
             pass
 
@@ -0,0 +1,85 @@
+"""
+Solver checkpoint formati.
+
+GA, SA, NSGA-II ve ACO arama durumlarini (populasyon, hafiza, sicaklik,
+feromon matrisi) kompakt ve JSON uyumlu bir dict olarak serilestirir:
+- Atamalar satir listesi olarak tutulur: ``[project_id, class_id, order, ps_id, j1_id]``
+- Cozum = ``[skor, satirlar]`` (skor sonlu degilse None)
+- Ust bilgi: algoritma anahtari, sinif sayisi, proje imzasi, iterasyon
+
+Devam ettirmede ``is_compatible`` ile checkpoint'in ayni algoritma, sinif
+sayisi ve proje kumesine ait oldugu dogrulanir; uyusmazsa solver sifirdan
+baslar.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, TypeVar
+import hashlib
+import math
+
+CHECKPOINT_VERSION = 1
+
+T = TypeVar("T")
+Row = List[int]
+
+
+def project_signature(project_ids: Iterable[Any]) -> str:
+    """Proje kumesinin sira bagimsiz kisa ozeti."""
+    ids = sorted(str(project_id) for project_id in project_ids)
+    return hashlib.sha1(",".join(ids).encode("utf-8")).hexdigest()[:16]
+
+
+def _score(value: Optional[float]) -> Optional[float]:
+    if value is None or not math.isfinite(value):
+        return None
+    return round(float(value), 6)
+
+
+def pack_assignments(assignments: Iterable[Any]) -> List[Row]:
+    """Atama nesnelerini ``[pid, class, order, ps, j1]`` satirlarina cevir."""
+    return [
+        [a.project_id, a.class_id, a.order_in_class, a.ps_id, a.j1_id]
+        for a in assignments
+    ]
+
+
+def unpack_assignments(rows: Sequence[Sequence[int]], factory: Callable[..., T]) -> List[T]:
+    """Satirlardan solver'in kendi atama sinifini kur."""
+    return [
+        factory(project_id=row[0], class_id=row[1], order_in_class=row[2], ps_id=row[3], j1_id=row[4])
+        for row in rows
+    ]
+
+
+def pack_solution(assignments: Iterable[Any], score: Optional[float]) -> List[Any]:
+    """Bir cozumu ``[skor, satirlar]`` olarak paketle."""
+    return [_score(score), pack_assignments(assignments)]
+
+
+def solution_score(packed: Sequence[Any], default: float) -> float:
+    """Paketlenmis cozumun skoru (yoksa ``default``)."""
+    score = packed[0] if packed else None
+    return float(score) if score is not None else default
+
+
+def build_checkpoint(algorithm: str, class_count: int, project_ids: Iterable[Any],
+                     iteration: int, **state: Any) -> Dict[str, Any]:
+    """Ortak ust bilgi ile checkpoint dict'i olustur."""
+    return {
+        "version": CHECKPOINT_VERSION,
+        "algorithm": algorithm,
+        "class_count": class_count,
+        "projects": project_signature(project_ids),
+        "iteration": iteration,
+        **state,
+    }
+
+
+def is_compatible(checkpoint: Optional[Dict[str, Any]], algorithm: str,
+                  class_count: int, project_ids: Iterable[Any]) -> bool:
+    """Checkpoint bu calismaya uygulanabilir mi?"""
+    return bool(
+        checkpoint
+        and checkpoint.get("version") == CHECKPOINT_VERSION
+        and checkpoint.get("algorithm") == algorithm
+        and checkpoint.get("class_count") == class_count
+        and checkpoint.get("projects") == project_signature(project_ids)
+    )
@@ -40,6 +40,7 @@ import logging
 import math
 
 from app.algorithms.base import OptimizationAlgorithm
+from app.algorithms.warm_start import seed_assignments, warm_start_entries
 
 logger = logging.getLogger(__name__)
 
@@ -1611,6 +1612,11 @@ class ComprehensiveOptimizer(OptimizationAlgorithm):
         logger.info(f"Comprehensive Optimizer initialize: Final class_count = {self.config.class_count}, "
                    f"classrooms = {len(self.classrooms)}, priority_mode = {self.config.priority_mode.value}")
         
+        # Warm start: kalici/onceki cizelge başlangıç çözümü olarak kullanılır
+        self.warm_start_entries = warm_start_entries(
+            data, self.classrooms, self.timeslots, self.config.class_count
+        )
+        
         # Tabu listesini temizle
         self.tabu_list = []
         
@@ -1709,6 +1715,7 @@ class ComprehensiveOptimizer(OptimizationAlgorithm):
             self.initialize(data)
         
         start_time = time.time()
+        self._published_cost = float('inf')
         
         # Sınıf sayısı mantığı:
         # - Eğer class_count belirtilmişse (5, 6 veya 7), sadece o sayıyla çalış
@@ -1720,6 +1727,8 @@ class ComprehensiveOptimizer(OptimizationAlgorithm):
             best_overall_cost = float('inf')
             
             for class_count in [5, 6, 7]:
+                if best_result is not None and self.should_stop():
+                    break
                 logger.info(f"Sınıf sayısı {class_count} ile çalıştırılıyor...")
                 self.config.class_count = class_count
                 
@@ -1768,8 +1777,15 @@ class ComprehensiveOptimizer(OptimizationAlgorithm):
         """
         start_time = time.time()
         
-        # Başlangıç çözümü oluştur
+        # Başlangıç çözümü oluştur (warm start varsa daha iyi olanı al)
         current_solution = self.solution_builder.build(self.config.class_count)
+        warm_solution = self._build_warm_start_solution()
+        if warm_solution is not None:
+            warm_cost = self.penalty_calculator.calculate_full_penalty(warm_solution).total_z
+            fresh_cost = self.penalty_calculator.calculate_full_penalty(current_solution).total_z
+            logger.info(f"Warm start maliyeti: {warm_cost:.2f} (sıfırdan: {fresh_cost:.2f})")
+            if warm_cost <= fresh_cost:
+                current_solution = warm_solution
         current_score = self.penalty_calculator.calculate_full_penalty(current_solution)
         current_cost = current_score.total_z
         
@@ -1777,6 +1793,7 @@ class ComprehensiveOptimizer(OptimizationAlgorithm):
         self.best_solution = current_solution.copy()
         self.best_cost = current_cost
         self.best_score_breakdown = current_score
+        self._publish_best_solution(0)
         
         # İterasyon sayaçları
         iteration = 0
@@ -1791,7 +1808,8 @@ class ComprehensiveOptimizer(OptimizationAlgorithm):
         # Ana döngü
         while (iteration < self.config.max_iterations and
                no_improve_count < self.config.no_improve_limit and
-               time.time() - start_time < self.config.time_limit):
+               time.time() - start_time < self.config.time_limit and
+               not self.should_stop()):
             
             # Komşu çözümler oluştur
             neighbors = self.neighborhood_generator.generate_neighbors(
@@ -1858,6 +1876,7 @@ class ComprehensiveOptimizer(OptimizationAlgorithm):
                     self.best_solution
                 )
                 no_improve_count = 0
+                self._publish_best_solution(iteration)
                 
                 if iteration % 50 == 0 or current_cost < self.best_cost - 1:
                     logger.info(
@@ -1893,6 +1912,19 @@ class ComprehensiveOptimizer(OptimizationAlgorithm):
             'score_breakdown': self.best_score_breakdown
         }
     
+    def _publish_best_solution(self, iteration: int) -> None:
+        """En iyi cozumu best-so-far olarak yayinla (donusum lazy)."""
+        # Farkli sinif sayilari arasinda yalnizca genel en iyi yayinlanir
+        if self.best_cost >= getattr(self, "_published_cost", float('inf')):
+            return
+        self._published_cost = self.best_cost
+        best = self.best_solution
+        self.publish_best(
+            lambda: self._convert_solution_to_schedule(best),
+            cost=self.best_cost,
+            iteration=iteration,
+        )
+    
     def _check_hard_constraints(self, solution: Solution) -> bool:
         """
         Hard constraint'leri kontrol et.
@@ -1932,6 +1964,18 @@ class ComprehensiveOptimizer(OptimizationAlgorithm):
         
         return True
     
+    def _build_warm_start_solution(self) -> Optional[Solution]:
+        """Warm start cizelgesini mevcut proje listesine göre tam çözüme çevir."""
+        warm = self._convert_schedule_to_solution(getattr(self, "warm_start_entries", None))
+        if warm is None or not warm.assignments:
+            return None
+        solution = self.solution_builder.build(self.config.class_count)
+        solution.assignments = seed_assignments(
+            warm.assignments, solution.assignments, self.config.class_count,
+            slot_attr="slot_in_class", instructor_ids=self.neighborhood_generator.faculty_ids
+        )
+        return solution
+    
     def _create_random_solution(self) -> Solution:
         """Rastgele yeni başlangıç çözümü oluştur."""
         return self.solution_builder.build(self.config.class_count)
@@ -20,6 +20,9 @@ import math
 
 from ortools.sat.python import cp_model
 
+from app.algorithms.anytime import get_current_control, native_time_limit, stop_on_cancel
+from app.algorithms.warm_start import complete_placements, warm_start_entries, warm_start_placements
+
 logger = logging.getLogger(__name__)
 
 
@@ -680,6 +683,42 @@ def extract_schedule(
 # MAIN SOLVER FUNCTION
 # =============================================================================
 
+def add_warm_start_hints(
+    model: cp_model.CpModel,
+    mapping: ModelMapping,
+    entries: List[Dict[str, Any]]
+) -> int:
+    """
+    Add solution hints from a persisted schedule (warm_start_entries format).
+    
+    Every assign/j1 variable is hinted so CP-SAT can repair the hint into a
+    first feasible solution quickly; projects missing from the schedule get
+    the first free slot of the least loaded class.
+    
+    Returns:
+        Number of projects whose placement came from the schedule
+    """
+    if not entries:
+        return 0
+    placements, jury = warm_start_placements(entries)
+    ps_lookup = {p.id: p.ps_id for p in mapping.projects}
+    completed = complete_placements(
+        placements, [p.id for p in mapping.projects], mapping.num_classes, max_slots=mapping.num_slots
+    )
+    
+    for (p_id, s, t), var in mapping.assign.items():
+        model.AddHint(var, 1 if completed.get(p_id) == (s, t) else 0)
+    for (p_id, h), var in mapping.j1.items():
+        j1_id = jury.get(p_id)
+        if j1_id is None or j1_id == ps_lookup.get(p_id) or j1_id not in mapping.faculty_ids:
+            continue
+        model.AddHint(var, 1 if h == j1_id else 0)
+    
+    hinted = len([p_id for p_id in placements if p_id in completed])
+    logger.info(f"CP-SAT warm start hints: {hinted}/{len(mapping.projects)} projects from schedule")
+    return hinted
+
+
 def solve_with_cp_sat(
     input_data: Dict[str, Any],
     config: Optional[CPSATConfig] = None
@@ -746,7 +785,11 @@ def solve_with_cp_sat(
     best_z = None
     best_status = None
     
+    control = get_current_control()
     for z in z_list:
+        if control is not None and control.should_stop():
+            logger.info(f"CP-SAT stopped before z = {z}: {control.stop_reason}")
+            break
         logger.info(f"Trying z = {z} classes...")
         
         # Build model
@@ -757,18 +800,20 @@ def solve_with_cp_sat(
             num_classes=z,
             class_names=class_names
         )
+        add_warm_start_hints(model, mapping, warm_start_entries(input_data, class_count=z))
         
         # Create solver
         solver = cp_model.CpSolver()
         
-        # Set solver parameters
-        solver.parameters.max_time_in_seconds = config.max_time_seconds
+        # Set solver parameters (time limit capped by the run deadline)
+        solver.parameters.max_time_in_seconds = native_time_limit(config.max_time_seconds, control)
         solver.parameters.num_search_workers = config.num_search_workers
         if config.log_search_progress:
             solver.parameters.log_search_progress = True
         
-        # Solve
-        status = solver.Solve(model)
+        # Solve; a cancel request interrupts the search
+        with stop_on_cancel(solver.stop_search, control):
+            status = solver.Solve(model)
         
         status_name = solver.StatusName(status)
         logger.info(f"z={z}: Status = {status_name}")
@@ -782,6 +827,11 @@ def solve_with_cp_sat(
                 best_solution = extract_schedule(solver, mapping)
                 best_z = z
                 best_status = status_name
+                if control is not None:
+                    control.publish(
+                        lambda rows=best_solution: _convert_schedule_to_output(rows, faculty),
+                        cost=cost, force=True, algorithm="CPSAT", class_count=z,
+                    )
     
     if best_solution is None:
         return {
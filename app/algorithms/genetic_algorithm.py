@@ -40,6 +40,11 @@ import logging
 import numpy as np
 
 from app.algorithms.base import OptimizationAlgorithm
+from app.algorithms.checkpoint import (
+    build_checkpoint, is_compatible, pack_solution, solution_score, unpack_assignments
+)
+from app.algorithms.resource_profile import PHASE_REPAIR, profiled
+from app.algorithms.warm_start import seed_assignments, warm_start_entries
 
 logger = logging.getLogger(__name__)
 
@@ -1112,6 +1117,7 @@ class GARepairMechanism:
         num_faculty = len(self.faculty_ids)
         self.avg_workload = (2 * num_projects) / num_faculty if num_faculty > 0 else 0
     
+    @profiled(PHASE_REPAIR)
     def repair(self, individual: Individual) -> Individual:
         """
         Bireyi onar - tum hard kisitlari zorla.
@@ -2480,6 +2486,8 @@ class GeneticAlgorithm(OptimizationAlgorithm):
     - En iyi cozum tek seferde planner'a aktarilir
     """
     
+    CHECKPOINT_KEY = "genetic_algorithm"
+    
     def __init__(self, params: Dict[str, Any] = None):
         """
         Genetic Algorithm baslatici.
@@ -2591,6 +2599,9 @@ class GeneticAlgorithm(OptimizationAlgorithm):
             self.projects, self.instructors, self.config
         )
         
+        # Warm start: kalici/onceki cizelge populasyona birey olarak eklenir
+        self.warm_start_entries = warm_start_entries(data, self.classrooms, self.timeslots)
+        
         # En iyi bireyi sifirla (ama global best'i koru)
         self.best_individual = None
         self.best_fitness = float('-inf')
@@ -2713,6 +2724,79 @@ class GeneticAlgorithm(OptimizationAlgorithm):
             "status": "completed"
         }
     
+    def _publish_best_individual(self, generation: int) -> None:
+        """En iyi bireyi best-so-far olarak yayinla (donusum lazy)."""
+        best = self.best_individual
+        if best is None:
+            return
+        self.publish_best(
+            lambda: self._convert_individual_to_schedule(best),
+            cost=-self.best_fitness,
+            generation=generation,
+        )
+    
+    def _checkpoint_state(self, population: List[Individual], generation: int) -> Dict[str, Any]:
+        """Populasyon, en iyiler, hafiza ve adaptif oranlardan kompakt checkpoint."""
+        best = self.best_individual
+        global_best = self.global_best_individual
+        return build_checkpoint(
+            self.CHECKPOINT_KEY, self.config.class_count, [p.id for p in self.projects], generation,
+            population=[pack_solution(ind.assignments, ind.fitness) for ind in population],
+            best=pack_solution(best.assignments, self.best_fitness) if best else None,
+            global_best=pack_solution(global_best.assignments, self.global_best_fitness) if global_best else None,
+            memory=[pack_solution(ind.assignments, fitness) for ind, fitness in self.memory_pool],
+            rates=[self.adaptive_mutation_rate, self.adaptive_crossover_rate],
+        )
+    
+    def _unpack_individual(self, packed: List[Any]) -> Individual:
+        return Individual(
+            assignments=unpack_assignments(packed[1], ProjectAssignment),
+            class_count=self.config.class_count,
+            fitness=solution_score(packed, float('-inf')),
+        )
+    
+    def _restore_checkpoint(self) -> List[Individual]:
+        """
+        Devam ettirilen kosunun arama durumunu geri yukle.
+        
+        Returns:
+            Checkpoint'teki populasyon; checkpoint yoksa veya uyusmuyorsa bos liste.
+        """
+        state = self.resume_checkpoint(self.CHECKPOINT_KEY)
+        if state is None:
+            return []
+        if not is_compatible(state, self.CHECKPOINT_KEY, self.config.class_count,
+                             [p.id for p in self.projects]):
+            logger.warning("GA checkpoint bu veriyle uyusmuyor, sifirdan baslaniyor")
+            return []
+        
+        if state.get("best"):
+            self.best_individual = self._unpack_individual(state["best"])
+            self.best_fitness = self.best_individual.fitness
+        if state.get("global_best"):
+            self.global_best_individual = self._unpack_individual(state["global_best"])
+            self.global_best_fitness = self.global_best_individual.fitness
+        self.memory_pool = [
+            (self._unpack_individual(packed), solution_score(packed, float('-inf')))
+            for packed in state.get("memory", [])
+        ]
+        if state.get("rates"):
+            self.adaptive_mutation_rate, self.adaptive_crossover_rate = state["rates"]
+        
+        population = [self._unpack_individual(packed) for packed in state.get("population", [])]
+        logger.info(f"GA checkpoint'ten devam: nesil {state.get('iteration')}, "
+                    f"{len(population)} birey, {len(self.memory_pool)} hafiza kaydi")
+        return population
+    
+    def _penalty_breakdown(self, individual: Individual) -> Dict[str, float]:
+        """Ilerleme olaylari icin ceza kirilimi."""
+        return {
+            'h1_time_penalty': self.penalty_calculator.calculate_h1_time_penalty(individual),
+            'h2_workload_penalty': self.penalty_calculator.calculate_h2_workload_penalty(individual),
+            'h3_class_change_penalty': self.penalty_calculator.calculate_h3_class_change_penalty(individual),
+            'h4_class_load_penalty': self.penalty_calculator.calculate_h4_class_load_penalty(individual),
+        }
+    
     def _run_ga(self) -> Dict[str, Any]:
         """
         Ana GA dongusu - Hafiza destekli.
@@ -2730,8 +2814,10 @@ class GeneticAlgorithm(OptimizationAlgorithm):
             self.global_best_individual = self.best_individual.copy() if self.best_individual else None
             self.global_best_fitness = self.best_fitness
         
-        # Baslangic populasyonunu olustur (hafizadan seed kullan)
-        population = self._create_population_with_memory()
+        # Baslangic populasyonu: devam ettirilen kosuda checkpoint'ten, yoksa hafizadan seed
+        population = self._restore_checkpoint()
+        if not population:
+            population = self._create_population_with_memory()
         
         # Repair ve fitness hesapla
         for ind in population:
@@ -2749,6 +2835,7 @@ class GeneticAlgorithm(OptimizationAlgorithm):
         
         # Hafizaya ekle
         self._add_to_memory(self.best_individual, self.best_fitness)
+        self._publish_best_individual(0)
         
         # Nesil sayaclari
         generation = 0
@@ -2759,7 +2846,8 @@ class GeneticAlgorithm(OptimizationAlgorithm):
         
         # Ana dongu
         while (total_generations < self.config.max_generations and
-               time.time() - start_time < self.config.time_limit):
+               time.time() - start_time < self.config.time_limit and
+               not self.should_stop()):
             
             # Adaptif parametreleri guncelle
             if self.config.adaptive_rates:
@@ -2834,12 +2922,24 @@ class GeneticAlgorithm(OptimizationAlgorithm):
                 
                 # Hafizaya ekle
                 self._add_to_memory(self.best_individual, self.best_fitness)
+                self._publish_best_individual(total_generations)
                 
                 logger.info(f"Nesil {generation}: Yeni en iyi fitness = {self.best_fitness:.2f} "
                           f"(Global: {self.global_best_fitness:.2f})")
             else:
                 no_improve_count += 1
             
+            # Ilerleme olayi (kisitlanmis; ceza kirilimi yalnizca gonderilirken hesaplanir)
+            best = self.best_individual
+            self.report_progress(
+                total_generations,
+                best_cost=-self.best_fitness,
+                penalty_breakdown=lambda: self._penalty_breakdown(best),
+                max_iterations=self.config.max_generations,
+                evaluations=(total_generations + 1) * self.config.population_size,
+            )
+            self.save_checkpoint(lambda: self._checkpoint_state(population, total_generations))
+            
             # Restart kontrolu
             if (self.config.restart_on_stagnation and 
                 no_improve_count >= self.config.stagnation_generations and
@@ -2886,6 +2986,8 @@ class GeneticAlgorithm(OptimizationAlgorithm):
             if no_improve_count >= self.config.no_improve_limit:
                 break
         
+        self.save_checkpoint(lambda: self._checkpoint_state(population, total_generations), force=True)
+        
         # Ceza detaylarini hesapla
         penalty_breakdown = {
             'h1_time_penalty': self.penalty_calculator.calculate_h1_time_penalty(self.best_individual),
@@ -3092,8 +3194,28 @@ class GeneticAlgorithm(OptimizationAlgorithm):
             worst_idx = min(range(len(population)), key=lambda i: population[i].fitness)
             population[worst_idx] = self.global_best_individual.copy()
         
+        # Warm start bireyini ekle (global best'in yerine degil)
+        warm_individual = self._build_warm_start_individual()
+        if warm_individual is not None and len(population) > 0:
+            warm_idx = len(population) - 1
+            if self.global_best_individual and warm_idx == worst_idx and len(population) > 1:
+                warm_idx -= 1
+            population[warm_idx] = warm_individual
+        
         return population
     
+    def _build_warm_start_individual(self) -> Optional[Individual]:
+        """Warm start cizelgesini mevcut proje listesine gore tam bireye cevir."""
+        warm = self._convert_schedule_to_individual(getattr(self, "warm_start_entries", None))
+        if warm is None or not warm.assignments:
+            return None
+        individual = self.initializer._create_heuristic_individual()
+        individual.assignments = seed_assignments(
+            warm.assignments, individual.assignments, self.config.class_count,
+            slot_attr="order_in_class", instructor_ids=self.operators.faculty_ids
+        )
+        return individual
+    
     def _add_to_memory(self, individual: Individual, fitness: float) -> None:
         """
         Hafizaya cozum ekle.
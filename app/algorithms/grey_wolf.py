@@ -33,9 +33,9 @@ import logging
 import copy
 import time
 from collections import defaultdict
-from datetime import time as dt_time
 
 from app.algorithms.base import OptimizationAlgorithm
+from app.algorithms.timeslot_calendar import parse_minutes
 
 logger = logging.getLogger(__name__)
 
@@ -134,15 +134,7 @@ class GreyWolf(OptimizationAlgorithm):
         pass
 
     def _parse_time_to_minutes(self, time_str) -> int:
-        if not time_str:
-            return 0
-        try:
-            if isinstance(time_str, dt_time):
-                return time_str.hour * 60 + time_str.minute
-            parts = str(time_str).split(":")
-            return int(parts[0]) * 60 + int(parts[1])
-        except:
-            return 0
+        return parse_minutes(time_str) or 0
 
     def _is_bitirme(self, project: Dict) -> bool:
         t = str(project.get("type", "")).lower()
@@ -697,8 +689,13 @@ class GreyWolf(OptimizationAlgorithm):
                 delta = copy.deepcopy(w)
                 delta_fitness = f
         
+        self.publish_best(alpha, cost=alpha_fitness, iteration=0)
+        
         # İterasyonlar
         for it in range(self.n_iterations):
+            if self.should_stop():
+                break
+            
             # a parametresi azalır (2 -> 0)
             a = self.a_decay - (self.a_decay * it / self.n_iterations)
             
@@ -718,6 +715,7 @@ class GreyWolf(OptimizationAlgorithm):
                     beta_fitness = alpha_fitness
                     alpha = copy.deepcopy(new_pos)
                     alpha_fitness = new_fit
+                    self.publish_best(alpha, cost=alpha_fitness, iteration=it)
                 elif new_fit < beta_fitness:
                     delta = copy.deepcopy(beta)
                     delta_fitness = beta_fitness
@@ -727,6 +725,18 @@ class GreyWolf(OptimizationAlgorithm):
                     delta = copy.deepcopy(new_pos)
                     delta_fitness = new_fit
             
+            incumbent = alpha
+            self.report_progress(
+                it,
+                best_cost=alpha_fitness,
+                penalty_breakdown=lambda: dict(zip(
+                    ("h1_time_penalty", "h2_workload_penalty", "h3_class_change_penalty"),
+                    self._calculate_penalties(incumbent),
+                )),
+                max_iterations=self.n_iterations,
+                evaluations=(it + 1) * self.n_wolves,
+            )
+            
             pass
         
         return alpha
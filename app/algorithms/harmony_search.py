@@ -30,9 +30,9 @@ import logging
 import copy
 import time
 from collections import defaultdict
-from datetime import time as dt_time
 
 from app.algorithms.base import OptimizationAlgorithm
+from app.algorithms.timeslot_calendar import parse_minutes
 
 logger = logging.getLogger(__name__)
 
@@ -130,15 +130,7 @@ class HarmonySearch(OptimizationAlgorithm):
         pass
 
     def _parse_time_to_minutes(self, time_str) -> int:
-        if not time_str:
-            return 0
-        try:
-            if isinstance(time_str, dt_time):
-                return time_str.hour * 60 + time_str.minute
-            parts = str(time_str).split(":")
-            return int(parts[0]) * 60 + int(parts[1])
-        except:
-            return 0
+        return parse_minutes(time_str) or 0
 
     def _is_bitirme(self, project: Dict) -> bool:
         t = str(project.get("type", "")).lower()
@@ -609,7 +601,12 @@ class HarmonySearch(OptimizationAlgorithm):
                 best_global_fitness = f
                 best_global = copy.deepcopy(p)
         
+        self.publish_best(best_global, cost=best_global_fitness, iteration=0)
+        
         for it in range(self.n_iterations):
+            if self.should_stop():
+                break
+            
             for p in particles:
                 new_pos = self._update_particle(p["pos"], p["best_pos"], best_global)
                 new_pos = self._fix_hard_constraints(new_pos)
@@ -625,6 +622,19 @@ class HarmonySearch(OptimizationAlgorithm):
                 if new_fit < best_global_fitness:
                     best_global_fitness = new_fit
                     best_global = copy.deepcopy(new_pos)
+                    self.publish_best(best_global, cost=best_global_fitness, iteration=it)
+            
+            incumbent = best_global
+            self.report_progress(
+                it,
+                best_cost=best_global_fitness,
+                penalty_breakdown=lambda: dict(zip(
+                    ("h1_time_penalty", "h2_workload_penalty", "h3_class_change_penalty"),
+                    self._calculate_penalties(incumbent),
+                )),
+                max_iterations=self.n_iterations,
+                evaluations=(it + 1) * self.n_particles,
+            )
             
             pass
         
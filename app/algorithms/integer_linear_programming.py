@@ -47,7 +47,9 @@ except ImportError:
     PULP_AVAILABLE = False
     pulp = None
 
+from app.algorithms.anytime import native_time_limit
 from app.algorithms.base import OptimizationAlgorithm
+from app.algorithms.warm_start import complete_placements, warm_start_entries, warm_start_placements
 
 logger = logging.getLogger(__name__)
 
@@ -180,12 +182,15 @@ class ILPModelBuilder:
         teachers: List[Teacher],
         config: ILPConfig,
         num_classes: int,
-        class_names: Optional[List[str]] = None
+        class_names: Optional[List[str]] = None,
+        warm_start: Optional[List[Dict[str, Any]]] = None
     ):
         self.projects = projects
         self.teachers = teachers
         self.config = config
         self.num_classes = num_classes
+        # Kalici/onceki cizelge (warm_start_entries formatinda) -> MIP start
+        self.warm_start = warm_start or []
         
         # Filter out research assistants - they are NOT part of the model
         self.faculty = [t for t in teachers if not t.is_research_assistant]
@@ -721,6 +726,30 @@ class ILPModelBuilder:
             'faculty_workload': faculty_workload
         }
     
+    def _overlay_schedule_warm_start(self, initial_solution: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Replace the greedy start with the persisted schedule where possible.
+        
+        Projects missing from the schedule keep a greedy-style placement
+        (least loaded class, first free slot); J1 falls back to greedy.
+        """
+        placements, jury = warm_start_placements(self.warm_start)
+        project_ids = [p.id for p in self.projects]
+        project_assignments = complete_placements(
+            placements, project_ids, self.num_classes, max_slots=self.max_slots
+        )
+        j1_assignments = dict(initial_solution.get('j1_assignments', {}))
+        for p_id, j1_id in jury.items():
+            if p_id in j1_assignments and j1_id in self.faculty_ids and j1_id != self.ps_lookup.get(p_id):
+                j1_assignments[p_id] = j1_id
+        
+        logger.info(f"Warm start from persisted schedule: {len(placements)}/{len(project_ids)} projects")
+        return {
+            **initial_solution,
+            'project_assignments': project_assignments,
+            'j1_assignments': j1_assignments,
+        }
+    
     def _apply_warm_start(self, initial_solution: Dict[str, Any]) -> None:
         """
         Apply the greedy initial solution as warm start.
@@ -780,17 +809,23 @@ class ILPModelBuilder:
         if self.model is None:
             raise ValueError("Model not built. Call build() first.")
         
-        # Generate and apply warm start if enabled
-        if self.config.use_warm_start:
+        # Generate and apply warm start if enabled (a persisted schedule always enables it)
+        use_warm_start = self.config.use_warm_start or bool(self.warm_start)
+        if use_warm_start:
             try:
                 initial_solution = self._generate_greedy_initial_solution()
+                if self.warm_start:
+                    initial_solution = self._overlay_schedule_warm_start(initial_solution)
                 self._apply_warm_start(initial_solution)
             except Exception as e:
                 logger.warning(f"Warm start failed: {e}")
         
+        # Time limit capped by the run deadline
+        time_limit = native_time_limit(self.config.max_time_seconds, self.solver_control)
+
         # Build optimized solver options
         solver_options = [
-            f"sec {self.config.max_time_seconds}",  # Time limit
+            f"sec {time_limit}",  # Time limit
             f"ratio {self.config.mip_gap}",          # MIP gap tolerance
         ]
         
@@ -812,10 +847,10 @@ class ILPModelBuilder:
         
         solver = pulp.PULP_CBC_CMD(
             msg=self.config.solver_msg,
-            timeLimit=self.config.max_time_seconds,
+            timeLimit=time_limit,
             gapRel=self.config.mip_gap,
-            warmStart=self.config.use_warm_start,
-            keepFiles=is_windows and self.config.use_warm_start,
+            warmStart=use_warm_start,
+            keepFiles=is_windows and use_warm_start,
             options=solver_options
         )
         
@@ -1102,7 +1137,8 @@ class IntegerLinearProgramming(OptimizationAlgorithm):
                     teachers=teachers,
                     config=self.config,
                     num_classes=z,
-                    class_names=class_names
+                    class_names=class_names,
+                    warm_start=warm_start_entries(self.data, self.classrooms, self.timeslots, z)
                 )
                 builder.build()
                 
@@ -0,0 +1,263 @@
+"""
+Ortak metrik motoru.
+
+Skor hesaplayicilari (``performance_metrics``, ``FitnessMetrics``,
+``StandardFitnessScorer``, ``ScoringService``) ayni ham istatistiklerden
+beslenir: proje sayimlari, sinif bazli slot siralari, ogretim uyesi yukleri,
+gec slot kullanimi... Bu modul bunlari iki katmanda hesaplar:
+
+- ``ProblemIndex``: problem ornegine ait, plandan bagimsiz indeksler (takvim,
+  kisi turleri, beklenen projeler, proje bilgileri). Ornek basina bir kez
+  olusturulur ve o ornegin tum planlari icin paylasilir.
+- ``PlanStats``: bir planin atamalari uzerinden tek geciste toplanan ham
+  istatistikler. Her on yuz kendi formulunu (olcek, agirlik, esik) bu
+  istatistiklerden uygular; atama listesini yeniden taramaz.
+
+Atama alanlari tek yerde normalize edilir: slot ``slot_id`` ya da
+``timeslot_id``, sinif ``class_id`` ya da ``classroom_id``.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import math
+
+from app.algorithms.timeslot_calendar import TimeslotCalendar, get_calendar
+
+RESPONSIBLE_ROLES = ("SORUMLU", "RESPONSIBLE")
+JURY_ROLES = ("JURI", "JURY")
+
+
+def assignment_slot(assignment: Dict[str, Any]) -> Any:
+    return assignment.get("slot_id") or assignment.get("timeslot_id")
+
+
+def assignment_classroom(assignment: Dict[str, Any]) -> Any:
+    return assignment.get("class_id") or assignment.get("classroom_id")
+
+
+def _role_rule_violations(project_type: str, responsibles: int, juries: int,
+                          both_roles: bool, instructor_count: int) -> int:
+    violations = 0
+    # Ayni kisi hem sorumlu hem juri olamaz
+    if both_roles:
+        violations += 1
+    if project_type == "bitirme":
+        if responsibles != 1:
+            violations += 1
+        if juries < 1:
+            violations += 1
+        if juries > 3:  # Max 3 juri
+            violations += 1
+    elif project_type == "ara":
+        if responsibles != 1:
+            violations += 1
+        if juries != 0:
+            violations += 1
+    # Instructor sayisi rollerle tutarli olmali
+    if instructor_count != responsibles + juries:
+        violations += 1
+    return violations
+
+
+def role_violations(assignment: Dict[str, Any]) -> int:
+    """Atamanin rol kurali ihlal sayisi (sorumlu/juri sayilari, cift rol, kadro tutarliligi)."""
+    roles = assignment.get("roles") or []
+    responsible_ids = [r.get("person_id") for r in roles if str(r.get("role", "")).upper() in RESPONSIBLE_ROLES]
+    jury_ids = [r.get("person_id") for r in roles if str(r.get("role", "")).upper() in JURY_ROLES]
+    return _role_rule_violations(
+        str(assignment.get("project_type") or assignment.get("type") or "").lower(),
+        len(responsible_ids), len(jury_ids), not set(responsible_ids).isdisjoint(jury_ids),
+        len(assignment.get("instructors") or []),
+    )
+
+
+def mean_std(values: Sequence[float]) -> Tuple[float, float]:
+    """Ortalama ve populasyon standart sapmasi (bos liste icin 0, 0)."""
+    if not values:
+        return 0.0, 0.0
+    mean = sum(values) / len(values)
+    variance = sum((value - mean) ** 2 for value in values) / len(values)
+    return mean, math.sqrt(variance)
+
+
+class ProblemIndex:
+    """
+    Problem ornegi icin bir kez hesaplanan indeksler.
+
+    Args:
+        projects: Beklenen projeler (``id``, ``type``/``project_type``, ``responsible_id``).
+        instructors: Ogretim uyeleri / kisiler (``id``, ``type``).
+        classrooms: Siniflar.
+        timeslots: Zaman dilimleri (ya da hazir ``TimeslotCalendar``).
+    """
+
+    def __init__(self, projects: Optional[Iterable[Dict[str, Any]]] = None,
+                 instructors: Optional[Iterable[Dict[str, Any]]] = None,
+                 classrooms: Optional[Sequence[Any]] = None,
+                 timeslots: Optional[Sequence[Any]] = None):
+        self.calendar: TimeslotCalendar = get_calendar(timeslots or [])
+        self.timeslot_count = len(timeslots or [])
+        self.classroom_count = len(classrooms or [])
+
+        self.project_ids: List[Any] = []
+        self.projects_by_id: Dict[Any, Dict[str, Any]] = {}
+        self.project_type_counts: Dict[str, int] = {"ara": 0, "bitirme": 0}
+        for project in projects or []:
+            pid = project.get("id")
+            if pid is not None:
+                self.project_ids.append(pid)
+                self.projects_by_id.setdefault(pid, project)
+            project_type = str(project.get("type") or project.get("project_type") or "").lower()
+            if project_type in self.project_type_counts:
+                self.project_type_counts[project_type] += 1
+        self.project_id_set = frozenset(self.project_ids)
+
+        self.people_types: Dict[Any, str] = {}
+        for person in instructors or []:
+            pid = person.get("id")
+            if pid is not None:
+                self.people_types[pid] = str(person.get("type") or "").lower()
+        self.instructor_ids = frozenset(self.people_types)
+
+    def stats(self, assignments: Iterable[Dict[str, Any]], roles: bool = True,
+              placements: bool = True) -> "PlanStats":
+        return PlanStats(self, assignments, roles=roles, placements=placements)
+
+    def stats_many(self, plans: Iterable[Iterable[Dict[str, Any]]], roles: bool = True,
+                   placements: bool = True) -> List["PlanStats"]:
+        """Ayni ornege ait planlarin istatistikleri (indeks paylasilir)."""
+        return [PlanStats(self, assignments, roles=roles, placements=placements) for assignments in plans]
+
+
+class PlanStats:
+    """
+    Bir planin tek geciste toplanan ham istatistikleri.
+
+    Attributes:
+        count: Atama sayisi.
+        project_counts: Proje ID -> atama sayisi (ilk gorulme sirasiyla).
+        type_counts: Atamadaki ``project_type`` (kucuk harf) -> sayi.
+        slot_usage: Slot ID -> atama sayisi.
+        classroom_usage: Sinif ID -> atama sayisi.
+        class_slots: Sinif -> slot ID listesi (atama sirasiyla, tekrarlar dahil).
+        instructor_loads: ``instructors`` listesindeki kisi -> gorev sayisi.
+        instructor_slots: Kisi -> (slot, sinif) listesi (``instructors`` uzerinden).
+        role_loads: ``roles`` icindeki kisi -> rol sayisi.
+        role_slots: Kisi -> (slot, sinif) listesi (atama basina bir kez).
+        role_violations: Toplam rol kurali ihlali.
+        late_count: Gec slota dusen atama sayisi.
+
+    Sayimlar duz ``dict`` olarak tutulur. Fitness hesaplayicilarinin sicak
+    dongulerinde gereksiz is yapilmamasi icin ``roles=False`` rol
+    istatistiklerini (``role_*``), ``placements=False`` ise kisi bazli
+    (slot, sinif) listelerini atlar; atlanan alanlar None olur.
+    """
+
+    def __init__(self, index: ProblemIndex, assignments: Iterable[Dict[str, Any]],
+                 roles: bool = True, placements: bool = True):
+        self.index = index
+        self.project_counts: Dict[Any, int] = {}
+        self.type_counts: Dict[str, int] = {}
+        self.slot_usage: Dict[Any, int] = {}
+        self.classroom_usage: Dict[Any, int] = {}
+        self.class_slots: Dict[Any, List[Any]] = {}
+        self.instructor_loads: Dict[Any, int] = {}
+        self.instructor_slots: Optional[Dict[Any, List[Tuple[Any, Any]]]] = {} if placements else None
+        self.role_loads: Optional[Dict[Any, int]] = {} if roles else None
+        self.role_slots: Optional[Dict[Any, List[Tuple[Any, Any]]]] = {} if roles and placements else None
+        self._class_ordinals: Optional[Dict[Any, List[int]]] = None
+
+        # Sicak dongu: yerel isimler ve dict.get ile sayim
+        project_counts, type_counts = self.project_counts, self.type_counts
+        slot_usage, classroom_usage, class_slots = self.slot_usage, self.classroom_usage, self.class_slots
+        instructor_loads, instructor_slots = self.instructor_loads, self.instructor_slots
+        role_loads, role_slots = self.role_loads, self.role_slots
+        late_ids = index.calendar.late_ids
+        count = late_count = violations = 0
+        for assignment in assignments:
+            count += 1
+            get = assignment.get
+            pid = get("project_id")
+            if pid is not None:
+                project_counts[pid] = project_counts.get(pid, 0) + 1
+            project_type = get("project_type")
+            if project_type:
+                key = str(project_type).lower()
+                type_counts[key] = type_counts.get(key, 0) + 1
+
+            slot = get("slot_id") or get("timeslot_id")
+            classroom = get("class_id") or get("classroom_id")
+            if slot is not None:
+                slot_usage[slot] = slot_usage.get(slot, 0) + 1
+                if slot in late_ids:
+                    late_count += 1
+            if classroom is not None:
+                classroom_usage[classroom] = classroom_usage.get(classroom, 0) + 1
+                if slot is not None:
+                    if classroom in class_slots:
+                        class_slots[classroom].append(slot)
+                    else:
+                        class_slots[classroom] = [slot]
+
+            place = (slot, classroom)
+            instructors = get("instructors") or ()
+            for instructor_id in instructors:
+                instructor_loads[instructor_id] = instructor_loads.get(instructor_id, 0) + 1
+                if not placements:
+                    continue
+                if instructor_id in instructor_slots:
+                    instructor_slots[instructor_id].append(place)
+                else:
+                    instructor_slots[instructor_id] = [place]
+
+            if not roles:
+                continue
+            responsible_ids = []
+            jury_ids = []
+            people = set()
+            for role in get("roles") or ():
+                person_id = role.get("person_id")
+                role_loads[person_id] = role_loads.get(person_id, 0) + 1
+                people.add(person_id)
+                kind = str(role.get("role", "")).upper()
+                if kind in RESPONSIBLE_ROLES:
+                    responsible_ids.append(person_id)
+                elif kind in JURY_ROLES:
+                    jury_ids.append(person_id)
+            for person_id in people if placements else ():
+                if person_id in role_slots:
+                    role_slots[person_id].append(place)
+                else:
+                    role_slots[person_id] = [place]
+            violations += _role_rule_violations(
+                str(project_type or get("type") or "").lower(),
+                len(responsible_ids), len(jury_ids),
+                bool(responsible_ids and jury_ids) and not set(responsible_ids).isdisjoint(jury_ids),
+                len(instructors),
+            )
+
+        self.count = count
+        self.late_count = late_count
+        self.role_violations = violations
+
+    # ------------------------------------------------------------------
+    # Turetilmis degerler
+    # ------------------------------------------------------------------
+    @property
+    def duplicate_extra(self) -> int:
+        """Ayni projenin fazladan atama sayisi."""
+        return sum(count - 1 for count in self.project_counts.values() if count > 1)
+
+    def class_ordinals(self) -> Dict[Any, List[int]]:
+        """Sinif -> takvimdeki slot siralari (tekil, sirali; takvim disi slotlar haric)."""
+        if self._class_ordinals is None:
+            id_to_index = self.index.calendar.id_to_index
+            self._class_ordinals = {}
+            for classroom, slots in self.class_slots.items():
+                ordinals = sorted({id_to_index[slot] for slot in slots if slot in id_to_index})
+                if ordinals:
+                    self._class_ordinals[classroom] = ordinals
+        return self._class_ordinals
+
+    def calendar_slots(self) -> List[Any]:
+        """Kullanilan ve takvimde bulunan slot ID'leri."""
+        id_to_index = self.index.calendar.id_to_index
+        return [slot for slot in self.slot_usage if slot in id_to_index]
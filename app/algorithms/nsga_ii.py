@@ -37,6 +37,10 @@ import time
 import logging
 
 from app.algorithms.base import OptimizationAlgorithm
+from app.algorithms.checkpoint import (
+    build_checkpoint, is_compatible, pack_solution, unpack_assignments
+)
+from app.algorithms.resource_profile import PHASE_REPAIR, profiled
 
 logger = logging.getLogger(__name__)
 
@@ -903,6 +907,7 @@ class NSGA2GeneticOperators:
                     assignment.j1_id = random.choice(valid)
                     return
     
+    @profiled(PHASE_REPAIR)
     def _repair_individual(self, individual: Individual) -> None:
         """
         Repair individual to satisfy constraints.
@@ -1407,6 +1412,8 @@ class NSGA2Scheduler(OptimizationAlgorithm):
     # J2 Placeholder constant
     J2_PLACEHOLDER = "[Araştırma Görevlisi]"
     
+    CHECKPOINT_KEY = "nsga_ii"
+    
     def __init__(self, params: Optional[Dict[str, Any]] = None):
         super().__init__(params)
         self.name = "NSGA-II Multi-Objective Scheduler"
@@ -1507,6 +1514,8 @@ class NSGA2Scheduler(OptimizationAlgorithm):
             for class_count in [5, 6, 7]:
                 if class_count > len(self.classrooms):
                     continue
+                if best_solution is not None and self.should_stop():
+                    break
                 
                 logger.info(f"\n--- Trying class_count = {class_count} ---")
                 solution, score = self._run_nsga2(class_count)
@@ -1543,11 +1552,13 @@ class NSGA2Scheduler(OptimizationAlgorithm):
         # Update config
         self.config.class_count = class_count
         
-        # Initialize population
-        population = self.population_initializer.create_population(
-            self.config.population_size,
-            class_count
-        )
+        # Initialize population (a resumed run continues from its checkpoint)
+        population, best_individual = self._restore_checkpoint(class_count)
+        if not population:
+            population = self.population_initializer.create_population(
+                self.config.population_size,
+                class_count
+            )
         
         # Evaluate initial population
         for individual in population:
@@ -1559,12 +1570,19 @@ class NSGA2Scheduler(OptimizationAlgorithm):
             self.nsga2_core.calculate_crowding_distance(front)
         
         # Track best
-        best_individual = None
         best_score = float('inf')
+        if best_individual is not None:
+            self._evaluate_individual(best_individual)
+            best_score = self._weighted_score(best_individual)
         stagnation_counter = 0
+        generation = 0
         
         # Main loop
         for generation in range(self.config.max_generations):
+            if self.should_stop():
+                logger.info(f"Stopping at generation {generation}: {self.solver_control.stop_reason}")
+                break
+            
             # Create offspring
             offspring = []
             
@@ -1610,19 +1628,77 @@ class NSGA2Scheduler(OptimizationAlgorithm):
                 best_score = current_score
                 best_individual = current_best.copy()
                 stagnation_counter = 0
+                self._publish_best_individual(best_individual, best_score, generation)
                 
                 if generation % 10 == 0:
                     logger.info(f"Gen {generation}: New best score = {best_score:.2f}")
                 else:
                     stagnation_counter += 1
             
+            if best_individual is not None:
+                objectives = best_individual.objectives or []
+                self.report_progress(
+                    generation,
+                    best_cost=best_score,
+                    penalty_breakdown=dict(zip(
+                        ('h1_continuity', 'h2_workload', 'h3_class_change', 'h4_class_load'),
+                        objectives,
+                    )),
+                    max_iterations=self.config.max_generations,
+                    evaluations=(generation + 1) * self.config.population_size,
+                )
+            self.save_checkpoint(lambda: self._checkpoint_state(population, best_individual, best_score,
+                                                                class_count, generation))
+            
             # Check stagnation
             if stagnation_counter >= self.config.stagnation_limit:
                 logger.info(f"Stopping at generation {generation} due to stagnation")
                 break
-                
+        
+        self.save_checkpoint(lambda: self._checkpoint_state(population, best_individual, best_score,
+                                                            class_count, generation), force=True)
         return best_individual, best_score
     
+    def _checkpoint_state(self, population: List[Individual], best: Optional[Individual],
+                          best_score: float, class_count: int, generation: int) -> Dict[str, Any]:
+        """Compact checkpoint of the current population and best individual."""
+        return build_checkpoint(
+            self.CHECKPOINT_KEY, class_count, [p.id for p in self.projects], generation,
+            population=[pack_solution(ind.assignments, None) for ind in population],
+            best=pack_solution(best.assignments, best_score) if best is not None else None,
+        )
+    
+    def _restore_checkpoint(self, class_count: int) -> Tuple[List[Individual], Optional[Individual]]:
+        """
+        Restore population and best individual of a resumed run.
+        
+        Objectives are not stored; callers re-evaluate the restored individuals.
+        """
+        state = self.resume_checkpoint(self.CHECKPOINT_KEY, class_count)
+        if state is None:
+            return [], None
+        if not is_compatible(state, self.CHECKPOINT_KEY, class_count, [p.id for p in self.projects]):
+            logger.warning("NSGA-II checkpoint does not match this instance, starting from scratch")
+            return [], None
+        
+        def unpack(packed: List[Any]) -> Individual:
+            return Individual(assignments=unpack_assignments(packed[1], ProjectAssignment),
+                              class_count=class_count)
+        
+        population = [unpack(packed) for packed in state.get("population", [])]
+        best = unpack(state["best"]) if state.get("best") else None
+        logger.info(f"NSGA-II resuming from checkpoint: generation {state.get('iteration')}, "
+                    f"{len(population)} individuals")
+        return population, best
+    
+    def _publish_best_individual(self, individual: Individual, score: float, generation: int) -> None:
+        """Publish best individual as best-so-far (conversion is lazy)."""
+        self.publish_best(
+            lambda: self._convert_to_output(individual).get("schedule", []),
+            cost=score,
+            generation=generation,
+        )
+    
     def _evaluate_individual(self, individual: Individual) -> None:
         """Evaluate objectives and feasibility for individual."""
         # Check feasibility
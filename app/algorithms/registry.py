@@ -0,0 +1,115 @@
+"""
+Tembel algoritma kaydi.
+
+``AlgorithmType`` -> (modul yolu, sinif adi) eslemesi. Algoritma modulleri
+(bazilari OR-Tools, PuLP, SciPy, NumPy ceker) import aninda degil, ilk
+kullanimda yuklenir; boylece yalnizca CRUD sunan API/Celery surecleri bu
+maliyeti odemez. Solver worker'lari secili algoritmalari ``prewarm`` ile
+onceden yukleyebilir (bkz. ``ALGORITHM_PREWARM``).
+"""
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+import importlib
+import threading
+import time
+
+from app.models.algorithm import AlgorithmType
+
+ALGORITHM_REGISTRY: Dict[AlgorithmType, Tuple[str, str]] = {
+    AlgorithmType.GENETIC_ALGORITHM: ("app.algorithms.genetic_algorithm", "EnhancedGeneticAlgorithm"),
+    AlgorithmType.SIMULATED_ANNEALING: ("app.algorithms.simulated_annealing", "SimulatedAnnealingAlgorithm"),
+    AlgorithmType.SIMPLEX: ("app.algorithms.real_simplex", "RealSimplexAlgorithm"),
+    AlgorithmType.ANT_COLONY: ("app.algorithms.ant_colony", "AntColonyOptimization"),
+    AlgorithmType.NSGA_II: ("app.algorithms.nsga_ii", "NSGA2Scheduler"),
+    AlgorithmType.NSGA_II_ENHANCED: ("app.algorithms.nsga_ii_enhanced", "NSGAIIEnhanced"),
+    AlgorithmType.GREEDY: ("app.algorithms.greedy", "Greedy"),
+    AlgorithmType.TABU_SEARCH: ("app.algorithms.tabu_search", "TabuSearch"),
+    AlgorithmType.PSO: ("app.algorithms.pso", "PSO"),
+    AlgorithmType.HARMONY_SEARCH: ("app.algorithms.harmony_search", "HarmonySearch"),
+    AlgorithmType.FIREFLY: ("app.algorithms.firefly", "Firefly"),
+    AlgorithmType.GREY_WOLF: ("app.algorithms.grey_wolf", "GreyWolf"),
+    AlgorithmType.CP_SAT: ("app.algorithms.cp_sat", "CPSAT"),
+    AlgorithmType.DEEP_SEARCH: ("app.algorithms.deep_search", "DeepSearch"),
+    AlgorithmType.LEXICOGRAPHIC: ("app.algorithms.lexicographic", "LexicographicAlgorithm"),
+    AlgorithmType.HYBRID_CP_SAT_NSGA: ("app.algorithms.hybrid_cp_sat_nsga", "HybridCPSATNSGAAlgorithm"),
+    # Yeni algoritmalar
+    AlgorithmType.ARTIFICIAL_BEE_COLONY: ("app.algorithms.artificial_bee_colony", "ArtificialBeeColony"),
+    AlgorithmType.CUCKOO_SEARCH: ("app.algorithms.cuckoo_search", "CuckooSearch"),
+    AlgorithmType.BRANCH_AND_BOUND: ("app.algorithms.branch_and_bound", "BranchAndBound"),
+    AlgorithmType.DYNAMIC_PROGRAMMING: ("app.algorithms.dynamic_programming", "DynamicProgrammingAlgorithm"),
+    AlgorithmType.WHALE_OPTIMIZATION: ("app.algorithms.whale_optimization", "WhaleOptimization"),
+    # Daha fazla algoritma
+    AlgorithmType.BAT_ALGORITHM: ("app.algorithms.bat_algorithm", "BatAlgorithm"),
+    AlgorithmType.DRAGONFLY_ALGORITHM: ("app.algorithms.dragonfly_algorithm", "DragonflyAlgorithm"),
+    AlgorithmType.A_STAR_SEARCH: ("app.algorithms.a_star_search", "AStarSearch"),
+    AlgorithmType.INTEGER_LINEAR_PROGRAMMING: ("app.algorithms.integer_linear_programming", "IntegerLinearProgramming"),
+    AlgorithmType.HUNGARIAN: ("app.algorithms.hungarian_algorithm", "HungarianAlgorithm"),
+    AlgorithmType.GENETIC_LOCAL_SEARCH: ("app.algorithms.genetic_local_search", "GeneticLocalSearch"),
+    AlgorithmType.COMPREHENSIVE_OPTIMIZER: ("app.algorithms.comprehensive_optimizer", "ComprehensiveOptimizer"),
+    AlgorithmType.BITIRME_PRIORITY_SCHEDULER: ("app.algorithms.bitirme_priority_scheduler", "BitirmePriorityScheduler"),
+}
+
+_loaded: Dict[AlgorithmType, type] = {}
+_lock = threading.Lock()
+
+
+def _resolve(algorithm_type) -> AlgorithmType:
+    try:
+        return AlgorithmType(algorithm_type)
+    except ValueError:
+        raise ValueError(f"Unsupported algorithm type: {algorithm_type}")
+
+
+def load_algorithm_class(algorithm_type) -> Type:
+    """
+    Algoritma sinifini dondur; modul ilk cagrida import edilir.
+
+    Raises:
+        ValueError: Tip bilinmiyorsa veya kayitta yoksa.
+    """
+    algorithm_type = _resolve(algorithm_type)
+    cls = _loaded.get(algorithm_type)
+    if cls is not None:
+        return cls
+    entry = ALGORITHM_REGISTRY.get(algorithm_type)
+    if entry is None:
+        raise ValueError(f"Unsupported algorithm type: {algorithm_type}")
+    module_path, class_name = entry
+    # Import kilidi ayni modulu iki thread'in yarim yuklemesini zaten engeller;
+    # buradaki kilit yalnizca cache yazimini sirali tutar.
+    module = importlib.import_module(module_path)
+    with _lock:
+        cls = _loaded.setdefault(algorithm_type, getattr(module, class_name))
+    return cls
+
+
+def is_loaded(algorithm_type) -> bool:
+    """Sinif bu surecte yuklendi mi (``load_algorithm_class`` ile)."""
+    return _resolve(algorithm_type) in _loaded
+
+
+def parse_names(value: Optional[str]) -> List[str]:
+    """``"genetic_algorithm, cp_sat"`` -> ``["genetic_algorithm", "cp_sat"]``; ``"all"`` tum kayit."""
+    names = [name.strip() for name in (value or "").split(",") if name.strip()]
+    if "all" in names:
+        return [algorithm_type.value for algorithm_type in ALGORITHM_REGISTRY]
+    return names
+
+
+def prewarm(names: Iterable[str]) -> Dict[str, Optional[float]]:
+    """
+    Verilen algoritmalari onceden yukle.
+
+    Returns:
+        Algoritma -> yukleme suresi (saniye); yuklenemeyenler icin None.
+        Hatalar yutulur: on yukleme worker'in acilisini engellememeli.
+    """
+    timings: Dict[str, Optional[float]] = {}
+    for name in names:
+        started = time.perf_counter()
+        try:
+            load_algorithm_class(name)
+        except Exception:
+            timings[name] = None
+            continue
+        timings[name] = round(time.perf_counter() - started, 4)
+    return timings
@@ -0,0 +1,197 @@
+"""
+Kosu kaynak profili.
+
+Bir algoritma kosusunun asamalara gore duvar saati ve CPU suresini, tepe
+bellek kullanimini (RSS), fitness degerlendirme sayisini ve son maliyeti
+toplar. Sonuc ``AlgorithmRun.resource_profile`` kolonunda saklanir.
+
+Asamalar (``PHASES``): ``initialize``, ``optimize``, ``repair`` (solver
+thread'inde), ``post_processing``, ``validation``, ``save`` (serviste).
+Asamalar ic ice olabilir (optimize icinde repair); her asamanin suresi kendi
+alt asamalari haric tutularak yazilir, boylece toplamlar cift sayilmaz.
+
+Solver kodu aktif profili ``SolverControl.profile`` uzerinden bulur:
+``phase("repair")`` context manager'i veya ``@profiled("repair")`` dekoratoru
+profil yoksa neredeyse bedavadir. CPU suresi ``time.thread_time`` ile olculur;
+serviste event loop thread'inde olculen asamalar ayni anda calisan diger
+isteklerin CPU'sunu da icerebilir. RSS surec geneli bir degerdir.
+"""
+from typing import Any, Callable, Dict, List, Optional
+from contextlib import contextmanager
+import functools
+import os
+import resource
+import threading
+import time
+
+from app.algorithms.anytime import get_current_control
+
+PHASE_INITIALIZE = "initialize"
+PHASE_OPTIMIZE = "optimize"
+PHASE_REPAIR = "repair"
+PHASE_POST_PROCESSING = "post_processing"
+PHASE_VALIDATION = "validation"
+PHASE_SAVE = "save"
+PHASES = (PHASE_INITIALIZE, PHASE_OPTIMIZE, PHASE_REPAIR,
+          PHASE_POST_PROCESSING, PHASE_VALIDATION, PHASE_SAVE)
+
+RSS_SAMPLE_INTERVAL = 0.1
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Surecin guncel RSS'i (Linux /proc); okunamazsa None."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def process_peak_rss_bytes() -> int:
+    """Surec baslangicindan beri tepe RSS (ru_maxrss Linux'ta KiB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _mb(value: Optional[int]) -> Optional[float]:
+    return round(value / (1024 * 1024), 2) if value is not None else None
+
+
+class RunProfile:
+    """
+    Tek bir kosunun kaynak profili. Thread-safe; solver thread'i ve servis
+    ayni nesneye yazar.
+
+    Args:
+        sample_interval: RSS ornekleme araligi (saniye; 0 = ornekleme yok).
+    """
+
+    def __init__(self, sample_interval: float = RSS_SAMPLE_INTERVAL):
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+        self.rss_start = current_rss_bytes()
+        self.rss_peak = self.rss_start
+        self._sample_interval = sample_interval
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    # -- RSS ornekleme -------------------------------------------------------
+
+    def start(self) -> "RunProfile":
+        if self._sample_interval > 0 and self.rss_start is not None and self._sampler is None:
+            self._sampler = threading.Thread(target=self._sample_loop, name="run-profile-rss", daemon=True)
+            self._sampler.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join(timeout=1.0)
+            self._sampler = None
+        self._sample_rss()
+        if self.finished_at is None:
+            self.finished_at = time.perf_counter()
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self._sample_interval):
+            self._sample_rss()
+
+    def _sample_rss(self) -> None:
+        rss = current_rss_bytes()
+        if rss is not None and (self.rss_peak is None or rss > self.rss_peak):
+            self.rss_peak = rss
+
+    # -- asamalar ------------------------------------------------------------
+
+    @contextmanager
+    def phase(self, name: str):
+        """Asamanin duvar/CPU suresini olc (alt asamalar haric)."""
+        stack: Optional[List[List[float]]] = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        frame = [time.perf_counter(), time.thread_time(), 0.0, 0.0]
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            wall = time.perf_counter() - frame[0]
+            cpu = time.thread_time() - frame[1]
+            if stack:
+                stack[-1][2] += wall
+                stack[-1][3] += cpu
+            self.add(name, wall - frame[2], cpu - frame[3])
+
+    def add(self, name: str, wall: float, cpu: float, calls: int = 1) -> None:
+        with self._lock:
+            entry = self.phases.get(name)
+            if entry is None:
+                entry = self.phases[name] = {"wall_s": 0.0, "cpu_s": 0.0, "calls": 0}
+            entry["wall_s"] += max(0.0, wall)
+            entry["cpu_s"] += max(0.0, cpu)
+            entry["calls"] += calls
+
+    def has_phase(self, name: str) -> bool:
+        return name in self.phases
+
+    # -- cikti ---------------------------------------------------------------
+
+    def to_dict(self, evaluations: Optional[int] = None, iterations: Optional[int] = None,
+                final_cost: Optional[float] = None) -> Dict[str, Any]:
+        """JSON kolonuna yazilacak ozet."""
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        wall = end - self.started_at
+        with self._lock:
+            phases = {
+                name: {"wall_s": round(entry["wall_s"], 4), "cpu_s": round(entry["cpu_s"], 4),
+                       "calls": int(entry["calls"])}
+                for name, entry in self.phases.items()
+            }
+        solver_wall = sum(phases.get(name, {}).get("wall_s", 0.0)
+                          for name in (PHASE_INITIALIZE, PHASE_OPTIMIZE, PHASE_REPAIR))
+        return {
+            "wall_s": round(wall, 4),
+            "phases": phases,
+            "rss_start_mb": _mb(self.rss_start),
+            "peak_rss_mb": _mb(self.rss_peak),
+            "process_peak_rss_mb": _mb(process_peak_rss_bytes()),
+            "evaluations": evaluations,
+            "iterations": iterations,
+            "evaluations_per_sec": (round(evaluations / solver_wall, 2)
+                                    if evaluations and solver_wall > 0 else None),
+            "final_cost": final_cost,
+        }
+
+
+def current_profile() -> Optional[RunProfile]:
+    """Aktif kosunun profili (solver thread'inde context'ten); yoksa None."""
+    control = get_current_control()
+    return getattr(control, "profile", None) if control is not None else None
+
+
+@contextmanager
+def phase(name: str, profile: Optional[RunProfile] = None):
+    """Aktif profil varsa asamayi olc; yoksa hicbir sey yapma."""
+    profile = profile or current_profile()
+    if profile is None:
+        yield
+        return
+    with profile.phase(name):
+        yield
+
+
+def profiled(name: str) -> Callable:
+    """Fonksiyonu ``phase(name)`` icinde calistiran dekorator (onarim giris noktalari icin)."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = current_profile()
+            if profile is None:
+                return func(*args, **kwargs)
+            with profile.phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -25,6 +25,13 @@ from collections import defaultdict
 from enum import Enum
 from copy import deepcopy
 
+from app.algorithms.anytime import get_current_control
+from app.algorithms.checkpoint import (
+    build_checkpoint, is_compatible, pack_solution, solution_score, unpack_assignments
+)
+from app.algorithms.resource_profile import PHASE_REPAIR, profiled
+from app.algorithms.warm_start import seed_assignments, warm_start_entries
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -554,6 +561,7 @@ class SARepairMechanism:
         num_faculty = len(self.faculty_ids)
         self.avg_workload = (2 * num_projects) / num_faculty if num_faculty > 0 else 0
     
+    @profiled(PHASE_REPAIR)
     def repair(self, state: SAState) -> SAState:
         """Apply all repair operations to ensure feasibility"""
         # 1. PS assignments
@@ -1897,6 +1905,8 @@ class SimulatedAnnealingScheduler:
     - Full constraint handling
     """
     
+    CHECKPOINT_KEY = "simulated_annealing"
+    
     def __init__(self, config: SAConfig = None):
         self.config = config or SAConfig()
         
@@ -1922,6 +1932,10 @@ class SimulatedAnnealingScheduler:
         self.classrooms: List[Dict] = []
         self.timeslots: List[Dict] = []
         
+        # Warm start (yalnizca ilk baslangic cozumunde kullanilir)
+        self.warm_start_entries: List[Dict[str, Any]] = []
+        self._warm_start_pending = False
+        
         # Statistics
         self.iterations = 0
         self.accepted_moves = 0
@@ -1975,6 +1989,12 @@ class SimulatedAnnealingScheduler:
             self.neighbour_generator.config.class_count = self.config.class_count
         if self.solution_builder:
             self.solution_builder.config.class_count = self.config.class_count
+        
+        # Warm start: kalici/onceki cizelge ilk zincirin baslangic durumu olur
+        self.warm_start_entries = warm_start_entries(
+            data, self.classrooms, self.timeslots, self.config.class_count
+        )
+        self._warm_start_pending = bool(self.warm_start_entries)
     
     def _load_data(self, data: Dict[str, Any]) -> None:
         """Load and parse input data"""
@@ -2025,6 +2045,15 @@ class SimulatedAnnealingScheduler:
         state = self.solution_builder.build_initial_solution()
         # Ensure state.class_count matches config.class_count
         state.class_count = self.config.class_count
+        if self._warm_start_pending:
+            self._warm_start_pending = False
+            warm = self._convert_schedule_to_state(self.warm_start_entries)
+            if warm is not None and warm.assignments:
+                state.assignments = seed_assignments(
+                    warm.assignments, state.assignments, state.class_count,
+                    slot_attr="order_in_class", instructor_ids=self.repair_mechanism.faculty_ids
+                )
+                logger.info(f"SimulatedAnnealingScheduler: warm start from {len(warm.assignments)} assignments")
         logger.info(f"SimulatedAnnealingScheduler.build_initial_solution: Using {state.class_count} classes")
         
         self.repair_mechanism.repair(state)
@@ -2401,9 +2430,16 @@ class SimulatedAnnealingScheduler:
         1. Seed initial solution
         2. Guide search during stagnation
         3. Store and reuse best solutions
+        
+        A resumed run continues from the checkpointed chain, memory and temperature.
         """
+        control = get_current_control()
+        resumed_temperature = self._restore_checkpoint(control)
+        
         # Initialize - use memory if available
-        if self.memory_pool and self.config.use_memory:
+        if resumed_temperature is not None:
+            pass  # current state, memory and global best come from the checkpoint
+        elif self.memory_pool and self.config.use_memory:
             self.current_state = self._build_initial_from_memory()
         else:
             self.current_state = self.build_initial_solution()
@@ -2412,7 +2448,8 @@ class SimulatedAnnealingScheduler:
         self.best_cost = self.current_state.cost
         
         # Check if memory has better solution
-        if self.global_best_state and self.global_best_cost < self.best_cost:
+        if (resumed_temperature is None and self.global_best_state
+                and self.global_best_cost < self.best_cost):
             # Start from global best with mutations
             self.current_state = self.global_best_state.copy()
             for _ in range(3):
@@ -2426,13 +2463,21 @@ class SimulatedAnnealingScheduler:
                 self.best_cost = self.current_state.cost
         
         temperature = self.config.initial_temperature
+        if resumed_temperature is not None:
+            # A finished chain is reheated so the new time budget is not wasted
+            temperature = max(resumed_temperature, self.reheat(self.config.final_temperature))
         no_improve_count = 0
         total_iterations = 0
         
         logger.info(f"SA Start: Initial cost = {self.best_cost:.2f}, T = {temperature:.2f}, "
                    f"Global best = {self.global_best_cost:.2f}")
         
+        self._publish_best_state(control, 0)
+        
         for iteration in range(self.config.max_iterations):
+            if control is not None and control.should_stop():
+                logger.info(f"SA stopped at iteration {iteration}: {control.stop_reason}")
+                break
             self.iterations = iteration
             total_iterations += 1
             
@@ -2481,6 +2526,7 @@ class SimulatedAnnealingScheduler:
                     if (not self.penalty_calculator or not self.penalty_calculator.has_unused_classes(self.best_state)):
                         self._add_to_memory(self.best_state, self.best_cost)
                     
+                    self._publish_best_state(control, iteration)
                     logger.info(f"Iteration {iteration}: New best cost = {self.best_cost:.2f}")
                 else:
                     no_improve_count += 1
@@ -2488,6 +2534,18 @@ class SimulatedAnnealingScheduler:
                 self.rejected_moves += 1
                 no_improve_count += 1
             
+            if control is not None:
+                best = self.best_state
+                control.report_progress(
+                    iteration,
+                    best_cost=self.best_cost,
+                    penalty_breakdown=lambda: self._penalty_breakdown(best),
+                    max_iterations=self.config.max_iterations,
+                    algorithm=self.get_name(),
+                    temperature=temperature,
+                )
+                control.checkpoint(lambda: self._checkpoint_state(temperature, iteration))
+            
             # Update temperature
             if iteration % self.config.iterations_per_temperature == 0:
                 temperature = self.get_temperature(
@@ -2533,8 +2591,82 @@ class SimulatedAnnealingScheduler:
                     self.best_state = self.global_best_state.copy()
                     self.best_cost = self.global_best_state.cost
         
+        if control is not None:
+            control.checkpoint(lambda: self._checkpoint_state(temperature, total_iterations), force=True)
+        
         return self.best_state
     
+    def _checkpoint_state(self, temperature: float, iteration: int) -> Dict[str, Any]:
+        """Compact checkpoint of the chain: current/global best state, memory, temperature."""
+        current = self.current_state
+        global_best = self.global_best_state
+        return build_checkpoint(
+            self.CHECKPOINT_KEY, self.config.class_count, [p.id for p in self.projects], iteration,
+            temperature=temperature,
+            current=pack_solution(current.assignments, current.cost) if current else None,
+            global_best=pack_solution(global_best.assignments, self.global_best_cost) if global_best else None,
+            memory=[pack_solution(state.assignments, cost) for state, cost in self.memory_pool],
+        )
+    
+    def _unpack_state(self, packed: List[Any]) -> SAState:
+        return SAState(
+            assignments=unpack_assignments(packed[1], ProjectAssignment),
+            class_count=self.config.class_count,
+            cost=solution_score(packed, float('inf')),
+        )
+    
+    def _restore_checkpoint(self, control) -> Optional[float]:
+        """
+        Restore the chain of a resumed run.
+        
+        Returns:
+            Checkpointed temperature, or None when there is nothing (compatible) to resume.
+        """
+        state = control.take_resume_state(self.CHECKPOINT_KEY) if control is not None else None
+        if state is None:
+            return None
+        if not state.get("current") or not is_compatible(
+                state, self.CHECKPOINT_KEY, self.config.class_count, [p.id for p in self.projects]):
+            logger.warning("SA checkpoint does not match this instance, starting from scratch")
+            return None
+        
+        self.current_state = self._unpack_state(state["current"])
+        # Penalty weights may have changed since the checkpoint; recompute the cost
+        self.current_state.cost = self.compute_cost(self.current_state)
+        if state.get("global_best"):
+            self.global_best_state = self._unpack_state(state["global_best"])
+            self.global_best_cost = self.global_best_state.cost
+        self.memory_pool = [
+            (self._unpack_state(packed), solution_score(packed, float('inf')))
+            for packed in state.get("memory", [])
+        ]
+        logger.info(f"SA resuming from checkpoint: iteration {state.get('iteration')}, "
+                    f"T = {state.get('temperature')}, {len(self.memory_pool)} memory states")
+        return float(state.get("temperature") or self.config.initial_temperature)
+    
+    def _publish_best_state(self, control, iteration: int) -> None:
+        """Publish the current best state as best-so-far (lazy conversion)."""
+        if control is None or self.best_state is None:
+            return
+        best = self.best_state
+        control.publish(
+            lambda: self._convert_to_schedule(best),
+            cost=self.best_cost,
+            algorithm=self.get_name(),
+            iteration=iteration,
+        )
+    
+    def _penalty_breakdown(self, state: SAState) -> Dict[str, float]:
+        """Penalty breakdown for progress events."""
+        if state is None or self.penalty_calculator is None:
+            return {}
+        return {
+            'h1_time_penalty': self.penalty_calculator.calculate_h1_time_penalty(state),
+            'h2_workload_penalty': self.penalty_calculator.calculate_h2_workload_penalty(state),
+            'h3_class_change_penalty': self.penalty_calculator.calculate_h3_class_change_penalty(state),
+            'h4_class_load_penalty': self.penalty_calculator.calculate_h4_class_load_penalty(state),
+        }
+    
     def run(self) -> Dict[str, Any]:
         """Run SA with restarts"""
         start_time = time.time()
@@ -2542,7 +2674,10 @@ class SimulatedAnnealingScheduler:
         best_overall_state = None
         best_overall_cost = float('inf')
         
+        control = get_current_control()
         for restart in range(self.config.num_restarts + 1):
+            if restart > 0 and control is not None and control.should_stop():
+                break
             self.restarts = restart
             
             # Reset statistics
@@ -2672,6 +2807,27 @@ class SimulatedAnnealingScheduler:
             "status": "completed"
         }
     
+    def _convert_schedule_to_state(self, schedule: List[Dict[str, Any]]) -> Optional[SAState]:
+        """Convert schedule entries (class_id / class_order indexes) to SA state."""
+        if not schedule:
+            return None
+        
+        state = SAState(class_count=self.config.class_count)
+        for entry in schedule:
+            project_id = entry.get("project_id")
+            instructors = entry.get("instructors", [])
+            if not project_id or len(instructors) < 2:
+                continue
+            state.assignments.append(ProjectAssignment(
+                project_id=project_id,
+                class_id=entry.get("class_id", 0),
+                order_in_class=entry.get("class_order", 0),
+                ps_id=instructors[0] if isinstance(instructors[0], int) else 0,
+                j1_id=instructors[1] if isinstance(instructors[1], int) else 0,
+                j2_id=-1
+            ))
+        return state
+    
     def _convert_to_schedule(self, state: SAState) -> List[Dict[str, Any]]:
         """
         Convert SA state to schedule format.
@@ -17,11 +17,11 @@ across all optimization algorithms to ensure consistent evaluation and compariso
 All metrics are normalized to 0-100 scale for consistency.
 """
 
-from typing import Dict, Any, List, Set, Tuple
-import numpy as np
-from collections import defaultdict
+from typing import Dict, Any, List, Optional, Set, Tuple
 import logging
 
+from app.algorithms.metric_engine import PlanStats, ProblemIndex, mean_std
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,6 +53,10 @@ class StandardFitnessScorer:
         self.instructors = instructors
         self.classrooms = classrooms
         self.timeslots = timeslots
+        # Shared per-instance index; every component reads one single-pass PlanStats
+        self.index = ProblemIndex(projects, instructors, classrooms, timeslots)
+        # Early slots: first half of the timeslot list
+        self.early_timeslot_ids = set(ts.get("id") for ts in (timeslots or [])[:len(timeslots or []) // 2])
         
         # Standard weights (can be customized)
         self.weights = {
@@ -87,15 +91,16 @@ class StandardFitnessScorer:
                 "percentage": 0.0
             }
         
-        # Calculate individual components
-        coverage_score = self._calculate_coverage_score(assignments)
-        consecutive_score = self._calculate_consecutive_score(assignments)
-        load_balance_score = self._calculate_load_balance_score(assignments)
-        classroom_score = self._calculate_classroom_efficiency(assignments)
-        time_score = self._calculate_time_efficiency(assignments)
-        conflict_penalty = self._calculate_conflict_penalty(assignments)
-        gap_penalty = self._calculate_gap_penalty(assignments)
-        early_slot_bonus = self._calculate_early_slot_bonus(assignments)
+        # Calculate individual components from one pass over the assignments
+        stats = self.stats(assignments)
+        coverage_score = self._calculate_coverage_score(assignments, stats)
+        consecutive_score = self._calculate_consecutive_score(assignments, stats)
+        load_balance_score = self._calculate_load_balance_score(assignments, stats)
+        classroom_score = self._calculate_classroom_efficiency(assignments, stats)
+        time_score = self._calculate_time_efficiency(assignments, stats)
+        conflict_penalty = self._calculate_conflict_penalty(assignments, stats)
+        gap_penalty = self._calculate_gap_penalty(assignments, stats)
+        early_slot_bonus = self._calculate_early_slot_bonus(assignments, stats)
         
         # Calculate weighted total
         total_score = (
@@ -132,7 +137,11 @@ class StandardFitnessScorer:
             "weights": self.weights
         }
     
-    def _calculate_coverage_score(self, assignments: List[Dict[str, Any]]) -> float:
+    def stats(self, assignments: List[Dict[str, Any]]) -> PlanStats:
+        """Single-pass statistics of the assignments, shared by all components."""
+        return self.index.stats(assignments, roles=False)
+    
+    def _calculate_coverage_score(self, assignments: List[Dict[str, Any]], stats: Optional[PlanStats] = None) -> float:
         """
         Calculate project coverage score (0-100).
         
@@ -145,13 +154,14 @@ class StandardFitnessScorer:
         if not self.projects:
             return 0.0
         
-        scheduled_projects = set(a.get("project_id") for a in assignments if a.get("project_id"))
+        stats = stats or self.stats(assignments)
+        scheduled_projects = [pid for pid in stats.project_counts if pid]
         total_projects = len(self.projects)
         
         coverage = len(scheduled_projects) / total_projects
         return coverage * 100.0
     
-    def _calculate_consecutive_score(self, assignments: List[Dict[str, Any]]) -> float:
+    def _calculate_consecutive_score(self, assignments: List[Dict[str, Any]], stats: Optional[PlanStats] = None) -> float:
         """
         Calculate consecutive grouping score (0-100).
         
@@ -164,20 +174,14 @@ class StandardFitnessScorer:
         if not assignments:
             return 0.0
         
-        # Build instructor timeslot mapping
-        instructor_slots = defaultdict(list)
-        for assignment in assignments:
-            for instructor_id in assignment.get("instructors", []):
-                timeslot_id = assignment.get("timeslot_id")
-                if timeslot_id:
-                    instructor_slots[instructor_id].append(timeslot_id)
+        stats = stats or self.stats(assignments)
         
         # Count consecutive sequences
         total_consecutive = 0
         total_possible = 0
         
-        for instructor_id, slots in instructor_slots.items():
-            sorted_slots = sorted(slots)
+        for instructor_id, places in stats.instructor_slots.items():
+            sorted_slots = sorted(timeslot_id for timeslot_id, _ in places if timeslot_id)
             if len(sorted_slots) <= 1:
                 continue
             
@@ -193,7 +197,7 @@ class StandardFitnessScorer:
         consecutive_ratio = total_consecutive / total_possible
         return consecutive_ratio * 100.0
     
-    def _calculate_load_balance_score(self, assignments: List[Dict[str, Any]]) -> float:
+    def _calculate_load_balance_score(self, assignments: List[Dict[str, Any]], stats: Optional[PlanStats] = None) -> float:
         """
         Calculate load balance score (0-100).
         
@@ -206,32 +210,27 @@ class StandardFitnessScorer:
         if not assignments or not self.instructors:
             return 0.0
         
-        # Count assignments per instructor
-        instructor_counts = defaultdict(int)
-        for assignment in assignments:
-            for instructor_id in assignment.get("instructors", []):
-                instructor_counts[instructor_id] += 1
+        # Assignments per instructor
+        instructor_counts = (stats or self.stats(assignments)).instructor_loads
         
         if not instructor_counts:
             return 0.0
         
         # Calculate variance
-        counts = list(instructor_counts.values())
-        mean_count = np.mean(counts)
-        variance = np.var(counts)
+        mean_count, std_count = mean_std(list(instructor_counts.values()))
         
         # Normalize: Low variance = high score
         if mean_count == 0:
             return 0.0
         
         # Use coefficient of variation (CV)
-        cv = np.sqrt(variance) / mean_count if mean_count > 0 else 0
+        cv = std_count / mean_count if mean_count > 0 else 0
         
         # Convert to score: CV = 0 → 100, CV = 1 → 0
         balance_score = max(0, (1 - cv) * 100.0)
         return balance_score
     
-    def _calculate_classroom_efficiency(self, assignments: List[Dict[str, Any]]) -> float:
+    def _calculate_classroom_efficiency(self, assignments: List[Dict[str, Any]], stats: Optional[PlanStats] = None) -> float:
         """
         Calculate classroom efficiency score (0-100).
         
@@ -244,31 +243,26 @@ class StandardFitnessScorer:
         if not assignments or not self.classrooms:
             return 0.0
         
-        # Build classroom usage mapping
-        classroom_usage = defaultdict(int)
-        for assignment in assignments:
-            classroom_id = assignment.get("classroom_id")
-            if classroom_id:
-                classroom_usage[classroom_id] += 1
+        # Classroom usage
+        classroom_usage = (stats or self.stats(assignments)).classroom_usage
+        usages = [count for classroom_id, count in classroom_usage.items() if classroom_id]
         
         # Calculate usage variance
-        if not classroom_usage:
+        if not usages:
             return 0.0
         
-        usages = list(classroom_usage.values())
-        mean_usage = np.mean(usages)
-        variance = np.var(usages)
+        mean_usage, std_usage = mean_std(usages)
         
         # Normalize
         if mean_usage == 0:
             return 0.0
         
-        cv = np.sqrt(variance) / mean_usage if mean_usage > 0 else 0
+        cv = std_usage / mean_usage if mean_usage > 0 else 0
         efficiency_score = max(0, (1 - cv) * 100.0)
         
         return efficiency_score
     
-    def _calculate_time_efficiency(self, assignments: List[Dict[str, Any]]) -> float:
+    def _calculate_time_efficiency(self, assignments: List[Dict[str, Any]], stats: Optional[PlanStats] = None) -> float:
         """
         Calculate time efficiency score (0-100).
         
@@ -281,14 +275,14 @@ class StandardFitnessScorer:
         if not assignments or not self.timeslots:
             return 0.0
         
-        used_timeslots = set(a.get("timeslot_id") for a in assignments if a.get("timeslot_id"))
+        used_timeslots = [ts for ts in (stats or self.stats(assignments)).slot_usage if ts]
         total_timeslots = len(self.timeslots)
         
         # More timeslots used = better efficiency (spreading the load)
         usage_ratio = len(used_timeslots) / total_timeslots if total_timeslots > 0 else 0
         return usage_ratio * 100.0
     
-    def _calculate_conflict_penalty(self, assignments: List[Dict[str, Any]]) -> float:
+    def _calculate_conflict_penalty(self, assignments: List[Dict[str, Any]], stats: Optional[PlanStats] = None) -> float:
         """
         Calculate conflict penalty (0-100, higher is worse).
         
@@ -301,33 +295,26 @@ class StandardFitnessScorer:
         if not assignments:
             return 0.0
         
+        stats = stats or self.stats(assignments)
         conflicts = 0
         
-        # Check for instructor conflicts (same instructor, same timeslot)
-        instructor_timeslots = defaultdict(set)
-        for assignment in assignments:
-            timeslot_id = assignment.get("timeslot_id")
-            for instructor_id in assignment.get("instructors", []):
-                if timeslot_id in instructor_timeslots[instructor_id]:
-                    conflicts += 1
-                instructor_timeslots[instructor_id].add(timeslot_id)
-        
-        # Check for classroom conflicts (same classroom, same timeslot)
-        classroom_timeslots = defaultdict(set)
-        for assignment in assignments:
-            classroom_id = assignment.get("classroom_id")
-            timeslot_id = assignment.get("timeslot_id")
-            if classroom_id and timeslot_id:
-                if timeslot_id in classroom_timeslots[classroom_id]:
-                    conflicts += 1
-                classroom_timeslots[classroom_id].add(timeslot_id)
+        # Instructor conflicts (same instructor, same timeslot)
+        for places in stats.instructor_slots.values():
+            timeslots = [timeslot_id for timeslot_id, _ in places]
+            conflicts += len(timeslots) - len(set(timeslots))
+        
+        # Classroom conflicts (same classroom, same timeslot)
+        for classroom_id, timeslots in stats.class_slots.items():
+            if classroom_id:
+                timeslots = [timeslot_id for timeslot_id in timeslots if timeslot_id]
+                conflicts += len(timeslots) - len(set(timeslots))
         
         # Normalize
-        max_possible_conflicts = len(assignments)
+        max_possible_conflicts = stats.count
         conflict_ratio = conflicts / max_possible_conflicts if max_possible_conflicts > 0 else 0
         return conflict_ratio * 100.0
     
-    def _calculate_gap_penalty(self, assignments: List[Dict[str, Any]]) -> float:
+    def _calculate_gap_penalty(self, assignments: List[Dict[str, Any]], stats: Optional[PlanStats] = None) -> float:
         """
         Calculate gap penalty (0-100, higher is worse).
         
@@ -340,20 +327,16 @@ class StandardFitnessScorer:
         if not assignments:
             return 0.0
         
-        # Build classroom timeslot mapping
-        classroom_slots = defaultdict(list)
-        for assignment in assignments:
-            classroom_id = assignment.get("classroom_id")
-            timeslot_id = assignment.get("timeslot_id")
-            if classroom_id and timeslot_id:
-                classroom_slots[classroom_id].append(timeslot_id)
+        stats = stats or self.stats(assignments)
         
         # Count gaps
         total_gaps = 0
         total_sequences = 0
         
-        for classroom_id, slots in classroom_slots.items():
-            sorted_slots = sorted(slots)
+        for classroom_id, slots in stats.class_slots.items():
+            if not classroom_id:
+                continue
+            sorted_slots = sorted(timeslot_id for timeslot_id in slots if timeslot_id)
             if len(sorted_slots) <= 1:
                 continue
             
@@ -372,7 +355,7 @@ class StandardFitnessScorer:
         gap_score = min(100.0, avg_gap * 20.0)  # Each gap worth 20 points penalty
         return gap_score
     
-    def _calculate_early_slot_bonus(self, assignments: List[Dict[str, Any]]) -> float:
+    def _calculate_early_slot_bonus(self, assignments: List[Dict[str, Any]], stats: Optional[PlanStats] = None) -> float:
         """
         Calculate early slot bonus (0-100).
         
@@ -385,16 +368,15 @@ class StandardFitnessScorer:
         if not assignments or not self.timeslots:
             return 0.0
         
-        # Count assignments in early slots (first half of timeslots)
-        mid_point = len(self.timeslots) // 2
-        early_timeslot_ids = set(ts.get("id") for ts in self.timeslots[:mid_point])
+        stats = stats or self.stats(assignments)
         
+        # Count assignments in early slots (first half of timeslots)
         early_assignments = sum(
-            1 for a in assignments 
-            if a.get("timeslot_id") in early_timeslot_ids
+            count for timeslot_id, count in stats.slot_usage.items()
+            if timeslot_id in self.early_timeslot_ids
         )
         
-        total_assignments = len(assignments)
+        total_assignments = stats.count
         early_ratio = early_assignments / total_assignments if total_assignments > 0 else 0
         return early_ratio * 100.0
     
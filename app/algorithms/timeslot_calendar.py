@@ -0,0 +1,262 @@
+"""
+Precomputed timeslot calendar.
+
+Zaman dilimi string'leri (``"09:00"``, ``"16:30:00"``, ``time`` nesneleri)
+her problem icin bir kez parse edilir. Servisler, validator ve metrik
+hesaplayicilari ayni ``TimeslotCalendar`` nesnesini kullanir; boylece
+binlerce kez calisan dongulerde string parse ve gec slot tespiti tekrarlanmaz.
+
+Her slot icin tutulanlar:
+- ordinal: kronolojik sira (0 = en erken)
+- start/end dakikasi (gun basindan itibaren)
+- session: "morning" / "afternoon" (veya kaynaktaki session_type)
+- is_late: 16:30 ve sonrasi cezali slot
+- reward: erken saatler yuksek puanli slot odulu
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# 16:30 ve sonrasi cezali (gec) slot
+LATE_SLOT_START_MINUTES = 16 * 60 + 30
+LATE_SLOT_REWARD = -9999.0
+# Tabloda olmayan slotlar odulsuz (FitnessMetrics'in eski davranisi)
+DEFAULT_SLOT_REWARD = 0.0
+UNPARSED_MINUTES = 24 * 60
+
+# Baslangic saatine gore slot odulleri (dakika -> odul)
+SLOT_REWARDS: Dict[int, float] = {
+    9 * 60: 1000.0,
+    9 * 60 + 30: 950.0,
+    10 * 60: 900.0,
+    10 * 60 + 30: 850.0,
+    11 * 60: 800.0,
+    11 * 60 + 30: 750.0,
+    13 * 60: 700.0,
+    13 * 60 + 30: 650.0,
+    14 * 60: 600.0,
+    14 * 60 + 30: 550.0,
+    15 * 60: 500.0,
+    15 * 60 + 30: 450.0,
+    16 * 60: 400.0,
+    16 * 60 + 30: LATE_SLOT_REWARD,
+    17 * 60: LATE_SLOT_REWARD,
+    17 * 60 + 30: LATE_SLOT_REWARD,
+}
+
+
+def parse_minutes(value: Any) -> Optional[int]:
+    """
+    Saat degerini gun basindan itibaren dakikaya cevirir.
+
+    ``"09:00"``, ``"09:00:00"``, ``time``/``datetime`` nesneleri desteklenir;
+    parse edilemezse None doner.
+    """
+    if value is None:
+        return None
+    if hasattr(value, "hour") and hasattr(value, "minute"):
+        return int(value.hour) * 60 + int(value.minute)
+    parts = str(value).strip().split(":")
+    if len(parts) < 2 or not parts[0].isdigit() or not parts[1][:2].isdigit():
+        return None
+    hour, minute = int(parts[0]), int(parts[1][:2])
+    if hour > 23 or minute > 59:
+        return None
+    return hour * 60 + minute
+
+
+def format_minutes(minutes: Optional[int]) -> str:
+    """Dakikayi HH:MM formatina cevirir."""
+    if minutes is None:
+        return ""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _field(slot: Any, name: str, default: Any = None) -> Any:
+    if isinstance(slot, dict):
+        return slot.get(name, default)
+    return getattr(slot, name, default)
+
+
+@dataclass(frozen=True)
+class SlotInfo:
+    """Tek bir zaman diliminin onceden hesaplanmis bilgileri."""
+    id: Any
+    ordinal: int
+    start_minutes: Optional[int]
+    end_minutes: Optional[int]
+    session: str
+    is_late: bool
+    reward: float
+    label: str
+    source: Any = None
+
+
+class TimeslotCalendar:
+    """
+    Bir problemin zaman dilimleri icin kronolojik takvim.
+
+    Slotlar baslangic saatine gore (esitlikte giris sirasina gore) siralanir;
+    baslangic saati parse edilemeyen slotlar sona konur.
+    """
+
+    def __init__(self, timeslots: Optional[Iterable[Any]] = None):
+        entries: List[Tuple[int, int, Any, Any, Optional[int], Optional[int]]] = []
+        for position, slot in enumerate(timeslots or []):
+            if slot is None:
+                continue
+            slot_id = _field(slot, "id")
+            if slot_id is None:
+                slot_id = position
+            start, end = self._parse_bounds(slot)
+            sort_key = start if start is not None else UNPARSED_MINUTES
+            entries.append((sort_key, position, slot_id, slot, start, end))
+        entries.sort(key=lambda entry: (entry[0], entry[1]))
+
+        self.slots: List[SlotInfo] = []
+        self.id_to_index: Dict[Any, int] = {}
+        for ordinal, (_, _, slot_id, slot, start, end) in enumerate(entries):
+            late = self._is_late(slot, start)
+            info = SlotInfo(
+                id=slot_id,
+                ordinal=ordinal,
+                start_minutes=start,
+                end_minutes=end,
+                session=self._session(slot, start),
+                is_late=late,
+                reward=SLOT_REWARDS.get(start, DEFAULT_SLOT_REWARD),
+                label=f"{format_minutes(start)}-{format_minutes(end)}" if start is not None else "unknown",
+                source=slot,
+            )
+            self.slots.append(info)
+            self.id_to_index.setdefault(slot_id, ordinal)
+
+        self.ordered_ids: List[Any] = [info.id for info in self.slots]
+        self.late_ids: FrozenSet[Any] = frozenset(info.id for info in self.slots if info.is_late)
+        # Gec olmayan en son slotun sirasi (-1 = hic uygun slot yok)
+        self.last_ok_index: int = -1
+        for info in self.slots:
+            if info.is_late:
+                break
+            self.last_ok_index = info.ordinal
+
+    @staticmethod
+    def _parse_bounds(slot: Any) -> Tuple[Optional[int], Optional[int]]:
+        start = parse_minutes(_field(slot, "start_time"))
+        end = parse_minutes(_field(slot, "end_time"))
+        if start is None:
+            time_range = str(_field(slot, "time_range") or _field(slot, "label") or "")
+            if "-" in time_range:
+                head, _, tail = time_range.partition("-")
+                start = parse_minutes(head)
+                end = end if end is not None else parse_minutes(tail)
+        return start, end
+
+    @staticmethod
+    def _is_late(slot: Any, start: Optional[int]) -> bool:
+        explicit = _field(slot, "is_late_slot")
+        if isinstance(explicit, bool):
+            return explicit
+        return start is not None and start >= LATE_SLOT_START_MINUTES
+
+    @staticmethod
+    def _session(slot: Any, start: Optional[int]) -> str:
+        session = _field(slot, "session_type")
+        if session is not None:
+            return str(getattr(session, "value", session))
+        if start is None:
+            return "unknown"
+        return "morning" if start < 12 * 60 else "afternoon"
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def __contains__(self, slot_id: Any) -> bool:
+        return slot_id in self.id_to_index
+
+    def index_of(self, slot_id: Any) -> Optional[int]:
+        """Slot ID'sinin kronolojik sirasi (bilinmiyorsa None)."""
+        return self.id_to_index.get(slot_id)
+
+    def get(self, slot_id: Any) -> Optional[SlotInfo]:
+        index = self.id_to_index.get(slot_id)
+        return self.slots[index] if index is not None else None
+
+    def is_late(self, slot_id: Any) -> bool:
+        return slot_id in self.late_ids
+
+    def reward(self, slot_id: Any) -> float:
+        info = self.get(slot_id)
+        return info.reward if info is not None else 0.0
+
+    def label(self, slot_id: Any) -> str:
+        info = self.get(slot_id)
+        return info.label if info is not None else "unknown"
+
+
+# Takvimin okudugu slot alanlari; icerik anahtari bunlarin degerlerinden olusur
+_SLOT_FIELDS = ("id", "start_time", "end_time", "time_range", "label", "is_late_slot", "session_type")
+_calendar_cache: "OrderedDict[Tuple[Any, ...], TimeslotCalendar]" = OrderedDict()
+# id(liste) -> (uzunluk, ilk/son eleman id'leri, takvim); listenin kendisi tutulmaz
+_identity_cache: "OrderedDict[int, Tuple[int, int, int, TimeslotCalendar]]" = OrderedDict()
+_CALENDAR_CACHE_SIZE = 8
+
+
+def _fingerprint(timeslots: Iterable[Any]) -> Tuple[Tuple[Any, ...], ...]:
+    """Slotlarin takvimi etkileyen alan degerleri."""
+    return tuple(
+        None if slot is None else tuple(_field(slot, name) for name in _SLOT_FIELDS)
+        for slot in timeslots
+    )
+
+
+def _identity(timeslots: List[Any]) -> Tuple[int, int, int]:
+    if not timeslots:
+        return 0, 0, 0
+    return len(timeslots), id(timeslots[0]), id(timeslots[-1])
+
+
+def _remember(cache: "OrderedDict[Any, Any]", key: Any, value: Any) -> None:
+    cache[key] = value
+    cache.move_to_end(key, last=False)
+    while len(cache) > _CALENDAR_CACHE_SIZE:
+        cache.popitem()
+
+
+def get_calendar(timeslots: Optional[List[Any]]) -> TimeslotCalendar:
+    """
+    Zaman dilimi listesi icin takvimi dondurur.
+
+    Once ayni liste nesnesi (id, uzunluk, ilk/son eleman) O(1) ile aranir;
+    bulunamazsa slot icerigine (ID, saatler, oturum bilgisi) gore aranir,
+    boylece ayni icerikli listeler ayni takvimi paylasir. Onbellekteki
+    takvimler alan kopyalarindan olusturulur, istek verisine referans
+    tutulmaz. Listeyi yerinde degistiren (eleman sayisini ve uclarini koruyarak)
+    cagiranlar takvimi ``TimeslotCalendar`` olarak acikca gecirmelidir.
+    """
+    if isinstance(timeslots, TimeslotCalendar):
+        return timeslots
+    if not isinstance(timeslots, list):
+        timeslots = list(timeslots or [])
+    identity = _identity(timeslots)
+    cached = _identity_cache.get(id(timeslots))
+    if cached is not None and cached[:3] == identity:
+        _identity_cache.move_to_end(id(timeslots), last=False)
+        return cached[3]
+
+    key = _fingerprint(timeslots)
+    try:
+        calendar = _calendar_cache.get(key)
+    except TypeError:
+        # Hashlenemeyen alan degeri: onbelleksiz olustur
+        return TimeslotCalendar(timeslots)
+    if calendar is None:
+        calendar = TimeslotCalendar(
+            None if values is None else dict(zip(_SLOT_FIELDS, values)) for values in key
+        )
+    _remember(_calendar_cache, key, calendar)
+    _remember(_identity_cache, id(timeslots), (*identity, calendar))
+    return calendar
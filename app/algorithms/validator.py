@@ -20,28 +20,26 @@ YENİ ÖZELLİKLER:
 - Late slot otomatik düzeltme
 - Load balance otomatik dengeleme
 """
-from typing import List, Dict, Any, Tuple, Set, Callable
+from typing import List, Dict, Any, Tuple, Set, Callable, Optional
 from collections import defaultdict, Counter
+from concurrent.futures import Future, ThreadPoolExecutor
 import json
+import logging
 import os
 import csv
 import statistics
+import threading
 from datetime import datetime
 
-try:
-    from openpyxl import Workbook
-except Exception:
-    Workbook = None
+from app.algorithms.timeslot_calendar import TimeslotCalendar, get_calendar
+from app.algorithms.resource_profile import PHASE_VALIDATION, profiled
 
 
-def detect_duplicates(assignments: List[Dict[str, Any]]) -> Dict[str, Any]:
-    by_project = defaultdict(list)
-    for a in assignments:
-        pid = a.get("project_id")
-        if pid is None:
-            continue
-        by_project[pid].append(a)
-
+# ----------------------------------------------------------------------
+# Rapor olusturucular: gruplamadan rapora. Tekil detect_* fonksiyonlari ve
+# tek gecisli ScheduleIndex ayni olusturuculari kullanir.
+# ----------------------------------------------------------------------
+def _duplicate_report(by_project: Dict[Any, List[Dict[str, Any]]]) -> Dict[str, Any]:
     duplicates = []
     for pid, items in by_project.items():
         if len(items) > 1:
@@ -52,33 +50,18 @@ def detect_duplicates(assignments: List[Dict[str, Any]]) -> Dict[str, Any]:
                                                     "duplicated_projects": len(duplicates)}}
 
 
-def detect_coverage(assignments: List[Dict[str, Any]], expected_project_ids: List[Any]) -> Dict[str, Any]:
-    scheduled = {a.get("project_id") for a in assignments if a.get("project_id") is not None}
+def _coverage_report(scheduled: Set[Any], expected_project_ids: List[Any]) -> Dict[str, Any]:
     expected = set(expected_project_ids)
     missing = list(expected - scheduled)
     extra = list(scheduled - expected)
     return {"expected_count": len(expected), "scheduled_count": len(scheduled), "missing": missing, "extra": extra}
 
 
-def detect_gaps(assignments: List[Dict[str, Any]], timeslots: List[Dict[str, Any]]) -> Dict[str, Any]:
-    # Build timeslot index
-    id_to_idx = {}
-    for idx, ts in enumerate(timeslots):
-        tid = ts.get("id")
-        id_to_idx[tid] = idx
-
-    classrooms = defaultdict(list)
-    for a in assignments:
-        cid = a.get("classroom_id")
-        tid = a.get("timeslot_id")
-        if cid is None or tid not in id_to_idx:
-            continue
-        classrooms[cid].append(id_to_idx[tid])
-
+def _gap_report(classroom_slots: Dict[Any, Set[int]]) -> Dict[str, Any]:
     details = []
     total_gaps = 0
-    for cid, idxs in classrooms.items():
-        idxs = sorted(set(idxs))
+    for cid, idxs in classroom_slots.items():
+        idxs = sorted(idxs)
         for prev, curr in zip(idxs, idxs[1:]):
             if curr - prev > 1:
                 missing = list(range(prev + 1, curr))
@@ -88,101 +71,98 @@ def detect_gaps(assignments: List[Dict[str, Any]], timeslots: List[Dict[str, Any
     return {"total_gaps": total_gaps, "details": details}
 
 
-def detect_late_slots(assignments: List[Dict[str, Any]], timeslots: List[Dict[str, Any]], late_pred) -> List[Dict[str, Any]]:
-    late = []
+def _late_slot_checker(timeslots: List[Dict[str, Any]], late_pred: Optional[Callable],
+                       calendar: Optional[TimeslotCalendar]) -> Callable[[Any], bool]:
+    if late_pred is None:
+        # Takvimdeki onceden hesaplanmis gec slot kumesi
+        return (calendar or get_calendar(timeslots)).late_ids.__contains__
     id_to_ts = {ts.get("id"): ts for ts in timeslots}
-    for a in assignments:
-        ts = id_to_ts.get(a.get("timeslot_id"))
-        if ts and late_pred(ts):
-            late.append({"project_id": a.get("project_id"), "classroom_id": a.get("classroom_id"), "timeslot_id": a.get("timeslot_id")})
-    return late
 
+    def is_late(tid: Any) -> bool:
+        ts = id_to_ts.get(tid)
+        return bool(ts) and late_pred(ts)
+    return is_late
 
-def detect_role_violations(assignments: List[Dict[str, Any]], people_types: Dict[Any, str]) -> Dict[str, Any]:
-    """Rol kısıtlarını kontrol et (sorumlu/jüri kuralları)"""
-    violations = []
-
-    for a in assignments:
-        project_id = a.get("project_id")
-        roles = a.get("roles", [])
-        instructors = a.get("instructors", [])
 
-        # Rol bilgilerini topla
-        responsibles = [r for r in roles if str(r.get("role", "")).upper() in ("SORUMLU", "RESPONSIBLE")]
-        juries = [r for r in roles if str(r.get("role", "")).upper() in ("JURI", "JURY")]
-
-        # Aynı kişi hem sorumlu hem jüri olamaz
-        resp_ids = {r.get("person_id") for r in responsibles}
-        jury_ids = {r.get("person_id") for r in juries}
-
-        same_person_both_roles = resp_ids & jury_ids
-        if same_person_both_roles:
+def _role_violations_of(a: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Tek atamanin rol ihlalleri (sorumlu/jüri kuralları)"""
+    violations = []
+    project_id = a.get("project_id")
+    roles = a.get("roles", [])
+
+    # Rol bilgilerini topla
+    responsibles = [r for r in roles if str(r.get("role", "")).upper() in ("SORUMLU", "RESPONSIBLE")]
+    juries = [r for r in roles if str(r.get("role", "")).upper() in ("JURI", "JURY")]
+
+    # Aynı kişi hem sorumlu hem jüri olamaz
+    resp_ids = {r.get("person_id") for r in responsibles}
+    jury_ids = {r.get("person_id") for r in juries}
+
+    same_person_both_roles = resp_ids & jury_ids
+    if same_person_both_roles:
+        violations.append({
+            "project_id": project_id,
+            "type": "same_person_both_roles",
+            "person_ids": list(same_person_both_roles),
+            "message": f"Proje {project_id}: Aynı kişi hem sorumlu hem jüri olamaz"
+        })
+
+    # Proje türüne göre gerekli rol sayısı kontrolü
+    project_type = str(a.get("project_type") or a.get("type") or "").lower()
+
+    if project_type == "bitirme":
+        if len(responsibles) != 1:
             violations.append({
                 "project_id": project_id,
-                "type": "same_person_both_roles",
-                "person_ids": list(same_person_both_roles),
-                "message": f"Proje {project_id}: Aynı kişi hem sorumlu hem jüri olamaz"
+                "type": "bitirme_responsible_count",
+                "expected": 1,
+                "actual": len(responsibles),
+                "message": f"Bitirme projesi {project_id}: 1 sorumlu olmalı, {len(responsibles)} var"
             })
+        if len(juries) < 1:
+            violations.append({
+                "project_id": project_id,
+                "type": "bitirme_jury_count",
+                "expected": "1+",
+                "actual": len(juries),
+                "message": f"Bitirme projesi {project_id}: En az 1 jüri olmalı, {len(juries)} var"
+            })
+    elif project_type == "ara":
+        if len(responsibles) != 1:
+            violations.append({
+                "project_id": project_id,
+                "type": "ara_responsible_count",
+                "expected": 1,
+                "actual": len(responsibles),
+                "message": f"Ara projesi {project_id}: 1 sorumlu olmalı, {len(responsibles)} var"
+            })
+        if len(juries) != 0:
+            violations.append({
+                "project_id": project_id,
+                "type": "ara_jury_count",
+                "expected": 0,
+                "actual": len(juries),
+                "message": f"Ara projesi {project_id}: Jüri olmamalı, {len(juries)} var"
+            })
+    return violations
 
-        # Proje türüne göre gerekli rol sayısı kontrolü
-        project_type = str(a.get("project_type") or a.get("type") or "").lower()
-
-        if project_type == "bitirme":
-            if len(responsibles) != 1:
-                violations.append({
-                    "project_id": project_id,
-                    "type": "bitirme_responsible_count",
-                    "expected": 1,
-                    "actual": len(responsibles),
-                    "message": f"Bitirme projesi {project_id}: 1 sorumlu olmalı, {len(responsibles)} var"
-                })
-            if len(juries) < 1:
-                violations.append({
-                    "project_id": project_id,
-                    "type": "bitirme_jury_count",
-                    "expected": "1+",
-                    "actual": len(juries),
-                    "message": f"Bitirme projesi {project_id}: En az 1 jüri olmalı, {len(juries)} var"
-                })
-        elif project_type == "ara":
-            if len(responsibles) != 1:
-                violations.append({
-                    "project_id": project_id,
-                    "type": "ara_responsible_count",
-                    "expected": 1,
-                    "actual": len(responsibles),
-                    "message": f"Ara projesi {project_id}: 1 sorumlu olmalı, {len(responsibles)} var"
-                })
-            if len(juries) != 0:
-                violations.append({
-                    "project_id": project_id,
-                    "type": "ara_jury_count",
-                    "expected": 0,
-                    "actual": len(juries),
-                    "message": f"Ara projesi {project_id}: Jüri olmamalı, {len(juries)} var"
-                })
 
+def _role_report(violations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    by_type = Counter(v["type"] for v in violations)
     return {
         "total_violations": len(violations),
         "violations": violations,
         "summary": {
-            "same_person_both_roles": len([v for v in violations if v["type"] == "same_person_both_roles"]),
-            "bitirme_responsible_issues": len([v for v in violations if v["type"] == "bitirme_responsible_count"]),
-            "bitirme_jury_issues": len([v for v in violations if v["type"] == "bitirme_jury_count"]),
-            "ara_responsible_issues": len([v for v in violations if v["type"] == "ara_responsible_count"]),
-            "ara_jury_issues": len([v for v in violations if v["type"] == "ara_jury_count"])
+            "same_person_both_roles": by_type["same_person_both_roles"],
+            "bitirme_responsible_issues": by_type["bitirme_responsible_count"],
+            "bitirme_jury_issues": by_type["bitirme_jury_count"],
+            "ara_responsible_issues": by_type["ara_responsible_count"],
+            "ara_jury_issues": by_type["ara_jury_count"]
         }
     }
 
 
-def detect_load_balance_violations(assignments: List[Dict[str, Any]], instructors: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Öğretim üyeleri yük dağılımını kontrol et (±1 tolerans)"""
-    instructor_loads = Counter()
-
-    for a in assignments:
-        for instructor_id in a.get("instructors", []):
-            instructor_loads[instructor_id] += 1
-
+def _load_balance_report(instructor_loads: Counter, instructors: List[Dict[str, Any]]) -> Dict[str, Any]:
     if not instructor_loads:
         return {"total_instructors": len(instructors), "assigned_instructors": 0, "unassigned_instructors": len(instructors)}
 
@@ -206,6 +186,7 @@ def detect_load_balance_violations(assignments: List[Dict[str, Any]], instructor
     assigned_instructor_ids = set(instructor_loads.keys())
     all_instructor_ids = {inst.get("id") for inst in instructors if inst.get("id") is not None}
     unassigned = list(all_instructor_ids - assigned_instructor_ids)
+    max_deviation = max((abs(load - mean_load) for load in loads), default=0)
 
     return {
         "total_instructors": len(instructors),
@@ -216,23 +197,12 @@ def detect_load_balance_violations(assignments: List[Dict[str, Any]], instructor
         "mean_load": mean_load,
         "std_load": std_load,
         "balance_violations": violations,
-        "max_deviation": max((abs(load - mean_load) for load in loads), default=0),
-        "is_balanced": max((abs(load - mean_load) for load in loads), default=0) <= 1.0
+        "max_deviation": max_deviation,
+        "is_balanced": max_deviation <= 1.0
     }
 
 
-def detect_classroom_switches(assignments: List[Dict[str, Any]], instructors: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Öğretim üyelerinin sınıf değiştirme sayısını hesapla"""
-    instructor_classrooms = defaultdict(set)
-
-    for a in assignments:
-        instructor_ids = a.get("instructors", [])
-        classroom_id = a.get("classroom_id")
-
-        for instructor_id in instructor_ids:
-            if instructor_id and classroom_id:
-                instructor_classrooms[instructor_id].add(classroom_id)
-
+def _classroom_switch_report(instructor_classrooms: Dict[Any, Set[Any]]) -> Dict[str, Any]:
     switches = {}
     total_switches = 0
 
@@ -253,15 +223,7 @@ def detect_classroom_switches(assignments: List[Dict[str, Any]], instructors: Li
     }
 
 
-def detect_session_count(assignments: List[Dict[str, Any]], timeslots: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Oturum sayısını hesapla (kullanılan timeslot sayısı)"""
-    used_timeslots = set()
-
-    for a in assignments:
-        timeslot_id = a.get("timeslot_id")
-        if timeslot_id:
-            used_timeslots.add(timeslot_id)
-
+def _session_report(used_timeslots: Set[Any], timeslots: List[Dict[str, Any]]) -> Dict[str, Any]:
     total_slots = len(timeslots)
     used_slots = len(used_timeslots)
 
@@ -274,6 +236,166 @@ def detect_session_count(assignments: List[Dict[str, Any]], timeslots: List[Dict
     }
 
 
+# ----------------------------------------------------------------------
+# Tekil kontroller (tek bir rapor isteyen cagiranlar icin)
+# ----------------------------------------------------------------------
+def detect_duplicates(assignments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    by_project = defaultdict(list)
+    for a in assignments:
+        pid = a.get("project_id")
+        if pid is None:
+            continue
+        by_project[pid].append(a)
+    return _duplicate_report(by_project)
+
+
+def detect_coverage(assignments: List[Dict[str, Any]], expected_project_ids: List[Any]) -> Dict[str, Any]:
+    scheduled = {a.get("project_id") for a in assignments if a.get("project_id") is not None}
+    return _coverage_report(scheduled, expected_project_ids)
+
+
+def detect_gaps(assignments: List[Dict[str, Any]], timeslots: List[Dict[str, Any]],
+                calendar: Optional[TimeslotCalendar] = None) -> Dict[str, Any]:
+    # Kronolojik timeslot indeksi (takvimden)
+    id_to_idx = (calendar or get_calendar(timeslots)).id_to_index
+
+    classrooms = defaultdict(set)
+    for a in assignments:
+        cid = a.get("classroom_id")
+        tid = a.get("timeslot_id")
+        if cid is None or tid not in id_to_idx:
+            continue
+        classrooms[cid].add(id_to_idx[tid])
+    return _gap_report(classrooms)
+
+
+def detect_late_slots(assignments: List[Dict[str, Any]], timeslots: List[Dict[str, Any]],
+                      late_pred: Optional[Callable] = None,
+                      calendar: Optional[TimeslotCalendar] = None) -> List[Dict[str, Any]]:
+    is_late = _late_slot_checker(timeslots, late_pred, calendar)
+    return [{"project_id": a.get("project_id"), "classroom_id": a.get("classroom_id"), "timeslot_id": a.get("timeslot_id")}
+            for a in assignments if is_late(a.get("timeslot_id"))]
+
+
+def detect_role_violations(assignments: List[Dict[str, Any]], people_types: Dict[Any, str]) -> Dict[str, Any]:
+    """Rol kısıtlarını kontrol et (sorumlu/jüri kuralları)"""
+    violations = []
+    for a in assignments:
+        violations.extend(_role_violations_of(a))
+    return _role_report(violations)
+
+
+def detect_load_balance_violations(assignments: List[Dict[str, Any]], instructors: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Öğretim üyeleri yük dağılımını kontrol et (±1 tolerans)"""
+    instructor_loads = Counter()
+    for a in assignments:
+        for instructor_id in a.get("instructors", []):
+            instructor_loads[instructor_id] += 1
+    return _load_balance_report(instructor_loads, instructors)
+
+
+def detect_classroom_switches(assignments: List[Dict[str, Any]], instructors: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Öğretim üyelerinin sınıf değiştirme sayısını hesapla"""
+    instructor_classrooms = defaultdict(set)
+    for a in assignments:
+        classroom_id = a.get("classroom_id")
+        for instructor_id in a.get("instructors", []):
+            if instructor_id and classroom_id:
+                instructor_classrooms[instructor_id].add(classroom_id)
+    return _classroom_switch_report(instructor_classrooms)
+
+
+def detect_session_count(assignments: List[Dict[str, Any]], timeslots: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Oturum sayısını hesapla (kullanılan timeslot sayısı)"""
+    used_timeslots = {a.get("timeslot_id") for a in assignments if a.get("timeslot_id")}
+    return _session_report(used_timeslots, timeslots)
+
+
+# ----------------------------------------------------------------------
+# Tek gecisli indeks
+# ----------------------------------------------------------------------
+class ScheduleIndex:
+    """
+    Atama listesinin tek gecisle kurulan indeksleri: proje, sinif ve slot
+    bazinda gruplamalar, ogretim uyesi yukleri/siniflari, gec slotlar ve rol
+    ihlalleri. ``validate_solution`` tum raporlari bu indeksten uretir;
+    boylece her kontrol atamalari yeniden dolasmaz.
+
+    Args:
+        assignments: Atamalar.
+        timeslots: Timeslot listesi (gap indeksi ve gec slotlar icin).
+        late_pred: Ozel gec slot kosulu (None = takvimdeki gec slotlar).
+        calendar: Hazir takvim (None = ``get_calendar(timeslots)``).
+    """
+
+    def __init__(self, assignments: List[Dict[str, Any]], timeslots: List[Dict[str, Any]],
+                 late_pred: Optional[Callable] = None, calendar: Optional[TimeslotCalendar] = None):
+        calendar = calendar or get_calendar(timeslots)
+        id_to_idx = calendar.id_to_index
+        is_late = _late_slot_checker(timeslots, late_pred, calendar)
+
+        self.by_project: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+        self.classroom_slots: Dict[Any, Set[int]] = defaultdict(set)
+        self.used_timeslots: Set[Any] = set()
+        self.instructor_loads: Counter = Counter()
+        self.instructor_classrooms: Dict[Any, Set[Any]] = defaultdict(set)
+        self.late_slots: List[Dict[str, Any]] = []
+        self.role_violations: List[Dict[str, Any]] = []
+
+        by_project = self.by_project
+        classroom_slots = self.classroom_slots
+        used_timeslots = self.used_timeslots
+        instructor_loads = self.instructor_loads
+        instructor_classrooms = self.instructor_classrooms
+        late_slots = self.late_slots
+        for a in assignments:
+            pid = a.get("project_id")
+            cid = a.get("classroom_id")
+            tid = a.get("timeslot_id")
+            if pid is not None:
+                by_project[pid].append(a)
+            if cid is not None:
+                slot_idx = id_to_idx.get(tid)
+                if slot_idx is not None:
+                    classroom_slots[cid].add(slot_idx)
+            if tid:
+                used_timeslots.add(tid)
+            if is_late(tid):
+                late_slots.append({"project_id": pid, "classroom_id": cid, "timeslot_id": tid})
+            for instructor_id in a.get("instructors", []):
+                instructor_loads[instructor_id] += 1
+                if instructor_id and cid:
+                    instructor_classrooms[instructor_id].add(cid)
+            # Rol listesi ve proje turu yoksa ihlal olamaz
+            if a.get("roles") or a.get("project_type") or a.get("type"):
+                self.role_violations.extend(_role_violations_of(a))
+
+    @property
+    def scheduled_projects(self) -> Set[Any]:
+        return set(self.by_project)
+
+    def duplicate_report(self) -> Dict[str, Any]:
+        return _duplicate_report(self.by_project)
+
+    def coverage_report(self, expected_project_ids: List[Any]) -> Dict[str, Any]:
+        return _coverage_report(self.scheduled_projects, expected_project_ids)
+
+    def gap_report(self) -> Dict[str, Any]:
+        return _gap_report(self.classroom_slots)
+
+    def role_report(self) -> Dict[str, Any]:
+        return _role_report(self.role_violations)
+
+    def load_balance_report(self, instructors: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return _load_balance_report(self.instructor_loads, instructors)
+
+    def classroom_switch_report(self) -> Dict[str, Any]:
+        return _classroom_switch_report(self.instructor_classrooms)
+
+    def session_report(self, timeslots: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return _session_report(self.used_timeslots, timeslots)
+
+
 def repair_duplicates(assignments: List[Dict[str, Any]], slot_rewards_map: Dict[str, float], timeslots: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     DEPRECATED: Bu fonksiyon artık kullanılmamalı!
@@ -447,20 +569,8 @@ def ensure_role_constraints(assignments: List[Dict[str, Any]],
 
 def remove_late_slots_from_solution(assignments: List[Dict[str, Any]], timeslots: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """16:30+ slotları kaldır"""
-    def is_late_slot(ts_id: str) -> bool:
-        ts = next((t for t in timeslots if t.get("id") == ts_id), None)
-        if not ts:
-            return False
-
-        start_time = str(ts.get("start_time", "09:00"))
-        try:
-            hour = int(start_time.split(":")[0])
-            minute = int(start_time.split(":")[1]) if len(start_time.split(":")) > 1 else 0
-            return hour > 16 or (hour == 16 and minute >= 30)
-        except:
-            return False
-
-    return [a for a in assignments if not is_late_slot(a.get("timeslot_id", ""))]
+    late_ids = get_calendar(timeslots).late_ids
+    return [a for a in assignments if a.get("timeslot_id", "") not in late_ids]
 
 
 def balance_instructor_load(assignments: List[Dict[str, Any]],
@@ -651,7 +761,11 @@ def export_schedule_to_excel(assignments: List[Dict[str, Any]], projects: List[D
             ";".join(instr_names)
         ])
 
-    # Try Excel
+    # Try Excel (openpyxl yalnizca .xlsx istendiginde yuklenir)
+    try:
+        from openpyxl import Workbook
+    except Exception:
+        Workbook = None
     if Workbook is not None and out_path.lower().endswith('.xlsx'):
         wb = Workbook()
         ws = wb.active
@@ -672,32 +786,30 @@ def export_schedule_to_excel(assignments: List[Dict[str, Any]], projects: List[D
     return csv_path
 
 
+@profiled(PHASE_VALIDATION)
 def validate_solution(assignments: List[Dict[str, Any]], projects: List[Dict[str, Any]],
                      instructors: List[Dict[str, Any]], classrooms: List[Dict[str, Any]],
                      timeslots: List[Dict[str, Any]], late_pred: Callable = None) -> Dict[str, Any]:
     """
-    Kapsamlı çözüm validasyonu - tüm gereksinimleri kontrol eder
+    Kapsamlı çözüm validasyonu - tüm gereksinimleri kontrol eder.
+    Atamalar bir kez dolasilir (ScheduleIndex); raporlar indeksten uretilir.
 
     Returns:
         Tüm validasyon raporlarını içeren sözlük
     """
-    if late_pred is None:
-        late_pred = lambda ts: _is_late_slot(ts)
-
     # Veri hazırlığı
     expected_project_ids = [p.get("id") for p in projects if p.get("id") is not None]
-    people_types = {person.get("id"): person.get("type") for person in instructors if person.get("id") and person.get("type")}
-    slot_rewards_map = build_slot_rewards_map_from_algorithm(None)
-
-    # Tüm kontrolleri çalıştır
-    duplicate_report = detect_duplicates(assignments)
-    coverage_report = detect_coverage(assignments, expected_project_ids)
-    gap_report = detect_gaps(assignments, timeslots)
-    late_slots_report = detect_late_slots(assignments, timeslots, late_pred)
-    role_violations_report = detect_role_violations(assignments, people_types)
-    load_balance_report = detect_load_balance_violations(assignments, instructors)
-    classroom_switches_report = detect_classroom_switches(assignments, instructors)
-    session_count_report = detect_session_count(assignments, timeslots)
+
+    # Tek geçiş: tüm kontrollerin gruplamaları
+    index = ScheduleIndex(assignments, timeslots, late_pred)
+    duplicate_report = index.duplicate_report()
+    coverage_report = index.coverage_report(expected_project_ids)
+    gap_report = index.gap_report()
+    late_slots_report = index.late_slots
+    role_violations_report = index.role_report()
+    load_balance_report = index.load_balance_report(instructors)
+    classroom_switches_report = index.classroom_switch_report()
+    session_count_report = index.session_report(timeslots)
 
     # Özet istatistikler
     ara_projects = sum(1 for p in projects if str(p.get("type", "")).lower() == "ara")
@@ -755,21 +867,7 @@ def _is_late_slot(slot: Dict[str, Any]) -> bool:
     """16:30 sonrası slotları tespit et"""
     if slot is None:
         return False
-    if isinstance(slot.get("is_late_slot"), bool):
-        return bool(slot.get("is_late_slot"))
-
-    # Zaman parsing
-    try:
-        label = str(slot.get("label") or slot.get("time_range") or "")
-        if any(x in label for x in ["16:30", "17:00", "17:30", "18:00"]):
-            return True
-        st = str(slot.get("start_time") or "")
-        parts = st.split(":")
-        h = int(parts[0]) if parts and parts[0].isdigit() else 0
-        m = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
-        return h > 16 or (h == 16 and m >= 30)
-    except Exception:
-        return False
+    return TimeslotCalendar([slot]).slots[0].is_late
 
 
 def generate_comprehensive_report(validation_result: Dict[str, Any], output_dir: str = "reports") -> Dict[str, str]:
@@ -948,45 +1046,68 @@ def generate_reports(assignments: List[Dict[str, Any]],
                     projects: List[Dict[str, Any]],
                     instructors: List[Dict[str, Any]],
                     classrooms: List[Dict[str, Any]],
-                    timeslots: List[Dict[str, Any]]) -> Dict[str, Any]:
+                    timeslots: List[Dict[str, Any]],
+                    validation_result: Optional[Dict[str, Any]] = None,
+                    output_dir: Optional[str] = None,
+                    background: bool = True) -> Dict[str, Any]:
     """
     Tüm raporları oluşturur ve dict olarak döner.
 
+    Args:
+        validation_result: Ayni atamalar icin hazir validate_solution() ciktisi
+            (verilmezse bir kez hesaplanir).
+        output_dir: Verilirse rapor dosyalari bu klasore yazilir (istege bagli).
+        background: Dosyalar arka plan thread'inde yazilir; cagiran beklemez.
+
     Returns:
         Tüm raporları içeren dict
     """
-    reports = {}
+    if validation_result is None:
+        validation_result = validate_solution(assignments, projects, instructors, classrooms, timeslots)
+
+    reports = {
+        key: validation_result[key]
+        for key in ("duplicate_report", "coverage_report", "gap_report", "late_slots_report", "load_balance_report")
+    }
+    reports["validation_result"] = validation_result
 
-    # Duplicate raporu
-    reports["duplicate_report"] = detect_duplicates(assignments)
+    if output_dir:
+        if background:
+            write_reports_async(validation_result, output_dir)
+            reports["report_dir"] = output_dir
+        else:
+            reports["report_files"] = generate_comprehensive_report(validation_result, output_dir)
 
-    # Coverage raporu
-    expected_ids = [p.get("id") for p in projects if p.get("id")]
-    reports["coverage_report"] = detect_coverage(assignments, expected_ids)
+    return reports
 
-    # Gap raporu
-    reports["gap_report"] = detect_gaps(assignments, timeslots)
 
-    # Late slots raporu
-    def is_late_slot(ts: Dict[str, Any]) -> bool:
-        start_time = str(ts.get("start_time", "09:00"))
-        try:
-            hour = int(start_time.split(":")[0])
-            minute = int(start_time.split(":")[1]) if len(start_time.split(":")) > 1 else 0
-            return hour > 16 or (hour == 16 and minute >= 30)
-        except:
-            return False
+_report_executor: Optional[ThreadPoolExecutor] = None
+_report_executor_lock = threading.Lock()
 
-    reports["late_slots_report"] = detect_late_slots(assignments, timeslots, is_late_slot)
 
-    # Load balance raporu
-    reports["load_balance_report"] = detect_load_balance_violations(assignments, instructors)
+def submit_report_write(fn: Callable[..., Any], *args: Any) -> Future:
+    """
+    Dosya yazimini tek thread'lik arka plan kuyruguna ver (yazimlar sirayla
+    yapilir, solver/servis beklemez). Hatalar loglanir.
+    """
+    global _report_executor
+    with _report_executor_lock:
+        if _report_executor is None:
+            _report_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="validator-reports")
+    future = _report_executor.submit(fn, *args)
+    future.add_done_callback(_log_report_failure)
+    return future
 
-    # Acceptance criteria kontrolü
-    validation_result = validate_solution(assignments, projects, instructors, classrooms, timeslots)
-    reports["validation_result"] = validation_result
 
-    return reports
+def write_reports_async(validation_result: Dict[str, Any], output_dir: str = "reports") -> Future:
+    """``generate_comprehensive_report`` arka planda; Future dosya yollarini verir."""
+    return submit_report_write(generate_comprehensive_report, validation_result, output_dir)
+
+
+def _log_report_failure(future: Future) -> None:
+    exc = future.exception()
+    if exc is not None:
+        logging.getLogger(__name__).warning(f"Rapor dosyalari yazilamadi: {exc}")
 
 
 def write_validator_summary(path: str, reports: Dict[str, Any]) -> None:
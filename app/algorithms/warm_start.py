@@ -0,0 +1,204 @@
+"""
+Warm start: kalici (ya da onceki bir kosunun) cizelgesinden baslangic cozumu.
+
+Servis katmani ``params.warm_start`` verildiginde cizelgeyi
+``data["warm_start_schedule"]`` altina koyar. Solver'lar bu modul ile
+kaydi kendi indeks uzaylarina cevirir:
+- ``class_id``   = sinif listesindeki (classrooms) sira
+- ``class_order`` = zaman dilimi listesindeki (timeslots) sira
+
+Cizelgede olmayan (yeni eklenmis) projeler en az yuklu sinifin ilk bos
+slotuna yerlestirilir; silinmis proje/sinif/zaman dilimine ait kayitlar
+atlanir. Boylece kucuk veri degisikliklerinden sonra yeniden optimizasyon
+onceki cozumun yakinindan baslar.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+WARM_START_KEY = "warm_start_schedule"
+
+Placement = Tuple[int, int]
+
+
+def _as_int(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value)
+    return None
+
+
+def normalize_instructor_ids(instructors: Any) -> List[int]:
+    """
+    Instructor listesini int id listesine cevir.
+
+    Dict kayitlar ``id`` alanindan okunur; placeholder'lar ve metin
+    etiketleri ("[Arastirma Gorevlisi]") -1 olur.
+    """
+    ids: List[int] = []
+    for item in instructors or []:
+        if isinstance(item, dict):
+            value = None if item.get("is_placeholder") else _as_int(item.get("id"))
+        else:
+            value = _as_int(item)
+        ids.append(value if value is not None and value > 0 else -1)
+    return ids
+
+
+def _id_index(items: Sequence[Any]) -> Dict[int, int]:
+    index: Dict[int, int] = {}
+    for position, item in enumerate(items or []):
+        item_id = _as_int(item.get("id") if isinstance(item, dict) else getattr(item, "id", None))
+        if item_id is not None and item_id not in index:
+            index[item_id] = position
+    return index
+
+
+def warm_start_entries(data: Optional[Dict[str, Any]],
+                       classrooms: Optional[Sequence[Any]] = None,
+                       timeslots: Optional[Sequence[Any]] = None,
+                       class_count: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    ``data["warm_start_schedule"]`` kayitlarini solver indekslerine cevir.
+
+    Args:
+        data: Algoritma girdisi.
+        classrooms: Solver'in kullandigi sinif listesi (varsayilan: data'daki).
+        timeslots: Solver'in kullandigi zaman dilimi listesi.
+        class_count: Verilirse bu sayinin disindaki siniflar atlanir.
+
+    Returns:
+        ``_convert_schedule_to_*`` yardimcilarinin bekledigi formatta kayitlar:
+        project_id, class_id, class_order, instructors (int, placeholder -1).
+    """
+    schedule = (data or {}).get(WARM_START_KEY) or []
+    if not schedule:
+        return []
+    if classrooms is None:
+        classrooms = (data or {}).get("classrooms", [])
+    if timeslots is None:
+        timeslots = (data or {}).get("timeslots", [])
+    class_index = _id_index(classrooms)
+    slot_index = _id_index(timeslots)
+
+    entries: List[Dict[str, Any]] = []
+    seen_projects = set()
+    skipped = 0
+    for entry in schedule:
+        if not isinstance(entry, dict):
+            skipped += 1
+            continue
+        project_id = _as_int(entry.get("project_id"))
+        classroom_id = _as_int(entry.get("classroom_id"))
+        timeslot_id = _as_int(entry.get("timeslot_id"))
+        # Kalici kayitlar id tasir; bazi kosu sonuclarinda yalnizca indeks vardir
+        class_id = class_index.get(classroom_id) if classroom_id is not None else _as_int(entry.get("class_id"))
+        if timeslot_id is not None:
+            class_order = slot_index.get(timeslot_id)
+        else:
+            class_order = _as_int(entry.get("class_order", entry.get("order_in_class")))
+        if (project_id is None or project_id in seen_projects or class_id is None or class_order is None
+                or (class_count is not None and class_id >= class_count)):
+            skipped += 1
+            continue
+        seen_projects.add(project_id)
+        entries.append({
+            "project_id": project_id,
+            "classroom_id": classroom_id,
+            "timeslot_id": timeslot_id,
+            "class_id": class_id,
+            "class_order": class_order,
+            "instructors": normalize_instructor_ids(entry.get("instructors")),
+        })
+    if skipped:
+        logger.info(f"Warm start: {skipped} schedule entries skipped (unknown project/class/timeslot)")
+    return entries
+
+
+def warm_start_placements(entries: Iterable[Dict[str, Any]]) -> Tuple[Dict[int, Placement], Dict[int, int]]:
+    """Kayitlardan {proje: (sinif, slot)} ve {proje: J1} eslemeleri."""
+    placements: Dict[int, Placement] = {}
+    jury: Dict[int, int] = {}
+    for entry in entries:
+        placements[entry["project_id"]] = (entry["class_id"], entry["class_order"])
+        instructors = entry.get("instructors") or []
+        if len(instructors) > 1 and instructors[1] > 0:
+            jury[entry["project_id"]] = instructors[1]
+    return placements, jury
+
+
+def complete_placements(placements: Dict[int, Placement], project_ids: Sequence[int],
+                        class_count: int, max_slots: Optional[int] = None) -> Dict[int, Placement]:
+    """
+    Warm yerlesimi tum projelere tamamla.
+
+    Gecerli warm yerlesimler korunur (cakisan hucrede ilk kayit kazanir),
+    kalan projeler en az yuklu sinifin ilk bos slotuna konur. Sonunda her
+    sinif icindeki sira 0..n-1 olacak sekilde sikistirilir.
+    """
+    if class_count <= 0:
+        return {}
+    result: Dict[int, Placement] = {}
+    occupied = set()
+    loads = [0] * class_count
+    for project_id in project_ids:
+        placement = placements.get(project_id)
+        if placement is None:
+            continue
+        class_id, slot = placement
+        if not (0 <= class_id < class_count and slot >= 0) or (max_slots is not None and slot >= max_slots):
+            continue
+        if (class_id, slot) in occupied:
+            continue
+        result[project_id] = (class_id, slot)
+        occupied.add((class_id, slot))
+        loads[class_id] += 1
+
+    for project_id in project_ids:
+        if project_id in result:
+            continue
+        class_id = min(range(class_count), key=lambda c: loads[c])
+        slot = 0
+        while (class_id, slot) in occupied:
+            slot += 1
+        result[project_id] = (class_id, slot)
+        occupied.add((class_id, slot))
+        loads[class_id] += 1
+
+    compacted: Dict[int, Placement] = {}
+    for class_id in range(class_count):
+        members = sorted((slot, project_id) for project_id, (c, slot) in result.items() if c == class_id)
+        for order, (_, project_id) in enumerate(members):
+            compacted[project_id] = (class_id, order)
+    return compacted
+
+
+def seed_assignments(warm: Sequence[Any], fresh: Sequence[Any], class_count: int,
+                     slot_attr: str = "order_in_class",
+                     instructor_ids: Optional[Iterable[int]] = None) -> List[Any]:
+    """
+    Taze bir cozumun atamalarini warm cozume gore yerlestir.
+
+    ``fresh`` solver'in kendi kurucusundan gelen tam cozumdur (guncel proje
+    listesi ve sabit PS bilgisi ondadir); sinif/slot ve J1 warm cozumden
+    alinir. Atama nesneleri yerinde guncellenir ve geri dondurulur.
+    """
+    warm_by_project = {a.project_id: a for a in warm}
+    placements = {pid: (a.class_id, getattr(a, slot_attr)) for pid, a in warm_by_project.items()}
+    valid_jury = set(instructor_ids) if instructor_ids is not None else None
+    completed = complete_placements(placements, [a.project_id for a in fresh], class_count)
+
+    for assignment in fresh:
+        assignment.class_id, slot = completed[assignment.project_id]
+        setattr(assignment, slot_attr, slot)
+        source = warm_by_project.get(assignment.project_id)
+        if source is None:
+            continue
+        j1_id = source.j1_id
+        if j1_id and j1_id > 0 and j1_id != assignment.ps_id and (valid_jury is None or j1_id in valid_jury):
+            assignment.j1_id = j1_id
+    return list(fresh)
@@ -8,7 +8,7 @@ import traceback
 
 from app.core.config import settings
 from app.security.rate_limiter import rate_limiter, check_rate_limit
-from app.monitoring.logger import get_logger, RequestTimer
+from app.monitoring.logger import get_logger, RequestTimer, metrics_collector
 from app.core.error_handling import create_error_response
 
 
@@ -120,6 +120,30 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         return response
 
 
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """
+    Middleware for request latency metrics.
+    Requests are labelled by route template (e.g. /api/v1/jobs/{job_id}) to keep
+    label cardinality bounded; unmatched paths share a single label.
+    """
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        start_time = time.perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            metrics_collector.record_request(
+                request.method,
+                getattr(route, "path", "unmatched"),
+                status_code,
+                time.perf_counter() - start_time,
+            )
+
+
 class ExceptionMiddleware(BaseHTTPMiddleware):
     """
     Middleware for handling exceptions.
@@ -243,6 +267,7 @@ def setup_middleware(app: FastAPI) -> None:
     app.add_middleware(RequestLoggingMiddleware)
     app.add_middleware(ExceptionMiddleware)
     app.add_middleware(RateLimiterMiddleware, rate_limit=1000, time_window=60)
+    app.add_middleware(MetricsMiddleware)
     
     # Add ProcessEndpointBlockerMiddleware LAST so it executes FIRST
     app.add_middleware(ProcessEndpointBlockerMiddleware) 
\ No newline at end of file
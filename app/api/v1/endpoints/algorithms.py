@@ -1,14 +1,17 @@
 from typing import Any, Dict, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text
 from datetime import datetime
+import asyncio
 import logging
 
 from app import models, schemas
 from app.api import deps
 from app.db.base import get_db
 from app.services.algorithm import AlgorithmService
+from app.services.run_storage import load_run_input
 from app.models.algorithm import AlgorithmType, AlgorithmRun
 from app.core.celery import celery_app
 from app.i18n import translate as _
@@ -816,11 +819,16 @@ async def execute_algorithm(
     # Frontend ile uyum: hem algorithm_type/parameters hem de algorithm/params kabul et
     algorithm_in: Dict[str, Any],
     db: AsyncSession = Depends(get_db),
+    profile: bool = Query(False, description="Solver'i ornekleyen profiler altinda calistir"),
     # Temporarily remove auth for testing
     # current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    Belirtilen algoritmayı çalıştırır
+    Belirtilen algoritmayı çalıştırır.
+
+    ``profile=true`` verilirse solver ornekleyen profiler altinda calisir; en
+    sicak fonksiyonlar sonuca eklenir, collapsed yiginlar
+    ``/results/{run_id}/profile`` adresinden indirilir.
     """
     # HER ZAMAN log yaz - endpoint başlangıcı
     import sys
@@ -904,6 +912,8 @@ async def execute_algorithm(
         import sys
         params = algorithm_in.get("parameters") or algorithm_in.get("params") or {}
         data = algorithm_in.get("data") or {}
+        if profile or algorithm_in.get("profile"):
+            params = {**params, "profile": True}
         
         # HER ZAMAN log yaz - TÜM KANALLARA
         log_msg = f"[ALGORITHM EXECUTE] Starting algorithm: {requested_name} -> {mapped}\n[ALGORITHM EXECUTE] Params: {params}"
@@ -972,7 +982,8 @@ async def execute_algorithm(
         print(f"DEBUG: gap_fix_result = {gap_fix_result}")
         
         # 💾 VERITABANINA KAYDET - Schedule'ları veritabanına kaydet
-        if isinstance(result, dict):
+        # Single-flight katilimcilarinda cizelgeyi lider kosu zaten yazdi
+        if isinstance(result, dict) and not result.get("single_flight"):
             # Phase 3 final_assignments varsa onu kullan (placeholder ile)
             assignments = result.get("final_assignments") or result.get("assignments", [])
             if assignments:
@@ -1096,7 +1107,9 @@ async def execute_algorithm(
             "task_id": str(algorithm_run.id),
             "message": "Algorithm completed successfully" if final_status == "completed" else "Algorithm failed",
             "result": result,  # Add algorithm result
-            "gap_fix_result": gap_fix_result  # Add gap fixing results
+            "gap_fix_result": gap_fix_result,  # Add gap fixing results
+            "cache": result.get("cache") if isinstance(result, dict) else None,
+            "single_flight": result.get("single_flight") if isinstance(result, dict) else None
         }
         
         # Schedule verilerini ekle
@@ -1242,6 +1255,229 @@ async def get_algorithm_status(
             detail=_("algorithms.status_error", locale=current_user.language, error=str(e))
         )
 
+@router.post("/cancel/{run_id}", response_model=Dict[str, Any])
+async def cancel_algorithm_run(
+    run_id: int,
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Calisan algoritmayi durdurur. Solver o ana kadarki en iyi cozumu dondurur.
+    """
+    if not await AlgorithmService.cancel_run(run_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No running algorithm with run id {run_id}"
+        )
+    return {"id": run_id, "status": "cancelling"}
+
+@router.post("/continue/{run_id}", response_model=Dict[str, Any])
+async def continue_algorithm_run(
+    run_id: int,
+    payload: Optional[Dict[str, Any]] = None,
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    GA / SA / NSGA-II / ACO kosusunu son checkpoint'inden (populasyon, feromon,
+    sicaklik, hafiza) yeni bir sure butcesiyle surdurur; sonuc yeni bir run
+    kaydi olarak doner.
+
+    Body: ``time_budget`` (saniye, varsayilan 60), ``params`` (orijinal
+    parametreleri ezer).
+    """
+    payload = payload or {}
+    try:
+        time_budget = float(payload.get("time_budget", 60))
+    except (TypeError, ValueError):
+        time_budget = 0
+    if time_budget <= 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="time_budget must be a positive number")
+    try:
+        result, algorithm_run = await AlgorithmService.continue_run(
+            run_id, time_budget, params=payload.get("params")
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    result = result if isinstance(result, dict) else {}
+    # Run kaydi baska bir session'da guncellenir; durum sonuctan okunur
+    failed = str(result.get("status", "")).lower() in ("failed", "error")
+    return {
+        "id": algorithm_run.id,
+        "resumed_from": run_id,
+        "status": "failed" if failed else "completed",
+        "result": result,
+        "schedule": result.get("schedule", []),
+        "assignments": result.get("final_assignments") or result.get("assignments", []),
+    }
+
+async def _accessible_job(job_id: str, current_user: models.User) -> Dict[str, Any]:
+    """Is kaydini oku; yoksa veya kullanicinin degilse 404."""
+    from app.services.job_service import can_access_job, job_store
+    job = await asyncio.to_thread(job_store.get, job_id)
+    if job is None or not can_access_job(job, current_user):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} not found")
+    return job
+
+@router.post("/jobs", response_model=Dict[str, Any], status_code=status.HTTP_202_ACCEPTED)
+async def submit_algorithm_job(
+    *,
+    payload: Dict[str, Any],
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Algoritma kosusunu Celery isi olarak kuyruga koyar ve hemen doner.
+
+    Body: ``algorithm``, ``data``, ``params``, ``priority`` (``interactive`` |
+    ``batch``). Durum ``GET /jobs/{job_id}``, sonuc ``GET /jobs/{job_id}/result``.
+    """
+    from app.services.job_service import PRIORITY_INTERACTIVE, submit_job
+    if not payload.get("algorithm"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="algorithm is required")
+    try:
+        # Eager modda gorev bu cagrida calisir; event loop'u bloklamasin
+        return await asyncio.to_thread(
+            submit_job,
+            payload["algorithm"],
+            data=payload.get("data"),
+            params=payload.get("params"),
+            priority=payload.get("priority", PRIORITY_INTERACTIVE),
+            user_id=current_user.id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid job request: {e}")
+
+@router.get("/jobs/{job_id}", response_model=Dict[str, Any])
+async def get_algorithm_job(
+    job_id: str,
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Is durumu ve ilerleme (``progress``, ``iteration``, ``best_cost``, ``run_id``).
+    """
+    return await _accessible_job(job_id, current_user)
+
+@router.post("/jobs/{job_id}/cancel", response_model=Dict[str, Any])
+async def cancel_algorithm_job(
+    job_id: str,
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Isi iptal eder; calisan solver o ana kadarki en iyi cozumle durur.
+    """
+    from app.services.job_service import cancel_job
+    await _accessible_job(job_id, current_user)
+    job = await asyncio.to_thread(cancel_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} not found")
+    return job
+
+@router.get("/jobs/{job_id}/result", response_model=Dict[str, Any])
+async def get_algorithm_job_result(
+    job_id: str,
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Tamamlanan isin sonucu; run kaydindan referansla okunur.
+    """
+    from app.services.job_service import JOB_QUEUED, JOB_RUNNING
+    job = await _accessible_job(job_id, current_user)
+    if job["status"] in (JOB_QUEUED, JOB_RUNNING) or job.get("run_id") is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": "Job has no result yet", "status": job["status"]}
+        )
+    try:
+        run = await AlgorithmService.get_run_result(job["run_id"])
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    result = run.get("result") or {}
+    return {
+        "job_id": job_id,
+        "run_id": job["run_id"],
+        "status": job["status"],
+        "result": result,
+        "schedule": result.get("schedule", []),
+        "assignments": result.get("final_assignments") or result.get("assignments", []),
+    }
+
+@router.post("/portfolio", response_model=Dict[str, Any])
+async def run_algorithm_portfolio(
+    *,
+    payload: Dict[str, Any],
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Secilen algoritmalari ortak bir deadline ile es zamanli calistirir, her
+    cizelgeyi ayni metrikle puanlar ve en iyisini kaydeder.
+
+    Body: ``algorithms`` (varsayilan: cp_sat, comprehensive_optimizer,
+    simulated_annealing, hungarian), ``deadline_seconds``, ``params``,
+    ``params_by_algorithm``, ``weights``, ``data`` (bos ise veritabani),
+    ``persist``.
+    """
+    from app.services.portfolio_service import DEFAULT_DEADLINE_SECONDS, DEFAULT_PORTFOLIO, run_portfolio
+    try:
+        race = await run_portfolio(
+            algorithms=payload.get("algorithms") or DEFAULT_PORTFOLIO,
+            data=payload.get("data"),
+            deadline_seconds=payload.get("deadline_seconds", DEFAULT_DEADLINE_SECONDS),
+            params=payload.get("params"),
+            params_by_algorithm=payload.get("params_by_algorithm"),
+            weights=payload.get("weights"),
+            persist=payload.get("persist", True),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid portfolio request: {e}")
+    if race["winner"] is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"message": "No algorithm in the portfolio produced a schedule", "table": race["table"]}
+        )
+    result = race["result"]
+    return {
+        "id": race["run_id"],
+        "winner": race["winner"],
+        "table": race["table"],
+        "deadline_seconds": race["deadline_seconds"],
+        "elapsed": race["elapsed"],
+        "result": result,
+        "schedule": result.get("schedule", []),
+        "assignments": result.get("assignments", []),
+    }
+
+@router.post("/incremental", response_model=Dict[str, Any])
+async def reoptimize_incrementally(
+    *,
+    payload: Dict[str, Any],
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Kalici cizelgeyi kucuk veri degisikliklerine gore yerel olarak onarir ve
+    yalnizca farklari dondurur; degismeyen atamalar yerinde kalir.
+
+    Body: ``changes`` (``added_projects``, ``removed_projects``,
+    ``blocked_instructors``, ``removed_classrooms``), ``time_limit``,
+    ``repair_conflicts``, ``data`` (bos ise veritabani), ``persist``.
+    """
+    from app.services.incremental_service import (
+        DEFAULT_TIME_LIMIT_SECONDS, ChangeSet, clamp_time_limit, incremental_reoptimize
+    )
+    try:
+        changes = ChangeSet.from_payload(payload.get("changes"))
+        time_limit = clamp_time_limit(payload.get("time_limit", DEFAULT_TIME_LIMIT_SECONDS))
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid change set: {e}")
+    try:
+        return await incremental_reoptimize(
+            changes,
+            data=payload.get("data"),
+            persist=payload.get("persist", True),
+            time_limit=time_limit,
+            repair_conflicts=payload.get("repair_conflicts", True),
+            classroom_count=payload.get("classroom_count", 7),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
 @router.post("/recommend-best", response_model=Dict[str, Any])
 async def recommend_best_algorithm(
     *,
@@ -1337,6 +1573,34 @@ async def get_algorithm_results(
             detail=f"Error getting algorithm results: {str(e)}"
         )
 
+@router.get("/results/{run_id}/profile")
+async def download_run_profile(
+    *,
+    run_id: int,
+    format: str = Query("collapsed", pattern="^(collapsed|json)$"),
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    ``profile=true`` ile calistirilan kosunun ornekleme profilini indirir.
+    Profil dosya yollari ve ic yiginlar icerdiginden yalnizca superuser erisir.
+
+    ``collapsed``: flamegraph.pl / speedscope ile acilabilen collapsed yiginlar;
+    ``json``: ornek sayisi, en sicak fonksiyonlar ve yiginlar.
+    """
+    from app.monitoring.sampling_profiler import collapsed_from_dict
+    from app.services.profile_store import profile_store
+
+    payload = await asyncio.to_thread(profile_store.load, run_id)
+    if payload is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No profile stored for run {run_id}")
+    if format == "json":
+        return payload
+    return PlainTextResponse(
+        collapsed_from_dict(payload),
+        headers={"Content-Disposition": f'attachment; filename="run_{run_id}.collapsed"'},
+    )
+
+
 @router.get("/compare", response_model=Dict[str, Any])
 async def compare_algorithms(
     *,
@@ -1399,7 +1663,7 @@ async def apply_fallback_schedules(
         )
         latest_run = result.scalar_one_or_none()
         
-        if not latest_run or not latest_run.data:
+        if not latest_run or not (latest_run.input_hash or await load_run_input(db, latest_run)):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No completed algorithm run found"
@@ -2131,6 +2395,56 @@ async def get_weight_sensitivity_analysis(
         )
 
 
+@router.post("/objective-weights/sweep")
+async def sweep_objective_weights(
+    sweep_in: Dict[str, Any],
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Binlerce ağırlık senaryosunu tek matris çarpımıyla skorlar ve sıralama kararlılığını döner.
+    
+    Expected body format:
+    {
+        "candidates": {"NSGA-II": {...objective_scores...}, "Genetic": {...}},
+        "mode": "monte_carlo" | "grid",
+        "samples": 2000,
+        "step": 0.1,
+        "concentration": 50,
+        "seed": 42,
+        "weight_scenarios": [...]   # opsiyonel, verilirse mode yok sayılır
+    }
+    """
+    try:
+        from app.services.objective_weights_service import ObjectiveWeightsService
+        
+        weights_service = ObjectiveWeightsService()
+        result = await weights_service.analyze_weight_sweep(
+            candidates=sweep_in.get("candidates") or {},
+            weight_scenarios=sweep_in.get("weight_scenarios"),
+            mode=sweep_in.get("mode", "monte_carlo"),
+            samples=int(sweep_in.get("samples", 2000)),
+            step=float(sweep_in.get("step", 0.1)),
+            concentration=float(sweep_in.get("concentration", 50.0)),
+            seed=sweep_in.get("seed"),
+        )
+        
+        if not result["success"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=result["message"]
+            )
+        
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error running weight sweep: {str(e)}"
+        )
+
+
 @router.post("/optimize-classroom-count", response_model=Dict[str, Any])
 async def optimize_classroom_count(
     *,
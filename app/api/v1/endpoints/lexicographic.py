@@ -9,7 +9,7 @@ from app import models, schemas
 from app.api import deps
 from app.db.base import get_db
 from app.models.algorithm import AlgorithmType, AlgorithmRun
-from app.algorithms.lexicographic import LexicographicAlgorithm
+from app.algorithms.registry import load_algorithm_class
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -116,7 +116,7 @@ async def optimize_with_lexicographic(
         }
         
         # Lexicographic algoritmasını başlat
-        lexicographic = LexicographicAlgorithm()
+        lexicographic = load_algorithm_class(AlgorithmType.LEXICOGRAPHIC)()
         
         # Optimizasyonu çalıştır
         logger.info("🚀 Lexicographic optimization başlatılıyor...")
@@ -4,6 +4,7 @@ Reports API Endpoints
 
 from typing import Any, List, Optional
 from datetime import datetime
+import asyncio
 from io import BytesIO
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -12,11 +13,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
 from app.models import User
-from app.services.report_generator_service import ReportGeneratorService
 from app.services.score_generator_service import ScoreGeneratorService
-from app.services.chart_generator_service import ChartGeneratorService
-from app.services.performance_metrics import compute, compute_many
-from app.services.planner_export_service import exportPlannerToExcel
+from app.services.performance_metrics import compute, compute_many, metric_executor
 
 router = APIRouter()
 
@@ -45,6 +43,7 @@ async def generate_comprehensive_report(
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Kapsamlı rapor oluşturur (PDF ve Excel)."""
+    from app.services.report_generator_service import ReportGeneratorService
     service = ReportGeneratorService()
     result = await service.generate_comprehensive_report(algorithm_run_id, format_types)
     
@@ -61,8 +60,9 @@ async def generate_load_distribution_chart(
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Yük dağılımı grafiği oluşturur."""
+    from app.services.chart_generator_service import ChartGeneratorService
     service = ChartGeneratorService()
-    result = await service.generate_load_distribution_chart(algorithm_run_id)
+    result = await service.generate_load_distribution_chart(algorithm_run_id, db)
     
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["error"])
@@ -77,8 +77,9 @@ async def generate_comprehensive_dashboard(
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Kapsamlı dashboard oluşturur."""
+    from app.services.chart_generator_service import ChartGeneratorService
     service = ChartGeneratorService()
-    result = await service.generate_comprehensive_dashboard(algorithm_run_id)
+    result = await service.generate_comprehensive_dashboard(algorithm_run_id, db)
     
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["error"])
@@ -110,7 +111,7 @@ async def compute_performance_metrics(
     # current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Tek bir plan için performans metriklerini hesapla."""
-    return {"success": True, "metrics": compute(plan)}
+    return {"success": True, "metrics": await asyncio.to_thread(compute, plan)}
 
 
 @router.post("/metrics/compare", response_model=dict)
@@ -124,7 +125,11 @@ async def compare_performance_metrics(
     by_algo = payload.get("byAlgorithm", {}) or {}
     weights = payload.get("weights")
     params = payload.get("params")
-    return {"success": True, "results": compute_many(by_algo, weights=weights, params=params)}
+    # Puanlama event loop dışında; büyük karşılaştırmalar süreç havuzunda paralel
+    results = await asyncio.to_thread(
+        compute_many, by_algo, weights=weights, params=params, executor=metric_executor()
+    )
+    return {"success": True, "results": results}
 
 
 @router.post("/export-planner-excel")
@@ -147,6 +152,7 @@ async def export_planner_excel(
         }
     """
     try:
+        from app.services.planner_export_service import exportPlannerToExcel
         excel_bytes = exportPlannerToExcel(planner_data)
     except Exception as exc:  # pragma: no cover - defensive logging
         raise HTTPException(status_code=400, detail=f"Excel export failed: {exc}") from exc
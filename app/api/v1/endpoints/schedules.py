@@ -8,12 +8,10 @@ from app import models, schemas
 from app.api import deps
 from app.db.base import get_db
 from app.services.schedule import ScheduleService
-from app.services.report import ReportService
 from app.i18n import translate as _
 
 router = APIRouter()
 schedule_service = ScheduleService()
-report_service = ReportService()
 
 @router.get("/", response_model=List[Dict[str, Any]])
 async def read_schedules(
@@ -223,7 +221,9 @@ async def generate_pdf_report(
     PDF formatında atama planı raporu oluştur
     """
     try:
-        pdf_data = await report_service.generate_schedule_pdf(db)
+        # reportlab/pandas yalnizca rapor istendiginde yuklenir
+        from app.services.report import ReportService
+        pdf_data = await ReportService().generate_schedule_pdf(db)
         
         # PDF dosyası için response
         headers = {
@@ -245,7 +245,8 @@ async def generate_excel_report(
     Excel formatında atama planı raporu oluştur
     """
     try:
-        excel_data = await report_service.generate_schedule_excel(db)
+        from app.services.report import ReportService
+        excel_data = await ReportService().generate_schedule_excel(db)
         
         # Excel dosyası için response
         headers = {
@@ -2,29 +2,227 @@
 WebSocket endpoints for real-time algorithm progress tracking
 """
 
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
 from fastapi.websockets import WebSocketState
+import itertools
 import json
 import asyncio
 import logging
+import time
+import uuid
 
 from app.api import deps
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+
+class ConnectionSender:
+    """
+    Tek bir WebSocket baglantisi icin gonderim kuyrugu.
+
+    Mesajlar kuyruga eklenir ve ayri bir task tarafindan gonderilir; yavas bir
+    istemci gondereni bekletmez. Ayni ``key`` ile gelen mesajlar (ornegin ayni
+    calismanin ilerleme mesajlari) birlestirilir: kuyrukta yalnizca en guncel
+    olan kalir. JSON kodlamasi gonderim aninda yapilir, boylece dusurulen
+    mesajlar hic kodlanmaz.
+    """
+
+    def __init__(self, websocket: WebSocket, user_id: int,
+                 max_queue: int = 256, send_timeout: float = 10.0):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.on_error = None
+
+        self._pending: "OrderedDict[Any, Tuple[Any, float]]" = OrderedDict()
+        self._wakeup = asyncio.Event()
+        self._seq = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+        self.sent = 0
+        self.superseded = 0
+        self.dropped = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._lag_total = 0.0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def close(self) -> None:
+        task = self._task
+        self._task = None
+        if task is None or task.done():
+            return
+        try:
+            current = asyncio.current_task()
+        except RuntimeError:
+            current = None
+        if task is not current:
+            task.cancel()
+
+    def enqueue(self, payload: Any, key: Optional[str] = None) -> None:
+        """
+        Mesaji kuyruga ekle.
+
+        Args:
+            payload: Hazir metin veya JSON'a cevrilecek dict.
+            key: Birlestirme anahtari; ayni anahtarli bekleyen mesajin yerini alir.
+        """
+        if key is not None and key in self._pending:
+            _, queued_at = self._pending[key]
+            self._pending[key] = (payload, queued_at)
+            self.superseded += 1
+        else:
+            if len(self._pending) >= self.max_queue:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+            self._pending[key if key is not None else ("seq", next(self._seq))] = (payload, time.monotonic())
+        self._wakeup.set()
+
+    def queue_lag(self) -> float:
+        """Kuyruktaki en eski mesajin bekleme suresi (saniye)."""
+        if not self._pending:
+            return 0.0
+        return time.monotonic() - next(iter(self._pending.values()))[1]
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "user_id": self.user_id,
+            "queue_depth": len(self._pending),
+            "queue_lag": self.queue_lag(),
+            "sent": self.sent,
+            "superseded": self.superseded,
+            "dropped": self.dropped,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+            "avg_lag": self._lag_total / self.sent if self.sent else 0.0,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            _, (payload, queued_at) = self._pending.popitem(last=False)
+            if self.websocket.client_state != WebSocketState.CONNECTED:
+                continue
+            try:
+                text = payload if isinstance(payload, str) else json.dumps(payload)
+                await asyncio.wait_for(self.websocket.send_text(text), self.send_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error sending message to user {self.user_id}: {e}")
+                if self.on_error is not None:
+                    self.on_error(self)
+                return
+            lag = time.monotonic() - queued_at
+            self.sent += 1
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self._lag_total += lag
+
+
+class RedisFanout:
+    """
+    API worker'lari arasinda WebSocket mesaj dagitimi (Redis pub/sub).
+
+    Her worker mesaji yerel baglantilara iletir ve ayni zamanda kanala
+    yayinlar; diger worker'lar kendi baglantilarina teslim eder. Kendi
+    yayinladigi mesajlari ``origin`` alanindan tanir ve atlar.
+    """
+
+    CHANNEL = "ws:fanout"
+
+    def __init__(self, manager: "ConnectionManager", channel: str = CHANNEL):
+        self.manager = manager
+        self.channel = channel
+        self.worker_id = uuid.uuid4().hex
+        self._redis = None
+        self._pubsub = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, redis) -> None:
+        self._redis = redis
+        self._pubsub = redis.pubsub()
+        await self._pubsub.subscribe(self.channel)
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.aclose()
+            except Exception as e:
+                logger.warning(f"WebSocket fan-out unsubscribe failed: {e}")
+            self._pubsub = None
+
+    async def publish(self, user_id: int, payload: Any, key: Optional[str]) -> None:
+        envelope = json.dumps({
+            "origin": self.worker_id,
+            "user_id": user_id,
+            "key": key,
+            "payload": payload,
+        })
+        try:
+            await self._redis.publish(self.channel, envelope)
+        except Exception as e:
+            logger.warning(f"WebSocket fan-out publish failed: {e}")
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"WebSocket fan-out receive failed: {e}")
+                await asyncio.sleep(1.0)
+                continue
+            if not message or message.get("type") != "message":
+                continue
+            try:
+                envelope = json.loads(message["data"])
+            except (TypeError, ValueError):
+                continue
+            if envelope.get("origin") == self.worker_id:
+                continue
+            self.manager.deliver_local(envelope["user_id"], envelope["payload"], envelope.get("key"))
+
+
 class ConnectionManager:
     """WebSocket bağlantı yöneticisi"""
     
     def __init__(self):
         self.active_connections: Dict[int, WebSocket] = {}
         self.algorithm_progress: Dict[int, Dict[str, Any]] = {}
+        self.senders: Dict[int, ConnectionSender] = {}
+        self.fanout: Optional[RedisFanout] = None
     
     async def connect(self, websocket: WebSocket, user_id: int):
         """Kullanıcı bağlantısını kabul et"""
         await websocket.accept()
+        previous = self.senders.pop(user_id, None)
+        if previous is not None:
+            previous.close()
+        sender = ConnectionSender(websocket, user_id)
+        sender.on_error = self._on_send_error
+        sender.start()
         self.active_connections[user_id] = websocket
+        self.senders[user_id] = sender
         logger.info(f"User {user_id} connected to WebSocket")
     
     def disconnect(self, user_id: int):
@@ -33,43 +231,76 @@ class ConnectionManager:
             del self.active_connections[user_id]
         if user_id in self.algorithm_progress:
             del self.algorithm_progress[user_id]
+        sender = self.senders.pop(user_id, None)
+        if sender is not None:
+            sender.close()
         logger.info(f"User {user_id} disconnected from WebSocket")
     
+    def _on_send_error(self, sender: ConnectionSender):
+        if self.senders.get(sender.user_id) is sender:
+            self.disconnect(sender.user_id)
+    
+    async def start_fanout(self, redis) -> bool:
+        """Redis pub/sub uzerinden worker'lar arasi dagitimi baslat."""
+        if redis is None or not hasattr(redis, "pubsub"):
+            return False
+        fanout = RedisFanout(self)
+        try:
+            await fanout.start(redis)
+        except Exception as e:
+            logger.warning(f"WebSocket fan-out could not be started: {e}")
+            return False
+        self.fanout = fanout
+        return True
+    
+    async def stop_fanout(self):
+        if self.fanout is not None:
+            await self.fanout.stop()
+            self.fanout = None
+    
+    def deliver_local(self, user_id: int, payload: Any, key: Optional[str] = None) -> bool:
+        """Mesaji bu worker'daki baglantinin kuyruguna ekle."""
+        if isinstance(payload, dict) and payload.get("type") == "algorithm_progress":
+            self.algorithm_progress[user_id] = payload.get("data", {})
+        sender = self.senders.get(user_id)
+        if sender is None:
+            return False
+        sender.enqueue(payload, key)
+        return True
+    
+    async def _dispatch(self, user_id: int, payload: Any, key: Optional[str] = None):
+        self.deliver_local(user_id, payload, key)
+        if self.fanout is not None:
+            await self.fanout.publish(user_id, payload, key)
+    
     async def send_personal_message(self, message: str, user_id: int):
         """Belirli kullanıcıya mesaj gönder"""
-        if user_id in self.active_connections:
-            websocket = self.active_connections[user_id]
-            if websocket.client_state == WebSocketState.CONNECTED:
-                try:
-                    await websocket.send_text(message)
-                except Exception as e:
-                    logger.error(f"Error sending message to user {user_id}: {e}")
-                    self.disconnect(user_id)
+        await self._dispatch(user_id, message)
     
     async def send_algorithm_progress(self, user_id: int, progress_data: Dict[str, Any]):
-        """Algoritma ilerleme durumunu gönder"""
+        """Algoritma ilerleme durumunu gönder (ayni calismanin eski mesajlari birlestirilir)"""
         self.algorithm_progress[user_id] = progress_data
-        message = json.dumps({
-            "type": "algorithm_progress",
-            "data": progress_data
-        })
-        await self.send_personal_message(message, user_id)
+        await self._dispatch(
+            user_id,
+            {"type": "algorithm_progress", "data": progress_data},
+            key=f"progress:{progress_data.get('algorithm_id')}",
+        )
     
     async def send_algorithm_complete(self, user_id: int, result_data: Dict[str, Any]):
         """Algoritma tamamlandığında sonucu gönder"""
-        message = json.dumps({
-            "type": "algorithm_complete",
-            "data": result_data
-        })
-        await self.send_personal_message(message, user_id)
+        await self._dispatch(user_id, {"type": "algorithm_complete", "data": result_data})
     
     async def send_algorithm_error(self, user_id: int, error_data: Dict[str, Any]):
         """Algoritma hatası durumunda hata mesajını gönder"""
-        message = json.dumps({
-            "type": "algorithm_error",
-            "data": error_data
-        })
-        await self.send_personal_message(message, user_id)
+        await self._dispatch(user_id, {"type": "algorithm_error", "data": error_data})
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Bu worker'daki baglantilarin gonderim kuyrugu ve gecikme metrikleri."""
+        return {
+            "fanout": self.fanout is not None,
+            "worker_id": self.fanout.worker_id if self.fanout is not None else None,
+            "connections": [sender.metrics() for sender in self.senders.values()],
+        }
 
 # Global connection manager
 manager = ConnectionManager()
@@ -131,6 +362,15 @@ async def websocket_endpoint(websocket: WebSocket, user_id: int):
         logger.error(f"WebSocket error for user {user_id}: {e}")
         manager.disconnect(user_id)
 
+@router.get("/metrics")
+async def websocket_metrics(
+    current_user=Depends(deps.get_current_active_superuser),
+) -> Dict[str, Any]:
+    """
+    WebSocket gonderim kuyruklarinin gecikme metrikleri (yalnizca bu worker).
+    """
+    return manager.get_metrics()
+
 # Utility functions for algorithm progress tracking
 async def update_algorithm_progress(user_id: int, algorithm_id: int, progress: float, 
                                   status: str, message: str = "", details: Dict[str, Any] = None):
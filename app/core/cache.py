@@ -1,5 +1,6 @@
 import redis
 from redis import asyncio as aioredis
+import asyncio
 import json
 import logging
 from typing import Any, Dict, List, Optional, Union
@@ -7,6 +8,7 @@ from datetime import timedelta
 from redis.exceptions import RedisError
 
 from app.core.config import settings
+from app.monitoring.logger import metrics_collector
 
 # Logging
 logger = logging.getLogger(__name__)
@@ -32,9 +34,14 @@ def get_redis_client():
     return redis_client
 
 
-async def init_redis_pool():
+async def init_redis_pool(timeout: Optional[float] = None):
     """
     Initialize Redis connection pool for async operations.
+
+    Args:
+        timeout: Upper bound (seconds) for the connection test; on timeout the
+            in-memory fallback is used. The ping runs in a thread so other
+            startup steps keep going meanwhile.
     """
     global redis_pool, redis_client
     
@@ -61,11 +68,12 @@ async def init_redis_pool():
         )
         
         # Test connection
-        redis_client.ping()
+        ping = asyncio.to_thread(redis_client.ping)
+        await (asyncio.wait_for(ping, timeout) if timeout else ping)
         logger.info(f"Redis bağlantı havuzu başlatıldı: {settings.REDIS_HOST}:{settings.REDIS_PORT}")
         return True
-    except RedisError as e:
-        logger.warning(f"Redis bağlantısı kurulamadı: {e}")
+    except (RedisError, asyncio.TimeoutError) as e:
+        logger.warning(f"Redis bağlantısı kurulamadı: {e!r}")
         # Create mock Redis client
         redis_client = MockRedis()
         redis_pool = MockRedisPool()
@@ -115,6 +123,7 @@ def get_cache(key: str) -> Optional[Any]:
     try:
         # Get data from Redis
         value = redis_client.get(key)
+        metrics_collector.record_cache_lookup("redis", bool(value))
         
         # Deserialize JSON if data exists
         if value:
@@ -206,6 +215,7 @@ async def get_cache_async(key: str) -> Optional[Any]:
     try:
         # Get data from Redis
         value = await redis_pool.get(key)
+        metrics_collector.record_cache_lookup("redis", bool(value))
         
         # Deserialize JSON if data exists
         if value:
@@ -313,21 +323,70 @@ class MockRedis:
         pass
 
 
+class MockPubSub:
+    """Bellek ici pub/sub aboneligi (redis.asyncio PubSub arayuzunun alt kumesi)."""
+
+    def __init__(self, pool: "MockRedisPool"):
+        self._pool = pool
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self.channels = set()
+
+    async def subscribe(self, *channels):
+        self.channels.update(channels)
+        self._pool._subscribers.add(self)
+
+    async def unsubscribe(self, *channels):
+        if channels:
+            self.channels.difference_update(channels)
+        else:
+            self.channels.clear()
+        if not self.channels:
+            self._pool._subscribers.discard(self)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        try:
+            if timeout:
+                return await asyncio.wait_for(self._queue.get(), timeout)
+            return self._queue.get_nowait()
+        except (asyncio.TimeoutError, asyncio.QueueEmpty):
+            return None
+
+    async def aclose(self):
+        await self.unsubscribe()
+
+    close = aclose
+
+
 class MockRedisPool:
     def __init__(self):
         self._cache = {}
         self._expires = {}
+        self._subscribers = set()
     
     async def get(self, key):
         if key in self._cache:
             return self._cache[key]
         return None
     
-    async def set(self, key, value, ex=None):
+    async def set(self, key, value, ex=None, nx=False, xx=False):
+        if (nx and key in self._cache) or (xx and key not in self._cache):
+            return None
         self._cache[key] = value
         if ex:
             self._expires[key] = ex
         return True
+
+    async def sadd(self, key, *members):
+        members_set = self._cache.setdefault(key, set())
+        before = len(members_set)
+        members_set.update(members)
+        return len(members_set) - before
+
+    async def smembers(self, key):
+        return set(self._cache.get(key, set()))
+
+    async def setex(self, key, time, value):
+        return await self.set(key, value, ex=time)
     
     async def expire(self, key, time):
         if key in self._cache:
@@ -368,6 +427,17 @@ class MockRedisPool:
     
     async def ping(self):
         return True
+    
+    async def publish(self, channel, message):
+        receivers = 0
+        for subscriber in list(self._subscribers):
+            if channel in subscriber.channels:
+                subscriber._queue.put_nowait({"type": "message", "channel": channel, "data": message})
+                receivers += 1
+        return receivers
+    
+    def pubsub(self):
+        return MockPubSub(self)
 
 
 class RedisCache:
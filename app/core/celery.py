@@ -1,6 +1,12 @@
+import logging
+
 from celery import Celery
+from celery.signals import celeryd_init
+from kombu import Queue
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 celery_app = Celery(
     "app",
     broker=settings.REDIS_URL,
@@ -8,12 +14,29 @@ celery_app = Celery(
     broker_connection_retry_on_startup=True
 )
 
+# Tanimli kuyruklar: -Q verilmeyen worker bunlarin hepsini dinler. Tek
+# worker'li kurulumda (docker-compose) algoritma isleri de tuketilir;
+# ayrik worker'lar -Q ile kuyruk secer.
+TASK_QUEUES = ("default", "algorithms", "algorithms_batch", "reports")
+
+celery_app.conf.task_default_queue = "default"
+celery_app.conf.task_queues = tuple(Queue(name) for name in TASK_QUEUES)
+
 celery_app.conf.task_routes = {
     "app.tasks.*": {"queue": "default"},
     "app.tasks.algorithms.*": {"queue": "algorithms"},
     "app.tasks.reports.*": {"queue": "reports"},
 }
 
+# Oncelik siniflari: etkilesimli isler "algorithms", toplu taramalar
+# "algorithms_batch" kuyruguna gider (app.services.job_service).
+# Redis transport'unda 0 en yuksek onceliktir.
+celery_app.conf.broker_transport_options = {
+    "priority_steps": list(range(10)),
+    "sep": ":",
+    "queue_order_strategy": "priority",
+}
+
 celery_app.conf.update(
     task_serializer="json",
     accept_content=["json"],
@@ -24,6 +47,79 @@ celery_app.conf.update(
     task_time_limit=3600,  # 1 saat
     worker_max_tasks_per_child=1000,
     worker_prefetch_multiplier=1,
+    # Worker coktugunde is kaybolmasin: mesaj is bitince onaylanir
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    task_default_priority=5,
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    task_eager_propagates=True,
 )
 
-celery_app.autodiscover_tasks(["app.tasks"]) 
\ No newline at end of file
+celery_app.autodiscover_tasks(["app.tasks"]) 
+
+
+# Rapor worker'inda (-Q reports) pool fork edilmeden once yuklenen rapor
+# modulleri (reportlab, matplotlib, openpyxl, pandas); API bunlari ilk rapor
+# isteginde yukler.
+REPORT_MODULES = (
+    "app.services.report",
+    "app.services.report_generator_service",
+    "app.services.chart_generator_service",
+    "app.services.planner_export_service",
+)
+
+
+def _queue_names(queues) -> list:
+    if isinstance(queues, str):
+        queues = queues.split(",")
+    return [str(queue).strip() for queue in queues or []]
+
+
+def _consumed_queues(queues, conf=None) -> list:
+    """
+    Worker'in dinledigi kuyruklar. -Q verilmediyse worker ``task_queues``
+    icindeki kuyruklari, o da tanimli degilse yalnizca varsayilan kuyrugu
+    dinler.
+    """
+    if queues:
+        return _queue_names(queues)
+    conf = conf or celery_app.conf
+    declared = [queue.name for queue in conf.task_queues or ()]
+    return declared or [conf.task_default_queue]
+
+
+def _serves_solver_queues(queues, conf=None) -> bool:
+    return any(queue.startswith("algorithms") for queue in _consumed_queues(queues, conf))
+
+
+@celeryd_init.connect
+def prewarm_solver_algorithms(sender=None, conf=None, options=None, **kwargs):
+    """
+    Solver worker'inda secili algoritma modullerini pool fork edilmeden once
+    yukle (cocuk surecler miras alir). Yalnizca CRUD/rapor kuyruklarini
+    dinleyen worker'lar bu maliyeti odemez.
+    """
+    from app.algorithms.registry import parse_names, prewarm
+
+    names = parse_names(settings.ALGORITHM_PREWARM)
+    if not names or not _serves_solver_queues((options or {}).get("queues"), conf):
+        return
+    timings = prewarm(names)
+    failed = [name for name, seconds in timings.items() if seconds is None]
+    logger.info("Algoritmalar onceden yuklendi: %s", timings)
+    if failed:
+        logger.warning("On yukleme basarisiz: %s", ", ".join(failed))
+
+
+@celeryd_init.connect
+def prewarm_report_modules(sender=None, conf=None, options=None, **kwargs):
+    """Yalnizca rapor kuyrugunu acikca dinleyen worker'da rapor modullerini yukle."""
+    import importlib
+
+    if "reports" not in _queue_names((options or {}).get("queues")):
+        return
+    for module_path in REPORT_MODULES:
+        try:
+            importlib.import_module(module_path)
+        except Exception as exc:
+            logger.warning("Rapor modulu yuklenemedi: %s: %s", module_path, exc)
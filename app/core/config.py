@@ -55,6 +55,27 @@ class Settings(BaseSettings):
     REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
     REDIS_PASSWORD: str = os.getenv("REDIS_PASSWORD", "")
     REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
+
+    # Algoritma sonuc cache'i (girdi parmak izi + algoritma + parametreler)
+    RESULT_CACHE_ENABLED: bool = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+    RESULT_CACHE_TTL: int = int(os.getenv("RESULT_CACHE_TTL", "1800"))
+    RESULT_CACHE_MAX_ENTRIES: int = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "32"))
+
+    # Solver checkpoint'leri (GA/SA/NSGA-II/ACO arama durumu, "continue" icin)
+    CHECKPOINT_ENABLED: bool = os.getenv("CHECKPOINT_ENABLED", "true").lower() == "true"
+    CHECKPOINT_DIR: str = os.getenv(
+        "CHECKPOINT_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "static", "checkpoints")
+    )
+    CHECKPOINT_INTERVAL: float = float(os.getenv("CHECKPOINT_INTERVAL", "30"))
+    CHECKPOINT_MAX_FILES: int = int(os.getenv("CHECKPOINT_MAX_FILES", "200"))
+
+    # Istege bagli ornekleyen profiler (profile=true): ornekleme araligi ve profil dosyalari
+    PROFILE_SAMPLE_INTERVAL: float = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.01"))
+    PROFILE_TOP_N: int = int(os.getenv("PROFILE_TOP_N", "20"))
+    PROFILE_DIR: str = os.getenv(
+        "PROFILE_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "static", "profiles")
+    )
+    PROFILE_MAX_FILES: int = int(os.getenv("PROFILE_MAX_FILES", "100"))
     
     # Email ayarları
     SMTP_TLS: bool = True
@@ -69,6 +90,20 @@ class Settings(BaseSettings):
     # Celery ayarları
     CELERY_BROKER_URL: str = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/1")
     CELERY_RESULT_BACKEND: str = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/2")
+    # Testlerde/gelistirmede isler broker'a gitmeden ayni surecte calisir
+    CELERY_TASK_ALWAYS_EAGER: bool = os.getenv("CELERY_TASK_ALWAYS_EAGER", "false").lower() == "true"
+    # Arka plan is kayitlarinin (durum/ilerleme) Redis'te tutulma suresi
+    JOB_TTL_SECONDS: int = int(os.getenv("JOB_TTL_SECONDS", "86400"))
+    # API acilis adimlarinin (Redis, i18n, DB, Celery yoklamasi) her biri icin zaman asimi
+    STARTUP_STEP_TIMEOUT: float = float(os.getenv("STARTUP_STEP_TIMEOUT", "3"))
+    # /health'teki Celery worker yoklamasinin onbellek suresi (saniye)
+    HEALTH_CELERY_TTL: float = float(os.getenv("HEALTH_CELERY_TTL", "30"))
+    # Solver worker'inda (algorithms* kuyrugu) acilista yuklenecek algoritmalar:
+    # virgulle ayrilmis AlgorithmType degerleri ya da "all" (bos = ilk kullanimda)
+    ALGORITHM_PREWARM: str = os.getenv("ALGORITHM_PREWARM", "")
+
+    # Prometheus: coklu uvicorn worker'inda metrik dosyalarinin dizini (bos = tek surec)
+    PROMETHEUS_MULTIPROC_DIR: str = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
     
     # Report ayarları
     REPORT_DIR: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static", "reports")
@@ -89,6 +124,8 @@ class Settings(BaseSettings):
     
     # Parallel processing settings
     MAX_WORKERS: int = int(os.getenv("MAX_WORKERS", "4"))
+    # Process pool size for batch plan scoring (/reports/metrics/compare); <= 1 scores in-thread
+    METRIC_WORKERS: int = int(os.getenv("METRIC_WORKERS", "4"))
     
     # Jury Refinement Configuration
     JURY_REFINEMENT_ENABLED: bool = True
@@ -0,0 +1,96 @@
+"""
+Uygulama acilis adimlari ve hafif saglik durumu.
+
+Birbirinden bagimsiz acilis adimlari (Redis, i18n, veritabani)
+``run_startup_steps`` ile ayni anda ve her biri kendi zaman asimiyla calisir;
+yavas ya da erisilemeyen bir servis digerlerini ve API'nin ilk istegi
+karsilamasini bekletmez. Zaman asimina ugrayan veya hata veren adim
+uygulamayi durdurmaz, sonucu ``app.state.startup`` altinda raporlanir.
+
+``CeleryHealth``: ``/health`` icin Celery worker yoklamasini onbellekler.
+Yoklama (broker erisilemezse saniyeler surebilir) istegi bekletmez; sonuc
+``ttl`` saniyeden eskiyse arka planda yenilenir.
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+StartupStep = Tuple[Callable[[], Awaitable[Any]], float]
+
+
+async def run_step(name: str, func: Callable[[], Awaitable[Any]], timeout: float) -> Dict[str, Any]:
+    """Tek adimi zaman asimiyla calistir; hatalari sonuca yaz, yukari firlatma."""
+    started = time.perf_counter()
+    outcome: Dict[str, Any] = {"ok": False, "result": None, "error": None}
+    try:
+        outcome["result"] = await asyncio.wait_for(func(), timeout)
+        outcome["ok"] = True
+    except asyncio.TimeoutError:
+        outcome["error"] = f"timed out after {timeout:g}s"
+        logger.warning("Acilis adimi zaman asimina ugradi: %s (%ss)", name, timeout)
+    except Exception as exc:
+        outcome["error"] = str(exc)
+        logger.warning("Acilis adimi basarisiz: %s: %s", name, exc)
+    outcome["seconds"] = round(time.perf_counter() - started, 3)
+    return outcome
+
+
+async def run_startup_steps(steps: Dict[str, StartupStep]) -> Dict[str, Dict[str, Any]]:
+    """
+    Adimlari ayni anda calistir.
+
+    Args:
+        steps: Ad -> (coroutine ureten fonksiyon, zaman asimi saniye).
+
+    Returns:
+        Ad -> ``ok``, ``result``, ``error``, ``seconds``.
+    """
+    names = list(steps)
+    outcomes = await asyncio.gather(*(run_step(name, *steps[name]) for name in names))
+    return dict(zip(names, outcomes))
+
+
+class CeleryHealth:
+    """
+    Onbellekli Celery worker yoklamasi.
+
+    Args:
+        ping: Worker cevaplarini donduren senkron fonksiyon (``control.ping``).
+        ttl: Sonucun taze sayildigi sure (saniye).
+        timeout: Worker cevaplari icin beklenecek sure (saniye).
+    """
+
+    def __init__(self, ping: Callable[..., Any], ttl: float = 30.0, timeout: float = 1.0):
+        self._ping = ping
+        self.ttl = ttl
+        self.timeout = timeout
+        self.alive: Optional[bool] = None
+        self.checked_at: Optional[float] = None
+        self._refreshing: Optional[asyncio.Task] = None
+
+    async def refresh(self) -> bool:
+        """Worker'lari simdi yokla (thread'de; event loop'u bloklamaz)."""
+        try:
+            replies = await asyncio.to_thread(self._ping, timeout=self.timeout)
+            self.alive = bool(replies)
+        except Exception:
+            self.alive = False
+        self.checked_at = time.monotonic()
+        return self.alive
+
+    def status(self) -> Optional[bool]:
+        """
+        Son bilinen durum (None = henuz yoklanmadi). Sonuc eskiyse yenileme
+        arka planda baslatilir; cagiran beklemez.
+        """
+        stale = self.checked_at is None or time.monotonic() - self.checked_at > self.ttl
+        if stale and (self._refreshing is None or self._refreshing.done()):
+            try:
+                self._refreshing = asyncio.get_running_loop().create_task(self.refresh())
+            except RuntimeError:
+                # Event loop disinda (senkron cagri): yalnizca bilinen durumu don
+                pass
+        return self.alive
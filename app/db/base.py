@@ -35,6 +35,7 @@ from app.models.project import Project  # noqa
 from app.models.classroom import Classroom  # noqa
 from app.models.timeslot import TimeSlot  # noqa
 from app.models.schedule import Schedule  # noqa
+from app.models.input_snapshot import InputSnapshot  # noqa
 from app.models.algorithm import AlgorithmRun  # noqa
 from app.models.user import User  # noqa
 from app.models.config import DynamicConfig  # noqa 
\ No newline at end of file
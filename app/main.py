@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.websockets import WebSocket
 import os
+import asyncio
 import datetime
 import logging
 from contextlib import asynccontextmanager
@@ -15,6 +16,7 @@ from app.core.config import settings
 from app.api.middleware import setup_middleware
 from app.core.celery import celery_app
 from app.core.cache import init_redis_pool
+from app.core.startup import CeleryHealth, run_startup_steps
 from app.i18n import init_i18n
 from app.core.error_handling import (
     optimization_planner_exception_handler,
@@ -24,15 +26,18 @@ from app.core.error_handling import (
     generic_exception_handler
 )
 from app.monitoring.logger import structured_logger, metrics_collector
+from app.monitoring import prometheus
 
+# /health icin onbellekli worker yoklamasi (istek broker'i beklemez)
+celery_health = CeleryHealth(celery_app.control.ping, ttl=settings.HEALTH_CELERY_TTL)
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
+
+async def init_cache_and_fanout() -> bool:
     """
-    Initialize services on application startup and cleanup on shutdown.
+    Redis connection and the WebSocket fan-out that depends on it.
     """
     # Initialize Redis connection
-    redis_connected = await init_redis_pool()
+    redis_connected = await init_redis_pool(timeout=settings.STARTUP_STEP_TIMEOUT)
     if redis_connected:
         print("Redis baglantisi basariyla kuruldu.")
         print(f"   Host: {settings.REDIS_HOST}:{settings.REDIS_PORT}")
@@ -40,49 +45,20 @@ async def lifespan(app: FastAPI):
         print("Redis baglantisi kurulamadi, bellek ici onbellek kullaniliyor.")
         print("   Not: Bu durum performansi etkileyebilir ve yalnizca gelistirme ortami icin onerilir.")
 
-    # Initialize i18n (internationalization)
-    init_i18n()
-    print("Coklu dil destegi baslatildi.")
-    
-    # Initialize structured logging
-    print("Structured logging initialized.")
-    
-    # Filter out /api/v1/process requests from ALL uvicorn logs
-    class ProcessEndpointFilter(logging.Filter):
-        """Filter to suppress ALL logs for /api/v1/process endpoint"""
-        def filter(self, record):
-            # Filter out any log containing /api/v1/process in any attribute
-            message_str = ""
-            if hasattr(record, 'message'):
-                message_str = str(record.message)
-            if hasattr(record, 'msg'):
-                message_str += str(record.msg)
-            if hasattr(record, 'getMessage'):
-                message_str += record.getMessage()
-            
-            # Check all string attributes
-            for attr in ['message', 'msg', 'args', 'pathname', 'filename', 'funcName']:
-                if hasattr(record, attr):
-                    attr_value = str(getattr(record, attr))
-                    if '/api/v1/process' in attr_value:
-                        return False
-            
-            if '/api/v1/process' in message_str:
-                return False
-            
-            return True
-    
-    # Apply filter to ALL uvicorn loggers
-    uvicorn_access_logger = logging.getLogger("uvicorn.access")
-    uvicorn_access_logger.addFilter(ProcessEndpointFilter())
-    
-    # Also apply to root uvicorn logger
-    uvicorn_logger = logging.getLogger("uvicorn")
-    uvicorn_logger.addFilter(ProcessEndpointFilter())
-    
-    print("Uvicorn log filter applied for /api/v1/process endpoint.")
-    
-    # Auto-create notification_logs table if it doesn't exist
+    # WebSocket mesajlarini worker'lar arasinda Redis pub/sub ile dagit
+    from app.core import cache as cache_module
+    from app.api.v1.endpoints.websocket import manager as websocket_manager
+    if redis_connected and await asyncio.wait_for(
+        websocket_manager.start_fanout(cache_module.redis_pool), settings.STARTUP_STEP_TIMEOUT
+    ):
+        print("WebSocket fan-out (Redis pub/sub) baslatildi.")
+    return redis_connected
+
+
+async def ensure_notification_logs_table() -> None:
+    """
+    Auto-create notification_logs table if it doesn't exist.
+    """
     try:
         from sqlalchemy import text
         from app.core.database import async_engine
@@ -165,12 +141,92 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"⚠ Warning: Could not auto-create notification_logs table: {str(e)}")
         print("   You can manually run migration at /api/v1/notification/migrate")
+
+
+async def init_translations() -> None:
+    """
+    Initialize i18n (internationalization) off the event loop.
+    """
+    await asyncio.to_thread(init_i18n)
+    print("Coklu dil destegi baslatildi.")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Initialize services on application startup and cleanup on shutdown.
+    """
+    # Prometheus: sorgu sureleri ve thread havuzu kapasitesi
+    from app.db.base import engine as session_engine
+    from app.core.database import engine as sync_engine, async_engine
+    for db_engine in (session_engine, async_engine, sync_engine):
+        prometheus.instrument_engine(db_engine)
+    prometheus.init_process()
+
+    # Initialize structured logging
+    print("Structured logging initialized.")
     
+    # Filter out /api/v1/process requests from ALL uvicorn logs
+    class ProcessEndpointFilter(logging.Filter):
+        """Filter to suppress ALL logs for /api/v1/process endpoint"""
+        def filter(self, record):
+            # Filter out any log containing /api/v1/process in any attribute
+            message_str = ""
+            if hasattr(record, 'message'):
+                message_str = str(record.message)
+            if hasattr(record, 'msg'):
+                message_str += str(record.msg)
+            if hasattr(record, 'getMessage'):
+                message_str += record.getMessage()
+            
+            # Check all string attributes
+            for attr in ['message', 'msg', 'args', 'pathname', 'filename', 'funcName']:
+                if hasattr(record, attr):
+                    attr_value = str(getattr(record, attr))
+                    if '/api/v1/process' in attr_value:
+                        return False
+            
+            if '/api/v1/process' in message_str:
+                return False
+            
+            return True
+    
+    # Apply filter to ALL uvicorn loggers
+    uvicorn_access_logger = logging.getLogger("uvicorn.access")
+    uvicorn_access_logger.addFilter(ProcessEndpointFilter())
+    
+    # Also apply to root uvicorn logger
+    uvicorn_logger = logging.getLogger("uvicorn")
+    uvicorn_logger.addFilter(ProcessEndpointFilter())
+    
+    print("Uvicorn log filter applied for /api/v1/process endpoint.")
+    
+    # Bagimsiz acilis adimlari ayni anda ve her biri kendi zaman asimiyla calisir;
+    # yavas/erisilemeyen bir servis API'nin acilmasini bekletmez. Redis adimi
+    # ping ve fan-out icin ayri sureler kullandigindan iki kat sure alir.
+    timeout = settings.STARTUP_STEP_TIMEOUT
+    app.state.startup = await run_startup_steps({
+        "redis": (init_cache_and_fanout, 2 * timeout),
+        "i18n": (init_translations, timeout),
+        "database": (ensure_notification_logs_table, timeout),
+    })
+    print("Acilis adimlari: " + ", ".join(
+        f"{name} {'ok' if outcome['ok'] else 'FAILED'} ({outcome['seconds']}s)"
+        for name, outcome in app.state.startup.items()
+    ))
+    # Celery yoklamasi broker erisilemezse saniyeler surebilir: arka planda baslat
+    celery_health.status()
+
     # Execute startup code
     yield
     
     # Execute shutdown code (resource cleanup)
     print("Uygulama kapatiliyor, kaynaklar temizleniyor...")
+    from app.api.v1.endpoints.websocket import manager as websocket_manager
+    await websocket_manager.stop_fanout()
+    from app.services.performance_metrics import shutdown_metric_executor
+    await asyncio.to_thread(shutdown_metric_executor)
+    prometheus.mark_process_dead()
 
 
 # Create FastAPI application
@@ -315,15 +371,13 @@ async def test_db():
         }
 
 @app.get("/health", status_code=status.HTTP_200_OK)
-def health_check():
+async def health_check():
     """
-    Health check endpoint.
+    Health check endpoint. Celery status is the last cached ping result
+    (refreshed in the background), so the probe never waits on the broker.
     """
-    try:
-        celery_status = celery_app.control.ping() is not None
-    except:
-        celery_status = False
-        
+    celery_status = celery_health.status() is True
+
     return {
         "status": "healthy",
         "timestamp": datetime.datetime.now().isoformat(),
@@ -335,10 +389,20 @@ def health_check():
     }
 
 
-@app.get("/metrics")
+@app.get("/metrics", include_in_schema=False)
 def get_metrics():
     """
-    Get application metrics.
+    Prometheus metrics (aggregated across worker processes in multiprocess mode).
+    """
+    from starlette.responses import Response
+    body, content_type = prometheus.render_latest()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/metrics/summary")
+def get_metrics_summary():
+    """
+    Get application metrics summary (this process only).
     """
     return {
         "success": True,
@@ -8,6 +8,7 @@ from app.models.project import Project
 from app.models.classroom import Classroom
 from app.models.timeslot import TimeSlot
 from app.models.schedule import Schedule
+from app.models.input_snapshot import InputSnapshot
 from app.models.algorithm import AlgorithmRun, AlgorithmType
 from app.models.user import User, UserRole
 from app.models.student import Student, project_student, student_keyword
@@ -21,6 +22,7 @@ __all__ = [
     "Classroom",
     "TimeSlot",
     "Schedule",
+    "InputSnapshot",
     "AlgorithmRun",
     "AlgorithmType",
     "User",
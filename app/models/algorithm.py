@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, JSON, DateTime, Enum, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, JSON, DateTime, Enum, ForeignKey, LargeBinary
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 import enum
@@ -44,11 +44,16 @@ class AlgorithmRun(Base):
     id = Column(Integer, primary_key=True, index=True)
     algorithm_type = Column(Enum(AlgorithmType, native_enum=True), nullable=False)
     parameters = Column(JSON)  # Algoritma parametreleri
-    data = Column(JSON)  # Algoritma giriş verisi
+    data = deferred(Column(JSON))  # Eski kayıtlar: tam giriş verisi (yeni kayıtlarda input_hash)
+    input_hash = Column(String(64), ForeignKey("input_snapshots.content_hash"), nullable=True, index=True)
     status = Column(String, default="running")  # running, completed, failed
-    result = Column(JSON)  # Sonuç detayları
+    result = deferred(Column(JSON))  # Eski kayıtlar: sonuç detayları (yeni kayıtlarda result_payload)
+    result_payload = deferred(Column(LargeBinary))  # Tekilleştirilmiş + sıkıştırılmış sonuç
+    result_encoding = Column(String(16))  # "zstd" / "gzip" (None = eski JSON kolon)
+    result_size = Column(Integer)  # Sıkıştırılmamış sonuç boyutu (byte)
     error = Column(String)  # Hata mesajı
     execution_time = Column(Float)  # ms cinsinden çalışma süresi
+    resource_profile = Column(JSON)  # Aşama bazlı duvar/CPU süresi, tepe RSS, değerlendirme sayısı, son maliyet
     started_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True))
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Added user_id
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+
+class InputSnapshot(Base):
+    """
+    Algoritma giris verisinin icerik adresli (content-addressed) kopyasi.
+
+    Ayni giris verisi (projeler, hocalar, sinif ve zaman dilimleri) icin tek
+    satir tutulur; ``AlgorithmRun.input_hash`` bu satira referans verir.
+    """
+    __tablename__ = "input_snapshots"
+
+    content_hash = Column(String(64), primary_key=True)  # Kanonik JSON'un SHA-256 ozeti
+    payload = Column(LargeBinary, nullable=False)  # Sikistirilmis JSON
+    encoding = Column(String(16), nullable=False)  # "zstd" veya "gzip"
+    size_bytes = Column(Integer)  # Sikistirilmamis JSON boyutu
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<InputSnapshot {self.content_hash[:12]}>"
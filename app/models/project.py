@@ -47,7 +47,7 @@ class Project(Base):
     
     # Proje açıklamasına göre 3 kişilik katılımcı sistemi
     # 1. kişi: Zorunlu olarak hoca (sorumlu)
-    responsible_instructor_id = Column(Integer, ForeignKey("instructors.id"), nullable=False)
+    responsible_instructor_id = Column(Integer, ForeignKey("instructors.id"), nullable=False, index=True)
     
     # Database'de olmayan kolonlar kaldırıldı
     
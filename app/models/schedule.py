@@ -8,9 +8,9 @@ class Schedule(Base):
     __tablename__ = "schedules"
     
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
-    classroom_id = Column(Integer, ForeignKey("classrooms.id"), nullable=False)
-    timeslot_id = Column(Integer, ForeignKey("timeslots.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False, index=True)
+    classroom_id = Column(Integer, ForeignKey("classrooms.id"), nullable=False, index=True)
+    timeslot_id = Column(Integer, ForeignKey("timeslots.id"), nullable=False, index=True)
     is_makeup = Column(Boolean, default=False)  # True: bütünleme, False: final
     instructors = Column(JSON, nullable=True)  # Jüri üyeleri (instructor ID'leri array)
     
@@ -10,6 +10,7 @@ from pathlib import Path
 import sys
 
 from app.core.config import settings
+from app.monitoring import prometheus
 
 
 class JSONFormatter(logging.Formatter):
@@ -136,6 +137,12 @@ class MetricsCollector:
         if status_code >= 400:
             self.metrics["error_count"] += 1
     
+    def record_request(self, method: str, route: str, status_code: int, duration: float):
+        """Record a finished HTTP request (route template, not raw path)."""
+        self.increment_request_count(route, status_code)
+        self.record_response_time(duration)
+        prometheus.observe_request(method, route, status_code, duration)
+
     def record_response_time(self, duration: float):
         """Record response time."""
         self.metrics["response_times"].append(duration)
@@ -143,8 +150,10 @@ class MetricsCollector:
         if len(self.metrics["response_times"]) > 1000:
             self.metrics["response_times"] = self.metrics["response_times"][-1000:]
     
-    def record_algorithm_run(self, algorithm_type: str, success: bool, duration: float):
+    def record_algorithm_run(self, algorithm_type: str, success: bool, duration: float,
+                             classrooms: int = 0):
         """Record algorithm execution."""
+        prometheus.observe_solver_run(algorithm_type, classrooms, "success" if success else "failed", duration)
         if algorithm_type not in self.metrics["algorithms_run"]:
             self.metrics["algorithms_run"][algorithm_type] = {
                 "total": 0,
@@ -170,6 +179,10 @@ class MetricsCollector:
         if len(algo_metrics["durations"]) > 100:
             algo_metrics["durations"] = algo_metrics["durations"][-100:]
     
+    def record_cache_lookup(self, cache: str, hit: bool):
+        """Record a cache read."""
+        prometheus.count_cache_lookup(cache, hit)
+
     def record_optimization_result(self, algorithm_type: str, fitness_score: float, duration: float):
         """Record optimization result."""
         result = {
@@ -0,0 +1,206 @@
+"""
+Prometheus metrikleri (``/metrics``).
+
+Coklu uvicorn worker'i ile calisirken ``PROMETHEUS_MULTIPROC_DIR`` ayarlanmalidir:
+her surec metriklerini bu dizindeki mmap dosyalarina yazar ve ``/metrics``
+istegi hangi worker'a duserse dussun tum sureclerin toplamini dondurur.
+Dizin uygulama baslamadan once bos olmalidir (ornegin baslatma betiginde
+temizlenir). Ayar bos ise metrikler surec icindeki varsayilan registry'dedir.
+
+Kuyruk derinligi surec disi bir degerdir; her scrape'te Redis'ten okunur.
+"""
+from typing import Any, Iterable, Optional, Tuple
+import logging
+import os
+import time
+
+from app.core.config import settings
+
+# prometheus_client deger sinifini import aninda secer; ayar .env'den geldiyse
+# ortam degiskenini ondan once kur
+if settings.PROMETHEUS_MULTIPROC_DIR and not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = settings.PROMETHEUS_MULTIPROC_DIR
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# Celery kuyruklari (app.core.celery.task_routes ve job_service.PRIORITY_ROUTES)
+CELERY_QUEUES = ("algorithms", "algorithms_batch", "reports", "default")
+# Redis transport oncelik adimlari: 0 -> "kuyruk", n -> "kuyruk:n"
+PRIORITY_STEPS = range(10)
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SOLVER_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP istek suresi (route sablonuna gore)",
+    ("method", "route", "status"), buckets=REQUEST_BUCKETS,
+)
+SOLVER_RUN_DURATION = Histogram(
+    "solver_run_duration_seconds", "Solver kosu suresi",
+    ("algorithm", "classrooms", "status"), buckets=SOLVER_BUCKETS,
+)
+SOLVER_THREADS_BUSY = Gauge(
+    "solver_threads_busy", "Solver calistiran mesgul worker thread sayisi",
+    multiprocess_mode="livesum",
+)
+SOLVER_THREADS_CAPACITY = Gauge(
+    "solver_threads_capacity", "Solver'larin kostugu varsayilan thread havuzu kapasitesi",
+    multiprocess_mode="livesum",
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache okumalari (hit/miss)", ("cache", "result"),
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Veritabani sorgu suresi", ("operation",), buckets=DB_BUCKETS,
+)
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def observe_request(method: str, route: str, status: int, duration: float) -> None:
+    HTTP_REQUEST_DURATION.labels(method, route, str(status)).observe(duration)
+
+
+def observe_solver_run(algorithm: str, classrooms: int, status: str, duration: float) -> None:
+    SOLVER_RUN_DURATION.labels(algorithm, str(classrooms), status).observe(duration)
+
+
+def count_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+class track_solver_thread:
+    """Solver thread'inin mesgul oldugu sureyi ``solver_threads_busy``'ye yansitir."""
+
+    def __enter__(self) -> "track_solver_thread":
+        SOLVER_THREADS_BUSY.inc()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        SOLVER_THREADS_BUSY.dec()
+
+
+# -- veritabani ------------------------------------------------------------
+
+def _operation(statement: str) -> str:
+    head = statement.lstrip().split(None, 1)
+    return head[0].upper() if head else "OTHER"
+
+
+def instrument_engine(engine: Any) -> None:
+    """
+    SQLAlchemy engine'ine sorgu suresi olaylarini bagla (async engine'lerde
+    ``sync_engine`` kullanilir). Ayni engine'e ikinci kez baglanmaz.
+    """
+    from sqlalchemy import event
+
+    target = getattr(engine, "sync_engine", engine)
+    if getattr(target, "_prometheus_instrumented", False):
+        return
+
+    @event.listens_for(target, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(target, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("_query_start")
+        if starts:
+            DB_QUERY_DURATION.labels(_operation(statement)).observe(time.perf_counter() - starts.pop())
+
+    @event.listens_for(target, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("_query_start"):
+            conn.info["_query_start"].pop()
+
+    target._prometheus_instrumented = True
+
+
+# -- kuyruk derinligi --------------------------------------------------------
+
+def queue_names(queue: str) -> Tuple[str, ...]:
+    return tuple(queue if step == 0 else f"{queue}:{step}" for step in PRIORITY_STEPS)
+
+
+class QueueDepthCollector:
+    """
+    Celery kuyruklarindaki bekleyen mesaj sayisini scrape aninda Redis'ten okur.
+    Redis'e ulasilamazsa metrik yayinlanmaz (scrape basarisiz olmaz).
+    """
+
+    def __init__(self, client: Any = None, queues: Iterable[str] = CELERY_QUEUES):
+        self._client = client
+        self.queues = tuple(queues)
+
+    def _redis(self) -> Any:
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=1, socket_connect_timeout=1)
+        return self._client
+
+    def describe(self):
+        # Kayit sirasinda Redis'e gidilmesin
+        yield GaugeMetricFamily("celery_queue_depth", "Celery kuyrugunda bekleyen mesaj", labels=["queue"])
+
+    def collect(self):
+        try:
+            client = self._redis()
+            pipe = client.pipeline()
+            for queue in self.queues:
+                for name in queue_names(queue):
+                    pipe.llen(name)
+            lengths = pipe.execute()
+        except Exception as e:
+            logger.debug(f"Queue depth unavailable: {e}")
+            return
+        family = GaugeMetricFamily("celery_queue_depth", "Celery kuyrugunda bekleyen mesaj", labels=["queue"])
+        steps = len(PRIORITY_STEPS)
+        for index, queue in enumerate(self.queues):
+            family.add_metric([queue], float(sum(lengths[index * steps:(index + 1) * steps])))
+        yield family
+
+
+queue_depth_collector = QueueDepthCollector()
+if not multiprocess_enabled():
+    REGISTRY.register(queue_depth_collector)
+
+
+# -- disa aktarim ------------------------------------------------------------
+
+def build_registry() -> CollectorRegistry:
+    """Scrape registry'si: multiprocess modda tum sureclerin toplami."""
+    if not multiprocess_enabled():
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(queue_depth_collector)
+    return registry
+
+
+def render_latest(registry: Optional[CollectorRegistry] = None) -> Tuple[bytes, str]:
+    """(govde, content type)"""
+    return generate_latest(registry or build_registry()), CONTENT_TYPE_LATEST
+
+
+def init_process() -> None:
+    """
+    Surec basina bir kez: thread havuzu kapasitesini yayinla. Solver'lar
+    ``asyncio.to_thread`` ile varsayilan executor'da kosar; boyutu
+    ThreadPoolExecutor varsayilanidir.
+    """
+    SOLVER_THREADS_CAPACITY.set(min(32, (os.cpu_count() or 1) + 4))
+
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    """Surec kapanirken canli gauge dosyalarini birak (multiprocess mod)."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid or os.getpid())
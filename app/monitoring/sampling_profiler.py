@@ -0,0 +1,147 @@
+"""
+Istatistiksel (ornekleyen) profiler.
+
+Ayri bir daemon thread, hedef thread'in cagri yiginini ``sys._current_frames()``
+ile sabit araliklarla okur ve ayni yiginlari sayar. Hedef koda hicbir kanca
+eklenmez; maliyet ornekleme hiziyla sinirlidir (varsayilan 100 Hz), bu yuzden
+uretimdeki tek bir kosu icin acilabilir.
+
+Cikti:
+- ``collapsed()``: flamegraph.pl / speedscope / inferno ile uyumlu
+  "cerceve;cerceve;... sayi" satirlari (kok solda).
+- ``top(n)``: en sicak fonksiyonlar; ``self`` ornekleri (yiginin tepesinde)
+  ve ``total`` ornekleri (yiginin herhangi bir yerinde).
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from collections import Counter
+import sys
+import threading
+import time
+
+DEFAULT_INTERVAL = 0.01
+MAX_DEPTH = 128
+
+Stack = Tuple[str, ...]
+
+
+def frame_label(frame: Any) -> str:
+    """``modul:Sinif.fonksiyon`` (collapsed formatini bozan karakterler temizlenir)."""
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{module}:{name}".replace(";", ",").replace(" ", "_")
+
+
+class SamplingProfiler:
+    """
+    Tek bir thread'i ornekleyen profiler.
+
+    Args:
+        interval: Ornekleme araligi (saniye).
+        thread_id: Orneklenecek thread (varsayilan: ``start`` cagiran thread).
+        max_depth: Yigin basina en fazla cerceve (derin yiginlar koke dogru kesilir).
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, thread_id: Optional[int] = None,
+                 max_depth: int = MAX_DEPTH):
+        self.interval = max(0.001, float(interval))
+        self.thread_id = thread_id
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        if self._thread is not None:
+            return self
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        """Orneklemeyi durdur (birden fazla kez cagrilabilir)."""
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+        if self.started_at is not None and not self.duration:
+            self.duration = time.perf_counter() - self.started_at
+        return self
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        target = self.thread_id
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(target)
+            if frame is None:
+                # Hedef thread bitti
+                break
+            self.stacks[self._walk(frame)] += 1
+            self.samples += 1
+
+    def _walk(self, frame: Any) -> Stack:
+        labels: List[str] = []
+        while frame is not None and len(labels) < self.max_depth:
+            labels.append(frame_label(frame))
+            frame = frame.f_back
+        labels.reverse()
+        return tuple(labels)
+
+    # -- cikti ---------------------------------------------------------------
+
+    def collapsed(self) -> str:
+        """Flamegraph uyumlu collapsed stack metni."""
+        return "\n".join(f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+    def top(self, n: int = 20) -> List[Dict[str, Any]]:
+        """En cok ornek alan ``n`` fonksiyon (self ornek sayisina gore)."""
+        return hot_functions(self.stacks, self.samples, n)
+
+    def to_dict(self, top_n: int = 20) -> Dict[str, Any]:
+        """Saklanacak tam profil (collapsed yiginlar dahil)."""
+        return {
+            "interval": self.interval,
+            "samples": self.samples,
+            "duration": round(self.duration, 4),
+            "top": self.top(top_n),
+            "stacks": [[list(stack), count] for stack, count in self.stacks.most_common()],
+        }
+
+
+def hot_functions(stacks: Counter, samples: int, n: int = 20) -> List[Dict[str, Any]]:
+    self_counts: Counter = Counter()
+    total_counts: Counter = Counter()
+    for stack, count in stacks.items():
+        if not stack:
+            continue
+        self_counts[stack[-1]] += count
+        for label in set(stack):
+            total_counts[label] += count
+    ranked = sorted(total_counts, key=lambda label: (-self_counts[label], -total_counts[label], label))
+    denominator = max(1, samples)
+    return [
+        {
+            "function": label,
+            "self": self_counts[label],
+            "self_pct": round(100.0 * self_counts[label] / denominator, 2),
+            "total": total_counts[label],
+            "total_pct": round(100.0 * total_counts[label] / denominator, 2),
+        }
+        for label in ranked[:n]
+    ]
+
+
+def collapsed_from_dict(profile: Dict[str, Any]) -> str:
+    """``to_dict`` ciktisindan collapsed stack metni."""
+    return "\n".join(f"{';'.join(stack)} {count}" for stack, count in profile.get("stacks", [])) + "\n"
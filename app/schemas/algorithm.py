@@ -21,7 +21,7 @@ class AlgorithmRunBase(BaseModel):
         return v
 
 class AlgorithmRunCreate(AlgorithmRunBase):
-    pass
+    input_hash: Optional[str] = None  # input_snapshots.content_hash
 
 class AlgorithmRunResponse(BaseModel):
     id: int
@@ -34,6 +34,8 @@ class AlgorithmRunResponse(BaseModel):
     schedule: Optional[List[Dict[str, Any]]] = None
     assignments: Optional[List[Dict[str, Any]]] = None
     solution: Optional[List[Dict[str, Any]]] = None
+    cache: Optional[Dict[str, Any]] = None  # Sonuc cache'i: hit / tier / fingerprint
+    single_flight: Optional[Dict[str, Any]] = None  # Katilinan kosu: {"role": "joiner", "joined_run_id": X}
 
 class AlgorithmRunUpdate(BaseModel):
     status: Optional[str] = None
@@ -41,6 +43,7 @@ class AlgorithmRunUpdate(BaseModel):
     error: Optional[str] = None
     execution_time: Optional[float] = None
     completed_at: Optional[datetime] = None
+    resource_profile: Optional[Dict[str, Any]] = None  # app.algorithms.resource_profile.RunProfile
 
 class AlgorithmRun(AlgorithmRunBase):
     id: int
@@ -1,19 +1,42 @@
 """
 Algorithm service module for managing algorithm operations.
 """
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import asyncio
 import logging
 import time
 import math
+import copy
+import contextvars
 from datetime import datetime
 
 from app.models.algorithm import AlgorithmType, AlgorithmRun
 from app.schemas.algorithm import AlgorithmRunCreate, AlgorithmRunUpdate
 from app.crud.algorithm import crud_algorithm
 from app.algorithms.factory import AlgorithmFactory
+from app.algorithms.anytime import (
+    LoopProgressForwarder, SolverControl, STOP_REASON_DEADLINE, use_control
+)
+from app.algorithms.warm_start import WARM_START_KEY
 from app.db.base import get_db
 from app.i18n import translate
 from app.services.gap_free_scheduler import GapFreeScheduler
+from app.services.schedule_postprocessing import PostProcessingPipeline
+from app.services.checkpoint_store import checkpoint_store
+from app.services.profile_store import profile_store
+from app.services.run_storage import (
+    content_hash, load_run_input, load_run_result, store_input_snapshot, store_run_result
+)
+from app.services.result_cache import is_cacheable_result, result_cache, result_fingerprint
+from app.services.run_cancellation import run_cancellation
+from app.services.single_flight import Flight, flight_key, single_flight
+from app.core.config import settings
+from app.algorithms.resource_profile import (
+    PHASE_OPTIMIZE, PHASE_POST_PROCESSING, PHASE_SAVE, PHASE_VALIDATION, RunProfile, phase,
+)
+from app.monitoring import prometheus
+from app.monitoring.sampling_profiler import SamplingProfiler
+from app.monitoring.logger import metrics_collector
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -24,6 +47,12 @@ class AlgorithmService:
     Service class for managing algorithm operations.
     """
 
+    # Calisan algoritmalarin kontrol nesneleri (run_id -> SolverControl)
+    _active_controls: Dict[int, SolverControl] = {}
+
+    # Deadline asildiktan sonra solver'in kendi kendine durmasi icin beklenen ek sure (saniye)
+    DEADLINE_GRACE_SECONDS = 2.0
+
     @staticmethod
     def get_algorithm_info(algorithm_type: AlgorithmType) -> Dict[str, Any]:
         """
@@ -505,15 +534,22 @@ class AlgorithmService:
                 return AlgorithmService.get_algorithm_info(AlgorithmType.GENETIC_ALGORITHM)
 
     @staticmethod
-    async def run_algorithm(algorithm_type, data: Dict[str, Any], params: Optional[Dict[str, Any]] = None, user_id: Optional[int] = None) -> Tuple[Dict[str, Any], AlgorithmRun]:
+    async def run_algorithm(algorithm_type, data: Dict[str, Any], params: Optional[Dict[str, Any]] = None, user_id: Optional[int] = None,
+                            on_control: Optional[Callable[[int, SolverControl], None]] = None) -> Tuple[Dict[str, Any], AlgorithmRun]:
         """
         Run the specified algorithm with the given data and parameters.
 
+        Ayni algoritma/girdi/parametrelerle es zamanli gelen istekler tek bir
+        solver kosusunda birlestirilir (single-flight); katilan istekler kendi
+        run kayitlarini ve liderin sonucunu alir.
+
         Args:
             algorithm_type: The algorithm type to run (can be AlgorithmType enum or string).
             data: Input data for the algorithm.
             params: Algorithm parameters.
             user_id: User ID for WebSocket progress tracking.
+            on_control: Solver baslamadan once (run id, SolverControl) ile cagrilir;
+                arka plan isleri ilerleme ve iptal icin kullanir.
 
         Returns:
             Tuple[Dict[str, Any], AlgorithmRun]: Algorithm result and run record.
@@ -521,7 +557,56 @@ class AlgorithmService:
         # Convert string to AlgorithmType enum if necessary
         if isinstance(algorithm_type, str):
             algorithm_type = AlgorithmType(algorithm_type.lower())
-        
+
+        # Profil istenen kosu kendi solver'ini calistirmali; baskasinin kosusuna katilmaz
+        if not (params or {}).get("single_flight", True) or (params or {}).get("profile"):
+            return await AlgorithmService._run_algorithm(algorithm_type, data, params, user_id,
+                                                         on_control=on_control)
+
+        # Veritabanindan yuklenen girdi anahtardan once okunur: anahtar guncel
+        # verinin hash'ine baglanir, veri degisince eski kosuya katilinmaz
+        if not data or not any(data.values()):
+            from app.db.base import async_session
+            async with async_session() as db:
+                classroom_count = params.get("classroom_count", 7) if params else 7
+                data = await AlgorithmService._get_real_data(db, classroom_count)
+
+        key = flight_key(algorithm_type.value, data, params)
+        flight, is_leader = await single_flight.begin(key, AlgorithmService._load_flight_result)
+        if not is_leader:
+            joined = await AlgorithmService._join_flight(flight, algorithm_type, data, params, user_id)
+            if joined is not None:
+                return joined
+            logger.warning(f"Single-flight leader for {algorithm_type.value} produced no result, running independently")
+            return await AlgorithmService._run_algorithm(algorithm_type, data, params, user_id,
+                                                         on_control=on_control)
+
+        try:
+            result, algorithm_run = await AlgorithmService._run_algorithm(
+                algorithm_type, data, params, user_id, flight=flight, on_control=on_control
+            )
+        except asyncio.CancelledError:
+            await asyncio.shield(single_flight.finish(flight))
+            raise
+        except Exception as e:
+            await single_flight.finish(flight, error=e)
+            raise
+        await single_flight.finish(flight, result=result)
+        return result, algorithm_run
+
+    @staticmethod
+    async def _run_algorithm(algorithm_type: AlgorithmType, data: Dict[str, Any],
+                             params: Optional[Dict[str, Any]] = None, user_id: Optional[int] = None,
+                             flight: Optional[Flight] = None,
+                             on_control: Optional[Callable[[int, SolverControl], None]] = None
+                             ) -> Tuple[Dict[str, Any], AlgorithmRun]:
+        """
+        Algoritmayi calistirir: run kaydi, cache, solver, post-processing ve kalicilik.
+
+        Args:
+            flight: Lider olunan single-flight kaydi; ilerleme katilimcilara da iletilir.
+            on_control: Solver baslamadan once (run id, SolverControl) ile cagrilir.
+        """
         start_time = time.time()
 
         logger.info(f"Starting algorithm {algorithm_type} with {len(data.get('projects', []))} projects, {len(data.get('instructors', []))} instructors, {len(data.get('classrooms', []))} classrooms, {len(data.get('timeslots', []))} timeslots")
@@ -529,19 +614,23 @@ class AlgorithmService:
         # Create algorithm run record
         # Ensure algorithm_type is converted to string value for database
         algorithm_type_str = algorithm_type.value if isinstance(algorithm_type, AlgorithmType) else str(algorithm_type)
-        algorithm_run_data = AlgorithmRunCreate(
-            algorithm_type=algorithm_type_str,
-            parameters=params or {},
-            data=data or {},
-            status="running",
-            started_at=datetime.now()
-        )
-
         from app.db.base import async_session
         async with async_session() as db:
+            # Giris verisi icerik hash'i ile bir kez saklanir; run yalnizca referans tutar
+            input_hash = await store_input_snapshot(db, data)
+            algorithm_run_data = AlgorithmRunCreate(
+                algorithm_type=algorithm_type_str,
+                parameters=params or {},
+                input_hash=input_hash,
+                status="running",
+                started_at=datetime.now()
+            )
             algorithm_run = await crud_algorithm.create(db, obj_in=algorithm_run_data)
             algorithm_run_id = algorithm_run.id  # Cache ID to avoid lazy loading issues
+            if flight is not None:
+                await single_flight.set_leader(flight, algorithm_run_id)
 
+            profile: Optional[RunProfile] = None
             try:
                 # WebSocket progress tracking - başlangıç
                 if user_id:
@@ -556,6 +645,30 @@ class AlgorithmService:
                     print("AlgorithmService: Loading real data...")
                     classroom_count = params.get("classroom_count", 7) if params else 7
                     data = await AlgorithmService._get_real_data(db, classroom_count)
+                    input_hash = content_hash(data)
+
+                # Warm start: kalici (ya da onceki bir kosunun) cizelgesi baslangic cozumu olur
+                cache_params = params
+                if (params or {}).get("warm_start"):
+                    warm_schedule = await AlgorithmService._load_warm_start(db, params["warm_start"])
+                    if warm_schedule:
+                        data[WARM_START_KEY] = warm_schedule
+                        cache_params = {**params, "warm_start": content_hash(warm_schedule)}
+                        logger.info(f"Warm start for {algorithm_type.value}: {len(warm_schedule)} assignments")
+
+                # Sonuc cache'i: ayni girdi + algoritma + parametre (+ seed) daha once cozulduyse tekrar calistirma
+                fingerprint = None
+                if (settings.RESULT_CACHE_ENABLED and (params or {}).get("use_cache", True)
+                        and not (params or {}).get("profile")):
+                    fingerprint = result_fingerprint(algorithm_type.value, input_hash, cache_params)
+                if fingerprint:
+                    cached = await result_cache.get(algorithm_type.value, fingerprint)
+                    if cached is not None:
+                        cached_result, cache_info = cached
+                        logger.info(f"Result cache hit ({cache_info['tier']}) for {algorithm_type.value}: {fingerprint[:12]}")
+                        return await AlgorithmService._complete_from_cache(
+                            db, algorithm_run, cached_result, cache_info, start_time, user_id
+                        )
                 
                 # CRITICAL: Add classroom_count to data dictionary so algorithms can access it
                 # Algoritmalar data.get("classroom_count") ile kontrol ediyor
@@ -590,9 +703,58 @@ class AlgorithmService:
                         f"Algorithm {algorithm_type.value} is running..."
                     )
 
+                # Anytime kontrolu: deadline (time_budget), iptal ve best-so-far snapshot'lari
+                control = SolverControl.from_params(params)
+                profile = control.profile = RunProfile().start()
+                if user_id or flight is not None:
+                    # Solver dongusundeki ilerleme olaylari websocket'e akar (katilimcilar dahil)
+                    control.on_progress = AlgorithmService._progress_forwarder(
+                        user_id, algorithm_run_id, algorithm_type.value, flight
+                    )
+                # Checkpoint: arama durumu periyodik olarak ve sonda diske yazilir;
+                # resume_from verilirse solver o kosunun son durumundan devam eder
+                if settings.CHECKPOINT_ENABLED and (params or {}).get("checkpoint", True):
+                    if "checkpoint_interval" not in (params or {}):
+                        control.checkpoint_interval = settings.CHECKPOINT_INTERVAL
+                    control.on_checkpoint = checkpoint_store.saver(algorithm_run_id)
+                if (params or {}).get("resume_from") is not None:
+                    control.resume_state = await asyncio.to_thread(checkpoint_store.load, params["resume_from"])
+                # SA/CP-SAT gibi OptimizationAlgorithm disindaki solver'lar kontrolu context'ten okur
+                if hasattr(algorithm, "set_control"):
+                    algorithm.set_control(control)
+                AlgorithmService._active_controls[algorithm_run_id] = control
+                if on_control is not None:
+                    on_control(algorithm_run_id, control)
+
                 # Run algorithm and get result
                 print(f"AlgorithmService Debug: Passing data with {len(data.get('projects', []))} projects to algorithm")
-                result = algorithm.execute(data)
+                # profile=true: solver thread'i ornekleyen profiler altinda calisir
+                sampler = SamplingProfiler(settings.PROFILE_SAMPLE_INTERVAL) if (params or {}).get("profile") else None
+                solver_started = time.perf_counter()
+                solver_ok = False
+                # Diger worker'lara dusen /cancel istekleri Redis uzerinden gelir
+                await run_cancellation.mark_active(algorithm_run_id)
+                cancel_watcher = asyncio.create_task(run_cancellation.watch(algorithm_run_id, control))
+                try:
+                    result = await AlgorithmService._execute_with_control(
+                        algorithm, data, control, params, sampler=sampler
+                    )
+                    solver_ok = not (isinstance(result, dict)
+                                     and str(result.get("status", "")).lower() in ("failed", "error"))
+                finally:
+                    AlgorithmService._active_controls.pop(algorithm_run_id, None)
+                    cancel_watcher.cancel()
+                    await run_cancellation.clear(algorithm_run_id)
+                    metrics_collector.record_algorithm_run(
+                        algorithm_type.value, solver_ok, time.perf_counter() - solver_started,
+                        classrooms=len(data.get("classrooms") or []),
+                    )
+                if control.stop_reason is not None and isinstance(result, dict):
+                    result["anytime"] = control.summary()
+                if control.checkpoint_count and isinstance(result, dict):
+                    result["checkpoint"] = {"resumable": True, "count": control.checkpoint_count}
+                if sampler is not None and isinstance(result, dict):
+                    result["profile"] = await AlgorithmService._store_profile(algorithm_run_id, sampler)
                 print(f"AlgorithmService Debug: Algorithm returned result: {result}")
                 
                 # DEBUG: Check algorithm name in result
@@ -614,7 +776,13 @@ class AlgorithmService:
                     # PSO için fallback yapma - kendi mantığı var
                     is_pso = 'pso' in str(algorithm_type).lower() or 'pso' in result.get('algorithm', '').lower()
                     
-                    if not is_pso and (result_status in ('failed', 'error', 'infeasible') or not has_assignments):
+                    # Kullanici iptal ettiyse baska bir algoritmaya gecme
+                    was_cancelled = control.cancel_token.is_cancelled and control.stop_reason != STOP_REASON_DEADLINE
+
+                    # Deadline cozumsuz doldu: yedek algoritmaya ayrilacak sure kalmadi
+                    timed_out = result_status == 'timed_out'
+
+                    if not is_pso and not was_cancelled and not timed_out and (result_status in ('failed', 'error', 'infeasible') or not has_assignments):
                         should_fallback = True
                         logger.info(f"Algorithm {algorithm_type} returned empty/failed result, falling back to ComprehensiveOptimizer")
                 
@@ -626,8 +794,9 @@ class AlgorithmService:
                             params=params or {}
                         )
                         
-                        fallback_algo.initialize(data)
-                        fallback_result = fallback_algo.optimize(data)
+                        with profile.phase(PHASE_OPTIMIZE):
+                            fallback_algo.initialize(data)
+                            fallback_result = fallback_algo.optimize(data)
                         
                         if fallback_result and (fallback_result.get('assignments') or fallback_result.get('schedule') or fallback_result.get('solution')):
                             # Fallback başarılı - sonucu kullan
@@ -705,92 +874,12 @@ class AlgorithmService:
                 # Enforce global gap-free compaction, late-slot removal and reporting at service level
                 try:
                     if isinstance(result, dict):
-                        # Use GapFreeScheduler + iterative reflow to aggressively remove gaps and late slots
-                        gap_scheduler = GapFreeScheduler()
-
-                        max_iters = 8
-                        for iteration in range(max_iters):
-                            improved = False
-                            for key in ("schedule", "assignments", "solution"):
-                                lst = result.get(key)
-                                if not isinstance(lst, list) or not lst:
-                                    continue
-
-                                # 1) Local and global compaction
-                                try:
-                                    algorithm._compact_schedule_classrooms(lst)  # type: ignore[attr-defined]
-                                except Exception:
-                                    pass
-                                try:
-                                    algorithm._compact_schedule_globally(lst)  # type: ignore[attr-defined]
-                                except Exception:
-                                    pass
-
-                                # 2) Gap-free optimizer from service - attempt to create continuous blocks
-                                try:
-                                    before = gap_scheduler.validate_gap_free_schedule(lst).get("total_gaps", 0)
-                                    optimized = gap_scheduler.optimize_for_gap_free(lst, getattr(algorithm, "timeslots", []))
-                                    # If optimizer returned something, replace list in-place
-                                    if optimized and len(optimized) > 0:
-                                        # replace contents preserving list object
-                                        lst.clear()
-                                        lst.extend(optimized)
-                                    after = gap_scheduler.validate_gap_free_schedule(lst).get("total_gaps", 0)
-                                    if after < before:
-                                        improved = True
-                                except Exception:
-                                    pass
-
-                                # 3) Try to move late assignments earlier
-                                try:
-                                    before_late = AlgorithmService._count_late_slots_static(lst, getattr(algorithm, "timeslots", []))
-                                    AlgorithmService._remove_late_assignments(
-                                        lst,
-                                        getattr(algorithm, "timeslots", []),
-                                        getattr(algorithm, "classrooms", []),
-                                        getattr(algorithm, "instructors", []),
-                                    )
-                                    after_late = AlgorithmService._count_late_slots_static(lst, getattr(algorithm, "timeslots", []))
-                                    if after_late < before_late:
-                                        improved = True
-                                except Exception:
-                                    pass
-
-                                # 4) Final greedy reflow earliest-first
-                                try:
-                                    moved = AlgorithmService._reflow_schedule_earliest_first(
-                                        lst,
-                                        getattr(algorithm, "timeslots", []),
-                                        getattr(algorithm, "classrooms", []),
-                                        getattr(algorithm, "instructors", []),
-                                    )
-                                    if moved > 0:
-                                        improved = True
-                                except Exception:
-                                    pass
-
-                            # If no improvement across all lists, break early
-                            if not improved:
-                                break
-
-                        # After iterations build gap and policy summary reports
-                        gap_reports = {}
-                        policy_summary = {"lists": {}}
-                        for key in ("schedule", "assignments", "solution"):
-                            lst = result.get(key)
-                            if isinstance(lst, list) and lst:
-                                try:
-                                    gap_reports[key] = algorithm._detect_classroom_gaps(lst)  # type: ignore[attr-defined]
-                                except Exception:
-                                    gap_reports[key] = {"total_gaps": None}
-                                try:
-                                    policy_summary["lists"][key] = AlgorithmService._summarize_schedule_policies(
-                                        lst,
-                                        getattr(algorithm, "timeslots", []),
-                                        getattr(algorithm, "classrooms", []),
-                                    )
-                                except Exception:
-                                    policy_summary["lists"][key] = {}
+                        # Asamali pipeline: ayni listeler bir kez islenir, degisiklik yoksa asamalar atlanir
+                        pipeline = PostProcessingPipeline(algorithm, gap_scheduler=GapFreeScheduler())
+                        with profile.phase(PHASE_POST_PROCESSING):
+                            result["post_processing"] = pipeline.run(result)
+                        with profile.phase(PHASE_VALIDATION):
+                            gap_reports, policy_summary = pipeline.build_reports(result)
                         if gap_reports:
                             result["gap_report_service_level"] = gap_reports
                         if policy_summary.get("lists"):
@@ -859,8 +948,10 @@ class AlgorithmService:
                 # Save schedules to database if result contains schedule data
                 if result:
                     print(f"DEBUG: Saving schedules to database. Result type: {type(result)}")
-                    print(f"DEBUG: Result content: {result}")
-                    await AlgorithmService._save_schedules_to_db(db, result)
+                    with profile.phase(PHASE_SAVE):
+                        persistence = await AlgorithmService._save_schedules_to_db(db, result)
+                    if isinstance(result, dict):
+                        result["schedule_persistence"] = persistence
                     print("DEBUG: Schedules saved to database")
                 else:
                     print("DEBUG: No result to save to database")
@@ -893,12 +984,26 @@ class AlgorithmService:
 
                 # Update algorithm run record
                 # Sanitize result to remove infinity/nan values (PostgreSQL JSON incompatible)
+                cacheable = bool(fingerprint) and is_cacheable_result(result)
+                if isinstance(result, dict):
+                    result["cache"] = {"hit": False, "fingerprint": fingerprint, "stored": cacheable}
                 sanitized_result = AlgorithmService.sanitize_for_json(result)
+                if cacheable:
+                    try:
+                        await result_cache.set(
+                            algorithm_type.value, fingerprint, sanitized_result,
+                            {"source_run_id": algorithm_run_id}
+                        )
+                    except Exception as cache_error:
+                        logger.warning(f"Result cache store failed: {cache_error}")
+                with profile.phase(PHASE_SAVE):
+                    await store_run_result(db, algorithm_run_id, sanitized_result)
+                profile.stop()
                 algorithm_run_update = AlgorithmRunUpdate(
                     status=final_status,
-                    result=sanitized_result,
                     execution_time=execution_time,
-                    completed_at=datetime.now()
+                    completed_at=datetime.now(),
+                    resource_profile=AlgorithmService._resource_profile(profile, control, result),
                 )
                 algorithm_run = await crud_algorithm.update(db, db_obj=algorithm_run, obj_in=algorithm_run_update)
 
@@ -948,7 +1053,10 @@ class AlgorithmService:
                         execution_time=execution_time,
                         completed_at=datetime.now()
                     )
-                    algorithm_run = await crud_algorithm.update(db, db_obj=algorithm_run, obj_in=algorithm_run_update)
+                    await store_run_result(db, algorithm_run_id, algorithm_run_update.result)
+                    algorithm_run = await crud_algorithm.update(
+                        db, db_obj=algorithm_run, obj_in=algorithm_run_update.model_dump(exclude_unset=True, exclude={"result"})
+                    )
 
                     # WebSocket: report completion with fallback
                     if user_id:
@@ -982,503 +1090,528 @@ class AlgorithmService:
 
                     # Re-raise the original exception
                     raise e
+            finally:
+                # RSS ornekleyici thread'i her durumda durur
+                if profile is not None:
+                    profile.stop()
+
+    @staticmethod
+    async def _complete_from_cache(db, algorithm_run: AlgorithmRun, result: Dict[str, Any],
+                                   cache_info: Dict[str, Any], start_time: float,
+                                   user_id: Optional[int] = None) -> Tuple[Dict[str, Any], AlgorithmRun]:
+        """
+        Cache'ten gelen sonucla run'i tamamla: cizelge yine kalici hale getirilir
+        (arada baska bir kosu yazmis olabilir), run kaydi ve websocket guncellenir.
+        """
+        run_id = algorithm_run.id
+        result["cache"] = cache_info
+        result["schedule_persistence"] = await AlgorithmService._save_schedules_to_db(db, result)
+
+        if user_id:
+            from app.api.v1.endpoints.websocket import complete_algorithm
+            await complete_algorithm(user_id, run_id, result)
+
+        await store_run_result(db, run_id, AlgorithmService.sanitize_for_json(result))
+        algorithm_run = await crud_algorithm.update(db, db_obj=algorithm_run, obj_in=AlgorithmRunUpdate(
+            status="completed",
+            execution_time=time.time() - start_time,
+            completed_at=datetime.now()
+        ))
+        return result, algorithm_run
+
+    @staticmethod
+    async def _join_flight(flight: Flight, algorithm_type: AlgorithmType, data: Dict[str, Any],
+                           params: Optional[Dict[str, Any]] = None,
+                           user_id: Optional[int] = None) -> Optional[Tuple[Dict[str, Any], AlgorithmRun]]:
+        """
+        Devam eden ayni kosuya katil: kendi run kaydini olustur, liderin
+        ilerleme akisina abone ol ve liderin sonucunu kendi kaydina yaz.
+
+        Returns:
+            (sonuc, run) ya da lider sonuc uretmeden ayrildiysa None
+        """
+        start_time = time.time()
+        from app.db.base import async_session
+        async with async_session() as db:
+            input_hash = await store_input_snapshot(db, data)
+            algorithm_run = await crud_algorithm.create(db, obj_in=AlgorithmRunCreate(
+                algorithm_type=algorithm_type.value,
+                parameters=params or {},
+                input_hash=input_hash,
+                status="running",
+                started_at=datetime.now()
+            ))
+            run_id = algorithm_run.id
+            await single_flight.subscribe(flight, user_id, run_id)
+            if user_id:
+                from app.api.v1.endpoints.websocket import update_algorithm_progress
+                leader = f"run {flight.leader_run_id}" if flight.leader_run_id else "an in-flight run"
+                await update_algorithm_progress(
+                    user_id, run_id, 0, "running",
+                    f"Algorithm {algorithm_type.value}: joined {leader} with identical input"
+                )
+            logger.info(f"Run {run_id} joined single-flight {flight.key[:12]} (leader run {flight.leader_run_id})")
+
+            try:
+                leader_result = await asyncio.shield(flight.future)
+            except Exception as e:
+                if user_id:
+                    from app.api.v1.endpoints.websocket import fail_algorithm
+                    await fail_algorithm(user_id, run_id, f"Joined run {flight.leader_run_id} failed: {e}")
+                await crud_algorithm.update(db, db_obj=algorithm_run, obj_in=AlgorithmRunUpdate(
+                    status="failed",
+                    error=f"Joined run {flight.leader_run_id} failed: {e}",
+                    completed_at=datetime.now()
+                ))
+                raise
+
+            if leader_result is None:
+                await crud_algorithm.update(db, db_obj=algorithm_run, obj_in=AlgorithmRunUpdate(
+                    status="failed",
+                    error=f"Joined run {flight.leader_run_id} ended without a result; re-running independently",
+                    completed_at=datetime.now()
+                ))
+                return None
+
+            # Lider cizelgeyi zaten kaydetti; yalnizca run kaydi ve websocket guncellenir
+            result = copy.deepcopy(leader_result)
+            result.pop("schedule_persistence", None)
+            result["single_flight"] = {"role": "joiner", "joined_run_id": flight.leader_run_id}
+
+            if user_id:
+                from app.api.v1.endpoints.websocket import complete_algorithm
+                await complete_algorithm(user_id, run_id, result)
+
+            await store_run_result(db, run_id, AlgorithmService.sanitize_for_json(result))
+            algorithm_run = await crud_algorithm.update(db, db_obj=algorithm_run, obj_in=AlgorithmRunUpdate(
+                status="completed",
+                execution_time=time.time() - start_time,
+                completed_at=datetime.now()
+            ))
+            return result, algorithm_run
+
+    @staticmethod
+    async def _load_warm_start(db, source: Any) -> List[Dict[str, Any]]:
+        """
+        Warm start cizelgesini yukle.
+
+        Args:
+            source: ``True`` / ``"persisted"`` -> schedules tablosu;
+                run id -> o kosunun sonucundaki cizelge.
+
+        Returns:
+            Atama listesi (bulunamazsa bos liste; kosu sifirdan baslar).
+        """
+        from sqlalchemy import select
+        from app.models.schedule import Schedule
+        from app.services.portfolio_service import extract_schedule
+
+        if source is True or source in ("persisted", "current"):
+            rows = await db.execute(
+                select(
+                    Schedule.project_id, Schedule.classroom_id,
+                    Schedule.timeslot_id, Schedule.instructors,
+                ).order_by(Schedule.id)
+            )
+            return [
+                {
+                    "project_id": row.project_id,
+                    "classroom_id": row.classroom_id,
+                    "timeslot_id": row.timeslot_id,
+                    "instructors": row.instructors or [],
+                }
+                for row in rows
+            ]
+
+        try:
+            run_id = int(source)
+        except (TypeError, ValueError):
+            logger.warning(f"Unknown warm_start source {source!r}, starting from scratch")
+            return []
+        algorithm_run = await crud_algorithm.get(db, id=run_id)
+        if algorithm_run is None:
+            logger.warning(f"Warm start run {run_id} not found, starting from scratch")
+            return []
+        return extract_schedule(await load_run_result(db, algorithm_run))
+
+    @staticmethod
+    async def continue_run(run_id: int, time_budget: float,
+                           params: Optional[Dict[str, Any]] = None,
+                           user_id: Optional[int] = None) -> Tuple[Dict[str, Any], AlgorithmRun]:
+        """
+        Bitmis (veya yarida kalmis) bir kosuyu son checkpoint'inden yeni sure butcesiyle surdur.
+
+        Ayni algoritma ve girdiyle yeni bir run kaydi acilir; orijinal
+        parametreler ``params`` ile ezilebilir.
+
+        Raises:
+            ValueError: Kosu veya checkpoint'i bulunamazsa.
+        """
+        from app.db.base import async_session
+        async with async_session() as db:
+            algorithm_run = await crud_algorithm.get(db, id=run_id)
+            if algorithm_run is None:
+                raise ValueError(f"Algorithm run {run_id} not found")
+            algorithm_type = algorithm_run.algorithm_type
+            base_params = dict(algorithm_run.parameters or {})
+            data = await load_run_input(db, algorithm_run) or {}
+        if not checkpoint_store.exists(run_id):
+            raise ValueError(f"No checkpoint stored for run {run_id}")
+
+        for key in ("warm_start", "time_budget", "deadline_seconds"):
+            base_params.pop(key, None)
+        run_params = {
+            **base_params,
+            **(params or {}),
+            "time_budget": float(time_budget),
+            "resume_from": run_id,
+            "use_cache": False,
+            "single_flight": False,
+        }
+        logger.info(f"Continuing run {run_id} ({algorithm_type}) with a {time_budget}s budget")
+        return await AlgorithmService.run_algorithm(algorithm_type, data, run_params, user_id)
+
+    @staticmethod
+    async def _load_flight_result(run_id: int) -> Optional[Dict[str, Any]]:
+        """Baska bir worker'daki liderin sonucunu run kaydindan oku."""
+        return (await AlgorithmService.get_run_result(run_id)).get("result")
+
+    @staticmethod
+    async def _execute_with_control(algorithm, data: Dict[str, Any], control: SolverControl,
+                                    params: Optional[Dict[str, Any]] = None,
+                                    executor=None,
+                                    sampler: Optional[SamplingProfiler] = None) -> Dict[str, Any]:
+        """
+        Algoritmayi worker thread'de calistirir ve deadline'i uygular.
+
+        Solver donguleri deadline'i kendileri kontrol eder; native solver'larin
+        (CP-SAT, CBC) sure limitleri kalan butceye indirilir. Solver deadline +
+        grace suresi icinde donmezse iptal edilir ve son yayinlanan best-so-far
+        cozum, o da yoksa ``timed_out`` sonucu dondurulur; boylece SLA asilmaz.
+
+        Args:
+            algorithm: Calistirilacak algoritma.
+            data: Algoritma giris verileri.
+            control: Calismanin SolverControl nesnesi.
+            params: Algoritma parametreleri (``deadline_grace`` okunur).
+            executor: Solver'in calisacagi thread havuzu (None = varsayilan havuz).
+            sampler: Verilirse solver thread'i bu profiler ile orneklenir.
+
+        Returns:
+            Dict[str, Any]: Algoritma sonucu veya best-so-far sonucu.
+        """
+        with use_control(control):
+            if executor is None:
+                task = asyncio.ensure_future(
+                    asyncio.to_thread(AlgorithmService._run_solver, algorithm, data, sampler)
+                )
+            else:
+                # to_thread gibi context'i kopyala; solver kontrolu worker thread'de gorur
+                context = contextvars.copy_context()
+                task = asyncio.get_running_loop().run_in_executor(
+                    executor, context.run, AlgorithmService._run_solver, algorithm, data, sampler
+                )
+
+        remaining = control.remaining()
+        if remaining is None:
+            return await task
+
+        grace = (params or {}).get("deadline_grace", AlgorithmService.DEADLINE_GRACE_SECONDS)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout=remaining + float(grace))
+        except asyncio.TimeoutError:
+            control.cancel(STOP_REASON_DEADLINE)
+            control.should_stop()
+            # Thread iptali gorunce kendi biter; sonucu artik beklenmiyor
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            best = control.best_result()
+            if not best or not best.get("schedule"):
+                logger.warning("Deadline exceeded without a best-so-far snapshot, returning timed_out")
+                return {
+                    "schedule": [],
+                    "assignments": [],
+                    "solution": [],
+                    "algorithm": algorithm.get_name(),
+                    "status": "timed_out",
+                    "partial": True,
+                }
+            logger.warning(f"Deadline exceeded, returning best-so-far snapshot #{best.get('snapshot')}")
+            schedule = best["schedule"]
+            return {
+                "schedule": schedule,
+                "assignments": schedule,
+                "solution": schedule,
+                "cost": best.get("cost"),
+                "algorithm": best.get("algorithm", algorithm.get_name()),
+                "status": "completed",
+                "partial": True,
+            }
+
+    @staticmethod
+    def _run_solver(algorithm, data: Dict[str, Any],
+                    sampler: Optional[SamplingProfiler] = None) -> Dict[str, Any]:
+        """
+        Worker thread govdesi; thread mesgul oldugu surece metriklerde sayilir.
+        ``initialize`` ve ``repair`` asamalari solver icinde ayrica olculur ve
+        ``optimize`` suresinden dusulur.
+        """
+        with prometheus.track_solver_thread(), phase(PHASE_OPTIMIZE):
+            if sampler is None:
+                return algorithm.execute(data)
+            with sampler:
+                return algorithm.execute(data)
+
+    @staticmethod
+    async def _store_profile(run_id: int, sampler: SamplingProfiler) -> Dict[str, Any]:
+        """
+        Ornekleme profilini diske yaz; sonuca eklenecek ozeti dondur.
+        Deadline asildiginda solver hala calisiyor olabilir; ornekleme burada durur.
+        """
+        sampler.stop()
+        payload = sampler.to_dict(settings.PROFILE_TOP_N)
+        stored = True
+        try:
+            await asyncio.to_thread(profile_store.save, run_id, payload)
+        except Exception as e:
+            stored = False
+            logger.warning(f"Profile for run {run_id} could not be stored: {e}")
+        return {
+            "samples": payload["samples"],
+            "interval": payload["interval"],
+            "duration": payload["duration"],
+            "top": payload["top"],
+            "stored": stored,
+            "download": f"{settings.API_V1_STR}/algorithms/results/{run_id}/profile" if stored else None,
+        }
+
+    @staticmethod
+    def _resource_profile(profile: RunProfile, control: SolverControl, result: Any) -> Dict[str, Any]:
+        """Kosu profilini run kaydina yazilacak hale getir."""
+        final_cost = None
+        if isinstance(result, dict):
+            for key in ("cost", "best_cost"):
+                if isinstance(result.get(key), (int, float)):
+                    final_cost = float(result[key])
+                    break
+        if final_cost is None:
+            best = control.best_result()
+            if best and isinstance(best.get("cost"), (int, float)):
+                final_cost = float(best["cost"])
+        if final_cost is not None and not math.isfinite(final_cost):
+            final_cost = None
+        return profile.to_dict(
+            evaluations=control.evaluations or control.iterations or None,
+            iterations=control.iterations or None,
+            final_cost=final_cost,
+        )
+
+    @staticmethod
+    def _progress_forwarder(user_id: Optional[int], run_id: int, algorithm_name: str,
+                            flight: Optional[Flight] = None) -> LoopProgressForwarder:
+        """
+        Solver ilerleme olaylarini ``ConnectionManager.send_algorithm_progress``'e
+        ileten callback olusturur. Worker thread'den cagrilir; gonderim ana
+        event loop'ta yapilir. ``flight`` verilirse ayni olaylar single-flight
+        katilimcilarinin kendi run'larina da gonderilir.
+        """
+        from app.api.v1.endpoints.websocket import update_algorithm_progress
+
+        async def sink(event: Dict[str, Any]) -> None:
+            fraction = event.get("fraction") or 0.0
+            best_cost = event.get("best_cost")
+            message = f"Algorithm {algorithm_name}: iteration {event.get('iteration')}"
+            if best_cost is not None:
+                message += f", best cost {best_cost:.2f}"
+            targets = [(user_id, run_id)] if user_id else []
+            if flight is not None:
+                targets += await single_flight.progress_targets(flight)
+            for target_user, target_run in targets:
+                await update_algorithm_progress(
+                    target_user, target_run, round(10 + 80 * fraction, 1), "running", message, details=event
+                )
+
+        return LoopProgressForwarder(asyncio.get_running_loop(), sink)
+
+    @staticmethod
+    async def cancel_run(run_id: int) -> bool:
+        """
+        Calisan bir algoritmayi iptal eder; solver mevcut en iyi cozumu dondurur.
+        Kosu baska bir worker'daysa iptal istegi Redis uzerinden iletilir.
+
+        Args:
+            run_id: AlgorithmRun ID'si.
+
+        Returns:
+            bool: Calisma (herhangi bir worker'da) bulunup iptal istendiyse True.
+        """
+        control = AlgorithmService._active_controls.get(run_id)
+        if control is not None:
+            control.cancel()
+            return True
+        return await run_cancellation.request(run_id)
 
     @staticmethod
-    async def _save_schedules_to_db(db, result: Dict[str, Any]) -> None:
+    async def _save_schedules_to_db(db, result: Dict[str, Any]) -> Dict[str, int]:
         """
         Save algorithm results to schedules table
-        
+
+        Yeni plan, kayitli plan ile ``project_id`` uzerinden karsilastirilir;
+        yalnizca eklenen, degisen ve silinen satirlar toplu (executemany)
+        ifadelerle tek transaction icinde yazilir.
+
         Args:
             db: Database session
             result: Algorithm result containing schedule data
+
+        Returns:
+            Degisen satir sayilari (inserted, updated, deleted, unchanged)
         """
-        print(f"DEBUG: _save_schedules_to_db called with result type: {type(result)}")
-        print(f"DEBUG: _save_schedules_to_db result content: {result}")
-        
         try:
-            from sqlalchemy import delete
+            from sqlalchemy import delete, insert, select, update
             from app.models.schedule import Schedule
-            
-            # Clear existing schedules
-            await db.execute(delete(Schedule))
-            print("DEBUG: Existing schedules cleared")
-            
-            # Extract schedule data from different possible formats
-            schedules = []
-            
-            # Format 0: Phase 3 "final_assignments" key (öncelikli, placeholder ile)
-            if "final_assignments" in result and result["final_assignments"]:
-                schedules = result["final_assignments"]
-            # Format 1: Direct "schedule" key
-            elif "schedule" in result and result["schedule"]:
-                schedules = result["schedule"]
-            # Format 2: "assignments" key
-            elif "assignments" in result and result["assignments"]:
-                schedules = result["assignments"]
-            # Format 3: Direct list in result
-            elif isinstance(result, list):
-                schedules = result
-            # Format 4: "solution" key
-            elif "solution" in result and result["solution"]:
-                schedules = result["solution"]
-            
-            # Ensure schedules is a list
-            if not isinstance(schedules, list):
-                logger.warning(f"Invalid schedule format: {type(schedules)}")
-                return
-            
-            # Final guard: deduplicate by project_id before saving (keep earliest timeslot_id)
-            try:
-                def _normalize_entry(item: Any) -> Optional[Dict[str, Any]]:
-                    if isinstance(item, dict):
-                        return {
-                            "project_id": item.get("project_id"),
-                            "classroom_id": item.get("classroom_id"),
-                            "timeslot_id": item.get("timeslot_id"),
-                            "is_makeup": item.get("is_makeup", False),
-                            "instructors": item.get("instructors", []),  # Jüri üyeleri
-                        }
-                    try:
-                        return {
-                            "project_id": getattr(item, "project_id", getattr(item, "id", None)),
-                            "classroom_id": getattr(item, "classroom_id", None),
-                            "timeslot_id": getattr(item, "timeslot_id", None),
-                            "is_makeup": getattr(item, "is_makeup", False),
-                            "instructors": getattr(item, "instructors", []),  # Jüri üyeleri
-                        }
-                    except Exception:
-                        return None
 
-                def _key(entry: Dict[str, Any]) -> str:
-                    pid = entry.get("project_id")
-                    return str(pid) if pid is not None else ""
+            rows = AlgorithmService._extract_schedule_rows(result)
+            if rows is None:
+                return {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+
+            existing = await db.execute(
+                select(
+                    Schedule.id, Schedule.project_id, Schedule.classroom_id,
+                    Schedule.timeslot_id, Schedule.is_makeup, Schedule.instructors,
+                ).order_by(Schedule.id)
+            )
+            persisted: Dict[Any, Dict[str, Any]] = {}
+            stale_ids: List[int] = []
+            for row in existing.all():
+                if row.project_id in persisted:
+                    # Ayni proje icin fazladan satir -> sil
+                    stale_ids.append(row.id)
+                    continue
+                persisted[row.project_id] = {
+                    "id": row.id,
+                    "classroom_id": row.classroom_id,
+                    "timeslot_id": row.timeslot_id,
+                    "is_makeup": bool(row.is_makeup),
+                    "instructors": row.instructors,
+                }
 
-                def _order(entry: Dict[str, Any]) -> Tuple[int, int]:
-                    try:
-                        ts_val = int(entry.get("timeslot_id", 10**9))
-                    except Exception:
-                        ts_val = 10**9
-                    try:
-                        room_val = int(entry.get("classroom_id", 10**9))
-                    except Exception:
-                        room_val = 10**9
-                    return ts_val, room_val
-
-                by_project: Dict[str, Dict[str, Any]] = {}
-                for raw in schedules:
-                    normalized = _normalize_entry(raw)
-                    if not normalized:
-                        continue
-                    key = _key(normalized)
-                    if not key:
-                        continue
-                    prev = by_project.get(key)
-                    if prev is None or _order(normalized) < _order(prev):
-                        by_project[key] = normalized
-                if by_project and len(by_project) != len(schedules):
-                    logger.warning(
-                        "Duplicate projects pruned before save | total=%s unique=%s removed=%s",
-                        len(schedules), len(by_project), len(schedules) - len(by_project),
-                    )
-                schedules = list(by_project.values()) if by_project else schedules
-            except Exception as e:
-                logger.error(f"Dedup before save failed: {e}")
-
-            # Add new schedules
-            saved_count = 0
-            for schedule_data in schedules:
-                # Handle different data structures
-                if isinstance(schedule_data, dict):
-                    project_id = schedule_data.get("project_id")
-                    classroom_id = schedule_data.get("classroom_id")
-                    timeslot_id = schedule_data.get("timeslot_id")
-                    is_makeup = schedule_data.get("is_makeup", False)
-                    instructors = schedule_data.get("instructors", [])  # Jüri üyeleri
-                    
-                    # Validate required fields
-                    if project_id and classroom_id and timeslot_id:
-                        schedule = Schedule(
-                            project_id=project_id,
-                            classroom_id=classroom_id,
-                            timeslot_id=timeslot_id,
-                            is_makeup=is_makeup,
-                            instructors=instructors  # Jüri üyelerini kaydet
-                        )
-                        db.add(schedule)
-                        saved_count += 1
-                    else:
-                        logger.warning(f"Invalid schedule data: {schedule_data}")
-            
+            inserts: List[Dict[str, Any]] = []
+            updates: List[Dict[str, Any]] = []
+            unchanged = 0
+            for project_id, entry in rows.items():
+                current = persisted.pop(project_id, None)
+                if current is None:
+                    inserts.append({"project_id": project_id, **entry})
+                elif any(current[field] != entry[field] for field in entry):
+                    updates.append({"id": current["id"], **entry})
+                else:
+                    unchanged += 1
+            stale_ids.extend(current["id"] for current in persisted.values())
+
+            if stale_ids:
+                await db.execute(delete(Schedule).where(Schedule.id.in_(stale_ids)))
+            if updates:
+                # Primary key uzerinden toplu UPDATE (executemany)
+                await db.execute(update(Schedule), updates)
+            if inserts:
+                await db.execute(insert(Schedule), inserts)
             await db.commit()
-            logger.info(f"Saved {saved_count} schedules to database")
-            
+
+            stats = {
+                "inserted": len(inserts),
+                "updated": len(updates),
+                "deleted": len(stale_ids),
+                "unchanged": unchanged,
+            }
+            logger.info(
+                "Saved schedules | inserted=%s updated=%s deleted=%s unchanged=%s",
+                stats["inserted"], stats["updated"], stats["deleted"], stats["unchanged"],
+            )
+            return stats
+
         except Exception as e:
             logger.error(f"Error saving schedules to database: {str(e)}")
             await db.rollback()
             raise e
 
-    # Internal helpers -------------------------------------------------------
-    def _remove_late_assignments(self, assignments: List[Dict[str, Any]], timeslots: List[Any] = None, classrooms: List[Any] = None, instructors: List[Any] = None) -> None:
+    @staticmethod
+    def _extract_schedule_rows(result: Any) -> Optional[Dict[Any, Dict[str, Any]]]:
         """
-        Service-level late slot enforcement. Attempts to move any assignment
-        scheduled at 16:30 or later into the earliest feasible pre-16:30 slot.
-        If no feasible slot exists, the assignment remains but is marked with
-        a heavy penalty flag for downstream reporting/UI.
+        Algoritma sonucundan kaydedilecek satirlari cikar.
 
-        Modifies the given assignments list in-place.
+        Proje basina tek satir tutulur (en erken timeslot, sonra en kucuk sinif).
+        Zorunlu alanlari eksik kayitlar atlanir. Gecersiz formatta None doner.
         """
-        try:
-            if not assignments:
-                return
-            # Build simple lookup/indexing using algorithm-like helpers
-            # Timeslots and classrooms may be needed for feasibility checks
-            timeslots = timeslots or []
-            classrooms = classrooms or []
-            instructors = instructors or []
-
-            # Local functions to identify late slots and parse ordering
-            def is_late_slot(ts: Any) -> bool:
-                try:
-                    start = ts.get("start_time", "") if isinstance(ts, dict) else getattr(ts, "start_time", "")
-                    parts = str(start).split(":")
-                    hour = int(parts[0]) if parts and parts[0].isdigit() else 0
-                    minute = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
-                    return hour > 16 or (hour == 16 and minute >= 30)
-                except Exception:
-                    return False
-
-            # Build ordered slot ids and id->ts map
-            def parse_start(ts: Any) -> tuple:
-                try:
-                    s = ts.get("start_time") if isinstance(ts, dict) else getattr(ts, "start_time", None)
-                    from datetime import datetime as _dt
-                    for fmt in ("%H:%M:%S", "%H:%M"):
-                        try:
-                            dt = _dt.strptime(str(s), fmt)
-                            return (dt.hour, dt.minute, dt.second)
-                        except Exception:
-                            continue
-                except Exception:
-                    pass
-                return (24, 0, 0)
-
-            ts_list = list(timeslots) if isinstance(timeslots, list) else []
-            ts_en = list(enumerate(ts_list))
-            ts_en.sort(key=lambda item: (parse_start(item[1]), item[0]))
-            id_to_ts: Dict[Any, Any] = {}
-            sorted_ids: List[Any] = []
-            ts_index: Dict[Any, int] = {}
-            for idx, ts in ts_en:
-                tid = ts.get("id") if isinstance(ts, dict) else getattr(ts, "id", idx)
-                if tid is None:
-                    tid = idx
-                id_to_ts[tid] = ts
-                sorted_ids.append(tid)
-                ts_index[tid] = len(sorted_ids) - 1
-
-            # Determine last acceptable index (<16:30)
-            last_ok_idx = len(sorted_ids) - 1
-            for i, tid in enumerate(sorted_ids):
-                ts = id_to_ts.get(tid)
-                if ts and is_late_slot(ts):
-                    last_ok_idx = i - 1
+        # Extract schedule data from different possible formats
+        schedules: Any = []
+        if isinstance(result, list):
+            schedules = result
+        elif isinstance(result, dict):
+            # "final_assignments" (Phase 3, placeholder ile) oncelikli
+            for key in ("final_assignments", "schedule", "assignments", "solution"):
+                if result.get(key):
+                    schedules = result[key]
                     break
 
-            if last_ok_idx < 0:
-                # No acceptable slots; just flag all as late
-                for a in assignments:
-                    a["late_penalized"] = True
-                return
-
-            # Build occupancy and instructor busy maps
-            occupied: Dict[tuple, bool] = {}
-            instructor_busy: Dict[Any, set] = {}
-            classroom_ids: List[Any] = []
-            for c in classrooms or []:
-                try:
-                    cid = c.get("id") if isinstance(c, dict) else getattr(c, "id", None)
-                    if cid is not None:
-                        classroom_ids.append(cid)
-                except Exception:
-                    continue
-            if not classroom_ids:
-                # Infer from assignments
-                for a in assignments:
-                    cid = a.get("classroom_id") if isinstance(a, dict) else None
-                    if cid is not None and cid not in classroom_ids:
-                        classroom_ids.append(cid)
-
-            for a in assignments:
-                if not isinstance(a, dict):
-                    continue
-                idx = ts_index.get(a.get("timeslot_id"))
-                cid = a.get("classroom_id")
-                if cid is not None and idx is not None:
-                    occupied[(cid, idx)] = True
-                for instr in a.get("instructors", []) or []:
-                    instructor_busy.setdefault(instr, set()).add(idx)
-
-            # Collect late assignments
-            late_list: List[Dict[str, Any]] = []
-            for a in assignments:
-                if not isinstance(a, dict):
-                    continue
-                ts = id_to_ts.get(a.get("timeslot_id"))
-                if ts and is_late_slot(ts):
-                    late_list.append(a)
-
-            # Try moving each late assignment
-            for a in late_list:
-                current_idx = ts_index.get(a.get("timeslot_id"))
-                if current_idx is None:
-                    a["late_penalized"] = True
-                    continue
-                instructors_ids = a.get("instructors", []) or []
-                moved = False
-                for target_idx in range(0, last_ok_idx + 1):
-                    for cid in sorted(classroom_ids):
-                        if occupied.get((cid, target_idx)):
-                            continue
-                        # Check instructor availability
-                        ok = True
-                        for instr in instructors_ids:
-                            if target_idx in instructor_busy.get(instr, set()):
-                                ok = False
-                                break
-                        if not ok:
-                            continue
-                        # Place
-                        old_cid = a.get("classroom_id")
-                        if old_cid is not None:
-                            occupied.pop((old_cid, current_idx), None)
-                        a["classroom_id"] = cid
-                        a["timeslot_id"] = sorted_ids[target_idx]
-                        occupied[(cid, target_idx)] = True
-                        for instr in instructors_ids:
-                            instructor_busy.setdefault(instr, set()).discard(current_idx)
-                            instructor_busy[instr].add(target_idx)
-                        moved = True
-                        break
-                    if moved:
-                        break
-                if not moved:
-                    # Could not move -> flag for penalty/reporting
-                    a["late_penalized"] = True
-        except Exception:
-            # Fail-safe: do nothing if any error occurs
-            return
-
-    def _reflow_schedule_earliest_first(self, assignments: List[Dict[str, Any]], timeslots: List[Any], classrooms: List[Any], instructors: List[Any]) -> int:
-        """
-        Algorithm-agnostic greedy packing:
-        - Build chronological timeslot order
-        - For each assignment in chronological order, try to move it to the
-          earliest feasible slot (strictly earlier), any classroom
-        - Feasibility: target classroom free and all instructors free in target slot
-        Returns number of moved assignments.
-        """
-        try:
-            if not assignments:
-                return 0
-            # Build slot ordering and maps
-            from datetime import datetime as _dt
-            def _parse_start(ts: Any) -> tuple:
-                try:
-                    s = ts.get("start_time") if isinstance(ts, dict) else getattr(ts, "start_time", None)
-                    for fmt in ("%H:%M:%S", "%H:%M"):
-                        try:
-                            dt = _dt.strptime(str(s), fmt)
-                            return (dt.hour, dt.minute, dt.second)
-                        except Exception:
-                            continue
-                except Exception:
-                    pass
-                return (24, 0, 0)
-
-            ts_en = list(enumerate(timeslots or []))
-            ts_en.sort(key=lambda item: (_parse_start(item[1]), item[0]))
-            ts_index: Dict[Any, int] = {}
-            id_to_ts: Dict[Any, Any] = {}
-            ordered_ids: List[Any] = []
-            for _, ts in ts_en:
-                tid = ts.get("id") if isinstance(ts, dict) else getattr(ts, "id", None)
-                if tid is None:
-                    tid = len(ordered_ids)
-                ts_index[tid] = len(ordered_ids)
-                id_to_ts[tid] = ts
-                ordered_ids.append(tid)
-            if not ts_index:
-                return 0
-
-            # Build classroom id list
-            classroom_ids: List[Any] = []
-            for c in classrooms or []:
-                try:
-                    cid = c.get("id") if isinstance(c, dict) else getattr(c, "id", None)
-                    if cid is not None:
-                        classroom_ids.append(cid)
-                except Exception:
-                    continue
-            if not classroom_ids:
-                # Infer from assignments
-                for a in assignments:
-                    if isinstance(a, dict):
-                        cid = a.get("classroom_id")
-                        if cid is not None and cid not in classroom_ids:
-                            classroom_ids.append(cid)
-
-            # Build occupancy and instructor busy maps
-            occupied: Dict[Tuple[Any, int], bool] = {}
-            busy: Dict[Any, set] = {}
-            for a in assignments:
-                if not isinstance(a, dict):
-                    continue
-                cid = a.get("classroom_id")
-                idx = ts_index.get(a.get("timeslot_id"))
-                if cid is not None and idx is not None:
-                    occupied[(cid, idx)] = True
-                for i in a.get("instructors", []) or []:
-                    busy.setdefault(i, set()).add(idx)
-
-            # Order assignments by current slot index to move earlier ones first
-            ordered = [a for a in assignments if isinstance(a, dict) and a.get("timeslot_id") in ts_index]
-            ordered.sort(key=lambda a: ts_index.get(a.get("timeslot_id"), 10**9))
-
-            moved = 0
-            for a in ordered:
-                cur_idx = ts_index.get(a.get("timeslot_id"))
-                if cur_idx is None:
-                    continue
-                instrs = a.get("instructors", []) or []
-                for target_idx in range(0, cur_idx):
-                    placed = False
-                    for cid in classroom_ids:
-                        if occupied.get((cid, target_idx)):
-                            continue
-                        # Instructors must be free
-                        ok = True
-                        for i in instrs:
-                            if target_idx in busy.get(i, set()):
-                                ok = False
-                                break
-                        if not ok:
-                            continue
-                        # Move
-                        old_cid = a.get("classroom_id")
-                        if old_cid is not None:
-                            occupied.pop((old_cid, cur_idx), None)
-                        a["classroom_id"] = cid
-                        a["timeslot_id"] = ordered_ids[target_idx]
-                        occupied[(cid, target_idx)] = True
-                        for i in instrs:
-                            busy.setdefault(i, set()).discard(cur_idx)
-                            busy[i].add(target_idx)
-                        moved += 1
-                        placed = True
-                        break
-                    if placed:
-                        break
-            return moved
-        except Exception:
-            return 0
-
-    def _summarize_schedule_policies(self, assignments: List[Dict[str, Any]], timeslots: List[Any], classrooms: List[Any]) -> Dict[str, Any]:
-        """
-        Produce a compact summary for reporting:
-        - total assignments
-        - count of late slots (>=16:30)
-        - distribution by timeslot
-        - classrooms having internal gaps after compaction
-        """
-        summary = {
-            "total": 0,
-            "late": 0,
-            "by_timeslot": {},
-            "classrooms_with_gap": 0,
-        }
-        try:
-            if not assignments:
-                return summary
-            summary["total"] = len(assignments)
-            # Build id->ts map
-            id_to_ts: Dict[Any, Any] = {}
-            for ts in timeslots or []:
-                tid = ts.get("id") if isinstance(ts, dict) else getattr(ts, "id", None)
-                if tid is not None:
-                    id_to_ts[tid] = ts
-            def is_late(ts: Any) -> bool:
-                try:
-                    start = ts.get("start_time", "") if isinstance(ts, dict) else getattr(ts, "start_time", "")
-                    parts = str(start).split(":")
-                    h = int(parts[0]) if parts and parts[0].isdigit() else 0
-                    m = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
-                    return h > 16 or (h == 16 and m >= 30)
-                except Exception:
-                    return False
-            def fmt_key(ts: Any) -> str:
-                try:
-                    start = str(ts.get("start_time", "")) if isinstance(ts, dict) else str(getattr(ts, "start_time", ""))
-                    end = str(ts.get("end_time", "")) if isinstance(ts, dict) else str(getattr(ts, "end_time", ""))
-                    sh = ":".join(start.split(":")[:2])
-                    eh = ":".join(end.split(":")[:2])
-                    return f"{sh}-{eh}"
-                except Exception:
-                    return "unknown"
-            for a in assignments:
-                if not isinstance(a, dict):
-                    continue
-                ts = id_to_ts.get(a.get("timeslot_id"))
-                if not ts:
-                    continue
-                key = fmt_key(ts)
-                summary["by_timeslot"][key] = summary["by_timeslot"].get(key, 0) + 1
-                if is_late(ts):
-                    summary["late"] += 1
-            # Gap detection via simple per-classroom continuity check
-            from collections import defaultdict
-            ts_order: Dict[Any, int] = {}
-            ordered = []
-            # Build ordering
-            def parse_start(ts: Any) -> tuple:
-                try:
-                    s = ts.get("start_time") if isinstance(ts, dict) else getattr(ts, "start_time", None)
-                    from datetime import datetime as _dt
-                    for fmt in ("%H:%M:%S", "%H:%M"):
-                        try:
-                            dt = _dt.strptime(str(s), fmt)
-                            return (dt.hour, dt.minute, dt.second)
-                        except Exception:
-                            continue
-                except Exception:
-                    pass
-                return (24, 0, 0)
-            ts_en = list(enumerate(timeslots or []))
-            ts_en.sort(key=lambda item: (parse_start(item[1]), item[0]))
-            for idx, ts in ts_en:
-                tid = ts.get("id") if isinstance(ts, dict) else getattr(ts, "id", idx)
-                ts_order[tid] = len(ordered)
-                ordered.append(tid)
-            per_class: Dict[Any, list] = defaultdict(list)
-            for a in assignments:
-                if not isinstance(a, dict):
-                    continue
-                cid = a.get("classroom_id")
-                tid = a.get("timeslot_id")
-                if cid is None or tid not in ts_order:
-                    continue
-                per_class[cid].append(ts_order[tid])
-            gaps = 0
-            for cid, idxs in per_class.items():
-                s = sorted(set(idxs))
-                for prev, curr in zip(s, s[1:]):
-                    if curr - prev > 1:
-                        gaps += 1
-                        break
-            summary["classrooms_with_gap"] = gaps
-        except Exception:
-            return summary
-        return summary
+        if not isinstance(schedules, list):
+            logger.warning(f"Invalid schedule format: {type(schedules)}")
+            return None
+
+        def _as_int(value: Any) -> Any:
+            # Kolonlar Integer; "5" ile 5 ayni satir sayilmali
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return value
 
+        def _order(entry: Dict[str, Any]) -> Tuple[int, int]:
+            try:
+                ts_val = int(entry.get("timeslot_id", 10**9))
+            except Exception:
+                ts_val = 10**9
+            try:
+                room_val = int(entry.get("classroom_id", 10**9))
+            except Exception:
+                room_val = 10**9
+            return ts_val, room_val
+
+        rows: Dict[Any, Dict[str, Any]] = {}
+        for item in schedules:
+            if isinstance(item, dict):
+                project_id = item.get("project_id")
+                entry = {
+                    "classroom_id": item.get("classroom_id"),
+                    "timeslot_id": item.get("timeslot_id"),
+                    "is_makeup": bool(item.get("is_makeup", False)),
+                    "instructors": item.get("instructors", []),  # Jüri üyeleri
+                }
+            else:
+                project_id = getattr(item, "project_id", getattr(item, "id", None))
+                entry = {
+                    "classroom_id": getattr(item, "classroom_id", None),
+                    "timeslot_id": getattr(item, "timeslot_id", None),
+                    "is_makeup": bool(getattr(item, "is_makeup", False)),
+                    "instructors": getattr(item, "instructors", []),
+                }
+            # Validate required fields
+            if not (project_id and entry["classroom_id"] and entry["timeslot_id"]):
+                logger.warning(f"Invalid schedule data: {item}")
+                continue
+            project_id = _as_int(project_id)
+            entry["classroom_id"] = _as_int(entry["classroom_id"])
+            entry["timeslot_id"] = _as_int(entry["timeslot_id"])
+            prev = rows.get(project_id)
+            if prev is None or _order(entry) < _order(prev):
+                rows[project_id] = entry
+
+        if rows and len(rows) != len(schedules):
+            logger.warning(
+                "Duplicate projects pruned before save | total=%s unique=%s removed=%s",
+                len(schedules), len(rows), len(schedules) - len(rows),
+            )
+        return rows
+
+    # Internal helpers -------------------------------------------------------
     @staticmethod
     async def _get_real_data(db, classroom_count: int = 7) -> Dict[str, Any]:
         """
@@ -1608,15 +1741,18 @@ class AlgorithmService:
 
             if not algorithm_run:
                 raise ValueError(f"Algorithm run with ID {run_id} not found.")
+            # Sikistirilmis sonuc yalnizca burada acilir
+            run_result = await load_run_result(db, algorithm_run)
         
         return {
                 "id": algorithm_run.id,
                 "algorithm_type": algorithm_run.algorithm_type,
                 "parameters": algorithm_run.parameters,
                 "status": algorithm_run.status,
-                "result": algorithm_run.result,
+                "result": run_result,
                 "error": algorithm_run.error,
                 "execution_time": algorithm_run.execution_time,
+                "resource_profile": algorithm_run.resource_profile,
                 "started_at": algorithm_run.started_at,
                 "completed_at": algorithm_run.completed_at
         }
\ No newline at end of file
@@ -11,7 +11,7 @@ from datetime import datetime, timedelta
 import asyncio
 import logging
 
-from app.core.cache import get_redis_client
+from app.core import cache as redis_cache
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -27,9 +27,9 @@ class CacheService:
         self.user_cache_ttl = 900  # 15 minutes for user-specific data
     
     async def _get_redis(self):
-        """Get Redis client with lazy initialization"""
+        """Get the async Redis pool (MockRedisPool when Redis is unavailable)"""
         if self.redis_client is None:
-            self.redis_client = await get_redis_client()
+            self.redis_client = redis_cache.redis_pool
         return self.redis_client
     
     def _generate_cache_key(self, prefix: str, *args, **kwargs) -> str:
@@ -23,6 +23,9 @@ except ImportError:
     CHARTS_AVAILABLE = False
     print("Warning: Chart generation libraries not available. Install matplotlib, seaborn, and numpy for chart support.")
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services import schedule_stats
 from app.services.final_makeup_service import FinalMakeupService
 from app.services.scoring import ScoringService
 
@@ -49,12 +52,14 @@ class ChartGeneratorService:
                 # Fallback to default style
                 pass
     
-    async def generate_load_distribution_chart(self, algorithm_run_id: Optional[int] = None) -> Dict[str, Any]:
+    async def generate_load_distribution_chart(self, algorithm_run_id: Optional[int] = None,
+                                               db: Optional[AsyncSession] = None) -> Dict[str, Any]:
         """
         Yük dağılımı grafiği oluşturur.
         
         Args:
             algorithm_run_id: Algoritma çalıştırma ID'si
+            db: Veritabanı oturumu (verilirse yükler SQL'de toplanır)
             
         Returns:
             Chart generation result
@@ -70,7 +75,7 @@ class ChartGeneratorService:
                 }
             
             # 1. Hoca yük verilerini al
-            instructor_loads = await self._get_instructor_load_data()
+            instructor_loads = await self._get_instructor_load_data(db)
             
             # 2. Grafik oluştur
             chart_data = await self._create_load_distribution_visualization(instructor_loads)
@@ -145,12 +150,14 @@ class ChartGeneratorService:
                 "message": "Sınıf geçiş raporu oluşturulamadı"
             }
     
-    async def generate_comprehensive_dashboard(self, algorithm_run_id: Optional[int] = None) -> Dict[str, Any]:
+    async def generate_comprehensive_dashboard(self, algorithm_run_id: Optional[int] = None,
+                                               db: Optional[AsyncSession] = None) -> Dict[str, Any]:
         """
         Kapsamlı dashboard oluşturur (tüm grafikler).
         
         Args:
             algorithm_run_id: Algoritma çalıştırma ID'si
+            db: Veritabanı oturumu (verilirse grafik verileri SQL'de toplanır)
             
         Returns:
             Dashboard generation result
@@ -161,7 +168,7 @@ class ChartGeneratorService:
             dashboard_data = {}
             
             # 1. Yük dağılımı grafiği
-            load_chart = await self.generate_load_distribution_chart(algorithm_run_id)
+            load_chart = await self.generate_load_distribution_chart(algorithm_run_id, db)
             if load_chart["success"]:
                 dashboard_data["load_distribution"] = load_chart
             
@@ -171,7 +178,7 @@ class ChartGeneratorService:
                 dashboard_data["classroom_transitions"] = transition_report
             
             # 3. Zaman dilimi kullanım grafiği
-            timeslot_chart = await self.generate_timeslot_usage_chart(algorithm_run_id)
+            timeslot_chart = await self.generate_timeslot_usage_chart(algorithm_run_id, db)
             if timeslot_chart["success"]:
                 dashboard_data["timeslot_usage"] = timeslot_chart
             
@@ -202,11 +209,12 @@ class ChartGeneratorService:
                 "message": "Dashboard oluşturulamadı"
             }
     
-    async def generate_timeslot_usage_chart(self, algorithm_run_id: Optional[int] = None) -> Dict[str, Any]:
+    async def generate_timeslot_usage_chart(self, algorithm_run_id: Optional[int] = None,
+                                            db: Optional[AsyncSession] = None) -> Dict[str, Any]:
         """Zaman dilimi kullanım grafiği oluştur"""
         try:
             # Zaman dilimi verilerini al
-            timeslot_data = await self._get_timeslot_usage_data()
+            timeslot_data = await self._get_timeslot_usage_data(db)
             
             # Grafik oluştur
             fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
@@ -227,7 +235,7 @@ class ChartGeneratorService:
                         str(count), ha='center', va='bottom')
             
             # 2. Günlük yoğunluk grafiği
-            hourly_data = await self._get_hourly_density_data()
+            hourly_data = await self._get_hourly_density_data(db, timeslot_data)
             hours = list(hourly_data.keys())
             densities = list(hourly_data.values())
             
@@ -301,8 +309,14 @@ class ChartGeneratorService:
             logger.error(f"Error generating project type distribution: {str(e)}")
             return {"success": False, "error": str(e)}
     
-    async def _get_instructor_load_data(self) -> List[Dict[str, Any]]:
-        """Hoca yük verilerini getir (placeholder)"""
+    async def _get_instructor_load_data(self, db: Optional[AsyncSession] = None) -> List[Dict[str, Any]]:
+        """Hoca yük verilerini getir (oturum yoksa placeholder)"""
+        if db is not None:
+            rows = await schedule_stats.instructor_load_rows(db)
+            return [
+                {key: row[key] for key in ("name", "bitirme_count", "ara_count", "total_load")}
+                for row in rows
+            ]
         return [
             {"name": "Dr. Ahmet Yılmaz", "bitirme_count": 3, "ara_count": 2, "total_load": 5.0},
             {"name": "Dr. Ayşe Demir", "bitirme_count": 2, "ara_count": 3, "total_load": 5.0},
@@ -323,8 +337,11 @@ class ChartGeneratorService:
             {"instructor": "Dr. Ali Veli", "from_classroom": "D109", "to_classroom": "D111", "transition_count": 2}
         ]
     
-    async def _get_timeslot_usage_data(self) -> List[Dict[str, Any]]:
-        """Zaman dilimi kullanım verilerini getir (placeholder)"""
+    async def _get_timeslot_usage_data(self, db: Optional[AsyncSession] = None) -> List[Dict[str, Any]]:
+        """Zaman dilimi kullanım verilerini getir (oturum yoksa placeholder)"""
+        if db is not None:
+            # Slot başına sayım tek bir GROUP BY sorgusuyla
+            return await schedule_stats.timeslot_usage(db)
         return [
             {"timeslot": "09:00-09:30", "usage_count": 5},
             {"timeslot": "09:30-10:00", "usage_count": 8},
@@ -340,8 +357,14 @@ class ChartGeneratorService:
             {"timeslot": "16:00-16:30", "usage_count": 4}
         ]
     
-    async def _get_hourly_density_data(self) -> Dict[str, float]:
-        """Saatlik yoğunluk verilerini getir (placeholder)"""
+    async def _get_hourly_density_data(self, db: Optional[AsyncSession] = None,
+                                       timeslot_data: Optional[List[Dict[str, Any]]] = None) -> Dict[str, float]:
+        """Saatlik yoğunluk verilerini getir (oturum yoksa placeholder)"""
+        if db is not None:
+            # Aynı istekte alınmış slot kullanımı varsa yeniden sorgulama
+            if timeslot_data is None or any("start" not in row for row in timeslot_data):
+                timeslot_data = await schedule_stats.timeslot_usage(db)
+            return schedule_stats.hourly_density(timeslot_data)
         return {
             "09:00": 0.3, "09:30": 0.5, "10:00": 0.8, "10:30": 1.0,
             "11:00": 0.7, "11:30": 0.4, "12:00": 0.1, "13:00": 0.4,
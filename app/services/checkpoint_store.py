@@ -0,0 +1,117 @@
+"""
+Solver checkpoint deposu.
+
+Her kosunun son arama durumu ``CHECKPOINT_DIR/run_<id>.ckpt`` dosyasinda
+sikistirilmis JSON olarak tutulur (``run_storage`` kodlamasi). Yazma atomiktir:
+gecici dosyaya yazilip ``os.replace`` ile yerine konur; boylece calisma
+ortasinda coken bir worker en fazla bir checkpoint araligi kaybeder ve yarim
+yazilmis dosya hic gorulmez. Dosya sayisi ``CHECKPOINT_MAX_FILES`` ile
+sinirlanir; en eskiler silinir.
+"""
+from typing import Any, Callable, Dict, Optional
+import glob
+import logging
+import os
+import tempfile
+
+from app.core.config import settings
+from app.services.run_storage import decode_payload, encode_payload
+
+logger = logging.getLogger(__name__)
+
+SUFFIX = ".ckpt"
+
+
+class CheckpointStore:
+    """
+    Kosu basina tek checkpoint dosyasi tutan disk deposu.
+
+    Args:
+        directory: Checkpoint klasoru (varsayilan: ``settings.CHECKPOINT_DIR``).
+        max_files: Tutulacak en fazla dosya sayisi (varsayilan: ``settings.CHECKPOINT_MAX_FILES``).
+    """
+
+    suffix = SUFFIX
+
+    def __init__(self, directory: Optional[str] = None, max_files: Optional[int] = None):
+        self._directory = directory
+        self._max_files = max_files
+
+    @property
+    def directory(self) -> str:
+        return self._directory or settings.CHECKPOINT_DIR
+
+    @property
+    def max_files(self) -> int:
+        return self._max_files if self._max_files is not None else settings.CHECKPOINT_MAX_FILES
+
+    def path(self, run_id: int) -> str:
+        return os.path.join(self.directory, f"run_{int(run_id)}{self.suffix}")
+
+    def save(self, run_id: int, state: Dict[str, Any]) -> int:
+        """
+        Checkpoint'i atomik olarak yaz.
+
+        Returns:
+            int: Diske yazilan bayt sayisi.
+        """
+        blob, encoding, _ = encode_payload(state)
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=f".run_{int(run_id)}.", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(encoding.encode("ascii") + b"\n" + blob)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp_path, self.path(run_id))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self._prune()
+        return len(blob)
+
+    def load(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """Kosunun son checkpoint'i; yoksa veya okunamiyorsa None."""
+        try:
+            with open(self.path(run_id), "rb") as handle:
+                encoding, _, blob = handle.read().partition(b"\n")
+            return decode_payload(blob, encoding.decode("ascii"))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Checkpoint for run {run_id} could not be read: {e}")
+            return None
+
+    def exists(self, run_id: int) -> bool:
+        return os.path.exists(self.path(run_id))
+
+    def delete(self, run_id: int) -> bool:
+        try:
+            os.unlink(self.path(run_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def saver(self, run_id: int) -> Callable[[Dict[str, Any]], None]:
+        """``SolverControl.on_checkpoint`` olarak kullanilacak yazici."""
+        def save(state: Dict[str, Any]) -> None:
+            size = self.save(run_id, state)
+            logger.debug(f"Checkpoint for run {run_id}: iteration {state.get('iteration')}, {size} bytes")
+        return save
+
+    def _prune(self) -> None:
+        if self.max_files <= 0:
+            return
+        files = glob.glob(os.path.join(self.directory, f"run_*{self.suffix}"))
+        if len(files) <= self.max_files:
+            return
+        files.sort(key=lambda path: os.path.getmtime(path))
+        for path in files[:len(files) - self.max_files]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+checkpoint_store = CheckpointStore()
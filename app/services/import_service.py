@@ -8,8 +8,6 @@ from io import BytesIO
 from datetime import datetime
 import re
 
-from openpyxl import load_workbook
-from openpyxl.utils import get_column_letter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
@@ -73,6 +71,8 @@ class ImportService:
         """
         Validate instructor email Excel file.
         """
+        from openpyxl import load_workbook
+
         try:
             wb = load_workbook(filename=BytesIO(file_content), data_only=True)
             sheet = wb.active
@@ -227,6 +227,8 @@ class ImportService:
         Returns:
             Dictionary with parsed data and validation results
         """
+        from openpyxl import load_workbook
+
         try:
             workbook = load_workbook(filename=BytesIO(file_content), data_only=True)
             sheet = workbook.active
@@ -686,6 +688,7 @@ class ImportService:
         """Generate Excel template file."""
         from openpyxl import Workbook
         from openpyxl.styles import Font, PatternFill, Alignment
+        from openpyxl.utils import get_column_letter
         
         wb = Workbook()
         ws = wb.active
@@ -0,0 +1,538 @@
+"""
+Incremental re-optimization of the persisted schedule.
+
+Kucuk veri degisikliklerinde (proje eklendi/silindi, ogretim uyesi bazi
+zaman dilimlerinde musait degil, sinif kaldirildi) tum cizelgeyi yeniden
+cozmek yerine kalici cizelge yerel olarak onarilir:
+
+1. Degisiklik seti uygulanir; etkilenen projeler "yerinden edilmis" olur.
+   Bloklanan juri uyesi once ayni hucrede degistirilmeye calisilir.
+2. ``ConflictResolutionService`` ile kalan ogretim uyesi/sinif cakismalari
+   tespit edilir; cakisan atamalardan biri yerinde birakilir.
+3. Yerinden edilen ve yeni projeler minimum hareketle bos hucrelere konur
+   (ayni sinif / yakin zaman dilimi / PS surekliligi tercih edilir). Bos
+   hucre yoksa sinirli yerel arama (tek adimli ejection) denenir.
+
+Degismeyen atamalara dokunulmaz; sonuc yalnizca farklari (diff) tasir.
+"""
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import asyncio
+import copy
+import logging
+import math
+import time
+
+from app.algorithms.warm_start import normalize_instructor_ids
+from app.services.conflict_resolution_service import ConflictResolutionService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIME_LIMIT_SECONDS = 1.0
+MAX_TIME_LIMIT_SECONDS = 30.0
+
+# Yerlesim maliyeti agirliklari (dusuk = tercih edilen)
+CLASSROOM_CHANGE_COST = 1.0
+SLOT_DISTANCE_COST = 0.1
+JURY_CHANGE_COST = 0.5
+NEW_CLASSROOM_COST = 5.0
+EJECTION_COST = 1.0
+CONTINUITY_BONUS = 0.3
+
+CHANGE_ADDED = "added"
+CHANGE_REMOVED = "removed"
+CHANGE_MOVED = "moved"
+CHANGE_JURY = "jury_changed"
+CHANGE_UNPLACED = "unplaced"
+
+PLACEHOLDER_J2 = {"id": -1, "name": "[Arastirma Gorevlisi]", "is_placeholder": True}
+
+Cell = Tuple[int, int]
+
+
+def clamp_time_limit(value: Any) -> float:
+    """
+    Yerel arama sure limitini dogrula ve ``MAX_TIME_LIMIT_SECONDS`` ile sinirla.
+
+    Raises:
+        ValueError: Deger sayi degilse, NaN/sonsuzsa veya pozitif degilse.
+    """
+    limit = float(value)
+    if not math.isfinite(limit) or limit <= 0:
+        raise ValueError("time_limit must be a positive finite number of seconds")
+    return min(limit, MAX_TIME_LIMIT_SECONDS)
+
+
+def _int_list(values: Any, name: str) -> List[int]:
+    if values is None:
+        return []
+    if not isinstance(values, (list, tuple, set)):
+        raise ValueError(f"{name} must be a list of ids")
+    try:
+        return [int(v) for v in values]
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must contain integer ids")
+
+
+@dataclass
+class ChangeSet:
+    """Kalici cizelgeye uygulanacak degisiklikler."""
+
+    added_projects: List[int] = field(default_factory=list)
+    removed_projects: List[int] = field(default_factory=list)
+    # instructor_id -> bloklu timeslot id'leri (None: tum gun)
+    blocked_instructors: Dict[int, Optional[Set[int]]] = field(default_factory=dict)
+    removed_classrooms: List[int] = field(default_factory=list)
+
+    @classmethod
+    def from_payload(cls, payload: Optional[Dict[str, Any]]) -> "ChangeSet":
+        """
+        Istek govdesinden degisiklik seti olustur.
+
+        ``blocked_instructors`` ``{"3": [201, 202]}`` ya da
+        ``[{"instructor_id": 3, "timeslot_ids": [201]}]`` olabilir; bos
+        liste/None o ogretim uyesinin tum gun musait olmadigi anlamina gelir.
+        """
+        payload = payload or {}
+        if not isinstance(payload, dict):
+            raise ValueError("changes must be an object")
+        blocked_raw = payload.get("blocked_instructors") or {}
+        if isinstance(blocked_raw, dict):
+            items = list(blocked_raw.items())
+        elif isinstance(blocked_raw, list):
+            items = []
+            for item in blocked_raw:
+                if not isinstance(item, dict) or "instructor_id" not in item:
+                    raise ValueError("blocked_instructors entries need an instructor_id")
+                items.append((item["instructor_id"], item.get("timeslot_ids")))
+        else:
+            raise ValueError("blocked_instructors must be an object or a list")
+
+        blocked: Dict[int, Optional[Set[int]]] = {}
+        for instructor_id, slots in items:
+            try:
+                instructor_id = int(instructor_id)
+            except (TypeError, ValueError):
+                raise ValueError("blocked_instructors keys must be instructor ids")
+            slot_ids = _int_list(slots, "timeslot_ids")
+            blocked[instructor_id] = set(slot_ids) if slot_ids else None
+
+        return cls(
+            added_projects=_int_list(payload.get("added_projects"), "added_projects"),
+            removed_projects=_int_list(payload.get("removed_projects"), "removed_projects"),
+            blocked_instructors=blocked,
+            removed_classrooms=_int_list(payload.get("removed_classrooms"), "removed_classrooms"),
+        )
+
+    def is_empty(self) -> bool:
+        return not (self.added_projects or self.removed_projects
+                    or self.blocked_instructors or self.removed_classrooms)
+
+
+class IncrementalRepairer:
+    """Kalici cizelgeyi degisiklik setine gore minimum hareketle onarir."""
+
+    def __init__(self, schedule: Iterable[Dict[str, Any]], data: Dict[str, Any], changes: ChangeSet,
+                 time_limit: float = DEFAULT_TIME_LIMIT_SECONDS, repair_conflicts: bool = True):
+        self.changes = changes
+        self.time_limit = time_limit
+        self.repair_conflicts = repair_conflicts
+        self.deadline = 0.0
+
+        self.original: Dict[int, Dict[str, Any]] = {}
+        for entry in schedule:
+            project_id = int(entry["project_id"])
+            if project_id not in self.original:
+                self.original[project_id] = {
+                    "project_id": project_id,
+                    "classroom_id": int(entry["classroom_id"]),
+                    "timeslot_id": int(entry["timeslot_id"]),
+                    "is_makeup": bool(entry.get("is_makeup", False)),
+                    "instructors": copy.deepcopy(entry.get("instructors") or []),
+                }
+
+        self.projects = {int(p["id"]): p for p in data.get("projects", []) or [] if isinstance(p, dict)}
+        self.faculty = [
+            int(i["id"]) for i in data.get("instructors", []) or []
+            if isinstance(i, dict) and "assistant" not in str(i.get("type", "instructor")).lower()
+        ]
+
+        # Zaman dilimleri baslangic saatine gore; surekliligi sira belirler
+        timeslots = sorted(
+            (t for t in data.get("timeslots", []) or [] if isinstance(t, dict)),
+            key=lambda t: (str(t.get("start_time", "")), t.get("id")),
+        )
+        self.slots = [int(t["id"]) for t in timeslots]
+        if not self.slots:
+            self.slots = sorted({e["timeslot_id"] for e in self.original.values()})
+        self.slot_pos = {slot: i for i, slot in enumerate(self.slots)}
+
+        removed_rooms = set(changes.removed_classrooms)
+        used_rooms = sorted({e["classroom_id"] for e in self.original.values()})
+        self.classrooms = [c for c in used_rooms if c not in removed_rooms]
+        self.spare_classrooms = [
+            int(c["id"]) for c in data.get("classrooms", []) or []
+            if isinstance(c, dict) and int(c["id"]) not in removed_rooms and int(c["id"]) not in used_rooms
+        ]
+
+        self.entries: Dict[int, Dict[str, Any]] = {}
+        self.cell: Dict[Cell, int] = {}
+        self.busy: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        self.load: Counter = Counter()
+
+    # -- durum yardimcilari -------------------------------------------------
+
+    def _ps(self, entry: Dict[str, Any]) -> Optional[int]:
+        project = self.projects.get(entry["project_id"]) or {}
+        ps = project.get("responsible_instructor_id") or project.get("responsible_id")
+        if ps:
+            return int(ps)
+        ids = normalize_instructor_ids(entry["instructors"])
+        return ids[0] if ids and ids[0] > 0 else None
+
+    @staticmethod
+    def _members(entry: Dict[str, Any]) -> List[int]:
+        return [i for i in normalize_instructor_ids(entry["instructors"]) if i > 0]
+
+    def _blocked(self, instructor_id: int, slot: int) -> bool:
+        if instructor_id not in self.changes.blocked_instructors:
+            return False
+        slots = self.changes.blocked_instructors[instructor_id]
+        return slots is None or slot in slots
+
+    def _available(self, instructor_id: int, slot: int, ignore: Optional[int] = None) -> bool:
+        if self._blocked(instructor_id, slot):
+            return False
+        occupants = self.busy.get((instructor_id, slot), ())
+        return not any(pid != ignore for pid in occupants)
+
+    def _place(self, entry: Dict[str, Any]) -> None:
+        pid = entry["project_id"]
+        self.entries[pid] = entry
+        self.cell[(entry["classroom_id"], entry["timeslot_id"])] = pid
+        for member in self._members(entry):
+            self.busy[(member, entry["timeslot_id"])].add(pid)
+            self.load[member] += 1
+
+    def _unplace(self, pid: int) -> Dict[str, Any]:
+        entry = self.entries.pop(pid)
+        cell = (entry["classroom_id"], entry["timeslot_id"])
+        if self.cell.get(cell) == pid:
+            del self.cell[cell]
+        for member in self._members(entry):
+            self.busy[(member, entry["timeslot_id"])].discard(pid)
+            self.load[member] -= 1
+        return entry
+
+    @staticmethod
+    def _replace_member(instructors: List[Any], old_id: int, new_id: int) -> List[Any]:
+        replaced = []
+        for item in instructors:
+            if isinstance(item, dict) and normalize_instructor_ids([item]) == [old_id]:
+                replaced.append({**item, "id": new_id})
+            elif not isinstance(item, dict) and normalize_instructor_ids([item]) == [old_id]:
+                replaced.append(new_id)
+            else:
+                replaced.append(item)
+        return replaced
+
+    def _neighbours(self, classroom_id: int, slot: int) -> List[int]:
+        pos = self.slot_pos.get(slot)
+        if pos is None:
+            return []
+        found = []
+        for other in (pos - 1, pos + 1):
+            if 0 <= other < len(self.slots):
+                pid = self.cell.get((classroom_id, self.slots[other]))
+                if pid is not None:
+                    found.append(pid)
+        return found
+
+    def _pick_substitute(self, entry: Dict[str, Any], slot: int, classroom_id: int,
+                         exclude: Set[int]) -> Optional[int]:
+        """Hucrede musait, en az yuklu (komsu hucrede zaten aktif olan tercihli) ogretim uyesi."""
+        nearby = set()
+        for pid in self._neighbours(classroom_id, slot):
+            nearby.update(self._members(self.entries[pid]))
+        best, best_key = None, None
+        for candidate in self.faculty:
+            if candidate in exclude or not self._available(candidate, slot, ignore=entry["project_id"]):
+                continue
+            key = (self.load[candidate] - (1 if candidate in nearby else 0), candidate)
+            if best_key is None or key < best_key:
+                best, best_key = candidate, key
+        return best
+
+    # -- yerlesim -----------------------------------------------------------
+
+    def _cell_cost(self, entry: Dict[str, Any], classroom_id: int, slot: int,
+                   ignore: Optional[int] = None) -> Optional[Tuple[float, List[Any]]]:
+        """
+        Projenin hucreye konma maliyeti ve gereken juri listesi. PS musait
+        degilse ya da juri tamamlanamiyorsa None.
+        """
+        ps = self._ps(entry)
+        if ps is None or not self._available(ps, slot, ignore=ignore):
+            return None
+        instructors = list(entry["instructors"])
+        members = set(self._members(entry)) | {ps}
+        cost = 0.0
+        for member in self._members(entry):
+            if member == ps or self._available(member, slot, ignore=ignore):
+                continue
+            substitute = self._pick_substitute(entry, slot, classroom_id, members)
+            if substitute is None:
+                return None
+            instructors = self._replace_member(instructors, member, substitute)
+            members.add(substitute)
+            cost += JURY_CHANGE_COST
+        if len(members) < 2:
+            # Yeni projede J1 henuz yok; hucreye gore secilir
+            j1 = self._pick_substitute(entry, slot, classroom_id, members)
+            if j1 is None:
+                return None
+            instructors = [ps, j1] + instructors[2:]
+
+        origin = self.original.get(entry["project_id"])
+        if origin is not None:
+            if classroom_id != origin["classroom_id"]:
+                cost += CLASSROOM_CHANGE_COST
+            if origin["timeslot_id"] in self.slot_pos and slot in self.slot_pos:
+                cost += SLOT_DISTANCE_COST * abs(self.slot_pos[slot] - self.slot_pos[origin["timeslot_id"]])
+        if classroom_id not in self.classrooms:
+            cost += NEW_CLASSROOM_COST
+        for pid in self._neighbours(classroom_id, slot):
+            if pid != ignore and ps in self._members(self.entries[pid]):
+                cost -= CONTINUITY_BONUS
+        return cost, instructors
+
+    def _free_cells(self) -> Iterable[Cell]:
+        for classroom_id in self.classrooms + self.spare_classrooms:
+            for slot in self.slots:
+                if (classroom_id, slot) not in self.cell:
+                    yield classroom_id, slot
+
+    def _best_free_cell(self, entry: Dict[str, Any]) -> Optional[Tuple[float, Cell, List[Any]]]:
+        best = None
+        for classroom_id, slot in self._free_cells():
+            scored = self._cell_cost(entry, classroom_id, slot)
+            if scored is not None and (best is None or scored[0] < best[0]):
+                best = (scored[0], (classroom_id, slot), scored[1])
+        return best
+
+    def _commit(self, entry: Dict[str, Any], cell: Cell, instructors: List[Any]) -> None:
+        self._place({**entry, "classroom_id": cell[0], "timeslot_id": cell[1], "instructors": instructors})
+
+    def _place_with_ejection(self, entry: Dict[str, Any]) -> bool:
+        """Dolu bir hucreyi, sakinini baska bos hucreye tasiyarak bosalt (tek adim)."""
+        best = None
+        for cell, occupant in list(self.cell.items()):
+            if time.monotonic() > self.deadline:
+                break
+            if cell[0] not in self.classrooms:
+                continue
+            scored = self._cell_cost(entry, cell[0], cell[1], ignore=occupant)
+            if scored is None or (best is not None and scored[0] >= best[0]):
+                continue
+            moved = self._unplace(occupant)
+            relocation = self._best_free_cell(moved)
+            self._place(moved)
+            if relocation is None:
+                continue
+            total = scored[0] + relocation[0] + EJECTION_COST
+            if best is None or total < best[0]:
+                best = (total, cell, scored[1], occupant, relocation[1], relocation[2])
+        if best is None:
+            return False
+        _, cell, instructors, occupant, target, occupant_instructors = best
+        self._commit(self._unplace(occupant), target, occupant_instructors)
+        self._commit(entry, cell, instructors)
+        return True
+
+    def _new_entry(self, project_id: int) -> Optional[Dict[str, Any]]:
+        project = self.projects.get(project_id)
+        if project is None:
+            return None
+        ps = project.get("responsible_instructor_id") or project.get("responsible_id")
+        if not ps:
+            return None
+        return {"project_id": project_id, "classroom_id": None, "timeslot_id": None,
+                "is_makeup": bool(project.get("is_makeup", False)),
+                "instructors": [int(ps), -1, dict(PLACEHOLDER_J2)]}
+
+    def _place_anywhere(self, entry: Dict[str, Any]) -> bool:
+        """Once bos hucreler, sonra tek adimli ejection."""
+        best = self._best_free_cell(entry)
+        if best is not None:
+            self._commit(entry, best[1], best[2])
+            return True
+        return self._place_with_ejection(entry)
+
+    # -- ana akis ---------------------------------------------------------
+
+    def _conflicting_projects(self) -> List[int]:
+        """Cakisma dedektoruyle bulunan, yerinden edilmesi gereken projeler."""
+        assignments = [
+            {
+                "project_id": pid,
+                "classroom_id": entry["classroom_id"],
+                "timeslot_id": entry["timeslot_id"],
+                "responsible_instructor_id": self._ps(entry),
+                "instructors": self._members(entry),
+            }
+            for pid, entry in self.entries.items()
+        ]
+        conflicts = ConflictResolutionService().detect_all_conflicts(assignments)
+        displaced: List[int] = []
+        for conflict in conflicts:
+            involved = sorted(a["project_id"] for a in conflict.get("conflicting_assignments", []))
+            # Ilki yerinde kalir, digerleri tasinir
+            displaced.extend(pid for pid in involved[1:] if pid not in displaced)
+        return displaced
+
+    def repair(self) -> Dict[str, Any]:
+        """Degisiklikleri uygula, yerel onarimi yap ve farklari dondur."""
+        started = time.monotonic()
+        self.deadline = started + self.time_limit
+        removed = set(self.changes.removed_projects)
+        removed_rooms = set(self.changes.removed_classrooms)
+        displaced: List[Dict[str, Any]] = []
+
+        for pid, entry in self.original.items():
+            if pid in removed:
+                continue
+            entry = copy.deepcopy(entry)
+            if entry["classroom_id"] in removed_rooms or entry["timeslot_id"] not in self.slot_pos:
+                displaced.append(entry)
+            else:
+                self._place(entry)
+
+        # Bloklu ogretim uyeleri: juri ise yerinde degistir, PS ise tasi
+        for pid in list(self.entries):
+            entry = self.entries[pid]
+            slot = entry["timeslot_id"]
+            blocked = [m for m in self._members(entry) if self._blocked(m, slot)]
+            if not blocked:
+                continue
+            if self._ps(entry) in blocked:
+                displaced.append(self._unplace(pid))
+                continue
+            entry = self._unplace(pid)
+            scored = self._cell_cost(entry, entry["classroom_id"], slot)
+            if scored is None:
+                displaced.append(entry)
+            else:
+                self._commit(entry, (entry["classroom_id"], slot), scored[1])
+
+        conflicts_before = 0
+        if self.repair_conflicts:
+            conflicting = self._conflicting_projects()
+            conflicts_before = len(conflicting)
+            for pid in conflicting:
+                if pid in self.entries:
+                    displaced.append(self._unplace(pid))
+
+        unplaced: List[int] = []
+        unresolved: List[int] = []
+        displaced.sort(key=lambda e: (self.slot_pos.get(e["timeslot_id"], len(self.slots)), e["project_id"]))
+        for entry in displaced:
+            if self._place_anywhere(entry):
+                continue
+            origin = self.original[entry["project_id"]]
+            cell = (origin["classroom_id"], origin["timeslot_id"])
+            if cell[0] in self.classrooms and cell[1] in self.slot_pos and cell not in self.cell:
+                # Yer bulunamadi: eski yerinde birak, kullaniciya bildir
+                self._place(copy.deepcopy(origin))
+                unresolved.append(entry["project_id"])
+            else:
+                unplaced.append(entry["project_id"])
+
+        for project_id in self.changes.added_projects:
+            if project_id in self.entries or project_id in removed:
+                continue
+            entry = self._new_entry(project_id)
+            if entry is None or not self._place_anywhere(entry):
+                unplaced.append(project_id)
+
+        diff = self._diff(removed)
+        counts = Counter(change["change"] for change in diff)
+        kept = len([pid for pid in self.original if pid not in removed])
+        unchanged = kept - counts[CHANGE_MOVED] - counts[CHANGE_JURY] - counts[CHANGE_UNPLACED]
+        return {
+            "schedule": [self.entries[pid] for pid in sorted(self.entries)],
+            "diff": diff,
+            "unplaced": unplaced,
+            "unresolved": unresolved,
+            "stats": {
+                "unchanged": unchanged,
+                "moved": counts[CHANGE_MOVED],
+                "jury_changed": counts[CHANGE_JURY],
+                "added": counts[CHANGE_ADDED],
+                "removed": counts[CHANGE_REMOVED],
+                "unplaced": len(unplaced),
+                "conflicts_repaired": conflicts_before,
+                "stability": round(unchanged / kept, 4) if kept else 1.0,
+            },
+            "elapsed": round(time.monotonic() - started, 4),
+        }
+
+    def _diff(self, removed: Set[int]) -> List[Dict[str, Any]]:
+        def _view(entry):
+            return {k: entry[k] for k in ("classroom_id", "timeslot_id", "instructors")}
+
+        diff = []
+        for pid in sorted(set(self.original) | set(self.entries)):
+            before, after = self.original.get(pid), self.entries.get(pid)
+            if before is None:
+                diff.append({"project_id": pid, "change": CHANGE_ADDED, "before": None, "after": _view(after)})
+            elif after is None:
+                change = CHANGE_REMOVED if pid in removed else CHANGE_UNPLACED
+                diff.append({"project_id": pid, "change": change, "before": _view(before), "after": None})
+            elif (before["classroom_id"], before["timeslot_id"]) != (after["classroom_id"], after["timeslot_id"]):
+                diff.append({"project_id": pid, "change": CHANGE_MOVED, "before": _view(before), "after": _view(after)})
+            elif before["instructors"] != after["instructors"]:
+                diff.append({"project_id": pid, "change": CHANGE_JURY, "before": _view(before), "after": _view(after)})
+        return diff
+
+
+async def incremental_reoptimize(changes: ChangeSet, data: Optional[Dict[str, Any]] = None,
+                                 persist: bool = True, time_limit: float = DEFAULT_TIME_LIMIT_SECONDS,
+                                 repair_conflicts: bool = True, classroom_count: int = 7) -> Dict[str, Any]:
+    """
+    Kalici cizelgeyi degisiklik setine gore onar.
+
+    Girdi verilmezse veritabanindaki gercek veri yuklenir. Onarim CPU isidir;
+    event loop'u bloklamamak icin thread'de ve oturum kapaliyken calisir.
+    ``persist`` ile yalnizca degisen satirlar ``schedules`` tablosuna yazilir.
+
+    Raises:
+        ValueError: Kalici cizelge yoksa veya ``time_limit`` gecersizse.
+    """
+    from sqlalchemy import select
+    from app.db.base import async_session
+    from app.models.schedule import Schedule
+    from app.services.algorithm import AlgorithmService
+
+    time_limit = clamp_time_limit(time_limit)
+    async with async_session() as db:
+        rows = await db.execute(
+            select(
+                Schedule.project_id, Schedule.classroom_id, Schedule.timeslot_id,
+                Schedule.is_makeup, Schedule.instructors,
+            ).order_by(Schedule.id)
+        )
+        schedule = [dict(row._mapping) for row in rows]
+        if not schedule:
+            raise ValueError("No persisted schedule to re-optimize")
+        if not data or not any(data.values()):
+            data = await AlgorithmService._get_real_data(db, classroom_count)
+
+    repairer = IncrementalRepairer(schedule, data, changes, time_limit, repair_conflicts)
+    result = await asyncio.to_thread(repairer.repair)
+    logger.info(f"Incremental re-optimization: {result['stats']} in {result['elapsed']}s")
+    result["schedule_persistence"] = None
+    if persist and result["diff"]:
+        async with async_session() as db:
+            result["schedule_persistence"] = await AlgorithmService._save_schedules_to_db(db, result)
+    return result
@@ -2,7 +2,7 @@ from typing import List, Optional, Dict, Any, Union
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, join
 from sqlalchemy.orm import selectinload
-import numpy as np
+import statistics
 from datetime import date, datetime, time
 
 from app.models.instructor import Instructor, InstructorType
@@ -133,8 +133,8 @@ class InstructorService(BaseService[Instructor, InstructorCreate, InstructorUpda
         return {
             "min_load": min(total_loads),
             "max_load": max(total_loads),
-            "avg_load": float(np.mean(total_loads)),
-            "std_dev": float(np.std(total_loads))
+            "avg_load": statistics.fmean(total_loads),
+            "std_dev": statistics.pstdev(total_loads)
         }
 
     async def get_availability(self, db: AsyncSession, instructor_id: int, date: date) -> InstructorAvailability:
@@ -0,0 +1,265 @@
+"""
+Algoritma kosulari icin arka plan is katmani (Celery).
+
+Akis:
+- ``submit_job`` is kaydini Redis'e yazar (``queued``) ve Celery gorevini
+  oncelik sinifina gore kuyruga koyar: ``interactive`` -> ``algorithms``,
+  ``batch`` -> ``algorithms_batch``.
+- Worker ``execute_job`` ile gercek servis yolunu (``AlgorithmService.run_algorithm``)
+  calistirir; solver ilerleme olaylari is kaydina yazilir, iptal bayragi
+  periyodik olarak kontrol edilir.
+- Sonuc result backend'e gonderilmez: cizelge run kaydinda (sikistirilmis)
+  saklanir, is kaydi yalnizca ``run_id`` referansini tutar.
+
+Is kaydi gonderen kullaniciyi (``user_id``) tutar; durum, sonuc ve iptal
+yalnizca o kullaniciya veya superuser'a aciktir (``can_access_job``).
+
+Is durumu ve ilerleme Redis'tedir; Redis yoksa ``MockRedis`` ile ayni surecte
+calisir (eager broker ile testler icin yeterli).
+"""
+from typing import Any, Dict, Optional
+from datetime import datetime
+import asyncio
+import json
+import logging
+import threading
+import uuid
+
+import redis
+from redis.exceptions import RedisError
+
+from app.algorithms.anytime import SolverControl
+from app.core.cache import get_redis_client
+from app.core.config import settings
+from app.models.algorithm import AlgorithmType
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+TERMINAL_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+
+# Oncelik sinifi -> (kuyruk, Celery onceligi; Redis transport'unda 0 en yuksek)
+PRIORITY_ROUTES = {
+    PRIORITY_INTERACTIVE: ("algorithms", 0),
+    PRIORITY_BATCH: ("algorithms_batch", 9),
+}
+
+KEY_PREFIX = "job:"
+CANCEL_POLL_SECONDS = 1.0
+
+
+class JobStore:
+    """
+    Is kayitlarini Redis'te JSON olarak tutar.
+
+    Args:
+        client: Senkron Redis istemcisi (varsayilan: ``REDIS_URL``; baglanilamazsa MockRedis).
+        ttl: Kayit yasam suresi (saniye).
+    """
+
+    def __init__(self, client: Any = None, ttl: Optional[int] = None):
+        self._client = client
+        self.ttl = ttl if ttl is not None else settings.JOB_TTL_SECONDS
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            self._client = self._connect()
+        return self._client
+
+    @staticmethod
+    def _connect() -> Any:
+        try:
+            client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True,
+                                          socket_timeout=5, socket_connect_timeout=5)
+            client.ping()
+            return client
+        except RedisError as e:
+            logger.warning(f"Job store falling back to in-process storage: {e}")
+            return get_redis_client()
+
+    @staticmethod
+    def key(job_id: str) -> str:
+        return f"{KEY_PREFIX}{job_id}"
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = self.client.get(self.key(job_id))
+        return json.loads(raw) if raw else None
+
+    def save(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        job["updated_at"] = datetime.now().isoformat()
+        self.client.set(self.key(job["job_id"]), json.dumps(job, default=str), ex=self.ttl)
+        return job
+
+    def update(self, job_id: str, **fields: Any) -> Optional[Dict[str, Any]]:
+        """Is kaydini guncelle; kayit yoksa None."""
+        with self._lock:
+            job = self.get(job_id)
+            if job is None:
+                return None
+            job.update(fields)
+            return self.save(job)
+
+    def request_cancel(self, job_id: str) -> None:
+        self.client.set(self.key(job_id) + ":cancel", "1", ex=self.ttl)
+
+    def cancel_requested(self, job_id: str) -> bool:
+        return bool(self.client.get(self.key(job_id) + ":cancel"))
+
+
+job_store = JobStore()
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+def submit_job(algorithm: str, data: Optional[Dict[str, Any]] = None,
+               params: Optional[Dict[str, Any]] = None, priority: str = PRIORITY_INTERACTIVE,
+               user_id: Optional[int] = None, store: Optional[JobStore] = None) -> Dict[str, Any]:
+    """
+    Algoritma kosusunu arka plan isi olarak kuyruga koy.
+
+    Raises:
+        ValueError: Bilinmeyen algoritma veya oncelik sinifi.
+
+    Returns:
+        Is kaydi (eager modda is tamamlanmis olarak doner).
+    """
+    from app.tasks.algorithms import run_algorithm
+
+    store = store or job_store
+    algorithm = AlgorithmType(str(algorithm).lower()).value
+    if priority not in PRIORITY_ROUTES:
+        raise ValueError(f"Unknown priority class: {priority!r} (expected one of {sorted(PRIORITY_ROUTES)})")
+    queue, celery_priority = PRIORITY_ROUTES[priority]
+
+    job_id = uuid.uuid4().hex
+    store.save({
+        "job_id": job_id,
+        "algorithm": algorithm,
+        "priority": priority,
+        "queue": queue,
+        "status": JOB_QUEUED,
+        "progress": 0.0,
+        "run_id": None,
+        "user_id": user_id,
+        "submitted_at": _now(),
+        "started_at": None,
+        "finished_at": None,
+        "error": None,
+    })
+    run_algorithm.apply_async(
+        args=[job_id, algorithm, data or {}, params or {}, user_id],
+        task_id=job_id, queue=queue, priority=celery_priority,
+    )
+    return store.get(job_id)
+
+
+def can_access_job(job: Dict[str, Any], user: Any) -> bool:
+    """Is kaydini yalnizca isi gonderen kullanici veya superuser gorebilir/iptal edebilir."""
+    if getattr(user, "is_superuser", False):
+        return True
+    return job.get("user_id") is not None and job.get("user_id") == getattr(user, "id", None)
+
+
+def cancel_job(job_id: str, store: Optional[JobStore] = None) -> Optional[Dict[str, Any]]:
+    """
+    Isi iptal et. Kuyruktaki is hic baslamaz; calisan isin solver'i o ana
+    kadarki en iyi cozumle durur.
+
+    Returns:
+        Guncel is kaydi; is bulunamazsa None.
+    """
+    store = store or job_store
+    job = store.get(job_id)
+    if job is None or job["status"] in TERMINAL_STATES:
+        return job
+    store.request_cancel(job_id)
+    if job["status"] == JOB_QUEUED:
+        try:
+            from app.core.celery import celery_app
+            celery_app.control.revoke(job_id)
+        except Exception as e:
+            # Worker gorevi alirsa iptal bayragini gorup calismadan cikar
+            logger.warning(f"Revoke of job {job_id} failed: {e}")
+        return store.update(job_id, status=JOB_CANCELLED, finished_at=_now())
+    return store.update(job_id, message="cancelling")
+
+
+async def _watch_cancel(job_id: str, holder: Dict[str, SolverControl], store: JobStore) -> None:
+    while True:
+        await asyncio.sleep(CANCEL_POLL_SECONDS)
+        control = holder.get("control")
+        if control is not None and await asyncio.to_thread(store.cancel_requested, job_id):
+            control.cancel()
+            return
+
+
+async def execute_job(job_id: str, algorithm: str, data: Dict[str, Any],
+                      params: Dict[str, Any], user_id: Optional[int] = None,
+                      store: Optional[JobStore] = None) -> Dict[str, Any]:
+    """
+    Isi worker'da calistir (Celery gorevinin govdesi).
+
+    Returns:
+        Result backend'e giden kucuk ozet: ``job_id``, ``run_id``, ``status``.
+    """
+    from app.services.algorithm import AlgorithmService
+
+    store = store or job_store
+    if store.cancel_requested(job_id):
+        store.update(job_id, status=JOB_CANCELLED, finished_at=_now())
+        return {"job_id": job_id, "run_id": None, "status": JOB_CANCELLED}
+    store.update(job_id, status=JOB_RUNNING, started_at=_now())
+
+    holder: Dict[str, SolverControl] = {}
+
+    def on_control(run_id: int, control: SolverControl) -> None:
+        holder["control"] = control
+        store.update(job_id, run_id=run_id)
+        forward = control.on_progress
+
+        def on_progress(event: Dict[str, Any]) -> None:
+            if forward is not None:
+                forward(event)
+            store.update(
+                job_id,
+                progress=round(10 + 80 * (event.get("fraction") or 0.0), 1),
+                iteration=event.get("iteration"),
+                best_cost=event.get("best_cost"),
+                elapsed=event.get("elapsed"),
+            )
+
+        control.on_progress = on_progress
+        if store.cancel_requested(job_id):
+            control.cancel()
+
+    watcher = asyncio.create_task(_watch_cancel(job_id, holder, store))
+    try:
+        result, algorithm_run = await AlgorithmService.run_algorithm(
+            algorithm, data, params, user_id, on_control=on_control
+        )
+    except Exception as e:
+        logger.error(f"Job {job_id} failed: {e}")
+        store.update(job_id, status=JOB_FAILED, error=str(e), finished_at=_now())
+        raise
+    finally:
+        watcher.cancel()
+
+    if store.cancel_requested(job_id):
+        status = JOB_CANCELLED
+    elif isinstance(result, dict) and str(result.get("status", "")).lower() in ("failed", "error"):
+        status = JOB_FAILED
+    else:
+        status = JOB_COMPLETED
+    store.update(job_id, status=status, run_id=algorithm_run.id, progress=100.0, finished_at=_now())
+    return {"job_id": job_id, "run_id": algorithm_run.id, "status": status}
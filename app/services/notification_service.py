@@ -11,8 +11,6 @@ from sqlalchemy import select, func
 
 from app.models import Instructor, Schedule, Project, Classroom, TimeSlot, NotificationLog, NotificationStatus
 from app.services.email_service import EmailService
-from app.services.planner_export_service import exportPlannerToExcel
-from app.services.excel_to_image_service import excel_to_png
 from io import BytesIO
 
 logger = logging.getLogger(__name__)
@@ -594,6 +592,7 @@ class NotificationService:
             
             # Generate Excel file (will be attached as .xlsx for full-resolution viewing)
             try:
+                from app.services.planner_export_service import exportPlannerToExcel
                 excel_bytes = exportPlannerToExcel(planner_data)
                 logger.info(f"Excel file generated for instructor {instructor_id}: {len(excel_bytes)} bytes")
             except Exception as e:
@@ -928,6 +927,7 @@ class NotificationService:
             
             # Generate Excel file (will be attached as .xlsx for full-resolution viewing)
             try:
+                from app.services.planner_export_service import exportPlannerToExcel
                 excel_bytes = exportPlannerToExcel(planner_data)
                 logger.info(f"Excel file generated for custom email {email}: {len(excel_bytes)} bytes")
             except Exception as e:
@@ -4,12 +4,19 @@ Manages configurable weights for the multi-objective optimization function
 """
 
 from typing import Dict, Any, List, Optional
+from itertools import combinations
+import asyncio
+import math
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.cache_service import cache_service
+import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Toplu senaryo analizinde tek istekte degerlendirilecek en fazla senaryo
+MAX_SWEEP_SCENARIOS = 50000
+
 
 class ObjectiveWeightsService:
     """Service for managing objective function weights"""
@@ -329,15 +336,31 @@ class ObjectiveWeightsService:
         
         results = []
         
-        for i, weights in enumerate(weight_scenarios):
-            scenario_result = await self.calculate_weighted_score(objective_scores, weights)
+        validation_result = self._validate_objective_scores(objective_scores)
+        if validation_result["valid"] and weight_scenarios:
+            # Tum senaryolar tek matris carpimi ile skorlanir
+            objectives = self._objective_order()
+            normalized = self._score_matrix([objective_scores])[0]
+            weight_matrix = self._weight_matrix(weight_scenarios, normalize=False)
+            components = weight_matrix * normalized
+            totals = np.clip(components.sum(axis=1), 0.0, 100.0)
+            present = [j for j, objective in enumerate(objectives) if objective in objective_scores]
             
-            if scenario_result["success"]:
+            for i, weights in enumerate(weight_scenarios):
                 results.append({
                     "scenario_id": i + 1,
                     "weights": weights,
-                    "total_score": scenario_result["total_weighted_score"],
-                    "weighted_components": scenario_result["weighted_components"]
+                    "total_score": round(float(totals[i]), 4),
+                    "weighted_components": {
+                        objectives[j]: {
+                            "raw_score": objective_scores[objectives[j]],
+                            "normalized_score": float(normalized[j]),
+                            "weight": weights.get(objectives[j], 0.0),
+                            "weighted_component": float(components[i, j]),
+                            "description": self.objective_descriptions[objectives[j]]["description"]
+                        }
+                        for j in present if objectives[j] in weights
+                    }
                 })
         
         # Sort by total score
@@ -352,34 +375,43 @@ class ObjectiveWeightsService:
     async def get_weight_sensitivity_analysis(self, objective_scores: Dict[str, float]) -> Dict[str, Any]:
         """Ağırlık hassasiyet analizi yapar"""
         
-        sensitivity_analysis = {}
+        validation_result = self._validate_objective_scores(objective_scores)
+        if not validation_result["valid"]:
+            return {
+                "success": False,
+                "message": "Objective scores validation failed",
+                "errors": validation_result["errors"]
+            }
         
-        for objective in self.default_weights.keys():
-            # Test with increased weight
-            increased_weights = self.default_weights.copy()
-            increased_weights[objective] = min(1.0, increased_weights[objective] + 0.2)
-            increased_weights = self._normalize_weights(increased_weights)
-            
-            increased_result = await self.calculate_weighted_score(objective_scores, increased_weights)
-            
-            # Test with decreased weight
-            decreased_weights = self.default_weights.copy()
-            decreased_weights[objective] = max(0.0, decreased_weights[objective] - 0.2)
-            decreased_weights = self._normalize_weights(decreased_weights)
-            
-            decreased_result = await self.calculate_weighted_score(objective_scores, decreased_weights)
-            
-            # Current result
-            current_result = await self.calculate_weighted_score(objective_scores)
-            
+        objectives = self._objective_order()
+        current = np.array([self.default_weights[o] for o in objectives], dtype=float)
+        
+        # Satir 0: mevcut agirliklar; her amac icin +0.2 ve -0.2 senaryolari
+        k = len(objectives)
+        increased = np.tile(current, (k, 1))
+        increased[np.arange(k), np.arange(k)] = np.minimum(1.0, current + 0.2)
+        decreased = np.tile(current, (k, 1))
+        decreased[np.arange(k), np.arange(k)] = np.maximum(0.0, current - 0.2)
+        weight_matrix = np.vstack([current, increased, decreased])
+        totals = weight_matrix[1:].sum(axis=1, keepdims=True)
+        weight_matrix[1:] /= np.where(totals > 0, totals, 1.0)
+        
+        scores = self._score_scenarios(self._score_matrix([objective_scores]), weight_matrix)[:, 0]
+        scores = np.round(scores, 4)
+        current_score = float(scores[0])
+        
+        sensitivity_analysis = {}
+        for j, objective in enumerate(objectives):
+            increased_score = float(scores[1 + j])
+            decreased_score = float(scores[1 + k + j])
             sensitivity_analysis[objective] = {
                 "current_weight": self.default_weights[objective],
-                "current_score": current_result["total_weighted_score"],
-                "increased_weight": increased_weights[objective],
-                "increased_score": increased_result["total_weighted_score"],
-                "decreased_weight": decreased_weights[objective],
-                "decreased_score": decreased_result["total_weighted_score"],
-                "sensitivity": abs(increased_result["total_weighted_score"] - decreased_result["total_weighted_score"])
+                "current_score": current_score,
+                "increased_weight": float(weight_matrix[1 + j, j]),
+                "increased_score": increased_score,
+                "decreased_weight": float(weight_matrix[1 + k + j, j]),
+                "decreased_score": decreased_score,
+                "sensitivity": abs(increased_score - decreased_score)
             }
         
         return {
@@ -387,3 +419,206 @@ class ObjectiveWeightsService:
             "most_sensitive": max(sensitivity_analysis.items(), key=lambda x: x[1]["sensitivity"])[0],
             "least_sensitive": min(sensitivity_analysis.items(), key=lambda x: x[1]["sensitivity"])[0]
         }
+
+    # ------------------------------------------------------------------
+    # Vectorized multi-scenario evaluation
+    # ------------------------------------------------------------------
+    def _objective_order(self) -> List[str]:
+        """Matris sutunlarinin sabit amac sirasi"""
+        return list(self.default_weights.keys())
+    
+    def _score_matrix(self, candidates: List[Dict[str, float]]) -> np.ndarray:
+        """
+        Aday cozumlerin objective skorlarini normalize edilmis matrise cevirir.
+        
+        Returns:
+            (n_candidates, n_objectives) matris; eksik amaclar 0 katki verir.
+        """
+        objectives = self._objective_order()
+        raw = np.array(
+            [[float(c.get(o, np.nan)) for o in objectives] for c in candidates],
+            dtype=float
+        ).reshape(len(candidates), len(objectives))
+        lower = np.array([self.objective_descriptions[o]["range"][0] for o in objectives], dtype=float)
+        upper = np.array([self.objective_descriptions[o]["range"][1] for o in objectives], dtype=float)
+        minimize = np.array([self.objective_descriptions[o]["target"] == "minimize" for o in objectives])
+        
+        span = upper - lower
+        safe_span = np.where(span == 0, 1.0, span)
+        normalized = (raw - lower) / safe_span
+        normalized = np.where(minimize, 1.0 - normalized, normalized)
+        normalized = np.where(span == 0, 1.0, np.clip(normalized, 0.0, 1.0))
+        return np.where(np.isnan(raw), 0.0, normalized)
+    
+    def _weight_matrix(self, weight_scenarios: List[Dict[str, float]], normalize: bool = True) -> np.ndarray:
+        """Agirlik senaryolarini (n_scenarios, n_objectives) matrise cevirir."""
+        objectives = self._objective_order()
+        weights = np.array(
+            [[float(w.get(o, 0.0)) for o in objectives] for w in weight_scenarios],
+            dtype=float
+        ).reshape(len(weight_scenarios), len(objectives))
+        if normalize:
+            totals = weights.sum(axis=1, keepdims=True)
+            weights = weights / np.where(totals > 0, totals, 1.0)
+        return weights
+    
+    @staticmethod
+    def _score_scenarios(score_matrix: np.ndarray, weight_matrix: np.ndarray) -> np.ndarray:
+        """Tum senaryo x aday skorlari tek matris carpimi ile: (n_scenarios, n_candidates)"""
+        return np.clip(weight_matrix @ score_matrix.T, 0.0, 100.0)
+    
+    def generate_weight_grid(self, step: float = 0.1) -> np.ndarray:
+        """
+        Simpleks uzerinde esit aralikli agirlik izgarasi uretir (toplam = 1).
+        
+        Args:
+            step: Izgara adimi; 1/step tam sayiya yuvarlanir.
+        """
+        if not step > 0:
+            raise ValueError(f"Grid step must be positive, got {step}")
+        divisions = max(1, int(round(1.0 / step)))
+        k = len(self.default_weights)
+        # Boyut uretimden once hesaplanir; buyuk izgaralar bellege hic alinmaz
+        size = math.comb(divisions + k - 1, k - 1)
+        if size > MAX_SWEEP_SCENARIOS:
+            raise ValueError(f"Grid step {step} produces {size} scenarios (max {MAX_SWEEP_SCENARIOS})")
+        # Stars and bars: k-1 ayiricinin konumlari
+        bars = np.array(list(combinations(range(divisions + k - 1), k - 1)), dtype=int).reshape(size, k - 1)
+        padded = np.hstack([np.full((len(bars), 1), -1), bars, np.full((len(bars), 1), divisions + k - 1)])
+        return (np.diff(padded, axis=1) - 1) / divisions
+    
+    def generate_weight_samples(self, samples: int = 2000, concentration: float = 50.0,
+                                base_weights: Optional[Dict[str, float]] = None,
+                                seed: Optional[int] = None) -> np.ndarray:
+        """
+        Mevcut agirliklar etrafinda Dirichlet dagilimindan Monte-Carlo senaryolari uretir.
+        
+        Args:
+            samples: Senaryo sayisi.
+            concentration: Buyuk deger = mevcut agirliklara daha yakin ornekler.
+            base_weights: Merkez agirliklar (varsayilan: mevcut agirliklar).
+            seed: Tekrarlanabilirlik icin rastgele tohum.
+        """
+        if samples > MAX_SWEEP_SCENARIOS:
+            raise ValueError(f"At most {MAX_SWEEP_SCENARIOS} scenarios can be sampled")
+        base = self._weight_matrix([base_weights or self.default_weights])[0]
+        alpha = np.maximum(base * concentration, 1e-3)
+        return np.random.default_rng(seed).dirichlet(alpha, size=max(1, int(samples)))
+    
+    async def analyze_weight_sweep(self, candidates: Dict[str, Dict[str, float]],
+                                   weight_scenarios: Optional[List[Dict[str, float]]] = None,
+                                   mode: str = "monte_carlo", samples: int = 2000,
+                                   step: float = 0.1, concentration: float = 50.0,
+                                   seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        ``weight_sweep`` i thread'de calistirir; buyuk taramalar event loop'u bloklamaz.
+        """
+        return await asyncio.to_thread(
+            self.weight_sweep, candidates, weight_scenarios, mode, samples, step, concentration, seed
+        )
+    
+    def weight_sweep(self, candidates: Dict[str, Dict[str, float]],
+                     weight_scenarios: Optional[List[Dict[str, float]]] = None,
+                     mode: str = "monte_carlo", samples: int = 2000,
+                     step: float = 0.1, concentration: float = 50.0,
+                     seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Cok sayida agirlik senaryosunu toplu skorlar ve siralama kararliligini olcer.
+        
+        Aday skorlari (n_candidates x n_objectives) ve agirliklar (n_scenarios x
+        n_objectives) matrislere yigilir; tum skorlar tek ``W @ S.T`` ile hesaplanir.
+        
+        Args:
+            candidates: Aday adi -> objective skorlari (ornegin algoritma sonuclari).
+            weight_scenarios: Acik senaryo listesi; verilmezse ``mode`` ile uretilir.
+            mode: "monte_carlo" (Dirichlet) veya "grid" (simpleks izgarasi).
+        """
+        errors = []
+        for name, scores in candidates.items():
+            validation_result = self._validate_objective_scores(scores)
+            errors.extend(f"{name}: {error}" for error in validation_result["errors"])
+        if not candidates:
+            errors.append("At least one candidate is required")
+        if errors:
+            return {
+                "success": False,
+                "message": "Objective scores validation failed",
+                "errors": errors
+            }
+        
+        try:
+            if weight_scenarios:
+                if len(weight_scenarios) > MAX_SWEEP_SCENARIOS:
+                    raise ValueError(f"At most {MAX_SWEEP_SCENARIOS} scenarios can be evaluated")
+                for weights in weight_scenarios:
+                    if any(not isinstance(w, (int, float)) or w < 0 for w in weights.values()) or sum(weights.values()) <= 0:
+                        raise ValueError(f"Invalid weight scenario: {weights}")
+                weight_matrix = self._weight_matrix(weight_scenarios)
+                mode = "explicit"
+            elif mode == "grid":
+                weight_matrix = self.generate_weight_grid(step)
+            elif mode == "monte_carlo":
+                weight_matrix = self.generate_weight_samples(samples, concentration, seed=seed)
+            else:
+                raise ValueError(f"Unknown sweep mode: {mode}")
+        except ValueError as e:
+            return {"success": False, "message": str(e), "errors": [str(e)]}
+        
+        names = list(candidates.keys())
+        score_matrix = self._score_matrix([candidates[name] for name in names])
+        scores = self._score_scenarios(score_matrix, weight_matrix)
+        baseline = self._score_scenarios(score_matrix, self._weight_matrix([self.default_weights]))[0]
+        
+        # Siralar: 1 = en iyi (yuksek skor)
+        order = np.argsort(-scores, axis=1, kind="stable")
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(1, len(names) + 1), axis=1)
+        baseline_ranks = np.empty(len(names), dtype=int)
+        baseline_ranks[np.argsort(-baseline, kind="stable")] = np.arange(1, len(names) + 1)
+        
+        winners = order[:, 0]
+        win_counts = np.bincount(winners, minlength=len(names))
+        baseline_winner = int(np.argmin(baseline_ranks))
+        
+        # Kendall tau: senaryo siralamasi ile mevcut agirlik siralamasi arasindaki uyum
+        if len(names) > 1:
+            upper_i, upper_j = np.triu_indices(len(names), k=1)
+            scenario_pairs = np.sign(scores[:, upper_i] - scores[:, upper_j])
+            baseline_pairs = np.sign(baseline[upper_i] - baseline[upper_j])
+            kendall_tau = (scenario_pairs * baseline_pairs).mean(axis=1)
+            mean_tau = float(kendall_tau.mean())
+            min_tau = float(kendall_tau.min())
+        else:
+            mean_tau = min_tau = 1.0
+        
+        candidate_stats = {}
+        for idx, name in enumerate(names):
+            candidate_scores = scores[:, idx]
+            candidate_ranks = ranks[:, idx]
+            candidate_stats[name] = {
+                "baseline_score": round(float(baseline[idx]), 4),
+                "baseline_rank": int(baseline_ranks[idx]),
+                "mean_score": float(candidate_scores.mean()),
+                "score_std": float(candidate_scores.std()),
+                "score_range": [float(candidate_scores.min()), float(candidate_scores.max())],
+                "win_rate": float(win_counts[idx] / len(weight_matrix)),
+                "mean_rank": float(candidate_ranks.mean()),
+                "rank_std": float(candidate_ranks.std()),
+                "rank_range": [int(candidate_ranks.min()), int(candidate_ranks.max())]
+            }
+        
+        return {
+            "success": True,
+            "mode": mode,
+            "scenario_count": int(len(weight_matrix)),
+            "objectives": self._objective_order(),
+            "candidates": candidate_stats,
+            "rank_stability": {
+                "baseline_winner": names[baseline_winner],
+                "winner_stability": float(win_counts[baseline_winner] / len(weight_matrix)),
+                "mean_kendall_tau": mean_tau,
+                "min_kendall_tau": min_tau,
+                "distinct_winners": int(np.count_nonzero(win_counts))
+            },
+            "current_weights": self.default_weights.copy()
+        }
@@ -23,8 +23,8 @@ class ParallelProcessingService:
         self.thread_pool_executor = None
         self.process_pool_executor = None
         
-    def _get_thread_pool(self):
-        """Get or create thread pool executor"""
+    def get_thread_pool(self):
+        """Get or create the shared thread pool executor"""
         if self.thread_pool_executor is None:
             self.thread_pool_executor = concurrent.futures.ThreadPoolExecutor(
                 max_workers=self.max_workers,
@@ -87,7 +87,7 @@ class ParallelProcessingService:
         
         try:
             if executor_type == "thread":
-                executor = self._get_thread_pool()
+                executor = self.get_thread_pool()
             elif executor_type == "process":
                 executor = self._get_process_pool()
             else:
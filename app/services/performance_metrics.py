@@ -6,12 +6,25 @@ Conforms to the spec:
 - Outputs: normalized 0-100 metrics and weighted total, with counts and violations
 
 This module is read-only and does not mutate plans or algorithms; it's used for evaluation only.
+
+The raw statistics come from the shared metric engine (``app.algorithms.metric_engine``):
+the instance part of a plan (slots, people, expected projects, classes) is indexed once
+and every plan is scanned in a single pass. ``compute_many`` shares one index between
+plans of the same instance and can score large batches on a process pool.
 """
+from concurrent.futures import Executor, ProcessPoolExecutor
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
-import math
 import json
+import logging
+import math
 import os
+import threading
+
+from app.algorithms.metric_engine import PlanStats, ProblemIndex, mean_std
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
 
 
 DEFAULT_WEIGHTS = {
@@ -55,369 +68,121 @@ def _load_weights_from_config(config_path: Optional[str]) -> Dict[str, float]:
         return DEFAULT_WEIGHTS.copy()
 
 
-def _index_slots(plan: Dict[str, Any]) -> Tuple[Dict[Any, int], Dict[Any, Dict[str, Any]], List[Any]]:
-    slots: List[Dict[str, Any]] = plan.get("slots", []) or []
-    # Slots are already in chronological order per spec; build index by their order
-    id_to_idx: Dict[Any, int] = {}
-    id_to_slot: Dict[Any, Dict[str, Any]] = {}
-    ordered_ids: List[Any] = []
-    for i, s in enumerate(slots):
-        sid = s.get("id", i)
-        id_to_idx[sid] = i
-        id_to_slot[sid] = s
-        ordered_ids.append(sid)
-    return id_to_idx, id_to_slot, ordered_ids
+def _normalize_0_100(value: float) -> float:
+    return max(0.0, min(100.0, float(value)))
 
 
-def _get_slot_reward(slot: Dict[str, Any]) -> float:
-    """Slot ödülünü hesapla - erken saatler yüksek puanlı"""
-    if slot is None:
-        return 0.0
-
-    # Zaman bilgisini al
-    time_range = str(slot.get("time_range") or slot.get("start_time") or "")
-
-    # Erken saatler yüksek ödül
-    if "09:00" in time_range:
-        return 1000.0
-    elif "09:30" in time_range:
-        return 950.0
-    elif "10:00" in time_range:
-        return 900.0
-    elif "10:30" in time_range:
-        return 850.0
-    elif "11:00" in time_range:
-        return 800.0
-    elif "11:30" in time_range:
-        return 750.0
-    elif "13:00" in time_range:
-        return 700.0
-    elif "13:30" in time_range:
-        return 650.0
-    elif "14:00" in time_range:
-        return 600.0
-    elif "14:30" in time_range:
-        return 550.0
-    elif "15:00" in time_range:
-        return 500.0
-    elif "15:30" in time_range:
-        return 450.0
-    elif "16:00" in time_range:
-        return 400.0
-    elif "16:30" in time_range:
-        return -9999.0  # Cezalı slot
-    elif "17:00" in time_range:
-        return -9999.0  # Cezalı slot
-    elif "17:30" in time_range:
-        return -9999.0  # Cezalı slot
-    elif "18:00" in time_range:
-        return -9999.0  # Cezalı slot
-
-    # Varsayılan düşük ödül
-    return 100.0
-
-
-def _is_late_slot(slot: Dict[str, Any]) -> bool:
-    """16:30 sonrası slotları tespit et"""
-    if slot is None:
-        return False
-    if isinstance(slot.get("is_late_slot"), bool):
-        return bool(slot.get("is_late_slot"))
-
-    # Zaman parsing
+def _resolve_weights_and_params(weights: Optional[Dict[str, float]], params: Optional[Dict[str, Any]]) -> Tuple[Dict[str, float], MetricParams]:
+    cfg_path = None
     try:
-        label = str(slot.get("label") or slot.get("time_range") or "")
-        if any(x in label for x in ["16:30", "17:00", "17:30", "18:00"]):
-            return True
-        st = str(slot.get("start_time") or "")
-        parts = st.split(":")
-        h = int(parts[0]) if parts and parts[0].isdigit() else 0
-        m = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
-        return h > 16 or (h == 16 and m >= 30)
+        cfg_path = params.get("config_path") if isinstance(params, dict) else None
     except Exception:
-        return False
-
-
-def _collect_expected_project_ids(plan: Dict[str, Any]) -> List[Any]:
-    eps = plan.get("expected_projects", []) or []
-    ids = []
-    for p in eps:
-        pid = p.get("id")
-        if pid is not None:
-            ids.append(pid)
-    return ids
-
-
-def _collect_expected_project_type_counts(plan: Dict[str, Any]) -> Dict[str, int]:
-    counts: Dict[str, int] = {"ara": 0, "bitirme": 0}
-    for p in plan.get("expected_projects", []) or []:
-        t = str(p.get("type") or p.get("project_type") or "").lower()
-        if t in counts:
-            counts[t] += 1
-    return counts
-
-
-def _collect_people_types(plan: Dict[str, Any]) -> Dict[Any, str]:
-    mapping: Dict[Any, str] = {}
-    for person in plan.get("people", []) or []:
-        pid = person.get("id")
-        if pid is not None:
-            mapping[pid] = str(person.get("type") or "").lower()
-    return mapping
-
-
-def _role_violations_for_assignment(ass: Dict[str, Any], people_types: Dict[Any, str]) -> int:
-    """Rol kısıtlarını kontrol et - güncellenmiş kurallara göre"""
-    violations = 0
-    project_type = str(ass.get("project_type") or ass.get("type") or "").lower()
-    roles = ass.get("roles") or []
-    instructors = ass.get("instructors", [])
-
-    # Rol bilgilerini topla
-    responsibles = [r for r in roles if str(r.get("role", "")).upper() in ("SORUMLU", "RESPONSIBLE")]
-    juries = [r for r in roles if str(r.get("role", "")).upper() in ("JURI", "JURY")]
-
-    # Aynı kişi hem sorumlu hem jüri olamaz
-    resp_ids = {r.get("person_id") for r in responsibles}
-    jury_ids = {r.get("person_id") for r in juries}
-    same_person_both_roles = resp_ids & jury_ids
-    if same_person_both_roles:
-        violations += 1
-
-    # Proje türüne göre gerekli rol sayısı kontrolü
-    if project_type == "bitirme":
-        if len(responsibles) != 1:
-            violations += 1
-        if len(juries) < 1:
-            violations += 1
-        # Jüri sayısı için ek kontrol - çok fazla olmamalı
-        if len(juries) > 3:  # Max 3 jüri
-            violations += 1
-    elif project_type == "ara":
-        if len(responsibles) != 1:
-            violations += 1
-        if len(juries) != 0:
-            violations += 1
-
-    # Instructor sayısı kontrolü (rollerle tutarlı olmalı)
-    expected_instructor_count = len(responsibles) + len(juries)
-    if len(instructors) != expected_instructor_count:
-        violations += 1
-
-    return violations
-
-
-def _compute_gap_units(assignments: List[Dict[str, Any]], id_to_idx: Dict[Any, int]) -> int:
-    if not assignments or not id_to_idx:
-        return 0
-    # Per-classroom continuity
-    by_class: Dict[Any, List[int]] = {}
-    for a in assignments:
-        cid = a.get("class_id") or a.get("classroom_id")
-        sid = a.get("slot_id") or a.get("timeslot_id")
-        if cid is None or sid not in id_to_idx:
-            continue
-        by_class.setdefault(cid, []).append(id_to_idx[sid])
-    total = 0
-    for cid, idxs in by_class.items():
-        s = sorted(set(idxs))
-        for prev, curr in zip(s, s[1:]):
-            if curr - prev > 1:
-                # Öğle arası gap'ını ignore et (timeslot index 6 ve 7 arası)
-                # Eğer gap 12:00-13:00 arasındaysa ignore et
-                if prev == 6 and curr == 7:  # 12:00-13:00 gap (timeslot index 6->7)
-                    continue
-                total += (curr - prev - 1)
-    return total
-
-
-def _compute_class_switch_stats(assignments: List[Dict[str, Any]], id_to_idx: Dict[Any, int], people_types: Dict[Any, str]) -> Tuple[int, int]:
-    # Returns (total_switches, faculty_count)
-    per_instructor = {}
-    for a in assignments:
-        roles = a.get("roles") or []
-        # consider only HOCA in either responsible or jury
-        involved = [r.get("person_id") for r in roles if people_types.get(r.get("person_id")) == "hoca"]
-        sid = a.get("slot_id") or a.get("timeslot_id")
-        cid = a.get("class_id") or a.get("classroom_id")
-        for iid in set(involved):
-            per_instructor.setdefault(iid, []).append((id_to_idx.get(sid, 10**9), cid))
-    total_switches = 0
-    for iid, items in per_instructor.items():
-        items.sort(key=lambda x: x[0])
-        prev_class = None
-        for _, cls in items:
-            if prev_class is None:
-                prev_class = cls
-            else:
-                if cls != prev_class:
-                    total_switches += 1
-                prev_class = cls
-    return total_switches, len(per_instructor)
-
-
-def _compute_loads(assignments: List[Dict[str, Any]], people_types: Dict[Any, str]) -> Dict[Any, int]:
-    loads: Dict[Any, int] = {}
-    for a in assignments:
-        roles = a.get("roles") or []
-        for r in roles:
-            pid = r.get("person_id")
-            if people_types.get(pid) != "hoca":
-                continue
-            loads[pid] = loads.get(pid, 0) + 1
-    return loads
+        cfg_path = None
+    W = _load_weights_from_config(cfg_path) if weights is None else {**DEFAULT_WEIGHTS, **weights}
+    p = MetricParams(**{k: v for k, v in (params or {}).items() if k in MetricParams().__dict__}) if isinstance(params, dict) else MetricParams()
+    return W, p
 
 
-def _normalize_0_100(value: float) -> float:
-    return max(0.0, min(100.0, float(value)))
+def build_index(plan: Dict[str, Any]) -> ProblemIndex:
+    """Index the instance part of a plan (slots, people, expected_projects, classes)."""
+    return ProblemIndex(
+        projects=plan.get("expected_projects", []) or [],
+        instructors=plan.get("people", []) or [],
+        classrooms=plan.get("classes", []) or [],
+        timeslots=plan.get("slots", []) or [],
+    )
 
 
-def _calculate_jury_refinement_score(assignments: List[Dict[str, Any]], people_types: Dict[Any, str]) -> float:
+def _calculate_jury_refinement_score(stats: PlanStats) -> float:
     """
     Calculate jury refinement score based on workload balance and continuity.
-    
+
     Args:
-        assignments: List of assignments
-        people_types: Mapping of person IDs to types
-        
+        stats: Single-pass statistics of the plan
+
     Returns:
         Score between 0-100 (higher is better)
     """
-    if not assignments:
+    if not stats.count or not stats.instructor_loads:
         return 0.0
-    
-    # Calculate instructor workload (total assignments per instructor)
-    instructor_workloads = {}
-    for assignment in assignments:
-        for instructor_id in assignment.get("instructors", []):
-            instructor_workloads[instructor_id] = instructor_workloads.get(instructor_id, 0) + 1
-    
-    if not instructor_workloads:
-        return 0.0
-    
-    # Calculate workload balance (lower variance is better)
-    workloads = list(instructor_workloads.values())
+
+    # Workload balance (lower variance is better)
+    workloads = list(stats.instructor_loads.values())
     if len(workloads) <= 1:
         return 100.0
-    
-    mean_workload = sum(workloads) / len(workloads)
-    variance = sum((w - mean_workload) ** 2 for w in workloads) / len(workloads)
-    std_workload = math.sqrt(variance)
-    
-    # Normalize workload balance (0-100)
+    _, std_workload = mean_std(workloads)
     workload_balance = max(0.0, 100.0 - (std_workload * 20.0))  # Penalty for high variance
-    
-    # Calculate continuity score (instructors in same classroom)
-    classroom_continuity = 0.0
-    instructor_classrooms = {}
-    
-    for assignment in assignments:
-        classroom_id = assignment.get("classroom_id")
-        for instructor_id in assignment.get("instructors", []):
-            if instructor_id not in instructor_classrooms:
-                instructor_classrooms[instructor_id] = set()
-            instructor_classrooms[instructor_id].add(classroom_id)
-    
-    # Calculate continuity (instructors using fewer classrooms get higher scores)
+
+    # Continuity: instructors using fewer classrooms get higher scores
     continuity_scores = []
-    for instructor_id, classrooms in instructor_classrooms.items():
-        if len(classrooms) == 1:
-            continuity_scores.append(100.0)  # Perfect continuity
-        else:
-            # Penalty for classroom changes
-            penalty = (len(classrooms) - 1) * 25.0
-            continuity_scores.append(max(0.0, 100.0 - penalty))
-    
+    for items in stats.instructor_slots.values():
+        classrooms = {classroom for _, classroom in items}
+        continuity_scores.append(max(0.0, 100.0 - (len(classrooms) - 1) * 25.0))
     avg_continuity = sum(continuity_scores) / len(continuity_scores) if continuity_scores else 0.0
-    
+
     # Combined score (weighted average)
     combined_score = (workload_balance * 0.6) + (avg_continuity * 0.4)
-    
     return _normalize_0_100(combined_score)
 
 
-def compute(plan: Dict[str, Any], weights: Optional[Dict[str, float]] = None, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    """Compute performance metrics for a single plan.
+def score_plan(index: ProblemIndex, assignments: List[Dict[str, Any]], weights: Dict[str, float], params: MetricParams) -> Dict[str, Any]:
+    """Score one plan's assignments against a prebuilt instance index.
 
     Args:
-        plan: Dict with keys: classes, slots, assignments, people, expected_projects
-        weights: optional per-metric weights; if None, try metrics.config.json then defaults
-        params: optional MetricParams overrides as dict
+        index: ``build_index`` result for the plan's instance
+        assignments: The plan's assignments
+        weights: Resolved per-metric weights
+        params: Resolved ``MetricParams``
 
     Returns: Dict with perMetric, totals, counts
     """
-    cfg_path = None
-    try:
-        cfg_path = params.get("config_path") if isinstance(params, dict) else None
-    except Exception:
-        cfg_path = None
-    W = _load_weights_from_config(cfg_path) if weights is None else {**DEFAULT_WEIGHTS, **weights}
-    p = MetricParams(**{k: v for k, v in (params or {}).items() if k in MetricParams().__dict__}) if isinstance(params, dict) else MetricParams()
-
-    # Indices and maps
-    id_to_idx, id_to_slot, ordered_slot_ids = _index_slots(plan)
-    assignments: List[Dict[str, Any]] = plan.get("assignments", []) or []
-    people_types = _collect_people_types(plan)
-    expected_ids = _collect_expected_project_ids(plan)
-    expected_total = len(expected_ids)
+    W, p = weights, params
+    stats = index.stats(assignments)
+    calendar = index.calendar
+    people_types = index.people_types
+    expected_total = len(index.project_ids)
 
     # Coverage
-    scheduled_ids = []
-    for a in assignments:
-        pid = a.get("project_id")
-        if pid is not None:
-            scheduled_ids.append(pid)
-    scheduled_unique = len(set(scheduled_ids))
-    missing = [pid for pid in expected_ids if pid not in set(scheduled_ids)]
+    scheduled_unique = len(stats.project_counts)
+    missing = [pid for pid in index.project_ids if pid not in stats.project_counts]
     coverage_pct = 100.0 * (scheduled_unique / expected_total) if expected_total > 0 else 0.0
 
     # Type-specific check (optional)
-    exp_types = _collect_expected_project_type_counts(plan)
+    exp_types = index.project_type_counts
     type_penalty = 0.0
     if exp_types.get("ara", 0) and exp_types.get("bitirme", 0):
-        # Estimate scheduled counts by project_type within assignments if present
-        sched_ara = sum(1 for a in assignments if str(a.get("project_type") or "").lower() == "ara")
-        sched_bit = sum(1 for a in assignments if str(a.get("project_type") or "").lower() == "bitirme")
-        type_diff = abs(sched_ara - exp_types.get("ara", 0)) + abs(sched_bit - exp_types.get("bitirme", 0))
+        # Scheduled counts by project_type within assignments if present
+        type_diff = abs(stats.type_counts.get("ara", 0) - exp_types["ara"]) + abs(stats.type_counts.get("bitirme", 0) - exp_types["bitirme"])
         if expected_total > 0:
             type_penalty = min(20.0, 100.0 * type_diff / expected_total)  # cap penalty
     CoverageScore = _normalize_0_100(coverage_pct - type_penalty)
 
     # Duplicates
-    counts_by_project: Dict[Any, int] = {}
-    for pid in scheduled_ids:
-        counts_by_project[pid] = counts_by_project.get(pid, 0) + 1
-    duplicate_extra = sum(max(0, c - 1) for c in counts_by_project.values())
+    duplicate_extra = stats.duplicate_extra
     DuplicateScore = _normalize_0_100(100.0 - min(100.0, 100.0 * (duplicate_extra / max(1, expected_total)) * p.duplicate_K))
 
-    # Gaps (global across classrooms)
-    gap_units = _compute_gap_units(assignments, id_to_idx)
-    total_slots = len(ordered_slot_ids)
+    # Gaps (per-classroom continuity, summed)
+    gap_units = 0
+    for ordinals in stats.class_ordinals().values():
+        for prev, curr in zip(ordinals, ordinals[1:]):
+            if curr - prev > 1:
+                gap_units += curr - prev - 1
+    total_slots = len(calendar)
     GapScore = _normalize_0_100(100.0 - min(100.0, 100.0 * (gap_units / max(1, total_slots)) * p.gap_G))
 
     # Late slots
-    late_assignments = 0
-    for a in assignments:
-        sid = a.get("slot_id") or a.get("timeslot_id")
-        slot = id_to_slot.get(sid)
-        if _is_late_slot(slot):
-            late_assignments += 1
-    late_ratio = late_assignments / max(1, len(assignments))
+    late_assignments = stats.late_count
+    late_ratio = late_assignments / max(1, stats.count)
     LateSlotScore = _normalize_0_100(100.0 - min(100.0, 100.0 * late_ratio * p.late_linear_L) - late_assignments * p.late_fixed_penalty_per_assignment)
 
     # Role compliance
-    role_violations = 0
-    for a in assignments:
-        role_violations += _role_violations_for_assignment(a, people_types)
+    role_violations = stats.role_violations
     RoleComplianceScore = _normalize_0_100(100.0 - role_violations * 5.0)
 
     # Load balance (faculty HOCA only)
-    loads = _compute_loads(assignments, people_types)
-    faculty_loads = [v for pid, v in loads.items() if people_types.get(pid) == "hoca"]
+    faculty_loads = [v for pid, v in stats.role_loads.items() if people_types.get(pid) == "hoca"]
     if len(faculty_loads) >= 1:
-        mean = sum(faculty_loads) / len(faculty_loads)
-        variance = sum((x - mean) ** 2 for x in faculty_loads) / len(faculty_loads)
-        std = math.sqrt(variance)
+        _, std = mean_std(faculty_loads)
         # Normalize: std <= threshold -> near 100; std >= threshold+span -> 0
         if std <= p.load_std_threshold:
             LoadBalanceScore = 100.0
@@ -428,7 +193,18 @@ def compute(plan: Dict[str, Any], weights: Optional[Dict[str, float]] = None, pa
         LoadBalanceScore = 0.0
 
     # Class switch (faculty HOCA only)
-    total_switches, faculty_count = _compute_class_switch_stats(assignments, id_to_idx, people_types)
+    id_to_idx = calendar.id_to_index
+    total_switches = 0
+    faculty_count = 0
+    for person_id, items in stats.role_slots.items():
+        if people_types.get(person_id) != "hoca":
+            continue
+        faculty_count += 1
+        prev_class = None
+        for _, cls in sorted(items, key=lambda item: id_to_idx.get(item[0], 10**9)):
+            if prev_class is not None and cls != prev_class:
+                total_switches += 1
+            prev_class = cls
     avg_switch = (total_switches / faculty_count) if faculty_count > 0 else 0.0
     # Map to 0-100: zero or <= target -> 100; linear drop afterwards capped at 0
     if avg_switch <= p.class_switch_target:
@@ -439,17 +215,15 @@ def compute(plan: Dict[str, Any], weights: Optional[Dict[str, float]] = None, pa
         ClassSwitchScore = _normalize_0_100(100.0 - drop)
 
     # Session count (optional): unique slot ids used
-    used_slots = {a.get("slot_id") or a.get("timeslot_id") for a in assignments if (a.get("slot_id") or a.get("timeslot_id")) in id_to_idx}
-    used_sessions = len(used_slots)
+    used_sessions = len(stats.calendar_slots())
     # Heuristic ideal: pack sessions so that used_sessions ~= ceil(total_projects / max_classes)
-    classes = plan.get("classes", []) or []
-    max_classes = max(1, min(len(classes), 7))
+    max_classes = max(1, min(index.classroom_count, 7))
     ideal_sessions = math.ceil(max(1, scheduled_unique) / max_classes)
     extra_sessions = max(0, used_sessions - ideal_sessions)
     SessionCountScore = _normalize_0_100(100.0 - min(100.0, 100.0 * (extra_sessions / max(1, used_sessions)) * p.session_penalty_factor))
 
     # Jury Refinement Score (NEW)
-    JuryRefinementScore = _calculate_jury_refinement_score(assignments, people_types)
+    JuryRefinementScore = _calculate_jury_refinement_score(stats)
 
     # Weighted total
     perMetric = {
@@ -495,17 +269,102 @@ def compute(plan: Dict[str, Any], weights: Optional[Dict[str, float]] = None, pa
     }
 
 
-def compute_many(plans_by_algorithm: Dict[str, Dict[str, Any]], weights: Optional[Dict[str, float]] = None, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    """Compute metrics for multiple algorithms, returning a comparable table."""
-    results: Dict[str, Any] = {"byAlgorithm": {}, "ranking": []}
+def compute(plan: Dict[str, Any], weights: Optional[Dict[str, float]] = None, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Compute performance metrics for a single plan.
+
+    Args:
+        plan: Dict with keys: classes, slots, assignments, people, expected_projects
+        weights: optional per-metric weights; if None, try metrics.config.json then defaults
+        params: optional MetricParams overrides as dict
+
+    Returns: Dict with perMetric, totals, counts
+    """
+    W, p = _resolve_weights_and_params(weights, params)
+    return score_plan(build_index(plan), plan.get("assignments", []) or [], W, p)
+
+
+# Plans whose instance fields are equal share one ProblemIndex in compute_many
+INSTANCE_FIELDS = ("slots", "people", "expected_projects", "classes")
+# Below this many assignments in a batch, process pool overhead outweighs parallel scoring
+PARALLEL_MIN_ASSIGNMENTS = 2000
+
+_metric_executor: Optional[ProcessPoolExecutor] = None
+# Callers run in worker threads (asyncio.to_thread); only one pool may be created
+_metric_executor_lock = threading.Lock()
+
+
+def metric_executor() -> Optional[Executor]:
+    """Shared process pool for batch scoring (None on a single CPU or METRIC_WORKERS <= 1)."""
+    global _metric_executor
+    workers = min(settings.METRIC_WORKERS, os.cpu_count() or 1)
+    if workers <= 1:
+        return None
+    with _metric_executor_lock:
+        if _metric_executor is None:
+            _metric_executor = ProcessPoolExecutor(max_workers=workers)
+        return _metric_executor
+
+
+def shutdown_metric_executor(wait: bool = True) -> None:
+    """Shut the shared pool down (application shutdown); a later call creates a new one."""
+    global _metric_executor
+    with _metric_executor_lock:
+        executor, _metric_executor = _metric_executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _shared_index(plan: Dict[str, Any], indexes: List[Tuple[Tuple[Any, ...], ProblemIndex]]) -> ProblemIndex:
+    key = tuple(plan.get(field, []) or [] for field in INSTANCE_FIELDS)
+    for other_key, index in indexes:
+        if all(a is b or a == b for a, b in zip(key, other_key)):
+            return index
+    index = build_index(plan)
+    indexes.append((key, index))
+    return index
+
+
+def _score_job(job: Tuple[ProblemIndex, List[Dict[str, Any]], Dict[str, float], MetricParams]) -> Dict[str, Any]:
+    try:
+        return score_plan(*job)
+    except Exception:
+        return {"error": True}
+
+
+def compute_many(plans_by_algorithm: Dict[str, Dict[str, Any]], weights: Optional[Dict[str, float]] = None,
+                 params: Optional[Dict[str, Any]] = None, executor: Optional[Executor] = None) -> Dict[str, Any]:
+    """Compute metrics for multiple algorithms, returning a comparable table.
+
+    Plans of the same instance are indexed once. With an ``executor`` (see ``metric_executor``)
+    batches of at least ``PARALLEL_MIN_ASSIGNMENTS`` assignments are scored in parallel.
+    """
+    W, p = _resolve_weights_and_params(weights, params)
+    by_algorithm: Dict[str, Any] = {}
+    names: List[str] = []
+    jobs: List[Tuple[ProblemIndex, List[Dict[str, Any]], Dict[str, float], MetricParams]] = []
+    indexes: List[Tuple[Tuple[Any, ...], ProblemIndex]] = []
     for name, plan in plans_by_algorithm.items():
         try:
-            results["byAlgorithm"][name] = compute(plan, weights=weights, params=params)
+            jobs.append((_shared_index(plan, indexes), plan.get("assignments", []) or [], W, p))
+            names.append(name)
+            by_algorithm[name] = None
         except Exception:
-            results["byAlgorithm"][name] = {"error": True}
+            by_algorithm[name] = {"error": True}
+
+    scored = None
+    if executor is not None and len(jobs) > 1 and sum(len(job[1]) for job in jobs) >= PARALLEL_MIN_ASSIGNMENTS:
+        try:
+            scored = list(executor.map(_score_job, jobs))
+        except Exception as exc:
+            logger.warning("Parallel metric scoring failed, falling back to sequential: %s", exc)
+    if scored is None:
+        scored = [_score_job(job) for job in jobs]
+    by_algorithm.update(zip(names, scored))
+
     # Build ranking by WeightedTotalScore
+    results: Dict[str, Any] = {"byAlgorithm": by_algorithm, "ranking": []}
     items: List[Tuple[str, float]] = []
-    for name, res in results["byAlgorithm"].items():
+    for name, res in by_algorithm.items():
         try:
             score = float(res.get("totals", {}).get("WeightedTotalScore", 0.0))
         except Exception:
@@ -514,5 +373,3 @@ def compute_many(plans_by_algorithm: Dict[str, Dict[str, Any]], weights: Optiona
     items.sort(key=lambda x: x[1], reverse=True)
     results["ranking"] = [{"algorithm": n, "score": s} for n, s in items]
     return results
-
-
@@ -0,0 +1,329 @@
+"""
+Algorithm portfolio racing.
+
+Secilen algoritmalar ayni problem ornegi uzerinde, ortak bir duvar saati
+deadline'i ile es zamanli calistirilir:
+- Girdi bir kez hazirlanir (gerekirse veritabanindan yuklenir ve snapshot
+  olarak saklanir); her solver thread guvenligi icin kendi kopyasini alir.
+- Tum solver'larin ``SolverControl`` nesneleri ayni mutlak deadline'i
+  paylasir; CP-SAT/CBC gibi native solver'lar bu deadline'i kendi sure
+  limiti olarak alir. Deadline + grace suresinde bitmeyenler iptal edilir
+  (thread'leri durur) ve varsa best-so-far cozumleri degerlendirilir.
+- Her cizelge ayni post-processing pipeline'indan gecirilip ayni
+  ``performance_metrics.compute`` ile puanlanir (thread'lerde, event loop
+  disinda); en iyisi kaydedilir.
+- Veritabani oturumu yaris boyunca acik tutulmaz: girdi once yuklenir,
+  sonuc yaris bittikten sonra yeni bir oturumla yazilir.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+import asyncio
+import copy
+import logging
+import time
+from datetime import datetime
+
+from app.algorithms.anytime import SolverControl, STOP_REASON_DEADLINE
+from app.algorithms.factory import AlgorithmFactory
+from app.models.algorithm import AlgorithmType
+from app.services.parallel_processing_service import parallel_processing_service
+from app.services.performance_metrics import compute
+from app.services.schedule_postprocessing import PostProcessingPipeline
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORTFOLIO = ("cp_sat", "comprehensive_optimizer", "simulated_annealing", "hungarian")
+DEFAULT_DEADLINE_SECONDS = 60.0
+MAX_DEADLINE_SECONDS = 600.0
+# Deadline'dan sonra solver'larin kendiliginden durmasi icin beklenen ek sure
+DEFAULT_GRACE_SECONDS = 2.0
+
+STATUS_COMPLETED = "completed"
+STATUS_PARTIAL = "partial"        # deadline'da kesildi, best-so-far kullanildi
+STATUS_TIMED_OUT = "timed_out"    # deadline + grace icinde cozum yok
+STATUS_FAILED = "failed"
+STATUS_EMPTY = "empty"
+
+
+def _algorithm_value(name: Any) -> str:
+    value = str(getattr(name, "value", name))
+    try:
+        return AlgorithmType(value).value
+    except ValueError:
+        return AlgorithmType(value.lower()).value
+
+
+def extract_schedule(result: Any) -> List[Dict[str, Any]]:
+    """Sonuctan atama listesini al (schedule > assignments > solution)."""
+    if isinstance(result, list):
+        return result
+    if not isinstance(result, dict):
+        return []
+    for key in ("schedule", "assignments", "solution"):
+        value = result.get(key)
+        if isinstance(value, list) and value:
+            return value
+    return []
+
+
+def build_metric_plan(data: Dict[str, Any], schedule: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Girdi verisi + cizelgeden ``performance_metrics.compute`` plan formatini olustur."""
+    return {
+        "classes": data.get("classrooms", []) or [],
+        "slots": data.get("timeslots", []) or [],
+        "assignments": schedule,
+        "people": [
+            {"id": i.get("id"), "type": i.get("type")}
+            for i in data.get("instructors", []) or [] if isinstance(i, dict)
+        ],
+        "expected_projects": [p for p in data.get("projects", []) or [] if isinstance(p, dict)],
+    }
+
+
+@dataclass
+class PortfolioEntry:
+    """Portfoydeki bir algoritmanin kosu ozeti."""
+
+    algorithm: str
+    status: str = STATUS_FAILED
+    score: Optional[float] = None
+    elapsed: Optional[float] = None
+    stop_reason: Optional[str] = None
+    assignments: int = 0
+    counts: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+
+    def row(self) -> Dict[str, Any]:
+        return {
+            "algorithm": self.algorithm,
+            "status": self.status,
+            "score": self.score,
+            "elapsed": round(self.elapsed, 3) if self.elapsed is not None else None,
+            "stop_reason": self.stop_reason,
+            "assignments": self.assignments,
+            "counts": self.counts,
+            "error": self.error,
+        }
+
+
+class PortfolioRacer:
+    """
+    Birden fazla algoritmayi ortak deadline ile yaristirir.
+
+    Args:
+        algorithms: Algoritma adlari (``AlgorithmType`` degerleri).
+        deadline_seconds: Tum portfoy icin duvar saati butcesi.
+        params: Tum algoritmalara verilecek ortak parametreler.
+        params_by_algorithm: Algoritmaya ozel parametreler (ortaklari ezer).
+        weights: ``performance_metrics.compute`` agirliklari.
+        grace_seconds: Deadline sonrasi durma icin taninan ek sure.
+    """
+
+    def __init__(self, algorithms: Sequence[str] = DEFAULT_PORTFOLIO,
+                 deadline_seconds: float = DEFAULT_DEADLINE_SECONDS,
+                 params: Optional[Dict[str, Any]] = None,
+                 params_by_algorithm: Optional[Dict[str, Dict[str, Any]]] = None,
+                 weights: Optional[Dict[str, float]] = None,
+                 grace_seconds: float = DEFAULT_GRACE_SECONDS):
+        names = [_algorithm_value(a) for a in algorithms]
+        if not names:
+            raise ValueError("Portfolio needs at least one algorithm")
+        self.algorithms = list(dict.fromkeys(names))
+        self.deadline_seconds = min(max(float(deadline_seconds), 1.0), MAX_DEADLINE_SECONDS)
+        self.params = dict(params or {})
+        self.params_by_algorithm = params_by_algorithm or {}
+        self.weights = weights
+        self.grace_seconds = max(0.0, float(grace_seconds))
+
+    def _params_for(self, name: str) -> Dict[str, Any]:
+        params = {**self.params, **(self.params_by_algorithm.get(name) or {})}
+        params["time_budget"] = self.deadline_seconds
+        return params
+
+    async def race(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Portfoyu calistir.
+
+        Returns:
+            {"winner", "result", "table", "deadline_seconds", "elapsed"}
+        """
+        started = time.monotonic()
+        deadline = started + self.deadline_seconds
+        executor = parallel_processing_service.get_thread_pool()
+        from app.services.algorithm import AlgorithmService
+
+        entries: Dict[str, PortfolioEntry] = {}
+        controls: Dict[str, SolverControl] = {}
+        instances: Dict[str, Any] = {}
+        tasks: Dict[asyncio.Task, str] = {}
+        finished_at: Dict[str, float] = {}
+
+        for name in self.algorithms:
+            entry = entries[name] = PortfolioEntry(algorithm=name)
+            params = self._params_for(name)
+            try:
+                algorithm = AlgorithmFactory().create_algorithm(algorithm_name=name, params=params)
+            except Exception as e:
+                entry.error = str(e)
+                continue
+            control = SolverControl.from_params(params)
+            control.deadline = deadline  # Tum portfoy ayni mutlak deadline'i paylasir
+            if hasattr(algorithm, "set_control"):
+                algorithm.set_control(control)
+            solver_data = copy.deepcopy(data)
+            solver_data["params"] = params
+            controls[name] = control
+            instances[name] = algorithm
+            task = asyncio.ensure_future(AlgorithmService._execute_with_control(
+                algorithm, solver_data, control, {**params, "deadline_grace": self.grace_seconds},
+                executor=executor,
+            ))
+            task.add_done_callback(lambda _t, n=name: finished_at.setdefault(n, time.monotonic()))
+            tasks[task] = name
+
+        if tasks:
+            done, pending = await asyncio.wait(
+                list(tasks), timeout=max(0.0, deadline - time.monotonic()) + self.grace_seconds
+            )
+        else:
+            done, pending = set(), set()
+
+        for task in done:
+            name = tasks[task]
+            entry = entries[name]
+            entry.elapsed = finished_at.get(name, time.monotonic()) - started
+            control = controls[name]
+            # Deadline'da best-so-far ile donen solver kontrolu yoklamamis olabilir
+            entry.stop_reason = control.stop_reason or (
+                control.cancel_token.reason if control.cancel_token.is_cancelled else None
+            )
+            try:
+                entry.result = task.result()
+            except Exception as e:
+                entry.error = str(e)
+                continue
+            if isinstance(entry.result, dict) and entry.result.get("status") == STATUS_TIMED_OUT:
+                entry.result = None
+                entry.status = STATUS_TIMED_OUT
+                continue
+            partial = isinstance(entry.result, dict) and entry.result.get("partial")
+            entry.status = STATUS_PARTIAL if partial else STATUS_COMPLETED
+
+        for task in pending:
+            # Kaybedenler deadline'da iptal edilir; thread kontrolu gorunce kendi durur
+            name = tasks[task]
+            entry = entries[name]
+            control = controls[name]
+            control.cancel(STOP_REASON_DEADLINE)
+            task.cancel()
+            entry.elapsed = time.monotonic() - started
+            entry.stop_reason = STOP_REASON_DEADLINE
+            best = control.best_result()
+            if best and best.get("schedule"):
+                schedule = best["schedule"]
+                entry.result = {"schedule": schedule, "assignments": schedule, "solution": schedule,
+                                "algorithm": name, "status": "completed", "partial": True}
+                entry.status = STATUS_PARTIAL
+            else:
+                entry.status = STATUS_TIMED_OUT
+
+        # Post-processing ve metrikler CPU isi: event loop'u bloklamamak icin thread'lerde
+        await asyncio.gather(*(
+            asyncio.to_thread(self._score, entry, instances.get(name), data)
+            for name, entry in entries.items() if entry.result is not None
+        ))
+
+        ranked = sorted(
+            (e for e in entries.values() if e.score is not None),
+            key=lambda e: (-e.score, e.elapsed if e.elapsed is not None else float("inf")),
+        )
+        winner = ranked[0] if ranked else None
+        table = [e.row() for e in ranked] + [e.row() for e in entries.values() if e.score is None]
+        return {
+            "winner": winner.algorithm if winner else None,
+            "result": winner.result if winner else None,
+            "table": table,
+            "deadline_seconds": self.deadline_seconds,
+            "elapsed": round(time.monotonic() - started, 3),
+        }
+
+    def _score(self, entry: PortfolioEntry, algorithm: Any, data: Dict[str, Any]) -> None:
+        """Cizelgeyi servis pipeline'indan gecir ve ortak metrikle puanla."""
+        result = entry.result if isinstance(entry.result, dict) else {"schedule": extract_schedule(entry.result)}
+        try:
+            if algorithm is not None:
+                result["post_processing"] = PostProcessingPipeline(algorithm).run(result)
+        except Exception as e:
+            logger.warning(f"Portfolio post-processing failed for {entry.algorithm}: {e}")
+        schedule = extract_schedule(result)
+        entry.result = result
+        entry.assignments = len(schedule)
+        if not schedule:
+            entry.status = STATUS_EMPTY if entry.status != STATUS_TIMED_OUT else entry.status
+            return
+        try:
+            metrics = compute(build_metric_plan(data, schedule), weights=self.weights)
+        except Exception as e:
+            entry.error = f"scoring failed: {e}"
+            return
+        entry.score = float(metrics["totals"]["WeightedTotalScore"])
+        entry.counts = metrics.get("counts", {})
+
+
+async def run_portfolio(algorithms: Sequence[str], data: Optional[Dict[str, Any]] = None,
+                        deadline_seconds: float = DEFAULT_DEADLINE_SECONDS,
+                        params: Optional[Dict[str, Any]] = None,
+                        params_by_algorithm: Optional[Dict[str, Dict[str, Any]]] = None,
+                        weights: Optional[Dict[str, float]] = None,
+                        persist: bool = True) -> Dict[str, Any]:
+    """
+    Portfoyu yaristir ve kazanani kaydet.
+
+    Girdi verilmezse veritabanindaki gercek veri bir kez yuklenir. Kazananin
+    cizelgesi ``schedules`` tablosuna yazilir ve portfoy tablosuyla birlikte
+    bir ``AlgorithmRun`` kaydi olusturulur.
+    """
+    from app.db.base import async_session
+    from app.crud.algorithm import crud_algorithm
+    from app.schemas.algorithm import AlgorithmRunCreate, AlgorithmRunUpdate
+    from app.services.algorithm import AlgorithmService
+    from app.services.run_storage import store_input_snapshot, store_run_result
+
+    racer = PortfolioRacer(algorithms, deadline_seconds, params, params_by_algorithm, weights)
+    # Oturum yalnizca girdi hazirligi icin acilir; yaris (600 sn'ye kadar) oturumsuz kosar
+    async with async_session() as db:
+        if not data or not any(data.values()):
+            data = await AlgorithmService._get_real_data(db, (params or {}).get("classroom_count", 7))
+        input_hash = await store_input_snapshot(db, data)
+        await db.commit()
+    if params and "classroom_count" in params:
+        data["classroom_count"] = params["classroom_count"]
+
+    race = await racer.race(data)
+    race["run_id"] = None
+    if not persist or race["winner"] is None:
+        return race
+
+    async with async_session() as db:
+        result = dict(race["result"])
+        result["portfolio"] = {k: race[k] for k in ("winner", "table", "deadline_seconds", "elapsed")}
+        result["schedule_persistence"] = await AlgorithmService._save_schedules_to_db(db, result)
+
+        algorithm_run = await crud_algorithm.create(db, obj_in=AlgorithmRunCreate(
+            algorithm_type=race["winner"],
+            parameters={"portfolio": racer.algorithms, "deadline_seconds": racer.deadline_seconds,
+                        **racer.params},
+            input_hash=input_hash,
+            status="running",
+            started_at=datetime.now()
+        ))
+        await store_run_result(db, algorithm_run.id, AlgorithmService.sanitize_for_json(result))
+        algorithm_run = await crud_algorithm.update(db, db_obj=algorithm_run, obj_in=AlgorithmRunUpdate(
+            status="completed",
+            execution_time=race["elapsed"],
+            completed_at=datetime.now()
+        ))
+        race["result"] = result
+        race["run_id"] = algorithm_run.id
+        return race
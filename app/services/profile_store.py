@@ -0,0 +1,32 @@
+"""
+Ornekleyen profiler ciktilarinin deposu.
+
+``profile=true`` ile calistirilan kosunun tam profili (collapsed yiginlar ve
+en sicak fonksiyonlar) ``PROFILE_DIR/run_<id>.prof`` dosyasinda checkpoint'lerle
+ayni bicimde (atomik yazma, sikistirilmis JSON, dosya sayisi siniri) saklanir.
+"""
+from app.core.config import settings
+from app.services.checkpoint_store import CheckpointStore
+
+
+class ProfileStore(CheckpointStore):
+    """
+    Kosu basina tek profil dosyasi tutan disk deposu.
+
+    Args:
+        directory: Profil klasoru (varsayilan: ``settings.PROFILE_DIR``).
+        max_files: Tutulacak en fazla dosya sayisi (varsayilan: ``settings.PROFILE_MAX_FILES``).
+    """
+
+    suffix = ".prof"
+
+    @property
+    def directory(self) -> str:
+        return self._directory or settings.PROFILE_DIR
+
+    @property
+    def max_files(self) -> int:
+        return self._max_files if self._max_files is not None else settings.PROFILE_MAX_FILES
+
+
+profile_store = ProfileStore()
@@ -0,0 +1,281 @@
+"""
+Algorithm result cache.
+
+Ayni girdi + ayni algoritma + ayni (normalize) parametrelerle yapilan
+kosular yeniden hesaplanmaz:
+- Anahtar: girdi snapshot'inin icerik hash'i, algoritma tipi ve normalize
+  edilmis parametrelerin kanonik ozeti (parmak izi).
+- Stokastik solver'lar yalnizca seed verildiginde cache'lenir; seed
+  parmak izine dahildir.
+- Iki katman: surec ici LRU (TTL'li) ve arkasinda Redis
+  (``cache_service.cache_algorithm_result``).
+- Proje / ogretim uyesi / derslik / zaman dilimi degistiginde cache
+  nesli (generation) artirilir; eski nesle ait kayitlar bir daha okunmaz.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import json
+import logging
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.monitoring.logger import metrics_collector
+from app.services.cache_service import cache_service
+from app.services.run_storage import content_hash
+
+logger = logging.getLogger(__name__)
+
+# Seed olmadan da ayni girdiye ayni sonucu ureten algoritmalar
+DETERMINISTIC_ALGORITHMS = frozenset({
+    "hungarian",
+    "bitirme_priority_scheduler",
+    "integer_linear_programming",
+})
+
+SEED_PARAMS = ("random_seed", "seed")
+
+# Sonucu etkilemeyen, yalnizca kosu davranisini belirleyen parametreler
+NON_SEMANTIC_PARAMS = frozenset({"use_cache"})
+
+# Kosuya ozgu, cache'e yazilmayan sonuc anahtarlari
+RUN_SPECIFIC_KEYS = ("cache", "schedule_persistence")
+
+WATCHED_TABLES = frozenset({"projects", "instructors", "classrooms", "timeslots"})
+
+GENERATION_KEY = f"{cache_service.cache_prefix}:result_cache:generation"
+
+# after_commit'ten baslatilan Redis yayin gorevleri (GC'ye karsi referans tutulur)
+_pending_publishes: set = set()
+
+
+def _normalize_value(value: Any) -> Any:
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {str(k): _normalize_value(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normalize_value(v) for v in value]
+    return value
+
+
+def normalize_params(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """None degerleri ve sonucu etkilemeyen anahtarlari at, 1.0 -> 1 esitle."""
+    if not params:
+        return {}
+    return {
+        str(key): _normalize_value(value)
+        for key, value in params.items()
+        if value is not None and key not in NON_SEMANTIC_PARAMS
+    }
+
+
+def result_fingerprint(algorithm_type: str, input_hash: Optional[str],
+                       params: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Cache anahtari olarak kullanilacak parmak izini hesapla.
+
+    Stokastik bir algoritma seed olmadan istendiyse (her kosu farkli sonuc
+    verebilir) veya girdi hash'i yoksa None doner; bu kosular cache'lenmez.
+    """
+    if not input_hash:
+        return None
+    normalized = normalize_params(params)
+    has_seed = any(normalized.get(key) is not None for key in SEED_PARAMS)
+    if algorithm_type not in DETERMINISTIC_ALGORITHMS and not has_seed:
+        return None
+    return content_hash({"algorithm": algorithm_type, "input": input_hash, "params": normalized})
+
+
+def is_cacheable_result(result: Any) -> bool:
+    """Yalnizca tam, basarili ve zamanlamadan bagimsiz sonuclar cache'lenir."""
+    if not isinstance(result, dict):
+        return False
+    if str(result.get("status", "")).lower() in ("failed", "error", "infeasible", "cancelled"):
+        return False
+    if (result.get("anytime") or {}).get("stop_reason"):
+        # Deadline / iptal ile kesilen kosunun sonucu makine yukune baglidir
+        return False
+    return bool(result.get("assignments") or result.get("schedule") or result.get("solution"))
+
+
+class ResultCache:
+    """Surec ici LRU + Redis katmanli algoritma sonuc cache'i."""
+
+    def __init__(self, max_entries: int = 32, ttl_seconds: int = 1800):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # fingerprint -> (olusturma zamani, nesil, JSON metni, meta)
+        self._local: "OrderedDict[str, Tuple[float, int, str, Dict[str, Any]]]" = OrderedDict()
+        self.generation = 0
+        self.stats = {"memory_hits": 0, "redis_hits": 0, "misses": 0, "stores": 0, "invalidations": 0}
+
+    # -- nesil (invalidation) -------------------------------------------
+
+    async def _sync_generation(self) -> int:
+        """Redis'teki nesli oku; baska bir surec artirdiysa yerel katmani bosalt."""
+        try:
+            remote = await cache_service.get(GENERATION_KEY)
+        except Exception:
+            remote = None
+        if isinstance(remote, int) and remote > self.generation:
+            self._local.clear()
+            self.generation = remote
+        return self.generation
+
+    def invalidate_local(self) -> int:
+        """Nesli artir ve surec ici katmani bosalt. Yeni nesli dondurur."""
+        self.generation += 1
+        self._local.clear()
+        self.stats["invalidations"] += 1
+        return self.generation
+
+    async def invalidate(self) -> int:
+        """Tum sureclerde gecerli olacak sekilde nesli artir ve Redis kayitlarini temizle."""
+        generation = self.invalidate_local()
+        await self._publish_generation(generation)
+        return generation
+
+    async def _publish_generation(self, generation: int) -> None:
+        try:
+            remote = await cache_service.get(GENERATION_KEY)
+            generation = max(generation, (remote if isinstance(remote, int) else 0) + 1)
+            self.generation = max(self.generation, generation)
+            await cache_service.set(GENERATION_KEY, generation, ttl=30 * 24 * 3600)
+            await cache_service.invalidate_algorithm_cache()
+        except Exception as e:
+            logger.warning(f"Result cache generation could not be published: {e}")
+
+    # -- okuma / yazma ----------------------------------------------------
+
+    def _redis_params(self, fingerprint: str, generation: int) -> Dict[str, Any]:
+        return {"fingerprint": fingerprint, "generation": generation}
+
+    async def get(self, algorithm_type: str, fingerprint: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Cache'teki sonucu bul.
+
+        Returns:
+            (sonuc, cache bilgisi) ya da None
+        """
+        generation = await self._sync_generation()
+        now = time.time()
+
+        entry = self._local.get(fingerprint)
+        if entry is not None:
+            created_at, entry_generation, payload, meta = entry
+            if entry_generation == generation and now - created_at <= self.ttl_seconds:
+                self._local.move_to_end(fingerprint)
+                self.stats["memory_hits"] += 1
+                metrics_collector.record_cache_lookup("result", True)
+                return json.loads(payload), self._info("memory", fingerprint, created_at, meta)
+            del self._local[fingerprint]
+
+        cached = await cache_service.get_cached_algorithm_result(
+            algorithm_type, self._redis_params(fingerprint, generation)
+        )
+        if isinstance(cached, dict) and isinstance(cached.get("result"), dict):
+            created_at = cached.get("created_at") or now
+            meta = cached.get("meta") or {}
+            self._remember(fingerprint, generation, json.dumps(cached["result"], default=str), meta, created_at)
+            self.stats["redis_hits"] += 1
+            metrics_collector.record_cache_lookup("result", True)
+            return cached["result"], self._info("redis", fingerprint, created_at, meta)
+
+        self.stats["misses"] += 1
+        metrics_collector.record_cache_lookup("result", False)
+        return None
+
+    async def set(self, algorithm_type: str, fingerprint: str, result: Dict[str, Any],
+                  meta: Optional[Dict[str, Any]] = None) -> bool:
+        """Sonucu iki katmana da yaz (kosuya ozgu anahtarlar atilir)."""
+        stored = {k: v for k, v in result.items() if k not in RUN_SPECIFIC_KEYS}
+        meta = dict(meta or {})
+        created_at = time.time()
+        generation = self.generation
+        self._remember(fingerprint, generation, json.dumps(stored, default=str), meta, created_at)
+        self.stats["stores"] += 1
+        return await cache_service.cache_algorithm_result(
+            algorithm_type, self._redis_params(fingerprint, generation),
+            {"result": stored, "meta": meta, "created_at": created_at},
+        )
+
+    def _remember(self, fingerprint: str, generation: int, payload: str,
+                  meta: Dict[str, Any], created_at: float) -> None:
+        self._local[fingerprint] = (created_at, generation, payload, meta)
+        self._local.move_to_end(fingerprint)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    @staticmethod
+    def _info(tier: str, fingerprint: str, created_at: float, meta: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "hit": True,
+            "tier": tier,
+            "fingerprint": fingerprint,
+            "age_seconds": round(max(0.0, time.time() - created_at), 3),
+            **meta,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "entries": len(self._local),
+            "generation": self.generation,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+result_cache = ResultCache(
+    max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RESULT_CACHE_TTL,
+)
+
+
+# -- ORM tabanli invalidation ---------------------------------------------
+
+def _touches_watched_tables(session: Session) -> bool:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table in WATCHED_TABLES:
+            return True
+    return False
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_dirty_after_flush(session, flush_context):
+    if _touches_watched_tables(session):
+        session.info["result_cache_dirty"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dirty_on_bulk_statement(orm_execute_state):
+    # delete(Project) / update(Classroom) gibi toplu ifadeler flush'tan gecmez
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.local_table.name in WATCHED_TABLES:
+        orm_execute_state.session.info["result_cache_dirty"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if not session.info.pop("result_cache_dirty", False):
+        return
+    generation = result_cache.invalidate_local()
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(result_cache._publish_generation(generation))
+    _pending_publishes.add(task)
+    task.add_done_callback(_pending_publishes.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_dirty_after_rollback(session):
+    session.info.pop("result_cache_dirty", None)
@@ -0,0 +1,98 @@
+"""
+Cross-worker cancellation of running algorithms.
+
+``SolverControl`` nesneleri solver'i calistiran surecte yasar; birden fazla
+uvicorn worker'i varken ``/cancel`` istegi baska bir worker'a dusebilir.
+Koordinasyon Redis uzerinden yapilir:
+- Kosu suresince ``active`` anahtari tutulur (hangi run'in bir yerde
+  calistigini bilmek icin).
+- Iptal istegi ``cancel`` anahtarini yazar; solver'i calistiran worker bu
+  anahtari ``POLL_INTERVAL_SECONDS`` araliklarla yoklar ve kontrolu iptal
+  eder (``job_service`` iptal yoklamasiyla ayni yaklasim).
+Redis yoksa yalnizca yerel kontroller iptal edilebilir.
+"""
+from typing import Any
+import asyncio
+import logging
+
+from app.core import cache as redis_cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "optimization_planner:run"
+ACTIVE_TTL_SECONDS = 3600
+CANCEL_TTL_SECONDS = 300
+POLL_INTERVAL_SECONDS = 1.0
+
+
+class RunCancellation:
+    """Redis-backed cancel requests for runs executing on any worker."""
+
+    def __init__(self, redis: Any = None):
+        self._redis = redis
+
+    @property
+    def redis(self):
+        return self._redis if self._redis is not None else redis_cache.redis_pool
+
+    @staticmethod
+    def _active_key(run_id: int) -> str:
+        return f"{KEY_PREFIX}:{run_id}:active"
+
+    @staticmethod
+    def _cancel_key(run_id: int) -> str:
+        return f"{KEY_PREFIX}:{run_id}:cancel"
+
+    async def mark_active(self, run_id: int) -> None:
+        """Kosunun bu surecte calismaya basladigini yayinla."""
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(self._active_key(run_id), "1", ex=ACTIVE_TTL_SECONDS)
+        except Exception as e:
+            logger.warning(f"Run {run_id} could not be marked active: {e}")
+
+    async def clear(self, run_id: int) -> None:
+        """Kosu bitti: aktiflik ve bekleyen iptal istegini sil."""
+        if self.redis is None:
+            return
+        try:
+            await self.redis.delete(self._active_key(run_id), self._cancel_key(run_id))
+        except Exception as e:
+            logger.warning(f"Run {run_id} cancellation keys could not be cleared: {e}")
+
+    async def request(self, run_id: int) -> bool:
+        """
+        Baska bir worker'da calisan kosu icin iptal iste.
+
+        Returns:
+            Kosu herhangi bir worker'da aktifse True.
+        """
+        if self.redis is None:
+            return False
+        try:
+            if not await self.redis.exists(self._active_key(run_id)):
+                return False
+            await self.redis.set(self._cancel_key(run_id), "1", ex=CANCEL_TTL_SECONDS)
+            return True
+        except Exception as e:
+            logger.warning(f"Cancel request for run {run_id} failed: {e}")
+            return False
+
+    async def watch(self, run_id: int, control: Any) -> None:
+        """Iptal istegi gelene kadar yokla, gelince ``control.cancel()`` cagir."""
+        if self.redis is None:
+            return
+        while True:
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+            try:
+                requested = await self.redis.get(self._cancel_key(run_id))
+            except Exception as e:
+                logger.debug(f"Cancel poll for run {run_id} failed: {e}")
+                continue
+            if requested:
+                control.cancel()
+                return
+
+
+run_cancellation = RunCancellation()
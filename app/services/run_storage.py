@@ -0,0 +1,188 @@
+"""
+Algorithm run storage.
+
+AlgorithmRun kayitlari icin normalize depolama:
+- Giris verisi (``data``) kanonik JSON'un SHA-256 ozeti ile ``input_snapshots``
+  tablosunda bir kez saklanir; run yalnizca ``input_hash`` tutar.
+- Sonuc (``result``) icindeki ayni listeler (``schedule`` / ``assignments`` /
+  ``solution`` / ``final_assignments``) tek kopyaya indirilir ve JSON
+  sikistirilarak (zstd varsa zstd, yoksa gzip) binary kolona yazilir.
+- Binary kolon ``deferred`` oldugu icin liste sorgulari sonucu yuklemez;
+  acma islemi yalnizca sonuc istendiginde yapilir.
+"""
+from typing import Any, Dict, Optional, Tuple
+import gzip
+import hashlib
+import json
+import logging
+
+from sqlalchemy import null, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.algorithm import AlgorithmRun
+from app.models.input_snapshot import InputSnapshot
+
+try:
+    import zstandard
+except Exception:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+ENCODING_ZSTD = "zstd"
+ENCODING_GZIP = "gzip"
+
+# Sonuc icinde birbirinin kopyasi olabilen liste anahtarlari (oncelik sirasiyla)
+DEDUP_KEYS = ("schedule", "assignments", "solution", "final_assignments")
+REF_MARKER = "$ref"
+
+
+def canonical_json(obj: Any) -> bytes:
+    """Anahtar sirasindan bagimsiz, bosluksuz JSON."""
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str,
+                      ensure_ascii=False).encode("utf-8")
+
+
+def content_hash(obj: Any) -> str:
+    """Kanonik JSON'un SHA-256 ozeti."""
+    return hashlib.sha256(canonical_json(obj)).hexdigest()
+
+
+def compress(raw: bytes) -> Tuple[bytes, str]:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=6).compress(raw), ENCODING_ZSTD
+    return gzip.compress(raw, compresslevel=6), ENCODING_GZIP
+
+
+def decompress(blob: bytes, encoding: str) -> bytes:
+    if encoding == ENCODING_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed payloads")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    if encoding == ENCODING_GZIP:
+        return gzip.decompress(blob)
+    raise ValueError(f"Unknown payload encoding: {encoding}")
+
+
+def encode_payload(obj: Any) -> Tuple[bytes, str, int]:
+    """JSON'a cevir ve sikistir. (blob, encoding, ham boyut) dondurur."""
+    raw = canonical_json(obj)
+    blob, encoding = compress(raw)
+    return blob, encoding, len(raw)
+
+
+def decode_payload(blob: bytes, encoding: str) -> Any:
+    return json.loads(decompress(blob, encoding).decode("utf-8"))
+
+
+def dedupe_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ayni icerikli liste anahtarlarini ``{"$ref": <ilk anahtar>}`` ile degistir.
+    """
+    if not isinstance(result, dict):
+        return result
+    deduped = dict(result)
+    seen: Dict[str, str] = {}
+    for key in DEDUP_KEYS:
+        value = result.get(key)
+        if not isinstance(value, list) or not value:
+            continue
+        digest = content_hash(value)
+        if digest in seen:
+            deduped[key] = {REF_MARKER: seen[digest]}
+        else:
+            seen[digest] = key
+    return deduped
+
+
+def restore_result(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """``dedupe_result`` ile tekillestirilmis sonucu eski haline getir."""
+    if not isinstance(payload, dict):
+        return payload
+    restored = dict(payload)
+    for key in DEDUP_KEYS:
+        value = restored.get(key)
+        if isinstance(value, dict) and set(value) == {REF_MARKER}:
+            # Ayni liste nesnesi paylasilir; cagiran taraf kopyalamadan okumali
+            restored[key] = restored.get(value[REF_MARKER])
+    return restored
+
+
+async def store_input_snapshot(db: AsyncSession, data: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Giris verisini icerik adresli olarak sakla ve hash'ini dondur.
+
+    Ayni hash zaten varsa yeni satir yazilmaz. Commit cagirana birakilir.
+    """
+    if not data:
+        return None
+    digest = content_hash(data)
+    exists = await db.execute(
+        select(InputSnapshot.content_hash).where(InputSnapshot.content_hash == digest)
+    )
+    if exists.scalar_one_or_none() is not None:
+        return digest
+    blob, encoding, size = encode_payload(data)
+    try:
+        async with db.begin_nested():
+            db.add(InputSnapshot(content_hash=digest, payload=blob, encoding=encoding, size_bytes=size))
+    except IntegrityError:
+        # Ayni snapshot'i eszamanli bir istek yazdi
+        logger.debug(f"Input snapshot {digest[:12]} already stored")
+    return digest
+
+
+async def load_input_snapshot(db: AsyncSession, digest: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not digest:
+        return None
+    row = (await db.execute(
+        select(InputSnapshot.payload, InputSnapshot.encoding).where(InputSnapshot.content_hash == digest)
+    )).first()
+    if row is None:
+        return None
+    return decode_payload(row.payload, row.encoding)
+
+
+async def store_run_result(db: AsyncSession, run_id: int, result: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Sonucu tekillestirip sikistirarak run satirina yaz. Commit cagirana birakilir.
+
+    Returns:
+        Ham ve sikistirilmis boyutlar (byte)
+    """
+    if result is None:
+        await db.execute(
+            update(AlgorithmRun).where(AlgorithmRun.id == run_id).values(
+                result=null(), result_payload=None, result_encoding=None, result_size=None)
+        )
+        return {"raw_bytes": 0, "stored_bytes": 0}
+    blob, encoding, size = encode_payload(dedupe_result(result))
+    await db.execute(
+        update(AlgorithmRun).where(AlgorithmRun.id == run_id).values(
+            result=null(), result_payload=blob, result_encoding=encoding, result_size=size)
+    )
+    return {"raw_bytes": size, "stored_bytes": len(blob)}
+
+
+async def load_run_result(db: AsyncSession, run: AlgorithmRun) -> Optional[Dict[str, Any]]:
+    """Run sonucunu oku; sikistirilmis ise ac, eski kayitlarda JSON kolonu kullan."""
+    if run.result_encoding:
+        blob = (await db.execute(
+            select(AlgorithmRun.result_payload).where(AlgorithmRun.id == run.id)
+        )).scalar_one_or_none()
+        if blob is None:
+            return None
+        return restore_result(decode_payload(blob, run.result_encoding))
+    return (await db.execute(
+        select(AlgorithmRun.result).where(AlgorithmRun.id == run.id)
+    )).scalar_one_or_none()
+
+
+async def load_run_input(db: AsyncSession, run: AlgorithmRun) -> Optional[Dict[str, Any]]:
+    """Run giris verisini oku (snapshot veya eski ``data`` kolonu)."""
+    if run.input_hash:
+        return await load_input_snapshot(db, run.input_hash)
+    return (await db.execute(
+        select(AlgorithmRun.data).where(AlgorithmRun.id == run.id)
+    )).scalar_one_or_none()
@@ -0,0 +1,432 @@
+"""
+Service-level schedule post-processing pipeline.
+
+Algoritma sonucundaki ``schedule`` / ``assignments`` / ``solution`` listeleri
+asamali bir pipeline'dan gecirilir:
+
+1. compact_classrooms / compact_globally (algoritma destekliyorsa)
+2. gap_free (GapFreeScheduler)
+3. late_removal (16:30 sonrasi atamalari erkene tasi)
+4. reflow (earliest-first greedy paketleme)
+
+- Ayni liste nesnesine isaret eden anahtarlar bir kez islenir.
+- Bir asama yalnizca kendisinden sonra bir asama listeyi degistirdiyse
+  tekrar calistirilir; hicbir sey degismezse pipeline durur.
+- Takvim ve yerlesim indeksleri (sinif doluluk / hoca mesgul haritalari)
+  asamalar arasinda paylasilir.
+- Her asamanin suresi, calisma/atlanma sayisi, tasima sayisi ve hatalari
+  sonuca ``post_processing`` olarak yazilir.
+"""
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+import time
+
+from app.algorithms.timeslot_calendar import TimeslotCalendar, get_calendar
+from app.algorithms.validator import detect_gaps
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_KEYS = ("schedule", "assignments", "solution")
+DEFAULT_MAX_PASSES = 8
+
+
+def classroom_ids_for(assignments: List[Dict[str, Any]], classrooms: List[Any]) -> List[Any]:
+    """Classroom ids from the problem data, inferred from assignments if empty."""
+    classroom_ids: List[Any] = []
+    for c in classrooms or []:
+        cid = c.get("id") if isinstance(c, dict) else getattr(c, "id", None)
+        if cid is not None:
+            classroom_ids.append(cid)
+    if not classroom_ids:
+        for a in assignments:
+            cid = a.get("classroom_id") if isinstance(a, dict) else None
+            if cid is not None and cid not in classroom_ids:
+                classroom_ids.append(cid)
+    return classroom_ids
+
+
+class PlacementIndex:
+    """
+    Bir atama listesi icin sinif doluluk ve hoca mesgul haritalari.
+
+    Tasima yapan asamalar indeksi ``move()`` ile guncel tutar; boylece ayni
+    pass icindeki sonraki asamalar haritalari yeniden kurmaz.
+    """
+
+    def __init__(self, assignments: List[Dict[str, Any]], calendar: TimeslotCalendar,
+                 classrooms: Optional[List[Any]] = None):
+        self.calendar = calendar
+        self.classroom_ids = classroom_ids_for(assignments, classrooms or [])
+        self.occupied: Dict[Tuple[Any, int], bool] = {}
+        self.busy: Dict[Any, set] = {}
+        ts_index = calendar.id_to_index
+        for a in assignments:
+            if not isinstance(a, dict):
+                continue
+            idx = ts_index.get(a.get("timeslot_id"))
+            cid = a.get("classroom_id")
+            if cid is not None and idx is not None:
+                self.occupied[(cid, idx)] = True
+            for instr in a.get("instructors", []) or []:
+                self.busy.setdefault(instr, set()).add(idx)
+
+    def is_free(self, cid: Any, target_idx: int, instructors: List[Any]) -> bool:
+        if self.occupied.get((cid, target_idx)):
+            return False
+        for instr in instructors:
+            if target_idx in self.busy.get(instr, set()):
+                return False
+        return True
+
+    def move(self, assignment: Dict[str, Any], current_idx: int, cid: Any, target_idx: int) -> None:
+        old_cid = assignment.get("classroom_id")
+        if old_cid is not None:
+            self.occupied.pop((old_cid, current_idx), None)
+        assignment["classroom_id"] = cid
+        assignment["timeslot_id"] = self.calendar.ordered_ids[target_idx]
+        self.occupied[(cid, target_idx)] = True
+        for instr in assignment.get("instructors", []) or []:
+            self.busy.setdefault(instr, set()).discard(current_idx)
+            self.busy[instr].add(target_idx)
+
+
+def count_late_slots(assignments: List[Dict[str, Any]], calendar: TimeslotCalendar) -> int:
+    """Number of assignments placed in late (>=16:30) slots."""
+    return sum(
+        1 for a in assignments
+        if isinstance(a, dict) and calendar.is_late(a.get("timeslot_id"))
+    )
+
+
+def remove_late_assignments(assignments: List[Dict[str, Any]], calendar: TimeslotCalendar,
+                            classrooms: List[Any] = None, index: Optional[PlacementIndex] = None) -> int:
+    """
+    Service-level late slot enforcement. Attempts to move any assignment
+    scheduled at 16:30 or later into the earliest feasible pre-16:30 slot.
+    If no feasible slot exists, the assignment remains but is marked with
+    a heavy penalty flag for downstream reporting/UI.
+
+    Modifies the given assignments list in-place and returns the number of
+    moved assignments.
+    """
+    if not assignments:
+        return 0
+    ts_index = calendar.id_to_index
+    last_ok_idx = calendar.last_ok_index
+
+    if last_ok_idx < 0:
+        # No acceptable slots; just flag all as late
+        for a in assignments:
+            a["late_penalized"] = True
+        return 0
+
+    late_list = [
+        a for a in assignments
+        if isinstance(a, dict) and calendar.is_late(a.get("timeslot_id"))
+    ]
+    if not late_list:
+        return 0
+
+    index = index or PlacementIndex(assignments, calendar, classrooms)
+    classroom_ids = sorted(index.classroom_ids)
+    moved = 0
+    for a in late_list:
+        current_idx = ts_index.get(a.get("timeslot_id"))
+        if current_idx is None:
+            a["late_penalized"] = True
+            continue
+        instructors_ids = a.get("instructors", []) or []
+        placed = False
+        for target_idx in range(0, last_ok_idx + 1):
+            for cid in classroom_ids:
+                if index.is_free(cid, target_idx, instructors_ids):
+                    index.move(a, current_idx, cid, target_idx)
+                    placed = True
+                    break
+            if placed:
+                break
+        if placed:
+            moved += 1
+        else:
+            # Could not move -> flag for penalty/reporting
+            a["late_penalized"] = True
+    return moved
+
+
+def reflow_schedule_earliest_first(assignments: List[Dict[str, Any]], calendar: TimeslotCalendar,
+                                   classrooms: List[Any] = None,
+                                   index: Optional[PlacementIndex] = None) -> int:
+    """
+    Algorithm-agnostic greedy packing:
+    - Use the calendar's chronological timeslot order
+    - For each assignment in chronological order, try to move it to the
+      earliest feasible slot (strictly earlier), any classroom
+    - Feasibility: target classroom free and all instructors free in target slot
+    Returns number of moved assignments.
+    """
+    if not assignments:
+        return 0
+    ts_index = calendar.id_to_index
+    if not ts_index:
+        return 0
+
+    index = index or PlacementIndex(assignments, calendar, classrooms)
+
+    # Order assignments by current slot index to move earlier ones first
+    ordered = [a for a in assignments if isinstance(a, dict) and a.get("timeslot_id") in ts_index]
+    ordered.sort(key=lambda a: ts_index.get(a.get("timeslot_id"), 10**9))
+
+    moved = 0
+    for a in ordered:
+        cur_idx = ts_index.get(a.get("timeslot_id"))
+        if cur_idx is None:
+            continue
+        instrs = a.get("instructors", []) or []
+        placed = False
+        for target_idx in range(0, cur_idx):
+            for cid in index.classroom_ids:
+                if index.is_free(cid, target_idx, instrs):
+                    index.move(a, cur_idx, cid, target_idx)
+                    moved += 1
+                    placed = True
+                    break
+            if placed:
+                break
+    return moved
+
+
+def summarize_schedule_policies(assignments: List[Dict[str, Any]], calendar: TimeslotCalendar) -> Dict[str, Any]:
+    """
+    Produce a compact summary for reporting:
+    - total assignments
+    - count of late slots (>=16:30)
+    - distribution by timeslot
+    - classrooms having internal gaps after compaction
+    """
+    summary = {
+        "total": 0,
+        "late": 0,
+        "by_timeslot": {},
+        "classrooms_with_gap": 0,
+    }
+    if not assignments:
+        return summary
+    summary["total"] = len(assignments)
+    per_class: Dict[Any, list] = {}
+    for a in assignments:
+        if not isinstance(a, dict):
+            continue
+        slot = calendar.get(a.get("timeslot_id"))
+        if slot is None:
+            continue
+        summary["by_timeslot"][slot.label] = summary["by_timeslot"].get(slot.label, 0) + 1
+        if slot.is_late:
+            summary["late"] += 1
+        cid = a.get("classroom_id")
+        if cid is not None:
+            per_class.setdefault(cid, []).append(slot.ordinal)
+    # Gap detection via simple per-classroom continuity check
+    gaps = 0
+    for idxs in per_class.values():
+        s = sorted(set(idxs))
+        if any(curr - prev > 1 for prev, curr in zip(s, s[1:])):
+            gaps += 1
+    summary["classrooms_with_gap"] = gaps
+    return summary
+
+
+def _placements(assignments: List[Any]) -> Counter:
+    return Counter(
+        (a.get("project_id"), a.get("classroom_id"), a.get("timeslot_id"))
+        for a in assignments if isinstance(a, dict)
+    )
+
+
+@dataclass
+class StageStats:
+    """Bir asamanin tum listeler ve pass'ler boyunca toplanan istatistikleri."""
+    name: str
+    runs: int = 0
+    skipped: int = 0
+    moves: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    last_error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "moves": self.moves,
+            "errors": self.errors,
+            "seconds": round(self.seconds, 6),
+            "last_error": self.last_error,
+        }
+
+
+@dataclass
+class PostProcessingContext:
+    """Tek bir liste icin asamalar arasinda paylasilan durum."""
+    algorithm: Any
+    calendar: TimeslotCalendar
+    timeslots: List[Any]
+    classrooms: List[Any]
+    index: Optional[PlacementIndex] = None
+
+    def placement_index(self, assignments: List[Dict[str, Any]]) -> PlacementIndex:
+        if self.index is None:
+            self.index = PlacementIndex(assignments, self.calendar, self.classrooms)
+        return self.index
+
+
+@dataclass
+class PostProcessingStage:
+    """
+    Pipeline asamasi.
+
+    ``run(assignments, context)`` listeyi yerinde degistirir. ``keeps_index``
+    True ise asama paylasilan ``PlacementIndex``'i kendisi guncel tutar;
+    aksi halde liste degistiginde indeks gecersiz sayilir.
+    """
+    name: str
+    run: Callable[[List[Dict[str, Any]], PostProcessingContext], Any]
+    keeps_index: bool = False
+
+
+class PostProcessingPipeline:
+    """
+    Degisiklik tespitli asamali post-processing.
+
+    Her liste icin bir "versiyon" sayaci tutulur; bir asama listeyi
+    degistirdiginde versiyon artar. Asama, en son calistigi versiyondan
+    sonra degisiklik olmadiysa atlanir. Pass sayisi ``max_passes`` ile
+    sinirlidir.
+    """
+
+    def __init__(self, algorithm: Any, stages: Optional[List[PostProcessingStage]] = None,
+                 max_passes: int = DEFAULT_MAX_PASSES, gap_scheduler: Any = None):
+        self.algorithm = algorithm
+        self.timeslots = getattr(algorithm, "timeslots", []) or []
+        self.classrooms = getattr(algorithm, "classrooms", []) or []
+        self.calendar = get_calendar(self.timeslots)
+        self.max_passes = max(1, int(max_passes))
+        self.gap_scheduler = gap_scheduler
+        self.stages = stages if stages is not None else self.default_stages()
+        self.stats: Dict[str, StageStats] = {s.name: StageStats(s.name) for s in self.stages}
+
+    def default_stages(self) -> List[PostProcessingStage]:
+        stages: List[PostProcessingStage] = []
+        # Algoritmaya ozgu sikistirma adimlari yalnizca destekleniyorsa eklenir
+        if hasattr(self.algorithm, "_compact_schedule_classrooms"):
+            stages.append(PostProcessingStage(
+                "compact_classrooms", lambda lst, ctx: ctx.algorithm._compact_schedule_classrooms(lst)))
+        if hasattr(self.algorithm, "_compact_schedule_globally"):
+            stages.append(PostProcessingStage(
+                "compact_globally", lambda lst, ctx: ctx.algorithm._compact_schedule_globally(lst)))
+        if self.gap_scheduler is not None:
+            stages.append(PostProcessingStage("gap_free", self._gap_free_stage))
+        stages.append(PostProcessingStage(
+            "late_removal",
+            lambda lst, ctx: remove_late_assignments(lst, ctx.calendar, index=ctx.placement_index(lst)),
+            keeps_index=True,
+        ))
+        stages.append(PostProcessingStage(
+            "reflow",
+            lambda lst, ctx: reflow_schedule_earliest_first(lst, ctx.calendar, index=ctx.placement_index(lst)),
+            keeps_index=True,
+        ))
+        return stages
+
+    def _gap_free_stage(self, lst: List[Dict[str, Any]], ctx: PostProcessingContext) -> None:
+        optimized = self.gap_scheduler.optimize_for_gap_free(lst, ctx.timeslots)
+        # If optimizer returned something, replace list contents preserving the list object
+        if optimized and len(optimized) > 0:
+            lst[:] = optimized
+
+    @staticmethod
+    def unique_lists(result: Dict[str, Any]) -> List[Tuple[List[str], List[Any]]]:
+        """Ayni liste nesnesini paylasan anahtarlari grupla."""
+        groups: Dict[int, Tuple[List[str], List[Any]]] = {}
+        for key in SCHEDULE_KEYS:
+            lst = result.get(key)
+            if isinstance(lst, list) and lst:
+                groups.setdefault(id(lst), ([], lst))[0].append(key)
+        return list(groups.values())
+
+    def run(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Tum listeleri isle ve ``post_processing`` raporunu dondur."""
+        started = time.perf_counter()
+        groups = self.unique_lists(result)
+        passes = {}
+        for keys, lst in groups:
+            passes["+".join(keys)] = self._process(lst)
+        return {
+            "lists": passes,
+            "stages": {name: stats.to_dict() for name, stats in self.stats.items()},
+            "total_seconds": round(time.perf_counter() - started, 6),
+        }
+
+    def _process(self, lst: List[Dict[str, Any]]) -> int:
+        ctx = PostProcessingContext(self.algorithm, self.calendar, self.timeslots, self.classrooms)
+        version = 0
+        last_seen: Dict[str, int] = {}
+        passes = 0
+        for _ in range(self.max_passes):
+            ran_any = False
+            changed_in_pass = False
+            for stage in self.stages:
+                stats = self.stats[stage.name]
+                if last_seen.get(stage.name) == version:
+                    stats.skipped += 1
+                    continue
+                ran_any = True
+                before = _placements(lst)
+                t0 = time.perf_counter()
+                try:
+                    stage.run(lst, ctx)
+                except Exception as e:
+                    stats.errors += 1
+                    stats.last_error = f"{type(e).__name__}: {e}"
+                    logger.warning(f"Post-processing stage '{stage.name}' failed: {e}")
+                    # Asama listeyi yarim birakmis olabilir; indeksi yeniden kur
+                    ctx.index = None
+                finally:
+                    stats.seconds += time.perf_counter() - t0
+                    stats.runs += 1
+                after = _placements(lst)
+                moves = max(sum((after - before).values()), sum((before - after).values()))
+                if moves:
+                    stats.moves += moves
+                    version += 1
+                    changed_in_pass = True
+                    if not stage.keeps_index:
+                        ctx.index = None
+                last_seen[stage.name] = version
+            if ran_any:
+                passes += 1
+            if not changed_in_pass:
+                break
+        return passes
+
+    def build_reports(self, result: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Her anahtar icin gap raporu ve politika ozeti (paylasilan takvimle)."""
+        gap_reports: Dict[str, Any] = {}
+        policy_summary: Dict[str, Any] = {"lists": {}}
+        for keys, lst in self.unique_lists(result):
+            try:
+                if hasattr(self.algorithm, "_detect_classroom_gaps"):
+                    gaps = self.algorithm._detect_classroom_gaps(lst)
+                else:
+                    gaps = detect_gaps(lst, self.timeslots, calendar=self.calendar)
+            except Exception:
+                gaps = {"total_gaps": None}
+            try:
+                summary = summarize_schedule_policies(lst, self.calendar)
+            except Exception:
+                summary = {}
+            for key in keys:
+                gap_reports[key] = gaps
+                policy_summary["lists"][key] = summary
+        return gap_reports, policy_summary
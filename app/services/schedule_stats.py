@@ -0,0 +1,143 @@
+"""
+Planlama istatistikleri icin SQL tarafli toplamalar.
+
+Skor ve grafik servisleri ogretim uyesi yuklerini, slot kullanimini ve
+sorumlu bazli planlama sayilarini eskiden tum ``Instructor``/``Schedule``
+ORM nesnelerini yukleyip Python'da sayarak hesapliyordu. Buradaki
+fonksiyonlar ayni istatistikleri gruplanmis sorgularla veritabaninda
+hesaplar; yalnizca toplam satirlari (ya da tek kolonluk listeler) doner.
+Tablolar buyudukce maliyet satir sayisi yerine grup sayisiyla artar.
+
+Varyans ``count``/``sum``/``sum(x*x)`` uzerinden tam sayi aritmetigiyle,
+Gini katsayisi SQL'de siralanmis yuk listesinden hesaplanir.
+"""
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.instructor import Instructor
+from app.models.project import Project
+from app.models.schedule import Schedule
+from app.models.timeslot import TimeSlot
+
+
+def _clock(value: Any) -> str:
+    """``time`` ya da metin saat degerini ``HH:MM`` bicimine cevir."""
+    if hasattr(value, "strftime"):
+        return value.strftime("%H:%M")
+    return str(value or "")[:5]
+
+
+async def instructor_load_rows(db: AsyncSession) -> List[Dict[str, Any]]:
+    """Ogretim uyesi yuk kolonlari (ORM nesnesi olusturmadan, ID sirasiyla)."""
+    result = await db.execute(
+        select(
+            Instructor.id, Instructor.name, Instructor.type,
+            Instructor.bitirme_count, Instructor.ara_count, Instructor.total_load,
+        ).order_by(Instructor.id)
+    )
+    return [
+        {
+            "id": row.id,
+            "name": row.name,
+            "type": row.type,
+            "bitirme_count": row.bitirme_count or 0,
+            "ara_count": row.ara_count or 0,
+            "total_load": row.total_load or 0,
+        }
+        for row in result.all()
+    ]
+
+
+async def load_summary(db: AsyncSession) -> Dict[str, Any]:
+    """
+    Pozitif yuklerin ozet istatistikleri (tek toplama sorgusu).
+
+    Returns:
+        ``count``, ``mean``, ``variance`` (populasyon), ``min``, ``max``.
+        Pozitif yuk yoksa ``count`` 0 olur.
+    """
+    load = Instructor.total_load
+    result = await db.execute(
+        select(
+            func.count(load), func.sum(load), func.sum(load * load), func.min(load), func.max(load),
+        ).where(load > 0)
+    )
+    count, total, squares, low, high = result.one()
+    if not count:
+        return {"count": 0, "mean": 0.0, "variance": 0.0, "min": None, "max": None}
+    total, squares = int(total), int(squares)
+    return {
+        "count": count,
+        "mean": total / count,
+        # Tam sayi toplamlarindan: (n * sum(x^2) - sum(x)^2) / n^2
+        "variance": max(0, count * squares - total * total) / (count * count),
+        "min": low,
+        "max": high,
+    }
+
+
+async def positive_loads(db: AsyncSession) -> List[int]:
+    """Sifirdan buyuk yukler, SQL'de kucukten buyuge sirali."""
+    load = Instructor.total_load
+    result = await db.execute(select(load).where(load > 0).order_by(load))
+    return list(result.scalars().all())
+
+
+def gini_coefficient(sorted_loads: Sequence[float]) -> float:
+    """Sirali yuk listesinin Gini katsayisi (en az iki deger gerekir)."""
+    n = len(sorted_loads)
+    total = sum(sorted_loads)
+    if n < 2 or not total:
+        return 0.0
+    weighted = sum((rank + 1) * load for rank, load in enumerate(sorted_loads))
+    return (2 * weighted) / (n * total) - (n + 1) / n
+
+
+async def schedule_counts_by_responsible(db: AsyncSession) -> Dict[int, int]:
+    """Sorumlu ogretim uyesi -> planlanmis proje sayisi (gruplanmis sorgu)."""
+    responsible = Project.responsible_instructor_id
+    result = await db.execute(
+        select(responsible, func.count(Schedule.id))
+        .join(Project, Schedule.project_id == Project.id)
+        .group_by(responsible)
+    )
+    return {instructor_id: count for instructor_id, count in result.all() if instructor_id is not None}
+
+
+async def timeslot_usage(db: AsyncSession) -> List[Dict[str, Any]]:
+    """
+    Zaman dilimi basina planlama sayisi (kullanilmayan slotlar 0 ile).
+
+    Returns:
+        Baslangic saatine gore sirali ``timeslot_id``, ``timeslot``
+        (``HH:MM-HH:MM``), ``start`` ve ``usage_count`` satirlari.
+    """
+    result = await db.execute(
+        select(TimeSlot.id, TimeSlot.start_time, TimeSlot.end_time, func.count(Schedule.id))
+        .outerjoin(Schedule, Schedule.timeslot_id == TimeSlot.id)
+        .group_by(TimeSlot.id, TimeSlot.start_time, TimeSlot.end_time)
+        .order_by(TimeSlot.start_time, TimeSlot.id)
+    )
+    rows = []
+    for slot_id, start, end, count in result.all():
+        rows.append({
+            "timeslot_id": slot_id,
+            "timeslot": f"{_clock(start)}-{_clock(end)}",
+            "start": _clock(start),
+            "usage_count": count,
+        })
+    return rows
+
+
+def hourly_density(usage_rows: Sequence[Dict[str, Any]]) -> Dict[str, float]:
+    """Baslangic saati -> en yogun saate gore normalize kullanim (0..1)."""
+    by_start: Dict[str, int] = {}
+    for row in usage_rows:
+        by_start[row["start"]] = by_start.get(row["start"], 0) + row["usage_count"]
+    peak = max(by_start.values(), default=0)
+    if not peak:
+        return {start: 0.0 for start in by_start}
+    return {start: round(count / peak, 2) for start, count in by_start.items()}
+
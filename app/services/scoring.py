@@ -11,14 +11,30 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 
+from app.algorithms.metric_engine import PlanStats, ProblemIndex
+from app.services import schedule_stats
 from app.models.schedule import Schedule
 from app.models.project import Project
-from app.models.instructor import Instructor
 from app.models.classroom import Classroom
 from app.models.timeslot import TimeSlot
 from app.core.config import settings
 
 
+def schedule_assignments(schedules: List[Schedule]) -> List[Dict[str, Any]]:
+    """Map ORM schedule rows to metric engine assignments (the project's responsible is the instructor)."""
+    assignments = []
+    for schedule in schedules:
+        project = schedule.project
+        responsible_id = project.responsible_id if project else None
+        assignments.append({
+            "project_id": schedule.project_id,
+            "classroom_id": schedule.classroom_id,
+            "timeslot_id": schedule.timeslot_id,
+            "instructors": [responsible_id] if responsible_id else [],
+        })
+    return assignments
+
+
 class ScoringService:
     """Service for calculating and generating optimization scores."""
     
@@ -27,6 +43,12 @@ class ScoringService:
         current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.scores_dir = os.path.join(current_dir, "scores")
         os.makedirs(self.scores_dir, exist_ok=True)
+        # Schedule rows carry no instance data; metrics use the raw slot/classroom ids
+        self._index = ProblemIndex()
+    
+    def _schedule_stats(self, schedules: List[Schedule]) -> PlanStats:
+        """Single-pass metric engine statistics of the schedule rows."""
+        return self._index.stats(schedule_assignments(schedules), roles=False)
     
     async def calculate_scores(self, db: AsyncSession, algorithm_run_id: Optional[int] = None) -> Dict[str, Any]:
         """
@@ -52,13 +74,14 @@ class ScoringService:
         
         if not schedules:
             return self._empty_scores()
+        stats = self._schedule_stats(schedules)
         
         # Calculate individual metrics according to project specification
         objective_scores = {
             "load_balance": await self._calculate_load_balance_score(db, schedules),
-            "classroom_changes": self._calculate_classroom_changes_score(schedules),
-            "time_efficiency": self._calculate_time_efficiency_score(schedules),
-            "session_minimization": self._calculate_session_minimization_score(schedules),
+            "classroom_changes": self._calculate_classroom_changes_score(schedules, stats),
+            "time_efficiency": self._calculate_time_efficiency_score(schedules, stats),
+            "session_minimization": self._calculate_session_minimization_score(schedules, stats),
             "rule_compliance": await self._calculate_rule_compliance_score(db, schedules)
         }
         
@@ -71,8 +94,8 @@ class ScoringService:
                 **objective_scores,
                 "gini_coefficient": await self._calculate_gini_coefficient(db, schedules),
                 "instructor_preference": self._calculate_instructor_preference_score(schedules),
-                "classroom_utilization": self._calculate_classroom_utilization_score(schedules),
-                "time_slot_distribution": self._calculate_time_slot_distribution_score(schedules)
+                "classroom_utilization": self._calculate_classroom_utilization_score(schedules, stats),
+                "time_slot_distribution": self._calculate_time_slot_distribution_score(schedules, stats)
             }
         }
         
@@ -101,28 +124,17 @@ class ScoringService:
     
     async def _calculate_load_balance_score(self, db: AsyncSession, schedules: List[Schedule]) -> Dict[str, Any]:
         """Calculate load balance score."""
-        # Get instructor loads
-        result = await db.execute(select(Instructor))
-        instructors = result.scalars().all()
+        # Mean/variance/min/max are aggregated in SQL; only the detail rows are fetched
+        summary = await schedule_stats.load_summary(db)
+        if not summary["count"]:
+            return {"score": 0.0, "variance": 0.0, "mean": 0.0, "details": {}}
         
         instructor_loads = {}
-        for instructor in instructors:
-            instructor_loads[instructor.id] = {
-                "name": instructor.name,
-                "type": instructor.type,
-                "bitirme_count": instructor.bitirme_count or 0,
-                "ara_count": instructor.ara_count or 0,
-                "total_load": instructor.total_load or 0
-            }
-        
-        # Calculate variance and statistics
-        loads = [load["total_load"] for load in instructor_loads.values() if load["total_load"] > 0]
-        
-        if not loads:
-            return {"score": 0.0, "variance": 0.0, "mean": 0.0, "details": {}}
+        for row in await schedule_stats.instructor_load_rows(db):
+            instructor_loads[row.pop("id")] = row
         
-        mean_load = sum(loads) / len(loads)
-        variance = sum((load - mean_load) ** 2 for load in loads) / len(loads)
+        mean_load = summary["mean"]
+        variance = summary["variance"]
         
         # Lower variance = better load balance
         max_variance = mean_load ** 2 if mean_load > 0 else 1
@@ -133,31 +145,23 @@ class ScoringService:
             "score": score,
             "variance": variance,
             "mean": mean_load,
-            "min": min(loads),
-            "max": max(loads),
+            "min": summary["min"],
+            "max": summary["max"],
             "details": instructor_loads
         }
     
-    def _calculate_classroom_changes_score(self, schedules: List[Schedule]) -> Dict[str, Any]:
+    def _calculate_classroom_changes_score(self, schedules: List[Schedule], stats: Optional[PlanStats] = None) -> Dict[str, Any]:
         """Calculate classroom changes score."""
-        instructor_classrooms = {}
+        stats = stats or self._schedule_stats(schedules)
         changes = 0
         total_assignments = 0
         
-        for schedule in schedules:
-            # Get instructors for this schedule (simplified - assuming project responsible)
-            project = schedule.project
-            if project and project.responsible_id:
-                instructor_id = project.responsible_id
-                classroom_id = schedule.classroom_id
-                
-                if instructor_id in instructor_classrooms:
-                    if instructor_classrooms[instructor_id] != classroom_id:
-                        changes += 1
-                else:
-                    instructor_classrooms[instructor_id] = classroom_id
-                
-                total_assignments += 1
+        # Instructors are the project responsibles (simplified); changes are counted
+        # against the instructor's first classroom
+        for places in stats.instructor_slots.values():
+            first_classroom = places[0][1]
+            changes += sum(1 for _, classroom_id in places[1:] if classroom_id != first_classroom)
+            total_assignments += len(places)
         
         # Calculate score (lower changes = better)
         max_possible_changes = max(0, total_assignments - 1)
@@ -170,26 +174,16 @@ class ScoringService:
             "max_possible_changes": max_possible_changes
         }
     
-    def _calculate_time_efficiency_score(self, schedules: List[Schedule]) -> Dict[str, Any]:
+    def _calculate_time_efficiency_score(self, schedules: List[Schedule], stats: Optional[PlanStats] = None) -> Dict[str, Any]:
         """Calculate time efficiency score (minimize gaps)."""
-        instructor_timeslots = {}
+        stats = stats or self._schedule_stats(schedules)
         gaps = 0
         total_instructors = 0
         
-        for schedule in schedules:
-            project = schedule.project
-            if project and project.responsible_id:
-                instructor_id = project.responsible_id
-                timeslot_id = schedule.timeslot_id
-                
-                if instructor_id not in instructor_timeslots:
-                    instructor_timeslots[instructor_id] = []
-                instructor_timeslots[instructor_id].append(timeslot_id)
-        
         # Calculate gaps for each instructor
-        for instructor_id, timeslots in instructor_timeslots.items():
-            if len(timeslots) > 1:
-                sorted_slots = sorted(timeslots)
+        for places in stats.instructor_slots.values():
+            if len(places) > 1:
+                sorted_slots = sorted(timeslot_id for timeslot_id, _ in places)
                 for i in range(1, len(sorted_slots)):
                     if sorted_slots[i] - sorted_slots[i-1] > 1:
                         gaps += 1
@@ -255,27 +249,13 @@ class ScoringService:
     
     async def _calculate_gini_coefficient(self, db: AsyncSession, schedules: List[Schedule]) -> Dict[str, Any]:
         """Calculate Gini coefficient for load distribution."""
-        # Get instructor loads
-        result = await db.execute(select(Instructor))
-        instructors = result.scalars().all()
-        
-        loads = [instructor.total_load or 0 for instructor in instructors]
-        loads = [load for load in loads if load > 0]  # Remove zero loads
+        # Positive loads, filtered and sorted in SQL
+        loads = await schedule_stats.positive_loads(db)
         
         if len(loads) < 2:
             return {"gini": 0.0, "interpretation": "insufficient_data"}
         
-        # Sort loads
-        loads = sorted(loads)
-        n = len(loads)
-        
-        # Calculate Gini coefficient
-        cumsum = 0
-        for i, load in enumerate(loads):
-            cumsum += (i + 1) * load
-        
-        total_sum = sum(loads)
-        gini = (2 * cumsum) / (n * total_sum) - (n + 1) / n
+        gini = schedule_stats.gini_coefficient(loads)
         
         # Interpretation
         if gini < 0.2:
@@ -317,13 +297,9 @@ class ScoringService:
             "total": total_preferences
         }
     
-    def _calculate_classroom_utilization_score(self, schedules: List[Schedule]) -> Dict[str, Any]:
+    def _calculate_classroom_utilization_score(self, schedules: List[Schedule], stats: Optional[PlanStats] = None) -> Dict[str, Any]:
         """Calculate classroom utilization score."""
-        classroom_usage = {}
-        
-        for schedule in schedules:
-            classroom_id = schedule.classroom_id
-            classroom_usage[classroom_id] = classroom_usage.get(classroom_id, 0) + 1
+        classroom_usage = dict((stats or self._schedule_stats(schedules)).classroom_usage)
         
         if not classroom_usage:
             return {"score": 0.0, "utilization": {}}
@@ -345,13 +321,9 @@ class ScoringService:
             "utilization": classroom_usage
         }
     
-    def _calculate_time_slot_distribution_score(self, schedules: List[Schedule]) -> Dict[str, Any]:
+    def _calculate_time_slot_distribution_score(self, schedules: List[Schedule], stats: Optional[PlanStats] = None) -> Dict[str, Any]:
         """Calculate time slot distribution score."""
-        timeslot_usage = {}
-        
-        for schedule in schedules:
-            timeslot_id = schedule.timeslot_id
-            timeslot_usage[timeslot_id] = timeslot_usage.get(timeslot_id, 0) + 1
+        timeslot_usage = dict((stats or self._schedule_stats(schedules)).slot_usage)
         
         if not timeslot_usage:
             return {"score": 0.0, "distribution": {}}
@@ -423,21 +395,16 @@ class ScoringService:
     
     async def _calculate_scores_by_instructor(self, db: AsyncSession, schedules: List[Schedule]) -> Dict[str, Any]:
         """Calculate scores broken down by instructor."""
-        result = await db.execute(select(Instructor))
-        instructors = result.scalars().all()
+        # Schedule counts per responsible instructor are grouped in SQL
+        schedule_counts = await schedule_stats.schedule_counts_by_responsible(db)
         
         instructor_scores = {}
-        for instructor in instructors:
-            instructor_schedules = [
-                s for s in schedules 
-                if s.project and s.project.responsible_id == instructor.id
-            ]
-            
-            instructor_scores[instructor.id] = {
-                "name": instructor.name,
-                "type": instructor.type,
-                "schedule_count": len(instructor_schedules),
-                "load": instructor.total_load or 0
+        for row in await schedule_stats.instructor_load_rows(db):
+            instructor_scores[row["id"]] = {
+                "name": row["name"],
+                "type": row["type"],
+                "schedule_count": schedule_counts.get(row["id"], 0),
+                "load": row["total_load"]
             }
         
         return instructor_scores
@@ -535,7 +502,7 @@ class ScoringService:
         
         return filepath
     
-    def _calculate_session_minimization_score(self, schedules: List[Schedule]) -> float:
+    def _calculate_session_minimization_score(self, schedules: List[Schedule], stats: Optional[PlanStats] = None) -> float:
         """
         Oturum minimizasyonu skorunu hesaplar.
         Proje açıklamasına göre: Oturum sayısının minimize edilmesi
@@ -544,12 +511,8 @@ class ScoringService:
             return 0.0
         
         # Kullanılan zaman dilimi sayısı
-        used_timeslots = set()
-        for schedule in schedules:
-            if schedule.timeslot_id:
-                used_timeslots.add(schedule.timeslot_id)
-        
-        timeslot_count = len(used_timeslots)
+        stats = stats or self._schedule_stats(schedules)
+        timeslot_count = sum(1 for timeslot_id in stats.slot_usage if timeslot_id)
         
         # Minimum oturum sayısına göre normalize et (0-100 arası)
         # İdeal durum: Tüm projeler aynı anda (minimum oturum sayısı)
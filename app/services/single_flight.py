@@ -0,0 +1,276 @@
+"""
+Single-flight coalescing of identical algorithm runs.
+
+Ayni algoritma + ayni girdi + ayni parametrelerle es zamanli gelen istekler
+tek bir solver kosusunda birlestirilir:
+- Ilk istek lider olur ve solver'i calistirir; sonraki ayni istekler
+  lidere katilir (joiner), ayni sonucu ve ayni ilerleme akisini alir.
+- Her katilimci yine kendi ``AlgorithmRun`` kaydini alir; sonucta
+  ``single_flight = {"role": "joiner", "joined_run_id": X}`` isareti bulunur.
+- Worker'lar arasi koordinasyon Redis kilidi (``SET NX EX``) ile yapilir.
+  Lider baska bir worker'daysa katilimci ``done`` anahtarini yoklar ve
+  sonucu liderin run kaydindan okur; ilerleme hedefleri Redis set'i ile
+  lidere bildirilir (websocket fan-out mesaji dogru worker'a tasir).
+- Her liderlik kilitte ve ``done`` anahtarinda bir token tasir; katilimci
+  yalnizca gordugu kilidin token'iyla yazilmis ``done`` degerini kabul eder,
+  onceki (bitmis) bir kosunun sonucuna baglanmaz.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+
+from app.core import cache as redis_cache
+from app.services.result_cache import normalize_params
+from app.services.run_storage import content_hash
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "optimization_planner:single_flight"
+LOCK_TTL_SECONDS = 3600
+DONE_TTL_SECONDS = 300
+POLL_INTERVAL_SECONDS = 0.5
+# Lider tarafinda uzak katilimci listesinin yenilenme araligi
+SUBSCRIBER_REFRESH_SECONDS = 1.0
+
+
+def flight_key(algorithm_type: str, data: Optional[Dict[str, Any]],
+               params: Optional[Dict[str, Any]]) -> str:
+    """
+    Kosunun tekillestirme anahtari. Veritabanindan yuklenen kosular icin
+    ``data`` yuklenmis girdi olmalidir (bos girdi tek bir anahtara duser);
+    seed'siz stokastik kosular da birlestirilir cunku liderin sonucu istek
+    icin gecerli bir cozumdur.
+    """
+    return content_hash({
+        "algorithm": algorithm_type,
+        "input": content_hash(data) if data and any(data.values()) else None,
+        "params": normalize_params(params),
+    })
+
+
+@dataclass
+class Flight:
+    """Bir anahtar icin devam eden (yerel ya da uzak liderli) kosu."""
+
+    key: str
+    future: asyncio.Future
+    leader_run_id: Optional[int] = None
+    remote: bool = False
+    # Liderlik token'i (kilit ve done degerlerinde tasinir)
+    token: Optional[str] = None
+    # Katilimcilarin ilerleme hedefleri: (user_id, run_id)
+    subscribers: List[Tuple[int, int]] = field(default_factory=list)
+    joined: int = 0
+    _remote_subscribers: List[Tuple[int, int]] = field(default_factory=list)
+    _subscribers_checked_at: float = 0.0
+    _poller: Optional[asyncio.Task] = None
+
+
+class SingleFlight:
+    """Process-local flight table backed by a Redis lock for cross-worker coalescing."""
+
+    def __init__(self, redis: Any = None):
+        self._redis = redis
+        self._flights: Dict[str, Flight] = {}
+        self.owner = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.stats = {"leaders": 0, "joiners": 0, "remote_joiners": 0, "abandoned": 0}
+
+    @property
+    def redis(self):
+        return self._redis if self._redis is not None else redis_cache.redis_pool
+
+    @staticmethod
+    def _lock_key(key: str) -> str:
+        return f"{KEY_PREFIX}:{key}:lock"
+
+    @staticmethod
+    def _done_key(key: str) -> str:
+        return f"{KEY_PREFIX}:{key}:done"
+
+    @staticmethod
+    def _subscribers_key(key: str) -> str:
+        return f"{KEY_PREFIX}:{key}:subscribers"
+
+    # -- lider / katilimci secimi ---------------------------------------
+
+    async def begin(self, key: str,
+                    load_result: Callable[[int], Awaitable[Optional[Dict[str, Any]]]]) -> Tuple[Flight, bool]:
+        """
+        Anahtar icin kosuya katil ya da lider ol.
+
+        Args:
+            key: ``flight_key`` sonucu.
+            load_result: Uzak liderin run id'sinden sonucu okuyan coroutine.
+
+        Returns:
+            (flight, lider_mi)
+        """
+        flight = self._flights.get(key)
+        if flight is not None:
+            flight.joined += 1
+            self.stats["joiners"] += 1
+            return flight, False
+
+        # Await'ten once kaydedilir; ayni surecteki es zamanli istekler bu flight'i gorur
+        flight = Flight(key=key, future=asyncio.get_running_loop().create_future())
+        self._flights[key] = flight
+
+        if await self._acquire_lock(flight):
+            self.stats["leaders"] += 1
+            return flight, True
+
+        flight.remote = True
+        flight.token = await self._lock_token(key)
+        flight.joined += 1
+        self.stats["remote_joiners"] += 1
+        flight._poller = asyncio.create_task(self._poll_remote(flight, load_result))
+        return flight, False
+
+    async def _acquire_lock(self, flight: Flight) -> bool:
+        flight.token = uuid.uuid4().hex
+        redis = self.redis
+        if redis is None:
+            return True
+        try:
+            acquired = await redis.set(
+                self._lock_key(flight.key),
+                json.dumps({"owner": self.owner, "token": flight.token, "run_id": None}),
+                ex=LOCK_TTL_SECONDS, nx=True,
+            )
+            if acquired:
+                # Onceki kosunun sonucu bu kosunun katilimcilarina gorunmemeli
+                await redis.delete(self._done_key(flight.key))
+            else:
+                flight.token = None
+            return bool(acquired)
+        except Exception as e:
+            logger.warning(f"Single-flight lock unavailable, running locally: {e}")
+            return True
+
+    async def _lock_token(self, key: str) -> Optional[str]:
+        """Kilidi tutan liderin token'i (kilit yoksa ya da okunamazsa None)."""
+        try:
+            lock = await self.redis.get(self._lock_key(key))
+            return json.loads(lock).get("token") if lock else None
+        except Exception as e:
+            logger.warning(f"Single-flight lock read failed: {e}")
+            return None
+
+    async def set_leader(self, flight: Flight, run_id: int) -> None:
+        """Liderin run id'sini yayinla (uzak katilimcilarin isareti icin)."""
+        flight.leader_run_id = run_id
+        redis = self.redis
+        if redis is None:
+            return
+        try:
+            await redis.set(
+                self._lock_key(flight.key),
+                json.dumps({"owner": self.owner, "token": flight.token, "run_id": run_id}),
+                ex=LOCK_TTL_SECONDS, xx=True,
+            )
+        except Exception as e:
+            logger.warning(f"Single-flight leader publish failed: {e}")
+
+    # -- ilerleme hedefleri -----------------------------------------------
+
+    async def subscribe(self, flight: Flight, user_id: Optional[int], run_id: int) -> None:
+        """Katilimcinin kosusunu liderin ilerleme akisina ekle."""
+        if not user_id:
+            return
+        target = (user_id, run_id)
+        flight.subscribers.append(target)
+        if flight.remote and self.redis is not None:
+            try:
+                await self.redis.sadd(self._subscribers_key(flight.key), json.dumps(list(target)))
+                await self.redis.expire(self._subscribers_key(flight.key), LOCK_TTL_SECONDS)
+            except Exception as e:
+                logger.warning(f"Single-flight subscribe failed: {e}")
+
+    async def progress_targets(self, flight: Flight) -> List[Tuple[int, int]]:
+        """Liderin ilerleme olaylarini iletecegi katilimci kosulari."""
+        if self.redis is not None and time.monotonic() - flight._subscribers_checked_at >= SUBSCRIBER_REFRESH_SECONDS:
+            flight._subscribers_checked_at = time.monotonic()
+            try:
+                members = await self.redis.smembers(self._subscribers_key(flight.key))
+                flight._remote_subscribers = [tuple(json.loads(m)) for m in members or ()]
+            except Exception as e:
+                logger.debug(f"Single-flight subscriber refresh failed: {e}")
+        return list(dict.fromkeys(flight.subscribers + flight._remote_subscribers))
+
+    # -- sonuclandirma ----------------------------------------------------
+
+    async def finish(self, flight: Flight, result: Optional[Dict[str, Any]] = None,
+                     error: Optional[BaseException] = None) -> None:
+        """
+        Lider kosuyu sonuclandir. ``result`` None ve hata yoksa kosu terk
+        edilmis sayilir; katilimcilar kendileri calistirir.
+        """
+        self._flights.pop(flight.key, None)
+        if not flight.future.done():
+            if error is not None:
+                flight.future.set_exception(error)
+                # Katilimci yoksa "exception never retrieved" uyarisini bastir
+                flight.future.exception()
+            else:
+                flight.future.set_result(result)
+        if result is None:
+            self.stats["abandoned"] += 1
+
+        redis = self.redis
+        if redis is None:
+            return
+        try:
+            if flight.leader_run_id is not None and error is None and result is not None:
+                await redis.set(
+                    self._done_key(flight.key),
+                    json.dumps({"token": flight.token, "run_id": flight.leader_run_id}),
+                    ex=DONE_TTL_SECONDS,
+                )
+            await redis.delete(self._lock_key(flight.key), self._subscribers_key(flight.key))
+        except Exception as e:
+            logger.warning(f"Single-flight release failed: {e}")
+
+    async def _poll_remote(self, flight: Flight,
+                           load_result: Callable[[int], Awaitable[Optional[Dict[str, Any]]]]) -> None:
+        """
+        Uzak liderin bitmesini bekle ve sonucu yerel flight'a aktar. Yalnizca
+        katilirken kilitte gorulen token'la yazilmis ``done`` kabul edilir;
+        token okunamadiysa katilimci kendisi calistirir.
+        """
+        result: Optional[Dict[str, Any]] = None
+        error: Optional[BaseException] = None
+        try:
+            while True:
+                lock = await self.redis.get(self._lock_key(flight.key))
+                if lock:
+                    lock = json.loads(lock)
+                    if lock.get("token") == flight.token:
+                        flight.leader_run_id = lock.get("run_id") or flight.leader_run_id
+                done = await self.redis.get(self._done_key(flight.key))
+                if done and flight.token and json.loads(done).get("token") == flight.token:
+                    flight.leader_run_id = json.loads(done).get("run_id")
+                    result = await load_result(flight.leader_run_id)
+                    break
+                if not lock or lock.get("token") != flight.token:
+                    # Lider sonuc yazmadan kayboldu (hata / iptal / cokme)
+                    logger.warning(f"Single-flight leader for {flight.key[:12]} vanished without a result")
+                    break
+                await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        except Exception as e:
+            error = e
+        self._flights.pop(flight.key, None)
+        if not flight.future.done():
+            if error is not None:
+                logger.warning(f"Single-flight remote wait failed: {error}")
+            flight.future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "in_flight": len(self._flights)}
+
+
+single_flight = SingleFlight()
@@ -1,9 +1,13 @@
-from app.tasks.algorithms import run_algorithm, compare_algorithms
-from app.tasks.reports import generate_pdf_report, generate_load_distribution_report
-
-__all__ = [
-    "run_algorithm",
-    "compare_algorithms",
-    "generate_pdf_report",
-    "generate_load_distribution_report"
-] 
\ No newline at end of file
+from app.tasks.algorithms import run_algorithm
+from app.tasks.reports import (
+    generate_assignment_report_pdf,
+    generate_assignment_report_excel,
+    generate_workload_report,
+)
+
+__all__ = [
+    "run_algorithm",
+    "generate_assignment_report_pdf",
+    "generate_assignment_report_excel",
+    "generate_workload_report",
+]
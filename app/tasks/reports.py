@@ -5,7 +5,6 @@ import os
 from datetime import datetime
 
 from app.db.session import SessionLocal
-from app.services.report import ReportService
 from app.core.cache import redis_client
 from app.core.config import settings
 
@@ -33,7 +32,8 @@ def generate_assignment_report_pdf(
     db = SessionLocal()
     
     try:
-        # Create report service
+        # Create report service (reportlab/pandas are loaded by the first report job)
+        from app.services.report import ReportService
         report_service = ReportService(db)
         
         # Get algorithm result if provided
@@ -106,7 +106,8 @@ def generate_assignment_report_excel(
     db = SessionLocal()
     
     try:
-        # Create report service
+        # Create report service (reportlab/pandas are loaded by the first report job)
+        from app.services.report import ReportService
         report_service = ReportService(db)
         
         # Get algorithm result if provided
@@ -179,7 +180,8 @@ def generate_workload_report(
     db = SessionLocal()
     
     try:
-        # Create report service
+        # Create report service (reportlab/pandas are loaded by the first report job)
+        from app.services.report import ReportService
         report_service = ReportService(db)
         
         # Get algorithm result if provided
@@ -0,0 +1,19 @@
+"""
+Algoritma benchmark paketi.
+
+- ``benchmarks.instances``: parametrik sentetik problem ornegi ureticisi
+- ``benchmarks.costs``: cizelgeden algoritmadan bagimsiz H1-H4 maliyetleri
+- ``benchmarks.runner``: factory'deki algoritmalari boyut x seed matrisinde
+  paralel calistirir, sonucu JSON'a yazar ve baseline ile karsilastirir
+- ``benchmarks.micro``: ceza, onarim ve komsuluk sicak fonksiyonlarinin
+  mikro benchmark'i
+- ``benchmarks.importtime``: ``-X importtime`` ile acilis (import) suresi ve
+  baseline karsilastirmasi
+
+Kullanim::
+
+    python -m benchmarks.runner --sizes 50,200 --seeds 1,2
+    python -m benchmarks.runner --update-baseline
+    python -m benchmarks.micro --sizes 100,400 --compare before.json
+    python -m benchmarks.importtime --update-baseline
+"""
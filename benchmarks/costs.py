@@ -0,0 +1,86 @@
+"""
+Cizelgeden algoritmadan bagimsiz H1-H4 maliyetleri.
+
+Her algoritmanin kendi ceza hesaplayicisi kendi ic temsili uzerinde calisir
+ve agirliklari farklidir; benchmark karsilastirmasi icin hepsi cikti
+cizelgesi uzerinden ayni tanimla olculur:
+
+- H1: ogretim elemani basina ardisik gorevler arasindaki bos slot sayisi
+- H2: ``max(0, |yuk - ortalama| - 2)`` toplami (ogretim uyeleri)
+- H3: zaman sirasinda ardisik gorevler arasindaki sinif degisimi sayisi
+- H4: kullanilan siniflarda ``|proje sayisi - hedef|`` toplami
+
+Ek olarak kapsam (planlanan proje orani) ve sert ihlaller (ayni hucrede iki
+proje, ayni slotta iki gorev) raporlanir.
+"""
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
+
+from app.algorithms.timeslot_calendar import get_calendar
+
+WORKLOAD_TOLERANCE = 2
+
+
+def _member_id(member: Any) -> Optional[Any]:
+    if isinstance(member, dict):
+        if member.get("is_placeholder"):
+            return None
+        member = member.get("id")
+    if member is None or (isinstance(member, (int, float)) and member <= 0):
+        return None
+    return member
+
+
+def schedule_costs(data: Dict[str, Any], schedule: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Cizelgenin H1-H4 maliyetleri, kapsam ve sert ihlal sayisi.
+
+    Args:
+        data: Problem ornegi (``generate_instance`` formati).
+        schedule: ``project_id``, ``classroom_id``, ``timeslot_id``,
+            ``instructors`` alanli atamalar.
+    """
+    calendar = get_calendar(data.get("timeslots") or [])
+    faculty = {i["id"] for i in data.get("instructors", []) if i.get("type") == "instructor"}
+
+    duties: Dict[Any, List[tuple]] = defaultdict(list)
+    cells: Counter = Counter()
+    class_loads: Counter = Counter()
+    scheduled = set()
+    for entry in schedule:
+        slot = calendar.index_of(entry.get("timeslot_id"))
+        classroom = entry.get("classroom_id")
+        scheduled.add(entry.get("project_id"))
+        cells[(classroom, slot)] += 1
+        class_loads[classroom] += 1
+        for member in entry.get("instructors") or []:
+            member = _member_id(member)
+            if member is not None and slot is not None:
+                duties[member].append((slot, classroom))
+
+    h1 = h3 = 0
+    double_booked = 0
+    for tasks in duties.values():
+        tasks.sort(key=lambda task: (task[0], str(task[1])))
+        for (slot, classroom), (next_slot, next_classroom) in zip(tasks, tasks[1:]):
+            if next_slot == slot:
+                double_booked += 1
+            h1 += max(0, next_slot - slot - 1)
+            h3 += classroom != next_classroom
+
+    loads = {member: len(duties.get(member, ())) for member in faculty}
+    average = sum(loads.values()) / len(loads) if loads else 0.0
+    h2 = sum(max(0.0, abs(load - average) - WORKLOAD_TOLERANCE) for load in loads.values())
+
+    target = len(schedule) / len(class_loads) if class_loads else 0.0
+    h4 = sum(abs(count - target) for count in class_loads.values())
+
+    expected = {p["id"] for p in data.get("projects", [])}
+    return {
+        "h1": h1,
+        "h2": round(h2, 3),
+        "h3": h3,
+        "h4": round(h4, 3),
+        "coverage": round(len(scheduled & expected) / len(expected), 4) if expected else 0.0,
+        "hard_violations": double_booked + sum(count - 1 for count in cells.values() if count > 1),
+    }
@@ -0,0 +1,201 @@
+"""
+Acilis (import) suresi benchmark'i.
+
+Her hedef modul temiz bir alt surecte ``python -X importtime -c "import X"``
+ile ``repeat`` kez import edilir; en kisa kumulatif sure raporlanir (disk
+onbellegi ve zamanlayici gurultusune karsi). Ayrica:
+
+- ``packages``: kendi (self) import suresinin ust paketlere gore dagilimi
+  (en agir ``top`` paket),
+- ``algorithm_modules``: import sirasinda yuklenen algoritma modulleri
+  (``app.algorithms.registry``); API/CRUD yollarinda bos kalmali.
+
+Baseline ile karsilastirmada sure toleransi goreceli, ``min_delta_ms`` mutlak
+alt sinirdir; baseline'da olmayan bir algoritma modulunun yuklenmesi de
+gerileme sayilir.
+
+Kullanim::
+
+    python -m benchmarks.importtime
+    python -m benchmarks.importtime --targets app.main --repeat 5
+    python -m benchmarks.importtime --update-baseline
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from collections import Counter
+from datetime import datetime
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARK_DIR)
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baselines", "importtime.json")
+DEFAULT_TARGETS = ("app.main", "app.algorithms.factory", "app.tasks.algorithms")
+DEFAULT_REPEAT = 3
+DEFAULT_TOP = 10
+
+Entry = Tuple[str, int, int, int]  # (modul, self_us, kumulatif_us, derinlik)
+
+
+def parse_importtime(stderr: str) -> List[Entry]:
+    """``-X importtime`` ciktisini (modul, self_us, kumulatif_us, derinlik) listesine cevir."""
+    entries: List[Entry] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            # Baslik satiri
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        entries.append((name.strip(), int(parts[0]), int(parts[1]), depth))
+    return entries
+
+
+def _algorithm_module_paths() -> set:
+    # Yalnizca kayit tablosunu okumak icin; kayit modulu algoritma yuklemez
+    from app.algorithms.registry import ALGORITHM_REGISTRY
+    return {module_path for module_path, _ in ALGORITHM_REGISTRY.values()}
+
+
+def run_once(target: str) -> List[Entry]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT_DIR, env.get("PYTHONPATH")]))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        tail = proc.stderr.strip().splitlines()[-1:] or [f"exit code {proc.returncode}"]
+        raise RuntimeError(f"import {target} failed: {tail[0]}")
+    return parse_importtime(proc.stderr)
+
+
+def measure(target: str, repeat: int = DEFAULT_REPEAT, top: int = DEFAULT_TOP) -> Dict[str, Any]:
+    """Hedefi ``repeat`` kez temiz surecte import et; en hizli kosunun dokumunu dondur."""
+    runs: List[Tuple[float, List[Entry]]] = []
+    for _ in range(max(1, repeat)):
+        entries = run_once(target)
+        total = next((cumulative for name, _, cumulative, _ in entries if name == target), None)
+        if total is None:
+            # Hedef zaten yorumlayici acilisinda yuklenmis; tum ciktinin toplami
+            total = sum(self_us for _, self_us, _, _ in entries)
+        runs.append((total / 1000.0, entries))
+    import_ms, entries = min(runs, key=lambda run: run[0])
+
+    packages: Counter = Counter()
+    for name, self_us, _, _ in entries:
+        packages[name.split(".", 1)[0]] += self_us
+    algorithm_paths = _algorithm_module_paths()
+    return {
+        "target": target,
+        "import_ms": round(import_ms, 1),
+        "runs_ms": [round(ms, 1) for ms, _ in runs],
+        "modules": len(entries),
+        "packages": {name: round(us / 1000.0, 1) for name, us in packages.most_common(top)},
+        "algorithm_modules": sorted(name for name, _, _, _ in entries if name in algorithm_paths),
+    }
+
+
+# ----------------------------------------------------------------------
+# Baseline karsilastirmasi
+# ----------------------------------------------------------------------
+def compare(results: Sequence[Dict[str, Any]], baseline: Sequence[Dict[str, Any]],
+            tolerance: float = 0.25, min_delta_ms: float = 100.0) -> List[Dict[str, Any]]:
+    """
+    Sonuclari baseline ile karsilastir.
+
+    Returns:
+        Gerileme listesi: ``target``, ``metric``, ``baseline``, ``current``.
+    """
+    reference = {row["target"]: row for row in baseline}
+    regressions: List[Dict[str, Any]] = []
+    for row in results:
+        base = reference.get(row["target"])
+        if base is None:
+            continue
+        before, after = base["import_ms"], row["import_ms"]
+        if after - before > max(min_delta_ms, before * tolerance):
+            regressions.append({"target": row["target"], "metric": "import_ms",
+                                "baseline": before, "current": after})
+        added = sorted(set(row["algorithm_modules"]) - set(base.get("algorithm_modules", [])))
+        if added:
+            regressions.append({"target": row["target"], "metric": "algorithm_modules",
+                                "baseline": len(base.get("algorithm_modules", [])), "current": ", ".join(added)})
+    return regressions
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def write_report(path: str, report: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+        handle.write("\n")
+
+
+def build_report(results: List[Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure module import (cold-start) time with -X importtime")
+    parser.add_argument("--targets", default=",".join(DEFAULT_TARGETS), help="Comma separated modules to import")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Fresh interpreters per target (best is kept)")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Heaviest packages to report per target")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Relative slowdown treated as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=100.0, help="Ignore slowdowns smaller than this")
+    args = parser.parse_args(argv)
+
+    results = []
+    for target in filter(None, (name.strip() for name in args.targets.split(","))):
+        row = measure(target, repeat=args.repeat, top=args.top)
+        heaviest = ", ".join(f"{name} {ms:.0f}ms" for name, ms in list(row["packages"].items())[:4])
+        print(f"{target:<28} {row['import_ms']:>8.1f} ms  {row['modules']:>5} modules  "
+              f"{len(row['algorithm_modules'])} algorithm modules  [{heaviest}]", flush=True)
+        results.append(row)
+    report = build_report(results, args.repeat)
+
+    if args.output:
+        write_report(args.output, report)
+        print(f"Results written to {args.output}")
+    if args.update_baseline:
+        write_report(args.baseline, report)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    regressions = compare(results, load_report(args.baseline)["results"],
+                          tolerance=args.tolerance, min_delta_ms=args.min_delta_ms)
+    if not regressions:
+        print("No import-time regressions against baseline")
+        return 0
+    print(f"\n{len(regressions)} REGRESSION(S) against {args.baseline}:")
+    for item in regressions:
+        print(f"  {item['target']:<28} {item['metric']:<18} {item['baseline']} -> {item['current']}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Sentetik problem ornegi ureticisi.
+
+Uretilen veri, servisin algoritmalara verdigi formatla aynidir
+(``projects``, ``instructors``, ``classrooms``, ``timeslots``). Ayni
+``InstanceSpec`` ve seed her zaman ayni ornegi uretir; boylece farkli
+commit'lerdeki olcumler karsilastirilabilir.
+"""
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import math
+import random
+
+from app.algorithms.timeslot_calendar import format_minutes, parse_minutes
+
+MIN_PROJECTS = 50
+MAX_PROJECTS = 2000
+
+# Takvim hazir ayarlari: (baslangic, bitis, slot dakikasi, ogle arasi)
+CALENDARS: Dict[str, Tuple[str, str, int, Optional[Tuple[str, str]]]] = {
+    "standard": ("09:00", "17:00", 30, ("12:00", "13:00")),
+    "compact": ("09:00", "16:30", 30, ("12:00", "13:00")),
+    "extended": ("08:30", "18:00", 30, ("12:00", "13:00")),
+    "hourly": ("09:00", "17:00", 60, ("12:00", "13:00")),
+}
+
+
+@dataclass(frozen=True)
+class InstanceSpec:
+    """
+    Problem ornegi parametreleri.
+
+    Args:
+        projects: Proje sayisi (50-2000).
+        instructors: Ogretim elemani sayisi (None = projects / 4, en az 8).
+        assistant_ratio: Arastirma gorevlisi orani.
+        bitirme_ratio: Bitirme projesi orani (kalani ara proje).
+        classrooms: Sinif sayisi (None = takvime %20 pay ile sigacak kadar, en az 3).
+        calendar: ``CALENDARS`` anahtari.
+        seed: Rastgelelik tohumu.
+    """
+    projects: int = 100
+    instructors: Optional[int] = None
+    assistant_ratio: float = 0.15
+    bitirme_ratio: float = 0.4
+    classrooms: Optional[int] = None
+    calendar: str = "standard"
+    seed: int = 1
+
+    def __post_init__(self):
+        if not MIN_PROJECTS <= self.projects <= MAX_PROJECTS:
+            raise ValueError(f"projects must be within {MIN_PROJECTS}-{MAX_PROJECTS}, got {self.projects}")
+        if self.calendar not in CALENDARS:
+            raise ValueError(f"Unknown calendar {self.calendar!r} (expected one of {sorted(CALENDARS)})")
+        if not 0.0 <= self.assistant_ratio < 1.0 or not 0.0 <= self.bitirme_ratio <= 1.0:
+            raise ValueError("assistant_ratio must be in [0, 1) and bitirme_ratio in [0, 1]")
+
+    @property
+    def key(self) -> str:
+        """Sonuc dosyalarinda kullanilan kisa ad."""
+        return f"p{self.projects}_s{self.seed}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def build_timeslots(calendar: str = "standard") -> List[Dict[str, Any]]:
+    """Takvim ayarindan gun ici zaman dilimlerini uret (ogle arasi atlanir)."""
+    start, end, step, lunch = CALENDARS[calendar]
+    current, stop = parse_minutes(start), parse_minutes(end)
+    lunch_start, lunch_end = (parse_minutes(lunch[0]), parse_minutes(lunch[1])) if lunch else (None, None)
+    timeslots = []
+    while current + step <= stop:
+        if lunch_start is not None and lunch_start <= current < lunch_end:
+            current = lunch_end
+            continue
+        timeslots.append({
+            "id": len(timeslots) + 1,
+            "start_time": f"{format_minutes(current)}:00",
+            "end_time": f"{format_minutes(current + step)}:00",
+            "is_morning": current < 12 * 60,
+            "is_active": True,
+        })
+        current += step
+    return timeslots
+
+
+def generate_instance(spec: InstanceSpec) -> Dict[str, Any]:
+    """
+    ``spec``'e gore deterministik problem ornegi uret.
+
+    Proje sorumlulari hocalar arasinda dengesiz dagitilir (gercek verideki
+    gibi birkac hocanin cok projesi olur); arastirma gorevlileri sorumlu
+    olamaz.
+    """
+    rng = random.Random(spec.seed)
+    timeslots = build_timeslots(spec.calendar)
+
+    instructor_count = spec.instructors or max(8, spec.projects // 4)
+    assistants = int(round(instructor_count * spec.assistant_ratio))
+    faculty = max(1, instructor_count - assistants)
+    instructors = [
+        {
+            "id": i,
+            "name": f"Instructor {i}",
+            "type": "instructor" if i <= faculty else "assistant",
+            "is_active": True,
+        }
+        for i in range(1, instructor_count + 1)
+    ]
+
+    # Zipf benzeri agirliklar: sorumluluk yuku dengesiz dagilir
+    weights = [1.0 / (rank ** 0.6) for rank in range(1, faculty + 1)]
+    rng.shuffle(weights)
+    supervisors = rng.choices(range(1, faculty + 1), weights=weights, k=spec.projects)
+    bitirme_count = int(round(spec.projects * spec.bitirme_ratio))
+    kinds = ["bitirme"] * bitirme_count + ["ara"] * (spec.projects - bitirme_count)
+    rng.shuffle(kinds)
+    projects = [
+        {
+            "id": p,
+            "title": f"{kind.title()} Project {p}",
+            "type": kind,
+            "project_type": kind,
+            "responsible_id": supervisor,
+            "responsible_instructor_id": supervisor,
+            "is_makeup": False,
+            "status": "active",
+        }
+        for p, (kind, supervisor) in enumerate(zip(kinds, supervisors), start=1)
+    ]
+
+    classroom_count = spec.classrooms or max(3, math.ceil(1.2 * spec.projects / max(1, len(timeslots))))
+    classrooms = [
+        {"id": c, "name": f"D{100 + c}", "capacity": 40, "is_active": True}
+        for c in range(1, classroom_count + 1)
+    ]
+    return {
+        "projects": projects,
+        "instructors": instructors,
+        "classrooms": classrooms,
+        "timeslots": timeslots,
+    }
+
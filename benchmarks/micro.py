@@ -0,0 +1,422 @@
+"""
+Sicak fonksiyonlar icin mikro benchmark.
+
+Ceza hesaplayicilari (GA, SA, ACO, NSGA-II, DP, comprehensive,
+lexicographic), SA onarimi, komsuluk uretimi ve validator, sabit seed'li
+sentetik orneklerde tek tek olculur:
+
+- Olcum ``timeit`` mantigiyla yapilir: dongu sayisi bir parti en az
+  ``min_time`` surecek sekilde kalibre edilir, bir isinma partisinden sonra
+  ``repeat`` parti olculur. Cagri basina medyan, IQR, standart sapma ve
+  ortalamanin %95 guven araligi raporlanir; ops/sn medyandan hesaplanir.
+- Bellek ayri bir ``tracemalloc`` turunda olculur (zamanlamaya karismaz):
+  cagri basina gecici tepe ayirma ve kalici (geri verilmeyen) bayt.
+- Girdiyi degistiren hedeflerde (onarim) her cagriya parti disinda
+  hazirlanmis taze kopya verilir; kopyalama sureye dahil degildir.
+
+Kullanim::
+
+    python -m benchmarks.micro --sizes 100,400 --output before.json
+    python -m benchmarks.micro --sizes 100,400 --compare before.json
+"""
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import argparse
+import gc
+import json
+import logging
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.instances import InstanceSpec, generate_instance
+
+DEFAULT_SIZES = (100,)
+DEFAULT_REPEAT = 7
+DEFAULT_MIN_TIME = 0.1
+ALLOC_CALLS = 20
+SEED = 1
+
+# Student t kritik degerleri (iki yonlu %95), serbestlik derecesi -> t
+_T95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306,
+        9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 30: 2.042}
+
+
+def _t95(df: int) -> float:
+    if df <= 0:
+        return float("nan")
+    for bound in sorted(_T95):
+        if df <= bound:
+            return _T95[bound]
+    return 1.96
+
+
+# ----------------------------------------------------------------------
+# Sabit ornekler ve algoritma bilesenleri
+# ----------------------------------------------------------------------
+class Fixtures:
+    """
+    Bir ornek boyutu icin algoritma bilesenleri ve baslangic cozumleri.
+
+    Her bilesen ilk kullanildiginda, sabit seed ile bir kez kurulur.
+    """
+
+    def __init__(self, projects: int, classrooms: int = 6):
+        self.spec = InstanceSpec(projects=projects, classrooms=classrooms, seed=SEED)
+        self.data = generate_instance(self.spec)
+        self.class_count = classrooms
+
+    @staticmethod
+    def _seeded(factory: Callable[[], Any]) -> Any:
+        random.seed(SEED)
+        return factory()
+
+    @cached_property
+    def ga(self) -> Tuple[Any, Any]:
+        from app.algorithms.genetic_algorithm import EnhancedGeneticAlgorithm
+        algorithm = EnhancedGeneticAlgorithm({})
+        algorithm.initialize(self.data)
+        return algorithm, self._seeded(algorithm.initializer._create_heuristic_individual)
+
+    @cached_property
+    def sa(self) -> Tuple[Any, Any]:
+        from app.algorithms.simulated_annealing import SAConfig, SimulatedAnnealingScheduler
+        scheduler = SimulatedAnnealingScheduler(SAConfig())
+        scheduler.initialize(self.data)
+        return scheduler, self._seeded(scheduler.build_initial_solution)
+
+    @cached_property
+    def aco(self) -> Tuple[Any, Any]:
+        from app.algorithms.ant_colony import ACOConfig, ACOScheduler, Ant
+        scheduler = ACOScheduler(ACOConfig())
+        scheduler.initialize(self.data)
+        ant = Ant(scheduler.projects, scheduler.instructors, scheduler.config,
+                  scheduler.pheromone_matrix, scheduler.penalty_calculator)
+        return scheduler, self._seeded(ant.construct_solution)
+
+    @cached_property
+    def nsga_ii(self) -> Tuple[Any, Any]:
+        from app.algorithms.nsga_ii import NSGA2Scheduler
+        scheduler = NSGA2Scheduler({})
+        scheduler.initialize(self.data)
+        scheduler._initialize_components()
+        individual = self._seeded(lambda: scheduler.population_initializer._create_greedy_individual(self.class_count))
+        return scheduler, individual
+
+    @cached_property
+    def dp(self) -> Tuple[Any, Any]:
+        from app.algorithms.dynamic_programming import DynamicProgrammingAlgorithm
+        algorithm = DynamicProgrammingAlgorithm({})
+        algorithm.initialize(self.data)
+        return algorithm, self._seeded(algorithm.solution_builder.build_initial_solution)
+
+    @cached_property
+    def comprehensive(self) -> Tuple[Any, Any]:
+        from app.algorithms.comprehensive_optimizer import ComprehensiveOptimizer
+        optimizer = ComprehensiveOptimizer({})
+        optimizer.initialize(self.data)
+        return optimizer, self._seeded(lambda: optimizer.solution_builder.build(optimizer.config.class_count))
+
+    @cached_property
+    def lexicographic(self) -> Tuple[Any, Any]:
+        from app.algorithms import lexicographic
+        config = lexicographic.LexicographicConfig()
+        state = self._seeded(lambda: lexicographic.build_initial_solution(
+            lexicographic._parse_projects(self.data["projects"]),
+            lexicographic._parse_teachers(self.data["instructors"]),
+            config, self.class_count,
+        ))
+        return config, state
+
+    @cached_property
+    def schedule(self) -> List[Dict[str, Any]]:
+        from app.algorithms.greedy import Greedy
+        result = self._seeded(lambda: Greedy({}).execute(dict(self.data)))
+        return result.get("schedule") or result.get("assignments") or []
+
+
+# ----------------------------------------------------------------------
+# Olculen hedefler
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class MicroCase:
+    """
+    Tek bir olcum hedefi.
+
+    ``build(fixtures)`` -> ``(fn, make_arg, mutates)``: ``fn(arg)`` olculen
+    cagri; ``mutates`` ise her cagriya ``make_arg()`` ile taze girdi verilir.
+    """
+    name: str
+    target: str
+    build: Callable[[Fixtures], Tuple[Callable[[Any], Any], Callable[[], Any], bool]]
+
+
+def _fixed(fn: Callable[[Any], Any], arg: Any) -> Tuple[Callable[[Any], Any], Callable[[], Any], bool]:
+    return fn, lambda: arg, False
+
+
+def _validate(f: Fixtures) -> Tuple[Callable[[Any], Any], Callable[[], Any], bool]:
+    from app.algorithms.validator import validate_solution
+    data = f.data
+    return _fixed(lambda schedule: validate_solution(
+        schedule, data["projects"], data["instructors"], data["classrooms"], data["timeslots"]
+    ), f.schedule)
+
+
+def _metrics_compute(f: Fixtures) -> Tuple[Callable[[Any], Any], Callable[[], Any], bool]:
+    from app.services.performance_metrics import compute
+    from app.services.portfolio_service import build_metric_plan
+    return _fixed(compute, build_metric_plan(f.data, f.schedule))
+
+
+def _fitness_total(f: Fixtures) -> Tuple[Callable[[Any], Any], Callable[[], Any], bool]:
+    from app.algorithms.fitness_helpers import FitnessMetrics
+    data = f.data
+    metrics = FitnessMetrics(data["projects"], data["instructors"], data["classrooms"], data["timeslots"])
+    return _fixed(metrics.calculate_total_fitness, f.schedule)
+
+
+def _lexicographic(f: Fixtures) -> Tuple[Callable[[Any], Any], Callable[[], Any], bool]:
+    from app.algorithms.lexicographic import calculate_penalties
+    config, state = f.lexicographic
+    return _fixed(lambda arg: calculate_penalties(arg, config), state)
+
+
+def _neighbors(f: Fixtures) -> Tuple[Callable[[Any], Any], Callable[[], Any], bool]:
+    optimizer, solution = f.comprehensive
+    return _fixed(optimizer.neighborhood_generator.generate_neighbors, solution)
+
+
+CASES: List[MicroCase] = [
+    MicroCase("ga.h1_time_penalty", "GAPenaltyCalculator.calculate_h1_time_penalty",
+              lambda f: _fixed(f.ga[0].penalty_calculator.calculate_h1_time_penalty, f.ga[1])),
+    MicroCase("ga.fitness", "GAPenaltyCalculator.calculate_fitness",
+              lambda f: _fixed(f.ga[0].penalty_calculator.calculate_fitness, f.ga[1])),
+    MicroCase("sa.total_cost", "SAPenaltyCalculator.calculate_total_cost",
+              lambda f: _fixed(f.sa[0].penalty_calculator.calculate_total_cost, f.sa[1])),
+    MicroCase("sa.repair", "SARepairMechanism.repair",
+              lambda f: (f.sa[0].repair_mechanism.repair, f.sa[1].copy, True)),
+    MicroCase("aco.total_cost", "ACOPenaltyCalculator.calculate_total_cost",
+              lambda f: _fixed(f.aco[0].penalty_calculator.calculate_total_cost, f.aco[1])),
+    MicroCase("nsga_ii.evaluate", "NSGA2ObjectiveCalculator.evaluate",
+              lambda f: _fixed(f.nsga_ii[0].objective_calculator.evaluate, f.nsga_ii[1])),
+    MicroCase("dp.total_cost", "DPPenaltyCalculator.calculate_total_cost",
+              lambda f: _fixed(f.dp[0].penalty_calculator.calculate_total_cost, f.dp[1])),
+    MicroCase("comprehensive.full_penalty", "PenaltyCalculator.calculate_full_penalty",
+              lambda f: _fixed(f.comprehensive[0].penalty_calculator.calculate_full_penalty, f.comprehensive[1])),
+    MicroCase("comprehensive.generate_neighbors", "NeighborhoodGenerator.generate_neighbors", _neighbors),
+    MicroCase("lexicographic.penalties", "lexicographic.calculate_penalties", _lexicographic),
+    MicroCase("validator.validate_solution", "validator.validate_solution", _validate),
+    MicroCase("metrics.compute", "performance_metrics.compute", _metrics_compute),
+    MicroCase("fitness.total", "FitnessMetrics.calculate_total_fitness", _fitness_total),
+]
+
+
+# ----------------------------------------------------------------------
+# Olcum
+# ----------------------------------------------------------------------
+def _batch(fn: Callable[[Any], Any], args: Sequence[Any]) -> float:
+    started = time.perf_counter()
+    for arg in args:
+        fn(arg)
+    return time.perf_counter() - started
+
+
+def _args(make_arg: Callable[[], Any], mutates: bool, loops: int) -> List[Any]:
+    if mutates:
+        return [make_arg() for _ in range(loops)]
+    return [make_arg()] * loops
+
+
+def measure(fn: Callable[[Any], Any], make_arg: Callable[[], Any], mutates: bool = False,
+            repeat: int = DEFAULT_REPEAT, min_time: float = DEFAULT_MIN_TIME,
+            alloc_calls: int = ALLOC_CALLS) -> Dict[str, Any]:
+    """
+    Tek bir hedefi olc.
+
+    Returns:
+        Cagri basina sure istatistikleri (mikrosaniye), ops/sn ve bellek.
+    """
+    # Kalibrasyon: parti suresi min_time'a ulasana kadar dongu sayisini artir
+    loops = 1
+    while True:
+        random.seed(SEED)
+        elapsed = _batch(fn, _args(make_arg, mutates, loops))
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9) * 1.2))
+
+    samples = []
+    gc_enabled = gc.isenabled()
+    for _ in range(repeat + 1):  # ilk parti isinma
+        args = _args(make_arg, mutates, loops)
+        random.seed(SEED)
+        gc.collect()
+        gc.disable()
+        try:
+            samples.append(_batch(fn, args) / loops)
+        finally:
+            if gc_enabled:
+                gc.enable()
+    samples = samples[1:]
+
+    peaks, retained = [], 0
+    calls = max(1, min(alloc_calls, loops))
+    args = _args(make_arg, mutates, calls)
+    random.seed(SEED)
+    tracemalloc.start()
+    try:
+        start_current, _ = tracemalloc.get_traced_memory()
+        for arg in args:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            result = fn(arg)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            del result
+        end_current, _ = tracemalloc.get_traced_memory()
+        retained = end_current - start_current
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(samples)
+    stdev = statistics.stdev(samples) if len(samples) > 1 else 0.0
+    quartiles = statistics.quantiles(samples, n=4) if len(samples) > 1 else [median, median, median]
+    micro = 1e6
+    return {
+        "loops": loops,
+        "repeat": repeat,
+        "median_us": round(median * micro, 3),
+        "mean_us": round(statistics.fmean(samples) * micro, 3),
+        "min_us": round(min(samples) * micro, 3),
+        "stdev_us": round(stdev * micro, 3),
+        "iqr_us": round((quartiles[2] - quartiles[0]) * micro, 3),
+        "ci95_us": round(_t95(len(samples) - 1) * stdev / math.sqrt(len(samples)) * micro, 3)
+        if len(samples) > 1 else None,
+        "ops_per_sec": round(1.0 / median, 2) if median > 0 else None,
+        "alloc_peak_kb": round(statistics.median(peaks) / 1024, 2),
+        "alloc_retained_bytes_per_call": round(retained / calls, 1),
+    }
+
+
+def run(sizes: Sequence[int] = DEFAULT_SIZES, cases: Optional[Sequence[MicroCase]] = None,
+        repeat: int = DEFAULT_REPEAT, min_time: float = DEFAULT_MIN_TIME,
+        echo: bool = False) -> List[Dict[str, Any]]:
+    """Secilen hedefleri her boyutta olc."""
+    rows = []
+    for size in sizes:
+        fixtures = Fixtures(size)
+        for case in cases or CASES:
+            row: Dict[str, Any] = {"case": case.name, "target": case.target, "projects": size}
+            try:
+                fn, make_arg, mutates = case.build(fixtures)
+                row.update(measure(fn, make_arg, mutates, repeat=repeat, min_time=min_time))
+                row["status"] = "ok"
+            except Exception as e:
+                row.update(status="error", error=f"{type(e).__name__}: {e}")
+            rows.append(row)
+            if echo:
+                print(_format_row(row), flush=True)
+    return rows
+
+
+# ----------------------------------------------------------------------
+# Karsilastirma ve komut satiri
+# ----------------------------------------------------------------------
+def compare(current: Sequence[Dict[str, Any]], previous: Sequence[Dict[str, Any]],
+            threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """
+    Iki olcumu karsilastir. Medyan ``threshold``'dan fazla degisip guven
+    araliklari ortusmuyorsa degisim anlamli sayilir.
+
+    Returns:
+        Ortak hedefler icin ``ratio`` (yeni / eski medyan) ve ``verdict``
+        (``slower`` / ``faster`` / ``same``).
+    """
+    reference = {(row["case"], row["projects"]): row for row in previous if row.get("status") == "ok"}
+    table = []
+    for row in current:
+        old = reference.get((row["case"], row["projects"]))
+        if old is None or row.get("status") != "ok":
+            continue
+        ratio = row["median_us"] / old["median_us"] if old["median_us"] else float("inf")
+        overlap = abs(row["mean_us"] - old["mean_us"]) <= (row.get("ci95_us") or 0) + (old.get("ci95_us") or 0)
+        verdict = "same"
+        if not overlap and ratio > 1 + threshold:
+            verdict = "slower"
+        elif not overlap and ratio < 1 - threshold:
+            verdict = "faster"
+        table.append({"case": row["case"], "projects": row["projects"], "before_us": old["median_us"],
+                      "after_us": row["median_us"], "ratio": round(ratio, 3), "verdict": verdict})
+    return table
+
+
+def _format_row(row: Dict[str, Any]) -> str:
+    if row.get("status") != "ok":
+        return f"{row['case']:<34} p{row['projects']:<5} {row.get('error')}"
+    return (
+        f"{row['case']:<34} p{row['projects']:<5} {row['median_us']:>12.1f}us "
+        f"±{row['ci95_us'] or 0:>9.1f} {row['ops_per_sec'] or 0:>11.1f} ops/s "
+        f"{row['alloc_peak_kb']:>9.1f} KB peak"
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmark penalty, repair and neighbourhood hot paths")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Project counts, e.g. 100,400")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="Minimum seconds per timed batch")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Previous result JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change treated as significant")
+    parser.add_argument("--list", action="store_true", help="List cases and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for case in CASES:
+            print(f"{case.name:<34} {case.target}")
+        return 0
+    logging.disable(logging.WARNING)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    cases = [case for case in CASES if args.filter in case.name]
+    rows = run(sizes, cases, repeat=max(2, args.repeat), min_time=args.min_time, echo=True)
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "min_time": args.min_time,
+            "seed": SEED,
+        },
+        "results": rows,
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+            handle.write("\n")
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            previous = json.load(handle)["results"]
+        table = compare(rows, previous, threshold=args.threshold)
+        print()
+        for item in table:
+            print(f"{item['case']:<34} p{item['projects']:<5} {item['before_us']:>12.1f} -> "
+                  f"{item['after_us']:>12.1f}us  x{item['ratio']:<6} {item['verdict']}")
+        return 1 if any(item["verdict"] == "slower" for item in table) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,393 @@
+"""
+Algoritma benchmark kosucusu.
+
+Her (algoritma, ornek boyutu, seed) kombinasyonu ayri bir surecte calisir:
+tepe bellek olcumu diger kosulardan etkilenmez, cokme veya takilma yalnizca
+o kombinasyonu etkiler (sert zaman asiminda surec sonlandirilir).
+
+Kaydedilenler: duvar saati, tepe bellek (MB), degerlendirme sayisi ve
+saniyedeki degerlendirme (solver'in ``report_progress`` ile bildirdigi
+arama adimi), ``benchmarks.costs`` ile olculen H1-H4, kapsam ve sert ihlal.
+
+Sonuc baseline dosyasiyla karsilastirilir; tolerans disindaki her gerileme
+listelenir ve surec 1 koduyla cikar::
+
+    python -m benchmarks.runner --sizes 50,200 --seeds 1,2 --workers 4
+    python -m benchmarks.runner --update-baseline
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.costs import schedule_costs
+from benchmarks.instances import CALENDARS, InstanceSpec, generate_instance
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baselines", "default.json")
+DEFAULT_RESULTS_DIR = os.path.join(BENCHMARK_DIR, "results")
+DEFAULT_SIZES = (50, 200)
+DEFAULT_SEEDS = (1,)
+DEFAULT_TIME_BUDGET = 10.0
+# Solver deadline'a uymazsa surec bu kadar ek sureden sonra sonlandirilir
+HARD_TIMEOUT_GRACE = 30.0
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_TIMEOUT = "timeout"
+STATUS_CRASHED = "crashed"
+# AlgorithmType'ta olup factory'de karsiligi olmayan algoritmalar
+STATUS_UNSUPPORTED = "unsupported"
+
+COST_KEYS = ("h1", "h2", "h3", "h4")
+
+
+# ----------------------------------------------------------------------
+# Tek kosu (alt surecte calisir)
+# ----------------------------------------------------------------------
+def _peak_memory_mb() -> float:
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS bayt dondurur
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _extract_schedule(result: Any) -> List[Dict[str, Any]]:
+    from app.services.portfolio_service import extract_schedule
+    return extract_schedule(result)
+
+
+def run_case(algorithm: str, spec: Dict[str, Any], time_budget: float) -> Dict[str, Any]:
+    """
+    Tek bir algoritmayi tek bir ornek uzerinde calistir ve olc.
+
+    Ayni surecte baska olcum yapilmamasi beklenir; tepe bellek surecin
+    solver oncesi tepe degerine gore farktir.
+    """
+    from app.algorithms.anytime import SolverControl, use_control
+    from app.algorithms.factory import AlgorithmFactory
+
+    instance = InstanceSpec(**spec)
+    row: Dict[str, Any] = {
+        "algorithm": algorithm,
+        "instance": instance.key,
+        "projects": instance.projects,
+        "seed": instance.seed,
+        "status": STATUS_OK,
+        "error": None,
+    }
+    data = generate_instance(instance)
+    random.seed(instance.seed)
+    try:
+        import numpy
+        numpy.random.seed(instance.seed)
+    except ImportError:
+        pass
+
+    progress = {"iteration": None}
+
+    def on_progress(event: Dict[str, Any]) -> None:
+        iteration = event.get("iteration")
+        if isinstance(iteration, int) and (progress["iteration"] is None or iteration > progress["iteration"]):
+            progress["iteration"] = iteration
+
+    params = {"time_budget": time_budget, "progress_rate": 0}
+    try:
+        solver = AlgorithmFactory().create_algorithm(algorithm, params=dict(params))
+    except ValueError as e:
+        return {**row, "status": STATUS_UNSUPPORTED, "error": str(e)}
+    except Exception as e:
+        return {**row, "status": STATUS_ERROR, "error": f"create: {e}"}
+    control = SolverControl.from_params(params, on_progress=on_progress)
+    if hasattr(solver, "set_control"):
+        solver.set_control(control)
+    data["params"] = params
+
+    memory_before = _peak_memory_mb()
+    started = time.perf_counter()
+    try:
+        with use_control(control):
+            result = solver.execute(data)
+    except Exception as e:
+        result = None
+        row.update(status=STATUS_ERROR, error=f"{type(e).__name__}: {e}")
+    wall_time = time.perf_counter() - started
+
+    schedule = _extract_schedule(result) if result is not None else []
+    evaluations = progress["iteration"] + 1 if progress["iteration"] is not None else None
+    row.update(
+        wall_time=round(wall_time, 4),
+        peak_memory_mb=round(max(0.0, _peak_memory_mb() - memory_before), 2),
+        evaluations=evaluations,
+        evaluations_per_sec=round(evaluations / wall_time, 2) if evaluations and wall_time > 0 else None,
+        stop_reason=control.stop_reason,
+        assignments=len(schedule),
+        costs=schedule_costs(data, schedule) if schedule else None,
+    )
+    if row["status"] == STATUS_OK and not schedule:
+        row.update(status=STATUS_ERROR, error="empty schedule")
+    return row
+
+
+def _child(conn, algorithm: str, spec: Dict[str, Any], time_budget: float) -> None:
+    logging.disable(logging.WARNING)
+    try:
+        conn.send(run_case(algorithm, spec, time_budget))
+    except Exception as e:
+        conn.send({"algorithm": algorithm, "status": STATUS_ERROR, "error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+# ----------------------------------------------------------------------
+# Paralel calistirma
+# ----------------------------------------------------------------------
+def run_matrix(algorithms: Sequence[str], specs: Sequence[InstanceSpec], time_budget: float,
+               workers: int = 1, hard_timeout: Optional[float] = None,
+               echo: bool = False) -> List[Dict[str, Any]]:
+    """
+    Tum kombinasyonlari en fazla ``workers`` es zamanli surecte calistir.
+
+    Returns:
+        Kombinasyon sirasinda sonuc satirlari.
+    """
+    hard_timeout = hard_timeout or time_budget + HARD_TIMEOUT_GRACE
+    cases = [(algorithm, spec) for spec in specs for algorithm in algorithms]
+    results: Dict[int, Dict[str, Any]] = {}
+    pending = list(enumerate(cases))
+    running: Dict[int, Tuple[multiprocessing.Process, Any, float]] = {}
+    context = multiprocessing.get_context()
+
+    def base_row(index: int) -> Dict[str, Any]:
+        algorithm, spec = cases[index]
+        return {"algorithm": algorithm, "instance": spec.key, "projects": spec.projects, "seed": spec.seed}
+
+    def finish(index: int, row: Dict[str, Any]) -> None:
+        results[index] = row
+        if echo:
+            print(_format_row(row), flush=True)
+
+    while pending or running:
+        while pending and len(running) < max(1, workers):
+            index, (algorithm, spec) = pending.pop(0)
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=_child, args=(sender, algorithm, spec.to_dict(), time_budget), daemon=True)
+            process.start()
+            sender.close()
+            running[index] = (process, receiver, time.monotonic())
+
+        for index, (process, receiver, started) in list(running.items()):
+            if receiver.poll():
+                try:
+                    finish(index, {**base_row(index), **receiver.recv()})
+                except EOFError:
+                    finish(index, {**base_row(index), "status": STATUS_CRASHED, "error": "no result"})
+            elif not process.is_alive():
+                finish(index, {**base_row(index), "status": STATUS_CRASHED,
+                               "error": f"exit code {process.exitcode}"})
+            elif time.monotonic() - started > hard_timeout:
+                process.terminate()
+                finish(index, {**base_row(index), "status": STATUS_TIMEOUT,
+                               "error": f"no result after {hard_timeout:.0f}s", "wall_time": hard_timeout})
+            else:
+                continue
+            process.join(timeout=5)
+            receiver.close()
+            del running[index]
+        time.sleep(0.05)
+
+    return [results[index] for index in range(len(cases))]
+
+
+# ----------------------------------------------------------------------
+# Baseline karsilastirmasi
+# ----------------------------------------------------------------------
+def _total_cost(row: Dict[str, Any]) -> Optional[float]:
+    costs = row.get("costs")
+    return sum(costs[key] for key in COST_KEYS) if costs else None
+
+
+def compare(results: Sequence[Dict[str, Any]], baseline: Sequence[Dict[str, Any]],
+            time_tolerance: float = 0.25, memory_tolerance: float = 0.25,
+            cost_tolerance: float = 0.05, min_time_delta: float = 0.5,
+            min_memory_delta: float = 5.0) -> List[Dict[str, Any]]:
+    """
+    Sonuclari baseline ile karsilastir.
+
+    Toleranslar goreceli; cok kisa kosulardaki gurultu icin mutlak alt
+    sinirlar (``min_time_delta`` saniye, ``min_memory_delta`` MB) uygulanir.
+
+    Returns:
+        Gerileme listesi: ``algorithm``, ``instance``, ``metric``, ``baseline``, ``current``.
+    """
+    reference = {(row["algorithm"], row["instance"]): row for row in baseline}
+    regressions: List[Dict[str, Any]] = []
+
+    def regress(row: Dict[str, Any], metric: str, before: Any, after: Any) -> None:
+        regressions.append({"algorithm": row["algorithm"], "instance": row["instance"],
+                            "metric": metric, "baseline": before, "current": after})
+
+    for row in results:
+        base = reference.get((row["algorithm"], row["instance"]))
+        if base is None or base.get("status") != STATUS_OK:
+            continue
+        if row.get("status") != STATUS_OK:
+            regress(row, "status", STATUS_OK, f"{row.get('status')}: {row.get('error')}")
+            continue
+
+        before, after = base.get("wall_time"), row.get("wall_time")
+        if before and after and after - before > max(min_time_delta, before * time_tolerance):
+            regress(row, "wall_time", before, after)
+
+        before, after = base.get("peak_memory_mb"), row.get("peak_memory_mb")
+        if before is not None and after is not None and after - before > max(min_memory_delta, before * memory_tolerance):
+            regress(row, "peak_memory_mb", before, after)
+
+        before, after = base.get("evaluations_per_sec"), row.get("evaluations_per_sec")
+        if before and after is not None and after < before * (1 - time_tolerance):
+            regress(row, "evaluations_per_sec", before, after)
+
+        before, after = _total_cost(base), _total_cost(row)
+        if before is not None and after is not None and after - before > max(1.0, before * cost_tolerance):
+            regress(row, "h1_h4_cost", round(before, 3), round(after, 3))
+
+        base_costs, costs = base.get("costs") or {}, row.get("costs") or {}
+        if costs.get("coverage", 0.0) < base_costs.get("coverage", 0.0) - 1e-9:
+            regress(row, "coverage", base_costs.get("coverage"), costs.get("coverage"))
+        if costs.get("hard_violations", 0) > base_costs.get("hard_violations", 0):
+            regress(row, "hard_violations", base_costs.get("hard_violations"), costs.get("hard_violations"))
+    return regressions
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def write_report(path: str, report: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2, sort_keys=False, default=str)
+        handle.write("\n")
+
+
+def build_report(results: List[Dict[str, Any]], args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "time_budget": args.time_budget,
+            "sizes": args.sizes,
+            "seeds": args.seeds,
+            "calendar": args.calendar,
+        },
+        "results": results,
+    }
+
+
+# ----------------------------------------------------------------------
+# Komut satiri
+# ----------------------------------------------------------------------
+def _format_row(row: Dict[str, Any]) -> str:
+    costs = row.get("costs") or {}
+    rate = row.get("evaluations_per_sec")
+    return (
+        f"{row['algorithm']:<28} {row['instance']:<12} {row.get('status', '?'):<8} "
+        f"{row.get('wall_time') or 0:>8.2f}s {row.get('peak_memory_mb') or 0:>8.1f}MB "
+        f"{(f'{rate:.0f}/s' if rate else '-'):>10} "
+        f"H1-4={[costs.get(key) for key in COST_KEYS] if costs else '-'}"
+        + (f"  {row['error']}" if row.get("error") else "")
+    )
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def _all_algorithms() -> List[str]:
+    from app.algorithms.factory import AlgorithmFactory
+    return AlgorithmFactory().list_algorithms()
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the algorithm benchmark matrix")
+    parser.add_argument("--algorithms", help="Comma separated algorithm names (default: every factory algorithm)")
+    parser.add_argument("--exclude", default="", help="Comma separated algorithms to skip")
+    parser.add_argument("--sizes", type=_int_list, default=list(DEFAULT_SIZES), help="Project counts, e.g. 50,200,1000")
+    parser.add_argument("--seeds", type=_int_list, default=list(DEFAULT_SEEDS), help="Instance seeds, e.g. 1,2,3")
+    parser.add_argument("--calendar", default="standard", choices=sorted(CALENDARS))
+    parser.add_argument("--instructors", type=int, help="Instructor count (default: projects / 4)")
+    parser.add_argument("--classrooms", type=int, help="Classroom count (default: fits the calendar)")
+    parser.add_argument("--bitirme-ratio", type=float, default=0.4)
+    parser.add_argument("--time-budget", type=float, default=DEFAULT_TIME_BUDGET, help="Per run solver deadline (s)")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--output", help="Result JSON path (default: benchmarks/results/bench_<timestamp>.json)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--no-compare", action="store_true", help="Skip the baseline comparison")
+    parser.add_argument("--time-tolerance", type=float, default=0.25)
+    parser.add_argument("--memory-tolerance", type=float, default=0.25)
+    parser.add_argument("--cost-tolerance", type=float, default=0.05)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    algorithms = args.algorithms.split(",") if args.algorithms else _all_algorithms()
+    excluded = set(filter(None, args.exclude.split(",")))
+    algorithms = [name for name in algorithms if name not in excluded]
+    options = {"calendar": args.calendar, "bitirme_ratio": args.bitirme_ratio,
+               "instructors": args.instructors, "classrooms": args.classrooms}
+    specs = [InstanceSpec(projects=size, seed=seed, **options) for size in args.sizes for seed in args.seeds]
+
+    print(f"Running {len(algorithms)} algorithms x {len(specs)} instances on {args.workers} workers "
+          f"(time budget {args.time_budget:g}s)", flush=True)
+    results = run_matrix(algorithms, specs, args.time_budget, workers=args.workers, echo=True)
+    report = build_report(results, args)
+
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, f"bench_{datetime.now():%Y%m%d_%H%M%S}.json")
+    write_report(output, report)
+    print(f"Results written to {output}")
+
+    if args.update_baseline:
+        write_report(args.baseline, report)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+    if args.no_compare:
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    regressions = compare(results, load_report(args.baseline)["results"],
+                          time_tolerance=args.time_tolerance, memory_tolerance=args.memory_tolerance,
+                          cost_tolerance=args.cost_tolerance)
+    if not regressions:
+        print("No regressions against baseline")
+        return 0
+    print(f"\n{len(regressions)} REGRESSION(S) against {args.baseline}:")
+    for item in regressions:
+        print(f"  {item['algorithm']:<28} {item['instance']:<12} {item['metric']:<20} "
+              f"{item['baseline']} -> {item['current']}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
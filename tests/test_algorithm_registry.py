@@ -0,0 +1,70 @@
+"""
+Test suite for the lazy algorithm registry and the import-time benchmark.
+"""
+
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from app.algorithms.factory import AlgorithmFactory
+from app.algorithms.registry import ALGORITHM_REGISTRY, is_loaded, load_algorithm_class, parse_names, prewarm
+from app.core.celery import _serves_solver_queues, celery_app
+from app.models.algorithm import AlgorithmType
+from benchmarks.importtime import compare, parse_importtime
+
+
+class TestAlgorithmRegistry:
+    """Algorithm modules load on first use"""
+
+    def test_factory_import_loads_no_algorithm_module(self):
+        modules = sorted(module_path for module_path, _ in ALGORITHM_REGISTRY.values())
+        code = (
+            "import sys, app.algorithms.factory\n"
+            f"print(','.join(m for m in {modules!r} if m in sys.modules))"
+        )
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert proc.stdout.strip() == ""
+
+    def test_create_resolves_lazily(self):
+        algorithm = AlgorithmFactory.create(AlgorithmType.GREEDY, {})
+        assert type(algorithm).__name__ == "Greedy"
+        assert is_loaded("greedy")
+        assert load_algorithm_class("greedy") is type(algorithm)
+        with pytest.raises(ValueError):
+            AlgorithmFactory.create(AlgorithmType.SIMPLEX_ARA)
+        with pytest.raises(ValueError):
+            AlgorithmFactory().create_algorithm("no_such_algorithm")
+
+    def test_prewarm_reports_timings(self):
+        assert parse_names(" greedy, ,tabu_search ") == ["greedy", "tabu_search"]
+        assert len(parse_names("all")) == len(ALGORITHM_REGISTRY)
+        timings = prewarm(["tabu_search", "no_such_algorithm"])
+        assert timings["tabu_search"] >= 0 and timings["no_such_algorithm"] is None
+
+    def test_prewarm_follows_consumed_queues(self):
+        assert _serves_solver_queues("algorithms_batch") and not _serves_solver_queues("reports,default")
+        # -Q yoksa tanimli kuyruklar; onlar da yoksa yalnizca varsayilan kuyruk
+        assert _serves_solver_queues(None, celery_app.conf)
+        assert not _serves_solver_queues(None, SimpleNamespace(task_queues=None, task_default_queue="celery"))
+
+
+class TestImportTimeBenchmark:
+    """-X importtime output parsing and baseline comparison"""
+
+    def test_parse_and_compare(self):
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   json.decoder\n"
+            "import time:       300 |        420 | json\n"
+        )
+        entries = parse_importtime(stderr)
+        assert entries == [("json.decoder", 120, 120, 1), ("json", 300, 420, 0)]
+
+        baseline = [{"target": "app.main", "import_ms": 1000.0, "algorithm_modules": []}]
+        current = [{"target": "app.main", "import_ms": 1100.0, "algorithm_modules": ["app.algorithms.cp_sat"]}]
+        regressions = compare(current, baseline, tolerance=0.25, min_delta_ms=100.0)
+        assert [item["metric"] for item in regressions] == ["algorithm_modules"]
+        current[0].update(import_ms=1400.0, algorithm_modules=[])
+        assert [item["metric"] for item in compare(current, baseline)] == ["import_ms"]
@@ -0,0 +1,240 @@
+"""
+Test suite for the anytime solver protocol (deadline, cancellation, best-so-far).
+"""
+
+import time
+
+import pytest
+
+from app.algorithms.anytime import (
+    CancellationToken,
+    SolverControl,
+    STOP_REASON_CANCELLED,
+    STOP_REASON_DEADLINE,
+    get_current_control,
+    native_time_limit,
+    use_control,
+)
+from app.algorithms.pso import PSO
+
+
+def _sample_data(project_count: int = 12):
+    instructors = [{"id": i, "name": f"Hoca {i}", "type": "instructor"} for i in range(1, 7)]
+    projects = [
+        {
+            "id": p,
+            "title": f"Proje {p}",
+            "type": "bitirme" if p % 2 else "ara",
+            "responsible_id": (p % 6) + 1,
+            "instructor_id": (p % 6) + 1,
+        }
+        for p in range(1, project_count + 1)
+    ]
+    classrooms = [{"id": c, "name": f"D10{c}", "capacity": 30} for c in range(1, 4)]
+    timeslots = [
+        {"id": t, "start_time": f"{9 + (t - 1) // 2:02d}:{30 * ((t - 1) % 2):02d}",
+         "end_time": f"{9 + t // 2:02d}:{30 * (t % 2):02d}"}
+        for t in range(1, 11)
+    ]
+    return {"projects": projects, "instructors": instructors,
+            "classrooms": classrooms, "timeslots": timeslots}
+
+
+class TestSolverControl:
+    """Unit tests for SolverControl"""
+
+    def test_no_budget_never_stops(self):
+        control = SolverControl()
+        assert control.should_stop() is False
+        assert control.remaining() is None
+
+    def test_deadline_stops(self):
+        control = SolverControl(time_budget=0.0)
+        assert control.should_stop() is True
+        assert control.stop_reason == STOP_REASON_DEADLINE
+
+    def test_cancellation_token(self):
+        token = CancellationToken()
+        control = SolverControl(time_budget=60, cancel_token=token)
+        assert control.should_stop() is False
+        token.cancel()
+        assert control.should_stop() is True
+        assert control.stop_reason == STOP_REASON_CANCELLED
+
+    def test_publish_is_throttled_and_lazy(self):
+        calls = []
+
+        def producer():
+            calls.append(1)
+            return [{"project_id": 1}]
+
+        control = SolverControl(snapshot_interval=3600)
+        assert control.publish(producer, cost=5.0, force=True) is True
+        assert control.publish(producer, cost=4.0) is False
+        assert len(calls) == 1
+
+        best = control.best_result()
+        assert len(calls) == 2
+        assert best["cost"] == 4.0
+        assert best["schedule"] == [{"project_id": 1}]
+
+    def test_from_params(self):
+        control = SolverControl.from_params({"time_budget": "20", "snapshot_interval": 0.5})
+        assert control.remaining() == pytest.approx(20, abs=0.5)
+        assert control.snapshot_interval == 0.5
+
+    def test_context_control(self):
+        control = SolverControl()
+        assert get_current_control() is None
+        with use_control(control):
+            assert get_current_control() is control
+        assert get_current_control() is None
+
+
+class TestAnytimeAlgorithm:
+    """Solver loops honour the deadline and publish their incumbent"""
+
+    def test_pso_stops_at_deadline_with_incumbent(self):
+        control = SolverControl(time_budget=0.3, snapshot_interval=0.0)
+        algorithm = PSO({"n_iterations": 1_000_000})
+        algorithm.set_control(control)
+
+        started = time.monotonic()
+        result = algorithm.execute(_sample_data())
+        elapsed = time.monotonic() - started
+
+        assert elapsed < 5
+        assert control.stop_reason == STOP_REASON_DEADLINE
+        assert len(result["schedule"]) == 12
+        assert control.best_result() is not None
+
+
+class TestSolverProgress:
+    """Throttled progress events emitted from solver loops"""
+
+    def test_progress_is_throttled(self):
+        events = []
+        control = SolverControl(on_progress=events.append, max_progress_rate=0.001)
+        assert control.report_progress(0, best_cost=10.0) is True
+        for i in range(1, 100):
+            control.report_progress(i, best_cost=10.0 - i)
+        assert len(events) == 1
+        assert control.report_progress(100, best_cost=1.0, force=True) is True
+        assert events[-1]["iteration"] == 100
+        assert "elapsed" in events[-1]
+
+    def test_penalty_breakdown_is_lazy(self):
+        calls = []
+
+        def breakdown():
+            calls.append(1)
+            return {"h1_time_penalty": 1.0}
+
+        control = SolverControl(on_progress=lambda event: None, max_progress_rate=0.001)
+        control.report_progress(0, penalty_breakdown=breakdown, max_iterations=10)
+        control.report_progress(1, penalty_breakdown=breakdown, max_iterations=10)
+        assert len(calls) == 1
+
+    def test_no_listener_is_noop(self):
+        control = SolverControl()
+        assert control.report_progress(0, best_cost=1.0) is False
+        assert control.progress_count == 0
+
+    def test_pso_reports_progress(self):
+        events = []
+        control = SolverControl(on_progress=events.append, max_progress_rate=0)
+        algorithm = PSO({"n_iterations": 5})
+        algorithm.set_control(control)
+        algorithm.execute(_sample_data())
+
+        assert events
+        assert events[-1]["algorithm"] == algorithm.get_name()
+        assert set(events[-1]["penalty_breakdown"]) == {
+            "h1_time_penalty", "h2_workload_penalty", "h3_class_change_penalty"
+        }
+        assert 0 < events[-1]["fraction"] <= 1.0
+
+
+class TestCrossWorkerCancel:
+    """A cancel request reaching another worker is relayed through Redis"""
+
+    def test_cancel_reaches_control_on_other_worker(self, monkeypatch):
+        import asyncio
+
+        from app.core.cache import MockRedisPool
+        from app.services import run_cancellation as module
+        from app.services.algorithm import AlgorithmService
+
+        monkeypatch.setattr(module, "POLL_INTERVAL_SECONDS", 0.01)
+        redis = MockRedisPool()
+        monkeypatch.setattr(module, "run_cancellation", module.RunCancellation(redis))
+        monkeypatch.setattr("app.services.algorithm.run_cancellation", module.run_cancellation)
+
+        async def scenario():
+            control = SolverControl()
+            worker = module.RunCancellation(redis)
+            await worker.mark_active(7)
+            watcher = asyncio.create_task(worker.watch(7, control))
+            # Istegi alan worker'da yerel kontrol yok
+            unknown = await AlgorithmService.cancel_run(8)
+            relayed = await AlgorithmService.cancel_run(7)
+            await asyncio.wait_for(watcher, 1.0)
+            await worker.clear(7)
+            return unknown, relayed, control.cancel_token.is_cancelled, await redis.exists("optimization_planner:run:7:cancel")
+
+        unknown, relayed, cancelled, pending = asyncio.run(scenario())
+        assert not unknown and relayed and cancelled and not pending
+
+
+class TestNativeSolverLimits:
+    """Exact solvers get the remaining budget as their own time limit"""
+
+    def test_native_time_limit_follows_deadline(self):
+        assert native_time_limit(120) == 120
+        control = SolverControl(time_budget=20)
+        assert native_time_limit(120, control) == pytest.approx(20, abs=0.5)
+        assert native_time_limit(5, control) == 5
+        control.deadline = time.monotonic() - 1
+        assert native_time_limit(120, control) == 0.1
+
+    def test_cp_sat_honours_deadline_and_cancel(self):
+        pytest.importorskip("ortools")
+        import threading
+
+        from app.algorithms.cp_sat import CPSATConfig, solve_with_cp_sat
+
+        data = _sample_data(40)
+        deadline = SolverControl(time_budget=0.5)
+        cancelled = SolverControl()
+        threading.Timer(0.3, cancelled.cancel).start()
+        for control in (deadline, cancelled):
+            started = time.monotonic()
+            with use_control(control):
+                solve_with_cp_sat(data, CPSATConfig(max_time_seconds=60))
+            assert time.monotonic() - started < 10
+        assert deadline.stop_reason == STOP_REASON_DEADLINE
+        assert cancelled.stop_reason == STOP_REASON_CANCELLED
+
+    def test_timeout_without_snapshot_is_bounded(self):
+        import asyncio
+
+        from app.services.algorithm import AlgorithmService
+
+        class _Silent:
+            def get_name(self):
+                return "silent"
+
+            def execute(self, data):
+                time.sleep(1.5)
+                return {"schedule": [{"project_id": 1}]}
+
+        async def scenario():
+            started = time.monotonic()
+            result = await AlgorithmService._execute_with_control(_Silent(), {}, control, {"deadline_grace": 0.1})
+            return result, time.monotonic() - started
+
+        control = SolverControl(time_budget=0.1)
+        result, elapsed = asyncio.run(scenario())
+        assert elapsed < 1.0
+        assert result["status"] == "timed_out" and result["schedule"] == []
+        assert control.stop_reason == STOP_REASON_DEADLINE
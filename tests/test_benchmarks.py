@@ -0,0 +1,118 @@
+"""
+Test suite for the benchmark instance generator, cost model, baseline comparison and micro-benchmarks.
+"""
+
+import pytest
+
+from benchmarks.costs import schedule_costs
+from benchmarks.instances import InstanceSpec, build_timeslots, generate_instance
+from benchmarks.micro import CASES, compare as compare_micro, measure, run as run_micro
+from benchmarks.runner import STATUS_OK, compare, run_case
+
+
+class TestInstanceGenerator:
+    """Deterministic, parameterized instances"""
+
+    def test_same_seed_same_instance(self):
+        spec = InstanceSpec(projects=120, seed=7, bitirme_ratio=0.25)
+        first, second = generate_instance(spec), generate_instance(spec)
+        assert first == second
+        assert generate_instance(InstanceSpec(projects=120, seed=8)) != first
+
+        assert len(first["projects"]) == 120
+        assert sum(p["type"] == "bitirme" for p in first["projects"]) == 30
+        faculty = {i["id"] for i in first["instructors"] if i["type"] == "instructor"}
+        assert {p["responsible_id"] for p in first["projects"]} <= faculty
+        assert len(first["classrooms"]) * len(first["timeslots"]) >= 120
+
+    def test_bounds_and_calendar(self):
+        with pytest.raises(ValueError):
+            InstanceSpec(projects=10)
+        with pytest.raises(ValueError):
+            InstanceSpec(projects=100, calendar="weekend")
+        starts = [slot["start_time"] for slot in build_timeslots("standard")]
+        assert starts[0] == "09:00:00" and "12:00:00" not in starts and "12:30:00" not in starts
+        assert len(build_timeslots("hourly")) < len(starts)
+
+
+class TestScheduleCosts:
+    """Algorithm independent H1-H4 on the output schedule"""
+
+    def test_costs(self):
+        data = {
+            "projects": [{"id": 1}, {"id": 2}, {"id": 3}],
+            "instructors": [{"id": 1, "type": "instructor"}, {"id": 2, "type": "instructor"}],
+            "timeslots": build_timeslots("standard")[:4],
+        }
+        schedule = [
+            {"project_id": 1, "classroom_id": "A", "timeslot_id": 1, "instructors": [1, 2]},
+            {"project_id": 2, "classroom_id": "B", "timeslot_id": 3, "instructors": [1, {"id": -1, "is_placeholder": True}]},
+        ]
+        costs = schedule_costs(data, schedule)
+        # Hoca 1: slot 0 -> 2 (1 bos slot, sinif degisimi); hoca 2 tek gorev
+        assert costs["h1"] == 1 and costs["h3"] == 1
+        assert costs["h4"] == 0 and costs["coverage"] == pytest.approx(2 / 3, abs=1e-4)
+        assert costs["hard_violations"] == 0
+
+        schedule.append({"project_id": 3, "classroom_id": "A", "timeslot_id": 1, "instructors": [2]})
+        assert schedule_costs(data, schedule)["hard_violations"] == 2
+
+
+class TestBaselineComparison:
+    """Regressions beyond tolerance are reported"""
+
+    def _row(self, **overrides):
+        row = {"algorithm": "greedy", "instance": "p50_s1", "status": STATUS_OK, "wall_time": 4.0,
+               "peak_memory_mb": 20.0, "evaluations_per_sec": 100.0,
+               "costs": {"h1": 10, "h2": 2.0, "h3": 5, "h4": 3.0, "coverage": 1.0, "hard_violations": 0}}
+        row.update(overrides)
+        return row
+
+    def test_compare(self):
+        baseline = [self._row()]
+        assert compare([self._row(wall_time=4.4, peak_memory_mb=22.0)], baseline) == []
+
+        worse = self._row(wall_time=6.0, evaluations_per_sec=50.0,
+                          costs={"h1": 30, "h2": 2.0, "h3": 5, "h4": 3.0, "coverage": 0.9, "hard_violations": 1})
+        metrics = {item["metric"] for item in compare([worse], baseline)}
+        assert metrics == {"wall_time", "evaluations_per_sec", "h1_h4_cost", "coverage", "hard_violations"}
+
+        failed = compare([self._row(status="error", error="boom")], baseline)
+        assert [item["metric"] for item in failed] == ["status"]
+        assert compare([self._row(algorithm="new_algorithm")], baseline) == []
+
+    def test_run_case_measures_greedy(self):
+        row = run_case("greedy", InstanceSpec(projects=50).to_dict(), time_budget=5)
+        assert row["status"] == STATUS_OK
+        assert row["assignments"] > 0 and row["wall_time"] >= 0
+        assert set(row["costs"]) >= {"h1", "h2", "h3", "h4", "coverage", "hard_violations"}
+
+
+class TestMicroBenchmark:
+    """Calibrated repeats, fresh inputs for mutating targets, comparison verdicts"""
+
+    def test_measure_statistics(self):
+        made = []
+
+        def make_arg():
+            made.append(1)
+            return list(range(50))
+
+        stats = measure(lambda values: values.sort(reverse=True), make_arg, mutates=True,
+                        repeat=3, min_time=0.001, alloc_calls=2)
+        assert stats["loops"] >= 1 and stats["repeat"] == 3
+        assert stats["median_us"] > 0 and stats["ops_per_sec"] > 0
+        assert stats["ci95_us"] is not None and stats["alloc_peak_kb"] >= 0
+        # Her cagri taze kopya alir: kalibrasyon + isinma + 3 parti + bellek turu
+        assert len(made) >= stats["loops"] * 4 + 2
+
+    def test_compare_verdicts(self):
+        before = [{"case": "x", "projects": 100, "status": "ok", "median_us": 100.0, "mean_us": 100.0, "ci95_us": 2.0}]
+        after = [dict(before[0], median_us=150.0, mean_us=150.0)]
+        assert compare_micro(after, before)[0]["verdict"] == "slower"
+        assert compare_micro([dict(before[0], median_us=103.0, mean_us=103.0)], before)[0]["verdict"] == "same"
+
+    def test_real_case_runs(self):
+        cases = [case for case in CASES if case.name == "lexicographic.penalties"]
+        rows = run_micro([50], cases, repeat=2, min_time=0.001)
+        assert rows[0]["status"] == "ok" and rows[0]["median_us"] > 0
@@ -0,0 +1,126 @@
+"""
+Test suite for solver checkpoints and resuming finished runs.
+"""
+
+import os
+
+from app.algorithms.anytime import SolverControl
+from app.algorithms.ant_colony import ACOConfig, Instructor as ACOInstructor, PheromoneMatrix, Project as ACOProject
+from app.algorithms.checkpoint import (
+    build_checkpoint, is_compatible, pack_solution, solution_score, unpack_assignments
+)
+from app.algorithms.simulated_annealing import ProjectAssignment, SAConfig, SimulatedAnnealingScheduler
+from app.services.checkpoint_store import CheckpointStore
+
+
+def _data(projects=12, classrooms=3):
+    return {
+        "projects": [
+            {"id": p, "title": f"P{p}", "type": "bitirme" if p % 3 == 0 else "ara", "responsible_id": 1 + p % 6}
+            for p in range(1, projects + 1)
+        ],
+        "instructors": [{"id": i, "name": f"I{i}", "type": "instructor"} for i in range(1, 7)],
+        "classrooms": [{"id": 100 + c, "name": f"D{c}"} for c in range(classrooms)],
+        "timeslots": [{"id": 200 + s, "start_time": f"{9 + s}:00", "end_time": f"{9 + s}:30"} for s in range(8)],
+    }
+
+
+class TestCheckpointFormat:
+    """Compact rows, scores and compatibility checks"""
+
+    def test_round_trip(self):
+        assignments = [ProjectAssignment(project_id=7, class_id=1, order_in_class=2, ps_id=3, j1_id=4)]
+        packed = pack_solution(assignments, float("inf"))
+        assert packed == [None, [[7, 1, 2, 3, 4]]]
+        assert solution_score(packed, 5.0) == 5.0
+        restored = unpack_assignments(packed[1], ProjectAssignment)
+        assert restored == assignments
+
+    def test_compatibility(self):
+        checkpoint = build_checkpoint("simulated_annealing", 3, [2, 1], 10, temperature=1.0)
+        assert is_compatible(checkpoint, "simulated_annealing", 3, [1, 2])
+        assert not is_compatible(checkpoint, "simulated_annealing", 4, [1, 2])
+        assert not is_compatible(checkpoint, "genetic_algorithm", 3, [1, 2])
+        assert not is_compatible(checkpoint, "simulated_annealing", 3, [1, 2, 3])
+        assert not is_compatible(None, "simulated_annealing", 3, [1, 2])
+
+
+class TestSolverControlCheckpoint:
+    """Throttled checkpoints and one-shot resume state"""
+
+    def test_interval_and_force(self):
+        saved = []
+        calls = []
+
+        def state():
+            calls.append(1)
+            return {"iteration": len(calls)}
+
+        control = SolverControl(checkpoint_interval=60.0, on_checkpoint=saved.append)
+        assert not control.checkpoint(state)
+        assert control.checkpoint(state, force=True)
+        assert len(calls) == 1 and saved[0]["iteration"] == 1 and "elapsed" in saved[0]
+        assert control.summary()["checkpoints"] == 1
+        assert not SolverControl().checkpoint(state, force=True)
+
+    def test_resume_state_is_taken_once(self):
+        control = SolverControl(resume_state={"algorithm": "nsga_ii", "class_count": 6})
+        assert control.take_resume_state("genetic_algorithm") is None
+        assert control.take_resume_state("nsga_ii", class_count=5) is None
+        assert control.take_resume_state("nsga_ii", class_count=6)["class_count"] == 6
+        assert control.take_resume_state("nsga_ii") is None
+
+
+class TestCheckpointStore:
+    """Atomic per-run files with a retention limit"""
+
+    def test_save_load_and_prune(self, tmp_path):
+        store = CheckpointStore(str(tmp_path), max_files=2)
+        store.saver(1)({"iteration": 1, "population": [[None, [[1, 0, 0, 2, 3]]]]})
+        assert store.load(1) == {"iteration": 1, "population": [[None, [[1, 0, 0, 2, 3]]]]}
+        assert store.load(99) is None
+
+        store.save(2, {"iteration": 2})
+        os.utime(store.path(1), (0, 0))
+        store.save(3, {"iteration": 3})
+        assert not store.exists(1) and store.exists(2) and store.exists(3)
+        assert sorted(os.listdir(tmp_path)) == ["run_2.ckpt", "run_3.ckpt"]
+        assert store.delete(2) and not store.delete(2)
+
+
+class TestSolverResume:
+    """Solvers continue from the checkpointed search state"""
+
+    def test_simulated_annealing_resumes_chain(self):
+        saved = []
+        first = SimulatedAnnealingScheduler(SAConfig(max_iterations=40))
+        first.initialize(_data())
+        control = SolverControl(checkpoint_interval=0.0, on_checkpoint=saved.append)
+        first.current_state = first.build_initial_solution()
+        checkpoint = first._checkpoint_state(12.5, 40)
+        control.checkpoint(checkpoint, force=True)
+
+        resumed = SimulatedAnnealingScheduler(SAConfig(max_iterations=40))
+        resumed.initialize(_data())
+        temperature = resumed._restore_checkpoint(SolverControl(resume_state=saved[-1]))
+        assert temperature == 12.5
+        assert pack_solution(resumed.current_state.assignments, None)[1] == checkpoint["current"][1]
+
+        other = SimulatedAnnealingScheduler(SAConfig(max_iterations=40))
+        other.initialize(_data(projects=13))
+        assert other._restore_checkpoint(SolverControl(resume_state=saved[-1])) is None
+
+    def test_pheromone_matrix_round_trip(self):
+        config = ACOConfig()
+        config.class_count = 3
+        projects = [ACOProject(id=p, title="", type="ara", ps_id=1) for p in (1, 2)]
+        instructors = [ACOInstructor(id=i, name="", type="instructor") for i in (1, 2)]
+        source = PheromoneMatrix(projects, instructors, config)
+        source.project_class_pheromone[2][1] = 4.25
+        source.project_jury_pheromone[1][2] = 0.5
+
+        target = PheromoneMatrix(projects + [ACOProject(id=3, title="", type="ara", ps_id=2)], instructors, config)
+        target.load_state(source.to_state())
+        assert target.project_class_pheromone[2][1] == 4.25
+        assert target.project_jury_pheromone[1][2] == 0.5
+        assert target.project_class_pheromone[3][0] == config.initial_pheromone
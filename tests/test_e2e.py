@@ -68,9 +68,13 @@ class TestE2E:
         # Should return 200 or 422 (validation error)
         assert response.status_code in [200, 422]
         
-        # 7. Get metrics
+        # 7. Get metrics (Prometheus text) and the JSON summary
         response = client.get("/metrics")
         assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "http_request_duration_seconds" in response.text
+        response = client.get("/metrics/summary")
+        assert response.status_code == 200
         metrics = response.json()
         assert "data" in metrics
     
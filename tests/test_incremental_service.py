@@ -0,0 +1,121 @@
+"""
+Test suite for incremental re-optimization of the persisted schedule.
+"""
+
+from collections import Counter
+
+from app.services.incremental_service import (
+    CHANGE_ADDED, CHANGE_JURY, CHANGE_MOVED, CHANGE_REMOVED, MAX_TIME_LIMIT_SECONDS, ChangeSet,
+    IncrementalRepairer, clamp_time_limit
+)
+
+CLASSROOMS = 8
+SLOTS = 30
+FACULTY = 40
+
+
+def _instance(projects=200):
+    """Cakismasiz bir kalici cizelge: her slotta 8 proje, PS/J1 slot icinde farkli."""
+    data = {
+        "projects": [], "instructors": [{"id": i, "type": "instructor"} for i in range(1, FACULTY + 1)],
+        "classrooms": [{"id": 100 + c} for c in range(CLASSROOMS + 1)],
+        "timeslots": [{"id": 500 + s, "start_time": f"{8 + s // 2:02d}:{30 * (s % 2):02d}"} for s in range(SLOTS)],
+    }
+    schedule = []
+    for p in range(1, projects + 1):
+        slot, room = divmod(p - 1, CLASSROOMS)
+        ps = 1 + (slot * 16 + 2 * room) % FACULTY
+        j1 = 1 + (slot * 16 + 2 * room + 1) % FACULTY
+        data["projects"].append({"id": p, "responsible_instructor_id": ps})
+        schedule.append({
+            "project_id": p, "classroom_id": 100 + room, "timeslot_id": 500 + slot,
+            "instructors": [ps, j1, {"id": -1, "is_placeholder": True}],
+        })
+    return schedule, data
+
+
+def _assert_feasible(result, changes):
+    cells = Counter((e["classroom_id"], e["timeslot_id"]) for e in result["schedule"])
+    assert max(cells.values()) == 1
+    duties = Counter()
+    for entry in result["schedule"]:
+        for member in entry["instructors"]:
+            member = member.get("id") if isinstance(member, dict) else member
+            if member and member > 0:
+                duties[(member, entry["timeslot_id"])] += 1
+                blocked = changes.blocked_instructors.get(member, ())
+                assert blocked is not None and entry["timeslot_id"] not in blocked
+    assert max(duties.values()) == 1
+
+
+class TestChangeSet:
+    """Payload parsing"""
+
+    def test_both_blocked_formats(self):
+        first = ChangeSet.from_payload({"blocked_instructors": {"3": [501, 502]}, "added_projects": ["7"]})
+        second = ChangeSet.from_payload({"blocked_instructors": [{"instructor_id": 3, "timeslot_ids": [501, 502]}]})
+        assert first.blocked_instructors == second.blocked_instructors == {3: {501, 502}}
+        assert first.added_projects == [7]
+        assert ChangeSet.from_payload({"blocked_instructors": {"4": []}}).blocked_instructors == {4: None}
+        assert ChangeSet.from_payload(None).is_empty()
+
+    def test_invalid_payload(self):
+        for payload in ({"removed_projects": "5"}, {"blocked_instructors": [{"timeslot_ids": [1]}]}):
+            try:
+                ChangeSet.from_payload(payload)
+            except ValueError:
+                continue
+            raise AssertionError(f"ValueError expected for {payload}")
+
+    def test_time_limit_is_clamped(self):
+        assert clamp_time_limit("2.5") == 2.5
+        assert clamp_time_limit(600) == MAX_TIME_LIMIT_SECONDS
+        for value in ("nan", float("inf"), 0, -1, "abc"):
+            try:
+                clamp_time_limit(value)
+            except ValueError:
+                continue
+            raise AssertionError(f"ValueError expected for {value!r}")
+
+
+class TestIncrementalRepairer:
+    """Local repair keeps the untouched part of the timetable stable"""
+
+    def test_blocked_jury_is_swapped_in_place(self):
+        schedule, data = _instance(40)
+        # Proje 1: PS=1, J1=2 (slot 500); 2 numara 500'de bloklu
+        changes = ChangeSet(blocked_instructors={2: {500}})
+        result = IncrementalRepairer(schedule, data, changes).repair()
+        assert [(d["project_id"], d["change"]) for d in result["diff"]] == [(1, CHANGE_JURY)]
+        assert result["diff"][0]["after"]["instructors"][0] == 1
+        assert result["diff"][0]["after"]["instructors"][2] == {"id": -1, "is_placeholder": True}
+        _assert_feasible(result, changes)
+
+    def test_blocked_supervisor_moves_project(self):
+        schedule, data = _instance(40)
+        changes = ChangeSet(blocked_instructors={1: None})
+        result = IncrementalRepairer(schedule, data, changes).repair()
+        moved = {d["project_id"] for d in result["diff"] if d["change"] == CHANGE_MOVED}
+        projects_of_1 = {e["project_id"] for e in schedule if 1 in e["instructors"][:2]}
+        assert result["unplaced"] == [] or set(result["unplaced"]) <= projects_of_1
+        assert moved <= projects_of_1
+        assert all(d["change"] in (CHANGE_MOVED, CHANGE_JURY) for d in result["diff"])
+
+    def test_mixed_changes_on_200_projects(self):
+        schedule, data = _instance(200)
+        data["projects"].append({"id": 201, "responsible_instructor_id": 5})
+        changes = ChangeSet(
+            added_projects=[201], removed_projects=[3],
+            blocked_instructors={7: {503, 504}}, removed_classrooms=[107],
+        )
+        result = IncrementalRepairer(schedule, data, changes).repair()
+        changes_by_kind = Counter(d["change"] for d in result["diff"])
+
+        assert result["unplaced"] == []
+        assert changes_by_kind[CHANGE_ADDED] == 1 and changes_by_kind[CHANGE_REMOVED] == 1
+        # Kaldirilan siniftaki 25 proje + bloklu PS projeleri disindakiler yerinde
+        assert changes_by_kind[CHANGE_MOVED] <= 25 + 2
+        assert result["stats"]["stability"] > 0.85
+        assert all(e["classroom_id"] != 107 for e in result["schedule"])
+        assert result["elapsed"] < 1.0
+        _assert_feasible(result, changes)
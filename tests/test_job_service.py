@@ -0,0 +1,95 @@
+"""
+Test suite for the background job layer on Celery.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.algorithms.anytime import SolverControl
+from app.core.cache import MockRedis
+from app.core.celery import celery_app
+from app.services import job_service
+from app.services.algorithm import AlgorithmService
+from app.services.job_service import (
+    JOB_CANCELLED, JOB_COMPLETED, JOB_QUEUED, JobStore, can_access_job, cancel_job, execute_job, submit_job
+)
+from app.tasks.algorithms import run_algorithm
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = JobStore(MockRedis())
+    monkeypatch.setattr(job_service, "job_store", store)
+    return store
+
+
+@pytest.fixture
+def fake_solver(monkeypatch):
+    calls = []
+
+    async def fake_run(algorithm_type, data=None, params=None, user_id=None, on_control=None, **kwargs):
+        control = SolverControl()
+        on_control(41, control)
+        control.on_progress({"fraction": 0.5, "iteration": 10, "best_cost": 3.0, "elapsed": 0.1})
+        calls.append((algorithm_type, params, control))
+        return {"status": "success", "schedule": []}, SimpleNamespace(id=41)
+
+    monkeypatch.setattr(AlgorithmService, "run_algorithm", staticmethod(fake_run))
+    return calls
+
+
+class TestJobSubmission:
+    """Queue routing, eager execution and cancellation"""
+
+    def test_eager_job_completes_with_run_reference(self, store, fake_solver, monkeypatch):
+        monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+        job = submit_job("simulated_annealing", params={"max_iterations": 5})
+
+        assert job["status"] == JOB_COMPLETED
+        assert job["run_id"] == 41 and job["progress"] == 100.0
+        assert job["iteration"] == 10 and job["best_cost"] == 3.0
+        assert fake_solver[0][:2] == ("simulated_annealing", {"max_iterations": 5})
+
+    def test_priority_routes_to_queue(self, store, monkeypatch):
+        sent = []
+        monkeypatch.setattr(run_algorithm, "apply_async", lambda **kwargs: sent.append(kwargs))
+        interactive = submit_job("genetic_algorithm")
+        batch = submit_job("genetic_algorithm", priority="batch")
+
+        assert interactive["status"] == JOB_QUEUED and interactive["queue"] == "algorithms"
+        assert [(s["queue"], s["priority"]) for s in sent] == [("algorithms", 0), ("algorithms_batch", 9)]
+        assert sent[1]["task_id"] == batch["job_id"]
+        with pytest.raises(ValueError):
+            submit_job("genetic_algorithm", priority="urgent")
+        with pytest.raises(ValueError):
+            submit_job("no_such_algorithm")
+
+    def test_default_worker_consumes_job_queues(self):
+        # -Q verilmeyen worker amqp.queues'daki tum kuyruklari dinler
+        consumed = set(celery_app.amqp.queues)
+        routed = {queue for queue, _ in job_service.PRIORITY_ROUTES.values()}
+        assert routed | {"reports", "default"} <= consumed
+        assert celery_app.conf.task_default_queue in consumed
+
+    def test_cancelled_queued_job_never_runs(self, store, fake_solver, monkeypatch):
+        monkeypatch.setattr(run_algorithm, "apply_async", lambda **kwargs: None)
+        monkeypatch.setattr(celery_app.control, "revoke", lambda job_id: None)
+        job = submit_job("genetic_algorithm")
+
+        assert cancel_job(job["job_id"])["status"] == JOB_CANCELLED
+        summary = asyncio.run(execute_job(job["job_id"], "genetic_algorithm", {}, {}))
+        assert summary == {"job_id": job["job_id"], "run_id": None, "status": JOB_CANCELLED}
+        assert fake_solver == []
+        assert cancel_job("missing") is None
+
+    def test_job_is_visible_to_submitter_only(self, store, monkeypatch):
+        monkeypatch.setattr(run_algorithm, "apply_async", lambda **kwargs: None)
+        job = submit_job("genetic_algorithm", user_id=5)
+
+        assert job["user_id"] == 5
+        assert can_access_job(job, SimpleNamespace(id=5, is_superuser=False))
+        assert not can_access_job(job, SimpleNamespace(id=6, is_superuser=False))
+        assert can_access_job(job, SimpleNamespace(id=6, is_superuser=True))
+        assert not can_access_job(dict(job, user_id=None), SimpleNamespace(id=5, is_superuser=False))
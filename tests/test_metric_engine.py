@@ -0,0 +1,125 @@
+"""
+Test suite for the shared metric engine and its scoring front ends.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from app.algorithms.fitness_helpers import FitnessMetrics
+from app.algorithms.metric_engine import ProblemIndex, role_violations
+from app.algorithms.standard_fitness import StandardFitnessScorer
+from app.services import performance_metrics
+
+
+SLOTS = [
+    {"id": 1, "start_time": "09:00", "end_time": "09:30"},
+    {"id": 2, "start_time": "09:30", "end_time": "10:00"},
+    {"id": 3, "start_time": "10:00", "end_time": "10:30"},
+    {"id": 4, "start_time": "16:30", "end_time": "17:00"},
+]
+PEOPLE = [{"id": 1, "type": "hoca"}, {"id": 2, "type": "hoca"}, {"id": 3, "type": "aras"}]
+PROJECTS = [{"id": 1, "type": "bitirme"}, {"id": 2, "type": "ara"}, {"id": 3, "type": "ara"}]
+CLASSES = [{"id": 10}, {"id": 11}]
+
+
+def _assignment(project_id, classroom_id, slot_id, responsible, *juries, project_type="ara"):
+    roles = [{"role": "SORUMLU", "person_id": responsible}] + [{"role": "JURI", "person_id": j} for j in juries]
+    return {"project_id": project_id, "classroom_id": classroom_id, "timeslot_id": slot_id,
+            "instructors": [responsible, *juries], "roles": roles, "project_type": project_type}
+
+
+ASSIGNMENTS = [
+    _assignment(1, 10, 1, 1, 2, project_type="bitirme"),
+    _assignment(2, 10, 3, 2),
+    _assignment(2, 11, 4, 1),
+    _assignment(3, 11, 2, 2, 2),
+]
+
+
+def _plan(assignments=ASSIGNMENTS):
+    # Her plan kendi kopyasini tasir (API'den gelen JSON gibi)
+    return {"slots": [dict(s) for s in SLOTS], "people": [dict(p) for p in PEOPLE],
+            "expected_projects": [dict(p) for p in PROJECTS], "classes": [dict(c) for c in CLASSES],
+            "assignments": assignments}
+
+
+class TestPlanStats:
+    """One pass collects the raw statistics every front end needs"""
+
+    def test_single_pass_counts(self):
+        index = ProblemIndex(PROJECTS, PEOPLE, CLASSES, SLOTS)
+        stats = index.stats(ASSIGNMENTS)
+
+        assert stats.count == 4 and stats.duplicate_extra == 1
+        assert stats.late_count == 1
+        assert stats.class_ordinals() == {10: [0, 2], 11: [1, 3]}
+        assert stats.instructor_loads == {1: 2, 2: 4}
+        assert stats.role_slots[2] == [(1, 10), (3, 10), (2, 11)]
+        assert stats.role_violations == sum(role_violations(a) for a in ASSIGNMENTS) == 2
+
+        light = index.stats(ASSIGNMENTS, roles=False, placements=False)
+        assert light.instructor_slots is None and light.role_loads is None
+        assert light.slot_usage == stats.slot_usage
+
+
+class TestComputeMany:
+    """Plans of one instance share an index and may be scored on an executor"""
+
+    def test_shared_index_and_executor(self, monkeypatch):
+        built = []
+        build_index = performance_metrics.build_index
+        monkeypatch.setattr(performance_metrics, "build_index", lambda plan: built.append(1) or build_index(plan))
+
+        other = _plan(ASSIGNMENTS[:2])
+        other["slots"] = SLOTS[:3]
+        plans = {"a": _plan(), "b": _plan(ASSIGNMENTS[:3]), "broken": None, "c": other}
+        sequential = performance_metrics.compute_many(plans)
+        assert len(built) == 2
+        assert sequential["byAlgorithm"]["broken"] == {"error": True}
+        assert sequential["byAlgorithm"]["a"] == performance_metrics.compute(_plan())
+        assert list(sequential["byAlgorithm"]) == ["a", "b", "broken", "c"]
+
+        monkeypatch.setattr(performance_metrics, "PARALLEL_MIN_ASSIGNMENTS", 0)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            assert performance_metrics.compute_many(plans, executor=executor) == sequential
+
+    def test_metric_executor_created_once_and_shut_down(self, monkeypatch):
+        created = []
+
+        class _Pool:
+            def __init__(self, max_workers):
+                created.append(self)
+                self.shut = False
+
+            def shutdown(self, wait=True, cancel_futures=False):
+                self.shut = True
+
+        monkeypatch.setattr(performance_metrics, "ProcessPoolExecutor", _Pool)
+        monkeypatch.setattr(performance_metrics.settings, "METRIC_WORKERS", 4)
+        monkeypatch.setattr(performance_metrics.os, "cpu_count", lambda: 4)
+        monkeypatch.setattr(performance_metrics, "_metric_executor", None)
+
+        with ThreadPoolExecutor(max_workers=8) as threads:
+            pools = set(threads.map(lambda _: performance_metrics.metric_executor(), range(32)))
+        assert len(created) == 1 and pools == {created[0]}
+        performance_metrics.shutdown_metric_executor()
+        assert created[0].shut and performance_metrics._metric_executor is None
+
+
+class TestFrontEnds:
+    """Fitness scorers read one PlanStats per evaluation"""
+
+    def test_components_share_stats(self, monkeypatch):
+        fitness = FitnessMetrics(PROJECTS, PEOPLE, CLASSES, SLOTS)
+        stats = fitness.stats(ASSIGNMENTS)
+        assert fitness.calculate_duplicate_penalty_score(ASSIGNMENTS, stats) == 0.0
+        assert fitness.calculate_late_slot_penalty_score(ASSIGNMENTS, stats) == 50.0
+        assert fitness.calculate_classroom_switch_score(ASSIGNMENTS, stats) == 90.0
+
+        scorer = StandardFitnessScorer(PROJECTS, PEOPLE, CLASSES, SLOTS)
+        calls = []
+        original = scorer.stats
+        monkeypatch.setattr(scorer, "stats", lambda assignments: calls.append(1) or original(assignments))
+        result = scorer.calculate_total_fitness(ASSIGNMENTS)
+        assert len(calls) == 1
+        assert result["components"]["coverage"] == 100.0
+        assert result["components"]["early_slot_bonus"] == 50.0
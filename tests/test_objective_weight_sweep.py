@@ -0,0 +1,68 @@
+"""
+Test suite for vectorized objective-weight scenario evaluation
+"""
+
+import numpy as np
+import pytest
+
+from app.services.objective_weights_service import ObjectiveWeightsService
+
+
+GOOD = {"load_balance": 0.1, "classroom_changes": 5, "time_efficiency": 0.9,
+        "session_minimization": 10, "rule_compliance": 0}
+BALANCED = {"load_balance": 0.4, "classroom_changes": 20, "time_efficiency": 0.7,
+            "session_minimization": 30, "rule_compliance": 2}
+POOR = {"load_balance": 0.8, "classroom_changes": 60, "time_efficiency": 0.3,
+        "session_minimization": 70, "rule_compliance": 10}
+
+
+class TestObjectiveWeightSweep:
+    """Batch scoring and rank stability"""
+
+    @pytest.fixture
+    def weights_service(self):
+        return ObjectiveWeightsService()
+
+    def test_grid_lies_on_simplex(self, weights_service):
+        grid = weights_service.generate_weight_grid(0.25)
+        # C(4 + 5 - 1, 5 - 1) = 70 kombinasyon
+        assert grid.shape == (70, 5)
+        assert np.allclose(grid.sum(axis=1), 1.0)
+        assert grid.min() >= 0
+
+    def test_oversized_grid_rejected_before_enumeration(self, weights_service, monkeypatch):
+        from app.services import objective_weights_service as module
+        monkeypatch.setattr(module, "combinations", lambda *a: pytest.fail("grid enumerated"))
+        # step=0.001 -> ~4e10 senaryo; boyut hesaplanip hemen reddedilir
+        with pytest.raises(ValueError, match="scenarios"):
+            weights_service.generate_weight_grid(0.001)
+        with pytest.raises(ValueError):
+            weights_service.generate_weight_grid(0)
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_scalar_score(self, weights_service):
+        scenarios = [{"load_balance": 0.5, "classroom_changes": 0.5},
+                     {"time_efficiency": 0.2, "rule_compliance": 0.8}]
+        comparison = await weights_service.compare_weight_scenarios(BALANCED, scenarios)
+        for scenario in comparison["scenarios"]:
+            scalar = await weights_service.calculate_weighted_score(BALANCED, scenario["weights"])
+            assert scenario["total_score"] == scalar["total_weighted_score"]
+
+    @pytest.mark.asyncio
+    async def test_monte_carlo_rank_stability(self, weights_service):
+        result = await weights_service.analyze_weight_sweep(
+            {"good": GOOD, "balanced": BALANCED, "poor": POOR}, samples=3000, seed=7
+        )
+
+        assert result["success"] is True
+        assert result["scenario_count"] == 3000
+        assert result["rank_stability"]["baseline_winner"] == "good"
+        assert result["rank_stability"]["winner_stability"] == 1.0
+        assert result["candidates"]["poor"]["rank_range"] == [3, 3]
+        assert result["rank_stability"]["mean_kendall_tau"] == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_invalid_candidate_is_rejected(self, weights_service):
+        result = await weights_service.analyze_weight_sweep({"bad": {"load_balance": 5.0}})
+        assert result["success"] is False
+        assert result["errors"]
@@ -0,0 +1,160 @@
+"""
+Test suite for algorithm portfolio racing.
+"""
+
+import asyncio
+import time
+
+from app.services import portfolio_service
+from app.services.portfolio_service import STATUS_COMPLETED, STATUS_PARTIAL, STATUS_TIMED_OUT, PortfolioRacer
+
+
+def _data():
+    return {
+        "projects": [{"id": 1, "type": "ara"}, {"id": 2, "type": "bitirme"}],
+        "instructors": [{"id": 10, "type": "instructor"}, {"id": 11, "type": "instructor"}],
+        "classrooms": [{"id": 1}],
+        "timeslots": [
+            {"id": 1, "start_time": "09:00", "end_time": "09:30"},
+            {"id": 2, "start_time": "09:30", "end_time": "10:00"},
+        ],
+    }
+
+
+def _assignment(project_id, timeslot_id):
+    return {"project_id": project_id, "classroom_id": 1, "timeslot_id": timeslot_id, "instructors": [10, 11]}
+
+
+class _FakeAlgorithm:
+    def __init__(self, behaviour):
+        self.behaviour = behaviour
+        self.control = None
+        self.timeslots = _data()["timeslots"]
+        self.classrooms = _data()["classrooms"]
+
+    def set_control(self, control):
+        self.control = control
+
+    def get_name(self):
+        return self.behaviour
+
+    def execute(self, data):
+        if self.behaviour == "full":
+            return {"schedule": [_assignment(1, 1), _assignment(2, 2)], "status": "completed"}
+        if self.behaviour == "half":
+            return {"schedule": [_assignment(1, 1)], "status": "completed"}
+        # "stubborn": best-so-far yayinlar ama deadline'i dinlemez
+        self.control.publish([_assignment(2, 1)], cost=5.0, force=True)
+        time.sleep(1.5)
+        return {"schedule": [_assignment(2, 1)], "status": "completed"}
+
+
+class _FakeFactory:
+    behaviours = {"greedy": "half", "hungarian": "full", "simulated_annealing": "stubborn"}
+
+    def create_algorithm(self, algorithm_name, params=None):
+        return _FakeAlgorithm(self.behaviours[algorithm_name])
+
+
+class TestPortfolioRacer:
+    """Shared deadline, common scoring and per-algorithm table"""
+
+    def test_best_schedule_wins_and_stragglers_are_cut(self, monkeypatch):
+        monkeypatch.setattr(portfolio_service, "AlgorithmFactory", _FakeFactory)
+        racer = PortfolioRacer(["greedy", "hungarian", "simulated_annealing"],
+                               deadline_seconds=1.0, grace_seconds=0.1)
+        race = asyncio.run(racer.race(_data()))
+
+        rows = {row["algorithm"]: row for row in race["table"]}
+        assert race["winner"] == "hungarian"
+        assert rows["hungarian"]["status"] == STATUS_COMPLETED
+        assert rows["hungarian"]["score"] > rows["greedy"]["score"]
+        assert rows["simulated_annealing"]["status"] == STATUS_PARTIAL
+        assert rows["simulated_annealing"]["stop_reason"] == "deadline"
+        assert race["table"][0]["algorithm"] == "hungarian"
+        assert race["elapsed"] < 1.5
+
+    def test_scoring_runs_off_the_event_loop(self, monkeypatch):
+        import threading
+
+        monkeypatch.setattr(portfolio_service, "AlgorithmFactory", _FakeFactory)
+        scored_on = []
+        score = PortfolioRacer._score
+        monkeypatch.setattr(PortfolioRacer, "_score",
+                            lambda self, *a: scored_on.append(threading.get_ident()) or score(self, *a))
+        racer = PortfolioRacer(["greedy", "hungarian"], deadline_seconds=1.0, grace_seconds=0.1)
+        race = asyncio.run(racer.race(_data()))
+
+        assert race["winner"] == "hungarian"
+        assert len(scored_on) == 2 and threading.get_ident() not in scored_on
+
+    def test_unknown_algorithm_is_rejected(self):
+        try:
+            PortfolioRacer(["not_an_algorithm"])
+        except ValueError:
+            return
+        raise AssertionError("ValueError expected")
+
+    def test_timed_out_without_snapshot(self, monkeypatch):
+        class _SilentAlgorithm(_FakeAlgorithm):
+            def execute(self, data):
+                time.sleep(1.5)
+                return {"schedule": [_assignment(1, 1)]}
+
+        class _SilentFactory:
+            def create_algorithm(self, algorithm_name, params=None):
+                return _SilentAlgorithm("silent")
+
+        monkeypatch.setattr(portfolio_service, "AlgorithmFactory", _SilentFactory)
+        race = asyncio.run(PortfolioRacer(["greedy"], deadline_seconds=1.0, grace_seconds=0.1).race(_data()))
+        assert race["winner"] is None
+        assert race["table"][0]["status"] == STATUS_TIMED_OUT
+
+    def test_native_solver_threads_stop_at_deadline(self, monkeypatch):
+        import pytest
+
+        pytest.importorskip("ortools")
+        from app.algorithms.comprehensive_optimizer import ComprehensiveOptimizer
+        from app.algorithms.cp_sat import CPSATConfig, solve_with_cp_sat
+        from app.services.algorithm import AlgorithmService
+        from tests.test_anytime_solver import _sample_data
+
+        class _CpSat(_FakeAlgorithm):
+            def execute(self, data):
+                return solve_with_cp_sat(data, CPSATConfig(max_time_seconds=60))
+
+        class _Comprehensive(ComprehensiveOptimizer):
+            def execute(self, data):
+                # Kosu suresi kontrol olmadan ~3 sn; yonlendirme katmanini atla
+                self.initialize(data)
+                return self.optimize(data)
+
+        class _NativeFactory:
+            def create_algorithm(self, algorithm_name, params=None):
+                if algorithm_name == "cp_sat":
+                    return _CpSat("cp_sat")
+                return _Comprehensive(params)
+
+        finished = {}
+        run_solver = AlgorithmService._run_solver
+
+        def tracked(algorithm, data, sampler=None):
+            try:
+                return run_solver(algorithm, data, sampler)
+            finally:
+                finished[algorithm.get_name()] = time.monotonic()
+
+        monkeypatch.setattr(portfolio_service, "AlgorithmFactory", _NativeFactory)
+        monkeypatch.setattr(AlgorithmService, "_run_solver", staticmethod(tracked))
+
+        async def scenario():
+            started = time.monotonic()
+            racer = PortfolioRacer(["cp_sat", "comprehensive_optimizer"], deadline_seconds=1.0, grace_seconds=0.1)
+            await racer.race(_sample_data(40))
+            while len(finished) < 2 and time.monotonic() - started < 10:
+                await asyncio.sleep(0.05)
+            return started
+
+        started = asyncio.run(scenario())
+        assert len(finished) == 2
+        assert all(at - started < 2.5 for at in finished.values())
@@ -0,0 +1,105 @@
+"""
+Test suite for the Prometheus /metrics exposition.
+"""
+
+import os
+import subprocess
+import sys
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import CollectorRegistry, REGISTRY, multiprocess
+from sqlalchemy import create_engine, text
+
+from app.api.middleware import MetricsMiddleware
+from app.monitoring import prometheus
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _sample(name, labels, registry=REGISTRY):
+    return registry.get_sample_value(name, labels) or 0.0
+
+
+class _FakePipeline:
+    def __init__(self, lists):
+        self.lists = lists
+        self.calls = []
+
+    def llen(self, name):
+        self.calls.append(name)
+
+    def execute(self):
+        return [len(self.lists.get(name, [])) for name in self.calls]
+
+
+class _FakeRedis:
+    def __init__(self, lists):
+        self.lists = lists
+
+    def pipeline(self):
+        return _FakePipeline(self.lists)
+
+
+class TestRequestMetrics:
+    """Latency histograms are labelled by route template"""
+
+    def test_route_template_label(self):
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/items/{item_id}")
+        def read_item(item_id: int):
+            return {"id": item_id}
+
+        labels = {"method": "GET", "route": "/items/{item_id}", "status": "200"}
+        before = _sample("http_request_duration_seconds_count", labels)
+        client = TestClient(app)
+        assert client.get("/items/1").status_code == 200
+        assert client.get("/items/2").status_code == 200
+        assert client.get("/missing").status_code == 404
+        assert _sample("http_request_duration_seconds_count", labels) == before + 2
+        assert _sample("http_request_duration_seconds_count",
+                       {"method": "GET", "route": "unmatched", "status": "404"}) >= 1
+
+
+class TestCollectors:
+    """DB query timings and queue depth"""
+
+    def test_engine_query_timings(self):
+        engine = create_engine("sqlite://")
+        prometheus.instrument_engine(engine)
+        prometheus.instrument_engine(engine)
+        before = _sample("db_query_duration_seconds_count", {"operation": "SELECT"})
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        assert _sample("db_query_duration_seconds_count", {"operation": "SELECT"}) == before + 1
+
+    def test_queue_depth_sums_priority_lists(self):
+        lists = {"algorithms": [1, 2], "algorithms:9": [3], "reports": [4]}
+        collector = prometheus.QueueDepthCollector(client=_FakeRedis(lists), queues=("algorithms", "reports"))
+        registry = CollectorRegistry()
+        registry.register(collector)
+        assert registry.get_sample_value("celery_queue_depth", {"queue": "algorithms"}) == 3
+        assert registry.get_sample_value("celery_queue_depth", {"queue": "reports"}) == 1
+
+
+class TestMultiprocess:
+    """Counters written by separate worker processes are aggregated"""
+
+    def test_aggregates_across_processes(self, tmp_path):
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path), PYTHONPATH=ROOT)
+        script = (
+            "from app.monitoring import prometheus as p\n"
+            "p.count_cache_lookup('result', True)\n"
+            "p.observe_solver_run('simplex', 6, 'success', 1.5)\n"
+        )
+        for _ in range(2):
+            subprocess.run([sys.executable, "-c", script], env=env, cwd=ROOT, check=True)
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=str(tmp_path))
+        assert registry.get_sample_value("cache_requests_total", {"cache": "result", "result": "hit"}) == 2
+        assert registry.get_sample_value(
+            "solver_run_duration_seconds_count", {"algorithm": "simplex", "classrooms": "6", "status": "success"}
+        ) == 2
@@ -0,0 +1,63 @@
+"""
+Test suite for per-run resource profiles.
+"""
+
+import time
+
+from app.algorithms.anytime import SolverControl, use_control
+from app.algorithms.resource_profile import PHASE_REPAIR, RunProfile, phase, profiled
+from app.services.algorithm import AlgorithmService
+
+
+@profiled(PHASE_REPAIR)
+def _repair(seconds):
+    time.sleep(seconds)
+    return "repaired"
+
+
+class TestRunProfile:
+    """Phase timings exclude nested phases"""
+
+    def test_nested_phases_are_exclusive(self):
+        profile = RunProfile(sample_interval=0)
+        with profile.phase("optimize"):
+            time.sleep(0.01)
+            with profile.phase("repair"):
+                time.sleep(0.05)
+        profile.stop()
+        phases = profile.to_dict()["phases"]
+        assert phases["repair"]["calls"] == 1
+        assert phases["repair"]["wall_s"] >= 0.05
+        assert 0.01 <= phases["optimize"]["wall_s"] < phases["repair"]["wall_s"]
+
+    def test_decorator_uses_active_control(self):
+        assert _repair(0) == "repaired"
+        control = SolverControl()
+        control.profile = RunProfile(sample_interval=0)
+        with use_control(control):
+            _repair(0.001)
+            _repair(0.001)
+            with phase("validation"):
+                pass
+        assert control.profile.phases[PHASE_REPAIR]["calls"] == 2
+        assert control.profile.has_phase("validation")
+
+
+class TestProfileSummary:
+    """Counters from progress reports end up in the stored profile"""
+
+    def test_evaluations_and_final_cost(self):
+        control = SolverControl()
+        control.report_progress(4, best_cost=12.0, evaluations=250)
+        control.report_progress(9, best_cost=10.0)
+        profile = RunProfile(sample_interval=0.01).start()
+        with profile.phase("optimize"):
+            time.sleep(0.02)
+        profile.stop()
+
+        summary = AlgorithmService._resource_profile(profile, control, {"cost": 10.0})
+        assert summary["iterations"] == 10 and summary["evaluations"] == 250
+        assert summary["evaluations_per_sec"] > 0
+        assert summary["final_cost"] == 10.0
+        assert summary["peak_rss_mb"] >= summary["rss_start_mb"]
+        assert AlgorithmService._resource_profile(profile, SolverControl(), {"cost": float("inf")})["final_cost"] is None
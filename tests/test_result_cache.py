@@ -0,0 +1,98 @@
+"""
+Test suite for the fingerprint-keyed algorithm result cache.
+"""
+
+import asyncio
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.cache import MockRedisPool
+from app.models.classroom import Classroom
+from app.services import result_cache as result_cache_module
+from app.services.cache_service import cache_service
+from app.services.result_cache import ResultCache, is_cacheable_result, result_fingerprint
+
+
+def _result():
+    return {"status": "completed", "schedule": [{"project_id": 1, "classroom_id": 1, "timeslot_id": 1}]}
+
+
+class TestFingerprint:
+    """Cache keys depend on input, algorithm and normalized params"""
+
+    def test_stochastic_requires_seed(self):
+        assert result_fingerprint("genetic_algorithm", "abc", {"population_size": 50}) is None
+        assert result_fingerprint("genetic_algorithm", "abc", {"random_seed": 7}) is not None
+        assert result_fingerprint("hungarian", "abc", None) is not None
+        assert result_fingerprint("hungarian", None, None) is None
+
+    def test_params_are_normalized(self):
+        base = result_fingerprint("greedy", "abc", {"seed": 1, "alpha": 1.0, "beta": None})
+        assert base == result_fingerprint("greedy", "abc", {"alpha": 1, "seed": 1, "use_cache": True})
+        assert base != result_fingerprint("greedy", "abc", {"seed": 2, "alpha": 1})
+        assert base != result_fingerprint("greedy", "abd", {"seed": 1, "alpha": 1})
+
+    def test_interrupted_results_are_not_cacheable(self):
+        assert is_cacheable_result(_result())
+        assert not is_cacheable_result({**_result(), "anytime": {"stop_reason": "deadline"}})
+        assert not is_cacheable_result({"status": "completed", "schedule": []})
+
+
+class TestResultCache:
+    """Memory and Redis tiers, and ORM-driven invalidation"""
+
+    def setup_method(self):
+        self._saved_client = cache_service.redis_client
+        cache_service.redis_client = MockRedisPool()
+
+    def teardown_method(self):
+        cache_service.redis_client = self._saved_client
+
+    def test_memory_then_redis_tier(self):
+        async def scenario():
+            cache = ResultCache(max_entries=2)
+            assert await cache.get("hungarian", "fp") is None
+            await cache.set("hungarian", "fp", {**_result(), "cache": {"hit": False}}, {"source_run_id": 5})
+
+            first, info = await cache.get("hungarian", "fp")
+            first["schedule"].clear()
+            second, _ = await cache.get("hungarian", "fp")
+
+            # Yeni surec: yerel katman bos, Redis'ten okunur
+            other = ResultCache()
+            from_redis, redis_info = await other.get("hungarian", "fp")
+            return info, second, from_redis, redis_info
+
+        info, second, from_redis, redis_info = asyncio.run(scenario())
+        assert info["tier"] == "memory" and info["source_run_id"] == 5
+        assert len(second["schedule"]) == 1
+        assert "cache" not in second
+        assert redis_info["tier"] == "redis"
+        assert from_redis == second
+
+    def test_commit_touching_watched_table_invalidates(self):
+        async def scenario():
+            engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+            async with engine.begin() as conn:
+                await conn.run_sync(lambda c: Classroom.__table__.create(c))
+            cache = result_cache_module.result_cache
+            try:
+                await cache.set("hungarian", "fp", _result())
+                async with AsyncSession(engine) as db:
+                    db.add(Classroom(name="D-101", capacity=30))
+                    await db.commit()
+                    after_insert = await cache.get("hungarian", "fp")
+
+                    await cache.set("hungarian", "fp", _result())
+                    await db.execute(delete(Classroom))
+                    await db.commit()
+                    await asyncio.sleep(0)
+                    after_bulk_delete = await cache.get("hungarian", "fp")
+                return after_insert, after_bulk_delete
+            finally:
+                await engine.dispose()
+
+        after_insert, after_bulk_delete = asyncio.run(scenario())
+        assert after_insert is None
+        assert after_bulk_delete is None
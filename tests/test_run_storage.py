@@ -0,0 +1,78 @@
+"""
+Test suite for normalized algorithm run storage.
+"""
+
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.models.algorithm import AlgorithmRun, AlgorithmType
+from app.models.input_snapshot import InputSnapshot
+from app.services.run_storage import (
+    content_hash,
+    dedupe_result,
+    load_run_input,
+    load_run_result,
+    restore_result,
+    store_input_snapshot,
+    store_run_result,
+)
+
+
+def _data():
+    return {
+        "projects": [{"id": 1, "type": "ara"}, {"id": 2, "type": "bitirme"}],
+        "timeslots": [{"id": 1, "start_time": "09:00"}],
+    }
+
+
+class TestResultDedup:
+    """Pure helpers for content hashing and result de-duplication"""
+
+    def test_content_hash_ignores_key_order(self):
+        assert content_hash({"a": 1, "b": [1, 2]}) == content_hash({"b": [1, 2], "a": 1})
+
+    def test_dedupe_roundtrip(self):
+        schedule = [{"project_id": 1, "timeslot_id": 1}]
+        result = {"schedule": schedule, "assignments": list(schedule), "solution": [], "cost": 3}
+        deduped = dedupe_result(result)
+        assert deduped["assignments"] == {"$ref": "schedule"}
+        assert restore_result(deduped) == result
+
+
+class TestRunStorage:
+    """Snapshots are stored once and results are compressed"""
+
+    def test_store_and_load(self):
+        async def scenario():
+            engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+            async with engine.begin() as conn:
+                await conn.run_sync(lambda c: InputSnapshot.__table__.create(c))
+                await conn.run_sync(lambda c: AlgorithmRun.__table__.create(c))
+            try:
+                async with AsyncSession(engine) as db:
+                    first = await store_input_snapshot(db, _data())
+                    second = await store_input_snapshot(db, _data())
+                    run = AlgorithmRun(algorithm_type=AlgorithmType.GREEDY, input_hash=first)
+                    db.add(run)
+                    await db.commit()
+                    await db.refresh(run)
+
+                    result = {"schedule": [{"project_id": 1}] * 50, "assignments": [{"project_id": 1}] * 50}
+                    sizes = await store_run_result(db, run.id, result)
+                    await db.commit()
+
+                    run = (await db.execute(select(AlgorithmRun))).scalar_one()
+                    snapshots = (await db.execute(select(InputSnapshot))).scalars().all()
+                    return (first, second, len(snapshots), sizes,
+                            await load_run_result(db, run), await load_run_input(db, run), result)
+            finally:
+                await engine.dispose()
+
+        first, second, snapshot_count, sizes, loaded, loaded_input, result = asyncio.run(scenario())
+        assert first == second
+        assert snapshot_count == 1
+        assert sizes["stored_bytes"] < sizes["raw_bytes"]
+        assert loaded == result
+        assert loaded_input == _data()
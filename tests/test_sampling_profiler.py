@@ -0,0 +1,60 @@
+"""
+Test suite for the on-demand sampling profiler.
+"""
+
+import asyncio
+import time
+
+from app.algorithms.anytime import SolverControl
+from app.monitoring.sampling_profiler import SamplingProfiler, collapsed_from_dict
+from app.services.algorithm import AlgorithmService
+from app.services.profile_store import ProfileStore
+
+
+def _hot_loop(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+class _BusySolver:
+    def execute(self, data):
+        _hot_loop(data["seconds"])
+        return {"status": "completed", "schedule": []}
+
+
+class TestSamplingProfiler:
+    """Samples the target thread and reports hot functions"""
+
+    def test_collapsed_stacks_and_top(self):
+        with SamplingProfiler(interval=0.002) as profiler:
+            _hot_loop(0.3)
+        assert profiler.samples > 10
+        top = profiler.top(5)
+        assert any(entry["function"].endswith(":_hot_loop") for entry in top)
+        assert all(0 <= entry["self_pct"] <= entry["total_pct"] <= 100 for entry in top)
+
+        line = profiler.collapsed().splitlines()[0]
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0 and ";" in stack
+        assert collapsed_from_dict(profiler.to_dict()) == profiler.collapsed()
+
+    def test_solver_thread_is_profiled_and_stored(self, tmp_path, monkeypatch):
+        store = ProfileStore(str(tmp_path), max_files=5)
+        monkeypatch.setattr("app.services.algorithm.profile_store", store)
+        sampler = SamplingProfiler(interval=0.002)
+
+        async def run():
+            result = await AlgorithmService._execute_with_control(
+                _BusySolver(), {"seconds": 0.2}, SolverControl(), {}, sampler=sampler
+            )
+            return result, await AlgorithmService._store_profile(7, sampler)
+
+        result, summary = asyncio.run(run())
+        assert result["status"] == "completed"
+        assert summary["stored"] and summary["download"].endswith("/algorithms/results/7/profile")
+        assert any(":_hot_loop" in entry["function"] for entry in summary["top"])
+        assert store.load(7)["samples"] == summary["samples"] > 0
+        assert store.path(7).endswith("run_7.prof")
@@ -0,0 +1,62 @@
+"""
+Test suite for diff-based schedule persistence.
+"""
+
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.models.schedule import Schedule
+from app.services.algorithm import AlgorithmService
+
+
+def _row(project_id, classroom_id, timeslot_id, instructors=None):
+    return {
+        "project_id": project_id,
+        "classroom_id": classroom_id,
+        "timeslot_id": timeslot_id,
+        "instructors": instructors or [1],
+    }
+
+
+async def _save_twice(first, second):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: Schedule.__table__.create(sync_conn))
+    try:
+        async with AsyncSession(engine) as db:
+            first_stats = await AlgorithmService._save_schedules_to_db(db, {"schedule": first})
+            second_stats = await AlgorithmService._save_schedules_to_db(db, {"schedule": second})
+            rows = (await db.execute(select(Schedule).order_by(Schedule.project_id))).scalars().all()
+            return first_stats, second_stats, [(r.project_id, r.classroom_id, r.timeslot_id) for r in rows]
+    finally:
+        await engine.dispose()
+
+
+class TestSaveSchedulesToDb:
+    """AlgorithmService._save_schedules_to_db writes only the diff"""
+
+    def test_diff_against_persisted_schedule(self):
+        first = [_row(1, 1, 1), _row(2, 1, 2), _row(3, 2, 1)]
+        second = [_row(1, 1, 1), _row(2, 2, 3), _row(4, 2, 2)]
+        first_stats, second_stats, rows = asyncio.run(_save_twice(first, second))
+
+        assert first_stats == {"inserted": 3, "updated": 0, "deleted": 0, "unchanged": 0}
+        assert second_stats == {"inserted": 1, "updated": 1, "deleted": 1, "unchanged": 1}
+        assert rows == [(1, 1, 1), (2, 2, 3), (4, 2, 2)]
+
+    def test_unchanged_schedule_writes_nothing(self):
+        schedule = [_row(1, 1, 1), _row(2, 1, 2)]
+        _, second_stats, rows = asyncio.run(_save_twice(schedule, [dict(r) for r in schedule]))
+
+        assert second_stats == {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 2}
+        assert len(rows) == 2
+
+    def test_duplicate_projects_keep_earliest_slot(self):
+        rows = AlgorithmService._extract_schedule_rows(
+            {"assignments": [_row(1, 2, 5), _row(1, 1, 3), _row("2", "1", "4"), {"project_id": 3}]}
+        )
+        assert rows[1]["timeslot_id"] == 3
+        assert rows[2]["classroom_id"] == 1
+        assert 3 not in rows
@@ -0,0 +1,86 @@
+"""
+Test suite for the staged service-level post-processing pipeline.
+"""
+
+from types import SimpleNamespace
+
+from app.services.schedule_postprocessing import (
+    PostProcessingPipeline,
+    PostProcessingStage,
+    remove_late_assignments,
+)
+from app.algorithms.timeslot_calendar import get_calendar
+
+
+def _algorithm():
+    timeslots = [
+        {"id": 1, "start_time": "09:00", "end_time": "09:30"},
+        {"id": 2, "start_time": "09:30", "end_time": "10:00"},
+        {"id": 3, "start_time": "16:00", "end_time": "16:30"},
+        {"id": 4, "start_time": "16:30", "end_time": "17:00"},
+    ]
+    classrooms = [{"id": 1}, {"id": 2}]
+    return SimpleNamespace(timeslots=timeslots, classrooms=classrooms)
+
+
+def _schedule():
+    return [
+        {"project_id": 1, "classroom_id": 1, "timeslot_id": 1, "instructors": [10]},
+        {"project_id": 2, "classroom_id": 1, "timeslot_id": 4, "instructors": [11]},
+        {"project_id": 3, "classroom_id": 2, "timeslot_id": 3, "instructors": [10]},
+    ]
+
+
+class TestPostProcessingPipeline:
+    """Unit tests for PostProcessingPipeline"""
+
+    def test_aliased_lists_processed_once(self):
+        schedule = _schedule()
+        result = {"schedule": schedule, "assignments": schedule, "solution": []}
+        pipeline = PostProcessingPipeline(_algorithm())
+        report = pipeline.run(result)
+
+        assert list(report["lists"]) == ["schedule+assignments"]
+        assert report["stages"]["late_removal"]["moves"] == 1
+        assert all(a["timeslot_id"] != 4 for a in schedule)
+        # Ikinci pass'te yalnizca degisiklikten etkilenen asamalar calisir
+        assert sum(stats["skipped"] for stats in report["stages"].values()) >= 1
+
+    def test_unchanged_stages_are_skipped(self):
+        calls = []
+
+        def noop(lst, ctx):
+            calls.append(len(lst))
+
+        def move_once(lst, ctx):
+            if lst[0]["timeslot_id"] != 2:
+                lst[0]["timeslot_id"] = 2
+
+        stages = [PostProcessingStage("noop", noop), PostProcessingStage("move", move_once)]
+        pipeline = PostProcessingPipeline(_algorithm(), stages=stages)
+        report = pipeline.run({"schedule": _schedule()})
+
+        assert report["stages"]["move"]["runs"] == 1
+        assert report["stages"]["move"]["moves"] == 1
+        assert len(calls) == 2
+        assert report["lists"]["schedule"] == 2
+
+    def test_stage_errors_are_recorded(self):
+        def broken(lst, ctx):
+            raise ValueError("boom")
+
+        pipeline = PostProcessingPipeline(_algorithm(), stages=[PostProcessingStage("broken", broken)])
+        report = pipeline.run({"schedule": _schedule()})
+
+        assert report["stages"]["broken"]["errors"] == 1
+        assert "boom" in report["stages"]["broken"]["last_error"]
+
+    def test_remove_late_flags_when_no_room(self):
+        algorithm = _algorithm()
+        calendar = get_calendar(algorithm.timeslots)
+        schedule = [
+            {"project_id": p, "classroom_id": 1, "timeslot_id": t, "instructors": [10]}
+            for p, t in ((1, 1), (2, 2), (3, 3), (4, 4))
+        ]
+        assert remove_late_assignments(schedule, calendar, [{"id": 1}]) == 0
+        assert schedule[3]["late_penalized"] is True
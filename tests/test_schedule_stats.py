@@ -0,0 +1,90 @@
+"""
+Test suite for SQL-side schedule aggregation used by scoring and charts.
+"""
+
+import asyncio
+from datetime import time
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import app.models  # noqa: F401  (iliskili mapper'lar)
+from app.models.instructor import Instructor
+from app.models.project import Project, ProjectType
+from app.models.schedule import Schedule
+from app.models.timeslot import SessionType, TimeSlot
+from app.services import schedule_stats
+from app.services.chart_generator_service import ChartGeneratorService
+from app.services.scoring import ScoringService
+
+
+LOADS = {1: 5, 2: 3, 3: 0, 4: 8}
+SLOTS = [(1, time(9, 0), time(9, 30)), (2, time(9, 30), time(10, 0)), (3, time(13, 0), time(13, 30))]
+# (schedule id, project id, timeslot id); proje i'nin sorumlusu (i % 2) + 1
+SCHEDULES = [(1, 1, 1), (2, 2, 1), (3, 3, 2), (4, 4, 1)]
+
+
+async def _with_db(check):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    tables = [model.__table__ for model in (Instructor, Project, TimeSlot, Schedule)]
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: [table.create(sync_conn) for table in tables])
+    try:
+        async with AsyncSession(engine) as db:
+            db.add_all([Instructor(id=iid, name=f"Hoca {iid}", type="instructor", total_load=load,
+                                   bitirme_count=load, ara_count=0) for iid, load in LOADS.items()])
+            db.add_all([TimeSlot(id=sid, start_time=start, end_time=end, session_type=SessionType.MORNING)
+                        for sid, start, end in SLOTS])
+            db.add_all([Project(id=pid, title=f"P{pid}", type=ProjectType.FINAL,
+                                responsible_instructor_id=(pid % 2) + 1) for pid in range(1, 5)])
+            db.add_all([Schedule(id=sid, project_id=pid, classroom_id=1, timeslot_id=tid)
+                        for sid, pid, tid in SCHEDULES])
+            await db.commit()
+            return await check(db)
+    finally:
+        await engine.dispose()
+
+
+class TestScoringAggregates:
+    """Load statistics come from grouped SQL and match the Python formulas"""
+
+    def test_load_balance_gini_and_instructor_breakdown(self):
+        service = ScoringService()
+
+        async def check(db):
+            return (await service._calculate_load_balance_score(db, []),
+                    await service._calculate_gini_coefficient(db, []),
+                    await service._calculate_scores_by_instructor(db, []))
+
+        balance, gini, by_instructor = asyncio.run(_with_db(check))
+
+        loads = sorted(load for load in LOADS.values() if load > 0)
+        mean = sum(loads) / len(loads)
+        variance = sum((load - mean) ** 2 for load in loads) / len(loads)
+        assert balance["mean"] == pytest.approx(mean) and balance["variance"] == pytest.approx(variance)
+        assert (balance["min"], balance["max"]) == (3, 8)
+        assert balance["details"][3] == {"name": "Hoca 3", "type": "instructor", "bitirme_count": 0,
+                                         "ara_count": 0, "total_load": 0}
+        assert gini["loads"] == loads
+        assert gini["gini"] == pytest.approx(
+            sum(abs(a - b) for a in loads for b in loads) / (2 * len(loads) ** 2 * mean))
+        assert {iid: row["schedule_count"] for iid, row in by_instructor.items()} == {1: 2, 2: 2, 3: 0, 4: 0}
+
+
+class TestChartAggregates:
+    """Chart data is aggregated in SQL when a session is given"""
+
+    def test_timeslot_usage_and_density(self):
+        service = ChartGeneratorService()
+
+        async def check(db):
+            usage = await service._get_timeslot_usage_data(db)
+            return usage, await service._get_hourly_density_data(db, usage), await service._get_instructor_load_data(db)
+
+        usage, density, instructor_loads = asyncio.run(_with_db(check))
+
+        assert [(row["timeslot"], row["usage_count"]) for row in usage] == [
+            ("09:00-09:30", 3), ("09:30-10:00", 1), ("13:00-13:30", 0)]
+        assert density == {"09:00": 1.0, "09:30": 0.33, "13:00": 0.0}
+        assert [row["total_load"] for row in instructor_loads] == list(LOADS.values())
+        assert schedule_stats.gini_coefficient([4, 4]) == 0.0
@@ -0,0 +1,110 @@
+"""
+Test suite for single-flight coalescing of identical algorithm runs.
+"""
+
+import asyncio
+
+from app.core.cache import MockRedisPool
+from app.services import single_flight as single_flight_module
+from app.services.single_flight import SingleFlight, flight_key
+
+
+class TestFlightKey:
+    """Coalescing keys ignore ordering and non-semantic params"""
+
+    def test_key_is_canonical(self):
+        first = flight_key("greedy", {"projects": [1, 2], "timeslots": [3]}, {"a": 1.0, "use_cache": False})
+        second = flight_key("greedy", {"timeslots": [3], "projects": [1, 2]}, {"a": 1})
+        assert first == second
+        assert first != flight_key("hungarian", {"projects": [1, 2], "timeslots": [3]}, {"a": 1})
+        assert flight_key("greedy", {}, None) == flight_key("greedy", {"projects": []}, None)
+
+
+class TestSingleFlight:
+    """Leader election, joiners and cross-worker hand-off"""
+
+    def setup_method(self):
+        self._saved_interval = single_flight_module.POLL_INTERVAL_SECONDS
+        single_flight_module.POLL_INTERVAL_SECONDS = 0.01
+
+    def teardown_method(self):
+        single_flight_module.POLL_INTERVAL_SECONDS = self._saved_interval
+
+    def test_local_joiner_shares_leader_result(self):
+        async def scenario():
+            redis = MockRedisPool()
+            flights = SingleFlight(redis=redis)
+            leader, is_leader = await flights.begin("k", None)
+            joiner, joiner_is_leader = await flights.begin("k", None)
+            await flights.set_leader(leader, 11)
+            await flights.subscribe(joiner, 3, 12)
+            targets = await flights.progress_targets(leader)
+            await flights.finish(leader, result={"schedule": [1]})
+            return (is_leader, joiner_is_leader, joiner is leader, targets,
+                    await joiner.future, await redis.exists("optimization_planner:single_flight:k:lock"))
+
+        is_leader, joiner_is_leader, same, targets, result, locked = asyncio.run(scenario())
+        assert is_leader and not joiner_is_leader and same
+        assert targets == [(3, 12)]
+        assert result == {"schedule": [1]}
+        assert not locked
+
+    def test_remote_joiner_reads_leader_run(self):
+        async def scenario():
+            redis = MockRedisPool()
+            worker_a, worker_b = SingleFlight(redis=redis), SingleFlight(redis=redis)
+            loaded = []
+
+            async def load_result(run_id):
+                loaded.append(run_id)
+                return {"schedule": ["from run %s" % run_id]}
+
+            leader, _ = await worker_a.begin("k", load_result)
+            remote, is_leader = await worker_b.begin("k", load_result)
+            await worker_a.set_leader(leader, 21)
+            await worker_b.subscribe(remote, 4, 22)
+            targets = await worker_a.progress_targets(leader)
+            await worker_a.finish(leader, result={"schedule": ["local"]})
+            return is_leader, remote.remote, targets, await remote.future, loaded
+
+        is_leader, remote_flag, targets, result, loaded = asyncio.run(scenario())
+        assert not is_leader and remote_flag
+        assert targets == [(4, 22)]
+        assert result == {"schedule": ["from run 21"]}
+        assert loaded == [21]
+
+    def test_vanished_leader_releases_joiners(self):
+        async def scenario():
+            redis = MockRedisPool()
+            worker_a, worker_b = SingleFlight(redis=redis), SingleFlight(redis=redis)
+            leader, _ = await worker_a.begin("k", None)
+            remote, _ = await worker_b.begin("k", None)
+            await worker_a.finish(leader, error=RuntimeError("solver crashed"))
+            return await asyncio.wait_for(remote.future, 1.0)
+
+        assert asyncio.run(scenario()) is None
+
+    def test_joiner_ignores_previous_flight_result(self):
+        async def scenario():
+            redis = MockRedisPool()
+            worker_a, worker_b = SingleFlight(redis=redis), SingleFlight(redis=redis)
+
+            async def load_result(run_id):
+                return {"schedule": ["from run %s" % run_id]}
+
+            first, _ = await worker_a.begin("k", load_result)
+            await worker_a.set_leader(first, 31)
+            await worker_a.finish(first, result={"schedule": ["first"]})
+            stale_done = await redis.exists("optimization_planner:single_flight:k:done")
+
+            second, is_leader = await worker_a.begin("k", load_result)
+            remote, _ = await worker_b.begin("k", load_result)
+            await asyncio.sleep(0.05)
+            pending = not remote.future.done()
+            await worker_a.set_leader(second, 32)
+            await worker_a.finish(second, result={"schedule": ["second"]})
+            return stale_done, is_leader, pending, await asyncio.wait_for(remote.future, 1.0)
+
+        stale_done, is_leader, pending, result = asyncio.run(scenario())
+        assert stale_done and is_leader and pending
+        assert result == {"schedule": ["from run 32"]}
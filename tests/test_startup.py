@@ -0,0 +1,64 @@
+"""
+Test suite for concurrent startup steps and lazy reporting imports.
+"""
+
+import asyncio
+import subprocess
+import sys
+import time
+
+from app.core.startup import CeleryHealth, run_startup_steps
+
+
+class TestStartupSteps:
+    """Independent steps run concurrently and are bounded by their timeouts"""
+
+    def test_concurrent_with_timeouts(self):
+        async def slow():
+            await asyncio.sleep(0.2)
+            return "ready"
+
+        async def hang():
+            await asyncio.sleep(10)
+
+        async def broken():
+            raise RuntimeError("boom")
+
+        started = time.perf_counter()
+        outcome = asyncio.run(run_startup_steps({
+            "a": (slow, 1.0), "b": (slow, 1.0), "hang": (hang, 0.3), "broken": (broken, 1.0),
+        }))
+        assert time.perf_counter() - started < 0.6
+        assert outcome["a"]["ok"] and outcome["a"]["result"] == "ready"
+        assert not outcome["hang"]["ok"] and "timed out" in outcome["hang"]["error"]
+        assert outcome["broken"]["error"] == "boom"
+
+    def test_celery_health_never_blocks(self):
+        def ping(timeout):
+            time.sleep(0.3)
+            return [{"worker@host": {"ok": "pong"}}]
+
+        async def probe():
+            health = CeleryHealth(ping, ttl=60)
+            started = time.perf_counter()
+            first = health.status()
+            elapsed = time.perf_counter() - started
+            await health._refreshing
+            return first, elapsed, health.status()
+
+        first, elapsed, second = asyncio.run(probe())
+        assert first is None and elapsed < 0.1
+        assert second is True
+
+
+class TestLazyReporting:
+    """Importing the API does not load the reporting libraries"""
+
+    def test_app_import_skips_report_stacks(self):
+        heavy = ["reportlab", "matplotlib", "pandas", "openpyxl", "xlsxwriter", "PIL"]
+        code = (
+            "import sys, app.main\n"
+            f"print('loaded=' + ','.join(m for m in {heavy!r} if m in sys.modules))"
+        )
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert "loaded=" in proc.stdout.splitlines()
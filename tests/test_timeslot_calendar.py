@@ -0,0 +1,107 @@
+"""
+Test suite for the precomputed timeslot calendar.
+"""
+
+from datetime import time
+
+from app.algorithms.timeslot_calendar import (
+    LATE_SLOT_REWARD,
+    TimeslotCalendar,
+    get_calendar,
+    parse_minutes,
+)
+from app.algorithms.validator import detect_gaps, detect_late_slots
+from app.services import performance_metrics
+
+
+def _timeslots():
+    # Bilerek karisik sirada: takvim kronolojik siralamali
+    return [
+        {"id": 3, "start_time": "10:00", "end_time": "10:30"},
+        {"id": 1, "start_time": "09:00:00", "end_time": "09:30:00"},
+        {"id": 5, "start_time": "16:30", "end_time": "17:00"},
+        {"id": 2, "start_time": "09:30", "end_time": "10:00"},
+        {"id": 4, "start_time": "16:00", "end_time": "16:30"},
+    ]
+
+
+class TestTimeslotCalendar:
+    """Unit tests for TimeslotCalendar"""
+
+    def test_parse_minutes(self):
+        assert parse_minutes("09:30") == 570
+        assert parse_minutes("16:30:00") == 990
+        assert parse_minutes(time(13, 15)) == 795
+        assert parse_minutes("invalid") is None
+        assert parse_minutes(None) is None
+
+    def test_chronological_order_and_late_flags(self):
+        calendar = TimeslotCalendar(_timeslots())
+        assert calendar.ordered_ids == [1, 2, 3, 4, 5]
+        assert calendar.index_of(3) == 2
+        assert calendar.late_ids == frozenset({5})
+        assert calendar.is_late(4) is False
+        assert calendar.last_ok_index == 3
+        assert calendar.reward(1) == 1000.0
+        assert calendar.reward(5) == LATE_SLOT_REWARD
+        assert calendar.label(2) == "09:30-10:00"
+        assert calendar.get(1).session == "morning"
+
+    def test_explicit_late_flag_wins(self):
+        calendar = TimeslotCalendar([{"id": 1, "start_time": "17:00", "is_late_slot": False}])
+        assert calendar.is_late(1) is False
+
+    def test_slots_outside_reward_table_score_zero(self):
+        calendar = TimeslotCalendar([{"id": 1, "start_time": "08:15"}, {"id": 2, "start_time": "18:00"}])
+        assert calendar.reward(1) == 0.0 and calendar.reward(2) == 0.0
+        assert calendar.is_late(2)
+
+    def test_get_calendar_reuses_instance(self, monkeypatch):
+        from app.algorithms import timeslot_calendar
+
+        timeslots = _timeslots()
+        calendar = get_calendar(timeslots)
+        # Ayni liste nesnesi icerik anahtari hesaplanmadan bulunur
+        monkeypatch.setattr(timeslot_calendar, "_fingerprint", None)
+        assert get_calendar(timeslots) is calendar
+        monkeypatch.undo()
+        assert get_calendar(calendar) is calendar
+        assert get_calendar(list(timeslots)) is calendar
+
+    def test_get_calendar_sees_in_place_changes(self):
+        timeslots = _timeslots()
+        calendar = get_calendar(timeslots)
+        slot_id = timeslots[0]["id"]
+        timeslots[0] = dict(timeslots[0], start_time="17:00", end_time="17:30")
+        updated = get_calendar(timeslots)
+        assert updated is not calendar
+        assert updated.is_late(slot_id) and not calendar.is_late(slot_id)
+        assert all(info.source is not slot for info, slot in zip(updated.slots, timeslots))
+
+
+class TestCalendarConsumers:
+    """Validator and metrics use the shared calendar"""
+
+    def test_validator_gaps_and_late_slots(self):
+        timeslots = _timeslots()
+        assignments = [
+            {"project_id": 1, "classroom_id": 1, "timeslot_id": 1},
+            {"project_id": 2, "classroom_id": 1, "timeslot_id": 3},
+            {"project_id": 3, "classroom_id": 2, "timeslot_id": 5},
+        ]
+        gaps = detect_gaps(assignments, timeslots)
+        assert gaps["total_gaps"] == 1
+        late = detect_late_slots(assignments, timeslots)
+        assert [a["project_id"] for a in late] == [3]
+
+    def test_metrics_late_slot_count(self):
+        plan = {
+            "slots": _timeslots(),
+            "assignments": [
+                {"project_id": 1, "classroom_id": 1, "slot_id": 1},
+                {"project_id": 2, "classroom_id": 1, "slot_id": 5},
+            ],
+            "expected_projects": [{"id": 1}, {"id": 2}],
+        }
+        result = performance_metrics.compute(plan)
+        assert result["counts"]["late_assignments"] == 1
@@ -0,0 +1,77 @@
+"""
+Test suite for the single-pass validator index and async report writing.
+"""
+
+import os
+
+from app.algorithms import validator
+
+
+TIMESLOTS = [
+    {"id": 1, "start_time": "09:00", "end_time": "09:30"},
+    {"id": 2, "start_time": "09:30", "end_time": "10:00"},
+    {"id": 3, "start_time": "10:00", "end_time": "10:30"},
+    {"id": 4, "start_time": "16:30", "end_time": "17:00"},
+]
+PROJECTS = [{"id": pid, "type": "bitirme" if pid % 2 else "ara"} for pid in range(1, 7)]
+INSTRUCTORS = [{"id": iid, "type": "instructor"} for iid in range(1, 5)]
+CLASSROOMS = [{"id": 10}, {"id": 11}]
+
+
+def _roles(responsible, *juries):
+    return [{"role": "SORUMLU", "person_id": responsible}] + [{"role": "JURI", "person_id": j} for j in juries]
+
+
+ASSIGNMENTS = [
+    {"project_id": 1, "classroom_id": 10, "timeslot_id": 1, "instructors": [1, 2], "project_type": "bitirme", "roles": _roles(1, 2)},
+    {"project_id": 2, "classroom_id": 10, "timeslot_id": 3, "instructors": [2], "project_type": "ara", "roles": _roles(2)},
+    {"project_id": 2, "classroom_id": 11, "timeslot_id": 1, "instructors": [2, 3], "project_type": "ara", "roles": _roles(2, 3)},
+    {"project_id": 3, "classroom_id": 11, "timeslot_id": 4, "instructors": [1, 1], "project_type": "bitirme", "roles": _roles(1, 1)},
+    {"project_id": 99, "classroom_id": None, "timeslot_id": 2, "instructors": []},
+]
+
+
+class TestScheduleIndex:
+    """One pass produces the same reports as the individual checks"""
+
+    def test_matches_individual_checks(self):
+        result = validator.validate_solution(ASSIGNMENTS, PROJECTS, INSTRUCTORS, CLASSROOMS, TIMESLOTS)
+        expected_ids = [p["id"] for p in PROJECTS]
+
+        assert result["duplicate_report"] == validator.detect_duplicates(ASSIGNMENTS)
+        assert result["coverage_report"] == validator.detect_coverage(ASSIGNMENTS, expected_ids)
+        assert result["gap_report"] == validator.detect_gaps(ASSIGNMENTS, TIMESLOTS)
+        assert result["late_slots_report"] == validator.detect_late_slots(ASSIGNMENTS, TIMESLOTS)
+        assert result["role_violations_report"] == validator.detect_role_violations(ASSIGNMENTS, {})
+        assert result["load_balance_report"] == validator.detect_load_balance_violations(ASSIGNMENTS, INSTRUCTORS)
+        assert result["classroom_switches_report"] == validator.detect_classroom_switches(ASSIGNMENTS, INSTRUCTORS)
+        assert result["session_count_report"] == validator.detect_session_count(ASSIGNMENTS, TIMESLOTS)
+
+        summary = result["summary"]
+        assert summary["total_duplicates"] == 1 and summary["total_gaps"] == 3
+        assert summary["late_slots_count"] == 1
+        assert result["role_violations_report"]["summary"] == {
+            "same_person_both_roles": 1, "bitirme_responsible_issues": 0, "bitirme_jury_issues": 0,
+            "ara_responsible_issues": 0, "ara_jury_issues": 1,
+        }
+
+    def test_custom_late_predicate(self):
+        index = validator.ScheduleIndex(ASSIGNMENTS, TIMESLOTS, late_pred=lambda ts: ts["id"] == 3)
+        assert [row["project_id"] for row in index.late_slots] == [2]
+
+
+class TestReportWriting:
+    """Report files are optional and written off the caller's thread"""
+
+    def test_reuses_validation_and_writes_in_background(self, tmp_path, monkeypatch):
+        validation = validator.validate_solution(ASSIGNMENTS, PROJECTS, INSTRUCTORS, CLASSROOMS, TIMESLOTS)
+        monkeypatch.setattr(validator, "validate_solution", lambda *a, **k: (_ for _ in ()).throw(AssertionError))
+
+        reports = validator.generate_reports(ASSIGNMENTS, PROJECTS, INSTRUCTORS, CLASSROOMS, TIMESLOTS,
+                                             validation_result=validation)
+        assert reports["gap_report"] is validation["gap_report"]
+        assert "report_dir" not in reports and "report_files" not in reports
+
+        future = validator.write_reports_async(validation, str(tmp_path))
+        files = future.result(timeout=10)
+        assert len(files) == 11 and all(os.path.exists(path) for path in files.values())
@@ -0,0 +1,106 @@
+"""
+Test suite for warm-starting solvers from a persisted schedule.
+"""
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import app.models  # noqa: F401  (FK hedef tablolari metadata'ya kaydolur)
+from app.algorithms.comprehensive_optimizer import ComprehensiveOptimizer
+from app.algorithms.integer_linear_programming import ILPConfig, ILPModelBuilder, Project, Teacher
+from app.algorithms.warm_start import (
+    WARM_START_KEY, complete_placements, normalize_instructor_ids, warm_start_entries
+)
+from app.models.schedule import Schedule
+from app.services.algorithm import AlgorithmService
+
+
+def _data():
+    return {
+        "projects": [
+            {"id": p, "title": f"P{p}", "type": "bitirme", "responsible_id": 10 + p % 2}
+            for p in range(1, 6)
+        ],
+        "instructors": [{"id": i, "name": f"I{i}", "type": "instructor"} for i in (10, 11, 12)],
+        "classrooms": [{"id": 101, "name": "D101"}, {"id": 102, "name": "D102"}],
+        "timeslots": [{"id": 200 + i, "start_time": f"{9 + i}:00", "end_time": f"{9 + i}:30"} for i in range(4)],
+        WARM_START_KEY: [
+            {"project_id": 1, "classroom_id": 102, "timeslot_id": 201, "instructors": [11, {"id": 12}, {"id": -1, "is_placeholder": True}]},
+            {"project_id": 2, "classroom_id": 102, "timeslot_id": 202, "instructors": [10, 12]},
+            {"project_id": 3, "classroom_id": 101, "timeslot_id": 200, "instructors": [11, 10]},
+            {"project_id": 99, "classroom_id": 999, "timeslot_id": 200, "instructors": [10, 11]},
+        ],
+    }
+
+
+class TestWarmStartEntries:
+    """Persisted ids map onto the solver's class/slot indexes"""
+
+    def test_ids_become_indexes(self):
+        entries = warm_start_entries(_data())
+        assert [(e["project_id"], e["class_id"], e["class_order"]) for e in entries] == [
+            (1, 1, 1), (2, 1, 2), (3, 0, 0)
+        ]
+        assert entries[0]["instructors"] == [11, 12, -1]
+        assert warm_start_entries(_data(), class_count=1)[0]["project_id"] == 3
+        assert warm_start_entries({"projects": []}) == []
+
+    def test_instructor_normalization(self):
+        assert normalize_instructor_ids([5, "7", {"id": 3}, "[Arastirma Gorevlisi]", None]) == [5, 7, 3, -1, -1]
+
+    def test_missing_projects_fill_least_loaded_class(self):
+        placements = complete_placements({1: (1, 1), 2: (1, 2), 3: (0, 0), 4: (1, 1)}, [1, 2, 3, 4, 5], 2)
+        # Sira sikistirilir; cakisan 4 ve yeni 5 en az yuklu sinifa gider
+        assert placements[1] == (1, 0) and placements[2] == (1, 1) and placements[3] == (0, 0)
+        assert {placements[4][0], placements[5][0]} == {0}
+        assert sorted(placements.values()) == [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1)]
+
+
+class TestSolverSeeding:
+    """Solvers start from the persisted placement"""
+
+    def test_comprehensive_optimizer_solution(self):
+        optimizer = ComprehensiveOptimizer({})
+        optimizer.initialize(_data())
+        solution = optimizer._build_warm_start_solution()
+        by_project = {a.project_id: a for a in solution.assignments}
+        assert (by_project[1].class_id, by_project[1].slot_in_class, by_project[1].j1_id) == (1, 0, 12)
+        assert (by_project[3].class_id, by_project[3].slot_in_class) == (0, 0)
+        assert set(by_project) == {1, 2, 3, 4, 5}
+
+    def test_ilp_mip_start_uses_schedule(self):
+        builder = ILPModelBuilder(
+            projects=[Project(id=p, ps_id=10 + p % 2, project_type="BITIRME") for p in range(1, 6)],
+            teachers=[Teacher(id=i, code=f"I{i}") for i in (10, 11, 12)],
+            config=ILPConfig(),
+            num_classes=2,
+            warm_start=warm_start_entries(_data()),
+        )
+        start = builder._overlay_schedule_warm_start(builder._generate_greedy_initial_solution())
+        assert start["project_assignments"][1] == (1, 0)
+        assert start["project_assignments"][3] == (0, 0)
+        assert start["j1_assignments"][1] == 12
+        assert len(set(start["project_assignments"].values())) == 5
+
+
+class TestLoadWarmStart:
+    """Warm start source is the schedules table"""
+
+    def test_persisted_schedule_is_loaded(self):
+        async def scenario():
+            engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+            async with engine.begin() as conn:
+                await conn.run_sync(lambda c: Schedule.__table__.create(c))
+            try:
+                async with AsyncSession(engine) as db:
+                    db.add(Schedule(project_id=1, classroom_id=102, timeslot_id=201, instructors=[11, 12]))
+                    await db.commit()
+                    return (await AlgorithmService._load_warm_start(db, True),
+                            await AlgorithmService._load_warm_start(db, "not-a-run"))
+            finally:
+                await engine.dispose()
+
+        persisted, unknown = asyncio.run(scenario())
+        assert persisted == [{"project_id": 1, "classroom_id": 102, "timeslot_id": 201, "instructors": [11, 12]}]
+        assert unknown == []
@@ -0,0 +1,103 @@
+"""
+Test suite for coalesced WebSocket send queues and cross-worker fan-out
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.websockets import WebSocketState
+
+from app.api.v1.endpoints.websocket import ConnectionManager
+from app.core.cache import MockRedisPool
+
+
+class FakeWebSocket:
+    """Minimal WebSocket stand-in; ``gate`` blocks sends to simulate a slow client."""
+
+    def __init__(self):
+        self.client_state = WebSocketState.CONNECTED
+        self.sent = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        await self.gate.wait()
+        self.sent.append(json.loads(text) if text.startswith("{") else text)
+
+
+async def _drain():
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+class TestCoalescedSender:
+    """Per-connection send queue"""
+
+    @pytest.mark.asyncio
+    async def test_progress_frames_are_coalesced(self):
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+        await manager.connect(websocket, 1)
+
+        websocket.gate.clear()
+        await manager.send_personal_message("first", 1)
+        await _drain()
+        for progress in range(10, 60, 10):
+            await manager.send_algorithm_progress(1, {"algorithm_id": 7, "progress": progress})
+        await manager.send_algorithm_complete(1, {"algorithm_id": 7, "progress": 100})
+        websocket.gate.set()
+        await _drain()
+
+        progress_frames = [m for m in websocket.sent if isinstance(m, dict) and m["type"] == "algorithm_progress"]
+        assert [m["data"]["progress"] for m in progress_frames] == [50]
+        assert websocket.sent[-1]["type"] == "algorithm_complete"
+
+        metrics = manager.get_metrics()["connections"][0]
+        assert metrics["superseded"] == 4
+        assert metrics["sent"] == 3
+        assert metrics["queue_depth"] == 0
+        manager.disconnect(1)
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_sender(self):
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+        await manager.connect(websocket, 1)
+        websocket.gate.clear()
+
+        await asyncio.wait_for(manager.send_personal_message("hello", 1), timeout=0.5)
+        await asyncio.wait_for(
+            manager.send_algorithm_progress(1, {"algorithm_id": 1, "progress": 5}), timeout=0.5
+        )
+        manager.disconnect(1)
+
+
+class TestRedisFanout:
+    """Cross-worker delivery through pub/sub"""
+
+    @pytest.mark.asyncio
+    async def test_progress_reaches_user_on_other_worker(self):
+        redis = MockRedisPool()
+        worker_a, worker_b = ConnectionManager(), ConnectionManager()
+        assert await worker_a.start_fanout(redis)
+        assert await worker_b.start_fanout(redis)
+
+        websocket = FakeWebSocket()
+        await worker_b.connect(websocket, 42)
+
+        await worker_a.send_algorithm_progress(42, {"algorithm_id": 3, "progress": 25})
+        for _ in range(50):
+            if websocket.sent:
+                break
+            await asyncio.sleep(0.01)
+
+        assert websocket.sent == [{"type": "algorithm_progress", "data": {"algorithm_id": 3, "progress": 25}}]
+        assert worker_b.algorithm_progress[42]["progress"] == 25
+
+        worker_b.disconnect(42)
+        await worker_a.stop_fanout()
+        await worker_b.stop_fanout()